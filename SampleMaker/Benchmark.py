@@ -0,0 +1,320 @@
+"""
+Fichier contenant la suite de micro-benchmarks des chemins critiques de la génération.
+
+Les tests vérifient la justesse des résultats et `Monitoring` suit le processeur et la mémoire, mais aucun ne mesure la durée de chaque opération.
+Cette suite chronomètre les opérations coûteuses pour des tailles (64 à 4096 pixels) et des densités fixes :
+
+- `mask.<motif>` : Génération de chaque motif de masque (`mask.existing_image` : lecture d'une image PNG de la taille mesurée).
+- `sampler.generate_localisation` et `sampler.generate_psf` : Tirage des positions et rendu des PSF d'une frame.
+- `noiser.apply` : Application du bruit à une frame.
+- `stack.add_sample.append` et `stack.add_sample.reserved` : Remplissage d'une pile sans et avec réservation.
+- `stack.save` et `stack.open` : Écriture et lecture d'une pile TIF (sans compression et zlib).
+
+Chaque cas est exécuté une première fois (non mesurée) puis répété jusqu'à `repeat` fois dans la limite de `budget` secondes.
+Les résultats (minimum, médiane et moyenne en secondes) sont enregistrés au format JSON avec les informations de la machine et du commit.
+
+**Comparaison** :
+
+`compare` compare deux fichiers de résultats cas par cas à partir des médianes. Un cas est une régression si sa médiane dépasse
+celle de la référence de plus de `threshold` (10 % par défaut), une amélioration si elle est inférieure de plus de `threshold`.
+
+**Usage** :
+
+```
+python -m SampleMaker benchmark [--sizes 64 256 1024 4096] [--densities 0.25 1] [--repeat 5] [--filter psf] [--output Reports/Benchmark.json]
+python -m SampleMaker compare reference.json current.json [--threshold 0.1]
+```
+"""
+
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from SampleMaker import Mask, Pattern, PatternType, Stack
+
+SIZES = (64, 256, 1024, 4096)
+DENSITIES = (0.25, 1.0)
+DEFAULT_THRESHOLD = 0.1
+MAX_PSF_WORK = 2e8					 # Molécules × pixels au-delà duquel le rendu des PSF n'est pas mesuré (trop long)
+MAX_STACK_BYTES = 256 * 1024 ** 2	 # Taille maximale des piles mesurées (le nombre de frames diminue avec la taille)
+MASK_PATTERNS = (PatternType.STRIPES, PatternType.SQUARES, PatternType.SUN, PatternType.EXISTING_IMAGE)
+
+Case = Tuple[str, Dict[str, Any], Callable[[], Optional[Callable[[], Any]]]]
+
+
+# ==================================================
+# region Measure
+# ==================================================
+##################################################
+def measure(function: Callable[[], Any], repeat: int = 5, budget: float = 2.0) -> Dict[str, Any]:
+	"""
+	Chronomètre une fonction : une exécution non mesurée puis jusqu'à `repeat` exécutions dans la limite de `budget` secondes.
+
+	:param function: Fonction sans argument à chronométrer.
+	:param repeat: Nombre maximal d'exécutions mesurées (par défaut 5).
+	:param budget: Durée visée des exécutions mesurées en secondes, au moins une exécution est mesurée (par défaut 2).
+	:return: Dictionnaire avec le minimum, la médiane et la moyenne en secondes et le nombre d'exécutions mesurées.
+	"""
+	start = time.perf_counter()
+	function()  # Exécution de chauffe (caches, allocations)
+	first = time.perf_counter() - start
+	n = max(1, min(repeat, int(budget / max(first, 1e-9))))
+	times = []
+	for _ in range(n):
+		start = time.perf_counter()
+		function()
+		times.append(time.perf_counter() - start)
+	return {"min": float(np.min(times)), "median": float(np.median(times)), "mean": float(np.mean(times)), "repeat": n}
+
+
+##################################################
+def get_case_name(name: str, params: Dict[str, Any]) -> str:
+	"""
+	Retourne le nom complet d'un cas (nom de l'opération et paramètres), utilisé comme clé des résultats.
+
+	:param name: Nom de l'opération.
+	:param params: Paramètres du cas.
+	:return: Le nom complet, par exemple "sampler.generate_psf[size=256,density=0.25]".
+	"""
+	return f"{name}[{','.join(f'{key}={value}' for key, value in params.items())}]"
+
+# ==================================================
+# endregion Measure
+# ==================================================
+
+
+# ==================================================
+# region Cases
+# ==================================================
+##################################################
+def get_stack_frames(size: int) -> int:
+	""" Nombre de frames des piles mesurées pour une taille donnée (16 au plus, 2 au moins, limité par `MAX_STACK_BYTES`). """
+	return int(max(2, min(16, MAX_STACK_BYTES // (size * size * 4))))
+
+
+##################################################
+def get_cases(sizes: Sequence[int] = SIZES, densities: Sequence[float] = DENSITIES, directory: str = ".") -> List[Case]:
+	"""
+	Construit la liste des cas à mesurer.
+
+	Chaque cas est un triplet (nom, paramètres, préparation). La préparation n'est pas chronométrée et retourne la fonction à mesurer
+	(ou None si le cas est ignoré).
+
+	:param sizes: Tailles des images en pixels.
+	:param densities: Densités de molécules par µm².
+	:param directory: Dossier des fichiers temporaires (piles TIF).
+	:return: La liste des cas.
+	"""
+	# Import local : Generator importe Tools qui n'a pas besoin de ce module
+	from SampleMaker.Generator import Noiser, Sampler
+
+	cases: List[Case] = []
+	for size in sizes:
+		for pattern in MASK_PATTERNS:
+			def mask_setup(size=size, pattern=pattern):
+				options = None
+				if pattern == PatternType.EXISTING_IMAGE:  # Image du motif soleil enregistrée à la taille mesurée
+					options = {"path": os.path.join(directory, f"benchmark_mask_{size}.png")}
+					Mask(_size=size, _pattern=Pattern.from_pattern(PatternType.SUN)).save(options["path"])
+				return lambda: Mask(_size=size, _pattern=Pattern.from_pattern(pattern, options))
+
+			cases.append((f"mask.{pattern.name.lower()}", {"size": size}, mask_setup))
+
+		for density in densities:
+			def localisation_setup(size=size, density=density):
+				sampler = Sampler(size=size, density=density)
+				return sampler.generate_localisation
+
+			def psf_setup(size=size, density=density):
+				sampler = Sampler(size=size, density=density)
+				localisation = sampler.generate_localisation()
+				intensities = sampler.fluorophore.get_intensities(localisation.shape[0], True)
+				if localisation.shape[0] * size * size > MAX_PSF_WORK: return None
+				return lambda: sampler.generate_psf(localisation, intensities)
+
+			cases.append(("sampler.generate_localisation", {"size": size, "density": density}, localisation_setup))
+			cases.append(("sampler.generate_psf", {"size": size, "density": density}, psf_setup))
+
+		def noiser_setup(size=size):
+			image = Sampler(size=size).generate_clean_sample()
+			noiser = Noiser()
+			return lambda: noiser.apply(image)
+
+		cases.append(("noiser.apply", {"size": size}, noiser_setup))
+
+		frames = get_stack_frames(size)
+		sample = np.random.uniform(0, 1000, (size, size)).astype(np.float32)
+
+		def append_setup(sample=sample, frames=frames):
+			def fill():
+				stack = Stack()
+				for i in range(frames): stack.add_sample(sample)
+			return fill
+
+		def reserved_setup(sample=sample, frames=frames, size=size):
+			def fill():
+				stack = Stack()
+				stack.reserve(frames, size, size)
+				for i in range(frames): stack.add_sample(sample, i)
+			return fill
+
+		cases.append(("stack.add_sample.append", {"size": size, "frames": frames}, append_setup))
+		cases.append(("stack.add_sample.reserved", {"size": size, "frames": frames}, reserved_setup))
+
+		for compression in ("none", "zlib"):
+			filename = os.path.join(directory, f"benchmark_{size}_{compression}.tif")
+
+			def save_setup(sample=sample, frames=frames, filename=filename, compression=compression):
+				stack = Stack()
+				stack.stack = np.repeat(sample[np.newaxis], frames, axis=0)
+				return lambda: stack.save(filename, compression=compression)
+
+			def open_setup(sample=sample, frames=frames, filename=filename, compression=compression):
+				stack = Stack()
+				stack.stack = np.repeat(sample[np.newaxis], frames, axis=0)
+				stack.save(filename, compression=compression)
+				return lambda: Stack().open(filename)
+
+			cases.append(("stack.save", {"size": size, "frames": frames, "compression": compression}, save_setup))
+			cases.append(("stack.open", {"size": size, "frames": frames, "compression": compression}, open_setup))
+	return cases
+
+# ==================================================
+# endregion Cases
+# ==================================================
+
+
+# ==================================================
+# region Run
+# ==================================================
+##################################################
+def get_metadata() -> Dict[str, Any]:
+	"""
+	Retourne les informations de la machine et du code mesuré (nécessaires pour comparer deux résultats).
+
+	:return: Dictionnaire des informations (date, commit, versions, processeur).
+	"""
+	try:
+		commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5,
+								cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+	except (OSError, subprocess.SubprocessError): commit = ""
+	return {"date":   datetime.now().isoformat(timespec="seconds"), "commit": commit or "unknown", "python": platform.python_version(),
+			"numpy":  np.__version__, "platform": platform.platform(), "processor": platform.processor() or platform.machine(),
+			"cpu_count": os.cpu_count()}
+
+
+##################################################
+def run_benchmarks(sizes: Sequence[int] = SIZES, densities: Sequence[float] = DENSITIES, repeat: int = 5, budget: float = 2.0,
+				   select: str = "", verbose: bool = True) -> Dict[str, Any]:
+	"""
+	Exécute tous les cas de la suite.
+
+	:param sizes: Tailles des images en pixels (par défaut `SIZES`).
+	:param densities: Densités de molécules par µm² (par défaut `DENSITIES`).
+	:param repeat: Nombre maximal d'exécutions mesurées par cas (par défaut 5).
+	:param budget: Durée visée des exécutions mesurées de chaque cas en secondes (par défaut 2).
+	:param select: Seuls les cas dont le nom contient cette chaîne sont exécutés (par défaut tous).
+	:param verbose: Si `True`, le résultat de chaque cas est affiché (par défaut True).
+	:return: Dictionnaire avec les informations (`metadata`) et les résultats de chaque cas (`results`).
+	"""
+	results = {}
+	with tempfile.TemporaryDirectory() as directory:
+		for name, params, setup in get_cases(sizes, densities, directory):
+			key = get_case_name(name, params)
+			if select not in key: continue
+			np.random.seed(0)  # Même charge de travail d'une exécution à l'autre
+			function = setup()
+			if function is None: result = {"skipped": "Charge de travail trop importante."}
+			else: result = measure(function, repeat, budget)
+			results[key] = {"name": name, "params": params} | result
+			if verbose: print(f"{key:<70} " + (f"{result['median'] * 1000:10.3f} ms (x{result['repeat']})" if "median" in result else "ignoré"))
+	return {"metadata": get_metadata(), "results": results}
+
+
+##################################################
+def save_results(results: Dict[str, Any], filename: str):
+	"""
+	Enregistre les résultats au format JSON.
+
+	:param results: Résultats de `run_benchmarks`.
+	:param filename: Nom du fichier de sortie.
+	"""
+	directory = os.path.dirname(filename)
+	if directory: os.makedirs(directory, exist_ok=True)
+	with open(filename, "w", encoding="utf-8") as f: json.dump(results, f, indent=4)
+
+
+##################################################
+def open_results(filename: str) -> Dict[str, Any]:
+	"""
+	Ouvre un fichier de résultats.
+
+	:param filename: Nom du fichier JSON.
+	:return: Les résultats.
+	:raises OSError: Si le fichier est introuvable.
+	"""
+	if not os.path.isfile(filename): raise OSError(f"Le fichier \"{filename}\" est introuvable.")
+	with open(filename, "r", encoding="utf-8") as f: return json.load(f)
+
+# ==================================================
+# endregion Run
+# ==================================================
+
+
+# ==================================================
+# region Compare
+# ==================================================
+##################################################
+def compare(reference: Dict[str, Any], current: Dict[str, Any], threshold: float = DEFAULT_THRESHOLD) -> Dict[str, Dict[str, Any]]:
+	"""
+	Compare deux résultats cas par cas (médianes des cas mesurés dans les deux résultats).
+
+	:param reference: Résultats de référence.
+	:param current: Résultats à comparer.
+	:param threshold: Variation relative tolérée (par défaut 0.1, soit 10 %).
+	:return: Dictionnaire associant à chaque cas commun les médianes, leur rapport et le statut ("regression", "improvement" ou "stable").
+	"""
+	comparison = {}
+	for key, result in current["results"].items():
+		ref = reference["results"].get(key, {})
+		if "median" not in result or "median" not in ref: continue
+		ratio = result["median"] / max(ref["median"], 1e-12)
+		status = "regression" if ratio > 1 + threshold else "improvement" if ratio < 1 - threshold else "stable"
+		comparison[key] = {"reference": ref["median"], "current": result["median"], "ratio": ratio, "status": status}
+	return comparison
+
+
+##################################################
+def get_regressions(comparison: Dict[str, Dict[str, Any]]) -> List[str]:
+	"""
+	Retourne les cas en régression d'une comparaison.
+
+	:param comparison: Résultat de `compare`.
+	:return: La liste des noms des cas en régression.
+	"""
+	return [key for key, value in comparison.items() if value["status"] == "regression"]
+
+
+##################################################
+def format_comparison(comparison: Dict[str, Dict[str, Any]]) -> str:
+	"""
+	Retourne le tableau d'une comparaison (une ligne par cas).
+
+	:param comparison: Résultat de `compare`.
+	:return: Le tableau sous forme de texte.
+	"""
+	lines = [f"{'Cas':<70} {'Référence':>12} {'Actuel':>12} {'Rapport':>8}  Statut"]
+	for key, value in comparison.items():
+		lines.append(f"{key:<70} {value['reference'] * 1000:9.3f} ms {value['current'] * 1000:9.3f} ms {value['ratio']:8.2f}  {value['status']}")
+	return "\n".join(lines)
+
+# ==================================================
+# endregion Compare
+# ==================================================
@@ -8,7 +8,8 @@ Structure :
 1. **Classe `Fluorophore`**
 
    - Modélise les caractéristiques d'un fluorophore, comme sa longueur d'onde, son intensité et son comportement
-     de scintillement. Elle inclut également une méthode pour calculer l'intensité avec des variations aléatoires.
+     de scintillement. Elle inclut également des méthodes pour calculer l'intensité avec des variations aléatoires
+     (pour une molécule ou pour un ensemble de molécules).
 
 2. **Fluorophores prédéfinis**
 
@@ -28,6 +29,9 @@ import random
 from dataclasses import dataclass
 from typing import Dict
 
+import numpy as np
+from numpy.typing import NDArray
+
 
 ##################################################
 @dataclass
@@ -60,6 +64,19 @@ class Fluorophore:
 			return max(0.0, (self.intensity * (1 + variation_percent)))
 		return max(0.0, self.intensity)
 
+	##################################################
+	def get_intensities(self, n: int, variation: bool = False) -> NDArray[np.float32]:
+		"""
+		Calcule l'intensité de plusieurs molécules en une seule fois.
+
+		:param n: Nombre de molécules.
+		:param variation: Si `True`, applique une variation aléatoire indépendante à l'intensité de base de chaque molécule.
+		:return: Tableau des intensités des molécules (avec ou sans variation).
+		"""
+		if not variation: return np.full(n, max(0.0, self.intensity), dtype=np.float32)
+		variation_percent = np.random.uniform(-self.delta, self.delta, n) / 100  # Variation en pourcentage entre -delta et +delta
+		return np.maximum(0.0, self.intensity * (1 + variation_percent)).astype(np.float32)
+
 	# ==================================================
 	# region IO
 	# ==================================================
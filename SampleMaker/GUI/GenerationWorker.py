@@ -0,0 +1,112 @@
+"""
+Module contenant la classe `GenerationWorker` qui génère une pile en dehors du thread de l'interface.
+
+La génération d'une pile peut durer plusieurs minutes : exécutée dans le thread principal, elle fige la fenêtre.
+Le `GenerationWorker` est déplacé dans un `QThread`, observe le générateur (`StackObserver`) et communique avec l'interface uniquement par signaux :
+
+- `progress` : avancement (frames générées, frames demandées, temps écoulé), émis au plus toutes les `interval` secondes.
+- `finished` : fin de la génération et de l'enregistrement (frames générées, frames demandées).
+- `failed` : message d'erreur si la génération ou l'enregistrement échoue.
+
+L'annulation (`cancel`) arrête la génération après la frame en cours, les frames déjà générées sont enregistrées.
+Si `monitoring` est activé, les ressources et le débit de la génération sont suivis (`Tools.Monitoring`) et le rapport est enregistré
+à côté de la pile (`<nom>_monitoring.html`). Les statistiques de la pile sont enregistrées si le générateur les calcule (`<nom>_statistics.npz`).
+"""
+
+import time
+from typing import Any, Dict, Optional
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from SampleMaker import Tools
+from SampleMaker.Generator.Stacker import Stacker
+from SampleMaker.Generator.StackObserver import MonitoringObserver, StackEvent, StackObserver
+
+PROGRESS_INTERVAL = 0.1  # Intervalle minimal entre deux signaux d'avancement (en secondes)
+MONITORING_INTERVAL = 0.5  # Intervalle des mesures du Monitoring (en secondes)
+
+
+##################################################
+def format_progress(done: int, total: int, elapsed: float) -> str:
+	"""
+	Retourne le message d'avancement d'une génération (frames, débit et temps restant estimé).
+
+	:param done: Nombre de frames générées.
+	:param total: Nombre de frames demandées.
+	:param elapsed: Temps écoulé en secondes.
+	:return: Le message à afficher dans la barre de statut.
+	"""
+	fps = done / elapsed if elapsed > 0 else 0.0
+	eta = f"{(total - done) / fps:.0f} s" if fps > 0 else "inconnu"
+	return f"Génération en cours... Frame {done}/{total} ({fps:.1f} frames/s, temps restant : {eta})"
+
+
+##################################################
+class GenerationWorker(QObject, StackObserver):
+	""" Génère et enregistre une pile (à exécuter dans un `QThread`) en signalant son avancement. """
+
+	progress = pyqtSignal(int, int, float)
+	finished = pyqtSignal(int, int)
+	failed = pyqtSignal(str)
+
+	##################################################
+	def __init__(self, stacker: Stacker, n_frames: int, basename: str, save_options: Optional[Dict[str, Any]] = None,
+				 interval: float = PROGRESS_INTERVAL, monitoring: bool = False):
+		"""
+		Initialise le worker de génération.
+
+		:param stacker: Générateur de pile configuré.
+		:param n_frames: Nombre de frames à générer.
+		:param basename: Chemin des fichiers de sortie sans extension (la pile en `.tif`, la vérité terrain en `.csv`).
+		:param save_options: Options d'enregistrement de la pile (voir `Stack.save`, par défaut aucune).
+		:param interval: Intervalle minimal entre deux signaux d'avancement en secondes (par défaut `PROGRESS_INTERVAL`).
+		:param monitoring: Si `True`, le rapport des ressources et du débit de la génération est enregistré (par défaut False).
+		"""
+		super().__init__()
+		self.stacker = stacker
+		self.n_frames = n_frames
+		self.basename = basename
+		self.save_options = save_options or {}
+		self.interval = interval
+		self.monitoring = monitoring
+		self._last_emit = 0.0
+		self.stacker.observers.append(self)
+
+	##################################################
+	def on_frame(self, event: StackEvent):
+		""" Relaie l'avancement du générateur en limitant la fréquence des signaux (la dernière frame est toujours signalée). """
+		done, now = event.frame + 1, time.perf_counter()
+		if done < event.total and not self.stacker.cancelled and now - self._last_emit < self.interval: return
+		self._last_emit = now
+		self.progress.emit(done, event.total, event.elapsed)
+
+	##################################################
+	def run(self):
+		"""
+		Génère la pile puis l'enregistre (même partielle si la génération a été annulée).
+		Toute erreur est signalée par `failed` : une exception sortant d'un slot Qt interromprait l'application
+		et l'interface attendrait indéfiniment la fin de la génération.
+		"""
+		monitoring = None
+		try:
+			if self.monitoring:
+				monitoring = Tools.Monitoring()  # Import de plotly et psutil uniquement si demandé
+				monitoring.start(MONITORING_INTERVAL)
+				self.stacker.observers.append(MonitoringObserver(monitoring))
+			stack = self.stacker.generate(self.n_frames, f"{self.basename}.csv")
+			if self.stacker.n_generated > 0: stack.save(f"{self.basename}.tif", **self.save_options)
+			if self.stacker.statistics is not None: self.stacker.statistics.save(f"{self.basename}_statistics.npz")
+			stack.release()  # Supprime le fichier temporaire de la pile projetée (voir `Generator.Planner`)
+			if monitoring is not None:
+				monitoring.stop()
+				monitoring.save(f"{self.basename}_monitoring.html", full_html=True)
+			self.finished.emit(self.stacker.n_generated, self.n_frames)
+		except Exception as error:  # Toute erreur (MemoryError, TypeError, numpy...), pas seulement celles des entrées/sorties
+			self.failed.emit(f"{type(error).__name__} : {error}")
+		finally:
+			if monitoring is not None and monitoring.running: monitoring.stop()
+
+	##################################################
+	def cancel(self):
+		""" Demande l'arrêt de la génération après la frame en cours (appelable depuis le thread de l'interface). """
+		self.stacker.cancel()
@@ -105,3 +105,16 @@ class MainUI(QMainWindow):
 		self.statusBar().showMessage(msg)
 		QApplication.processEvents()  # Force l'interface à se rafraîchir
 		print(msg)
+
+	##################################################
+	def closeEvent(self, event):
+		"""
+		Annule la génération en cours avant de fermer la fenêtre (les frames déjà générées sont enregistrées).
+
+		:param event: Événement de fermeture.
+		"""
+		widget = self.centralWidget()
+		if widget.is_generating():  # pragma: no cover
+			widget.cancel_function()
+			widget.wait_generation()
+		event.accept()
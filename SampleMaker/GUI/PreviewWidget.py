@@ -0,0 +1,95 @@
+"""
+Module contenant la classe `PreviewWidget` qui affiche l'aperçu d'une frame à côté des paramètres.
+
+L'aperçu est calculé par `Generator.Preview` (une frame à résolution réduite ou la zone centrale à pleine résolution).
+Chaque modification d'un paramètre relance un minuteur : l'aperçu n'est recalculé qu'une fois les modifications terminées
+(`DEBOUNCE_MS` millisecondes sans nouvelle modification), les masques et les noyaux étant conservés entre deux rendus.
+"""
+
+import numpy as np
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QImage, QPixmap
+from PyQt5.QtWidgets import QCheckBox, QLabel, QVBoxLayout, QWidget
+
+from SampleMaker.Generator.Preview import Preview
+from SampleMaker.GUI.Settings.Settings import Settings
+
+PREVIEW_SIZE = 256  # Taille de l'aperçu en pixels
+DEBOUNCE_MS = 150   # Délai sans modification avant le calcul de l'aperçu (en millisecondes)
+
+
+##################################################
+class PreviewWidget(QWidget):
+	""" Widget affichant l'aperçu d'une frame, mis à jour à chaque modification des paramètres. """
+
+	##################################################
+	def __init__(self, settings: Settings, parent=None):
+		"""
+		Initialise le widget d'aperçu et relie les modifications des paramètres au minuteur.
+
+		:param settings: Paramètres de l'interface à prévisualiser.
+		:param parent: Widget parent de ce widget.
+		"""
+		super().__init__(parent)
+		self.settings = settings
+		self.preview = Preview(max_size=PREVIEW_SIZE)
+		self._image = None  # Référence au tampon de la QImage affichée
+
+		layout = QVBoxLayout()
+		layout.setAlignment(Qt.AlignTop)
+		layout.addWidget(QLabel("<b>Aperçu</b>"))
+		self.image_label = QLabel()
+		self.image_label.setFixedSize(PREVIEW_SIZE, PREVIEW_SIZE)
+		self.image_label.setAlignment(Qt.AlignCenter)
+		self.image_label.setStyleSheet("background-color: black;")
+		layout.addWidget(self.image_label)
+		self.roi_box = QCheckBox("Zone centrale à pleine résolution")
+		self.roi_box.stateChanged.connect(self.schedule)
+		layout.addWidget(self.roi_box)
+		self.info_label = QLabel()
+		self.info_label.setWordWrap(True)
+		self.info_label.setFixedWidth(PREVIEW_SIZE)
+		layout.addWidget(self.info_label)
+		self.setLayout(layout)
+
+		self.timer = QTimer(self)
+		self.timer.setSingleShot(True)
+		self.timer.setInterval(DEBOUNCE_MS)
+		self.timer.timeout.connect(self.refresh)
+		self.settings.on_change(self.schedule)
+		self.schedule()
+
+	##################################################
+	def schedule(self, *_):
+		""" Relance le minuteur : l'aperçu sera recalculé après `DEBOUNCE_MS` millisecondes sans nouvelle modification. """
+		self.timer.start()
+
+	##################################################
+	def refresh(self):
+		""" Calcule et affiche l'aperçu avec les paramètres courants (ou le message d'erreur des paramètres). """
+		msg = self.settings.parse_settings()
+		if msg != "":
+			self.info_label.setText(msg)
+			return
+		self.preview.roi = self.roi_box.isChecked()
+		try: frame = self.preview.render(self.settings.get_parameters())
+		except (OSError, ValueError) as error:  # pragma: no cover
+			self.info_label.setText(str(error))
+			return
+		self.show_frame(frame)
+		scale = "zone centrale" if self.preview.roi else f"résolution 1/{self.preview.factor}"
+		self.info_label.setText(f"{self.preview.n_molecules} molécules ({scale}), calculé en {self.preview.duration * 1000:.0f} ms")
+
+	##################################################
+	def show_frame(self, frame):
+		"""
+		Affiche une frame en niveaux de gris (contraste étiré entre les centiles 0.5 et 99.5).
+
+		:param frame: Image 2D à afficher.
+		"""
+		low, high = np.percentile(frame, (0.5, 99.5))
+		scaled = np.clip((frame - low) / max(high - low, 1e-6) * 255, 0, 255).astype(np.uint8)
+		self._image = np.ascontiguousarray(scaled)
+		height, width = self._image.shape
+		image = QImage(self._image.data, width, height, width, QImage.Format_Grayscale8)
+		self.image_label.setPixmap(QPixmap.fromImage(image).scaled(PREVIEW_SIZE, PREVIEW_SIZE, Qt.KeepAspectRatio))
@@ -5,13 +5,21 @@ Ce module définit la classe `SettingWidget`, qui crée et gère l'interface uti
 Elle contient des sections de paramètres organisées sous forme de layout,
 permettant de modifier différents paramètres pour la génération de fichiers et l'affichage des résultats.
 Le widget principal gère également la barre de statut et les actions associées aux boutons de l'interface utilisateur.
+La génération est exécutée dans un thread séparé (`GenerationWorker`) : l'interface reste réactive,
+l'avancement est affiché dans la barre de statut et la génération peut être annulée.
+Un aperçu d'une frame (`PreviewWidget`) est affiché à droite des paramètres et mis à jour à chaque modification.
+Avant la génération, la mémoire et la durée sont estimées (`Generator.Planner`) : une pile trop grande pour la mémoire
+est projetée depuis un fichier temporaire et l'utilisateur est averti.
 """
 
 import os
 
-from PyQt5.QtCore import Qt
-from PyQt5.QtWidgets import QHBoxLayout, QLabel, QLayout, QMessageBox, QPushButton, QVBoxLayout, QWidget
+from PyQt5.QtCore import Qt, QThread
+from PyQt5.QtWidgets import QApplication, QHBoxLayout, QLabel, QLayout, QMessageBox, QPushButton, QVBoxLayout, QWidget
 
+from SampleMaker.Generator.Planner import Planner, StorageMode
+from SampleMaker.GUI.GenerationWorker import format_progress, GenerationWorker
+from SampleMaker.GUI.PreviewWidget import PreviewWidget
 from SampleMaker.GUI.Settings.Settings import Settings
 from SampleMaker.Tools.Utils import add_suffix, get_timestamp_for_files
 
@@ -30,12 +38,14 @@ class SettingWidget(QWidget):
 		Initialise le widget principal de l'interface utilisateur.
 
 		Cette méthode configure l'interface en ajoutant différentes sections de paramètres dans la mise en page.
-		Elle crée également les boutons "Reset" et "Générer" et relie les actions correspondantes.
+		Elle crée également les boutons "Reset", "Générer" et "Annuler" et relie les actions correspondantes.
 
 		:param parent: Widget parent de ce widget, généralement la fenêtre principale (MainUI).
 		"""
 		super().__init__(parent)  # Initialise QWidget avec le parent
 		self.parent = parent  # Stocke une référence à MainUI
+		self.thread, self.worker = None, None  # Génération en cours
+		self.planner = Planner()  # Étalonnage de la machine conservé entre deux générations
 
 		# Mise en page principale
 		self.main_layout = QVBoxLayout()
@@ -81,19 +91,35 @@ class SettingWidget(QWidget):
 		for s in self.settings.ui["Noise"]: setting_layout.addLayout(s.layout)
 		self.main_layout.addLayout(self.create_section("Bruit", setting_layout))
 
-		# Ajouter les boutons Reset et Générer
+		# Section Sortie
+		setting_layout = QHBoxLayout()
+		setting_layout.setAlignment(Qt.AlignLeft)  # Définir l'alignement du layout à gauche
+		for s in self.settings.ui["Output"]: setting_layout.addLayout(s.layout)
+		self.main_layout.addLayout(self.create_section("Sortie", setting_layout))
+
+		# Ajouter les boutons Reset, Générer et Annuler
 		buttons_layout = QHBoxLayout()
 		reset_button = QPushButton("Reset")
 		reset_button.clicked.connect(self.settings.reset_ui)
-		generate_button = QPushButton("Générer")
-		generate_button.clicked.connect(self.generate_function)
+		self.generate_button = QPushButton("Générer")
+		self.generate_button.clicked.connect(self.generate_function)
+		self.cancel_button = QPushButton("Annuler")
+		self.cancel_button.setEnabled(False)
+		self.cancel_button.clicked.connect(self.cancel_function)
 		buttons_layout.addWidget(reset_button)
-		buttons_layout.addWidget(generate_button)
+		buttons_layout.addWidget(self.generate_button)
+		buttons_layout.addWidget(self.cancel_button)
 
 		self.main_layout.addLayout(buttons_layout)
 
+		# Aperçu à droite des paramètres
+		self.preview = PreviewWidget(self.settings, self)
+		page_layout = QHBoxLayout()
+		page_layout.addLayout(self.main_layout)
+		page_layout.addWidget(self.preview, alignment=Qt.AlignTop)
+
 		# Appliquer la mise en page principale
-		self.setLayout(self.main_layout)
+		self.setLayout(page_layout)
 
 	##################################################
 	def create_section(self, title: str, layout: QLayout) -> QVBoxLayout:
@@ -118,11 +144,12 @@ class SettingWidget(QWidget):
 		"""
 		Fonction de génération appelée lors du clic sur le bouton "Générer".
 
-		Cette méthode récupère les valeurs des paramètres, effectue les calculs nécessaires
-		et génère les fichiers de sortie en utilisant les valeurs des paramètres actuels.
-		Elle met à jour la barre de statut pour informer l'utilisateur de l'état d'avancement.
+		Cette méthode récupère les valeurs des paramètres, crée le générateur et lance la génération dans un thread séparé.
+		L'avancement (frames, débit et temps restant) est affiché dans la barre de statut au fil de la génération.
+		Si la pile ne tient pas en mémoire, elle est projetée depuis un fichier temporaire et un avertissement est affiché.
 		"""
 		# Cette fonction sera appelée quand le bouton "Générer" est cliqué
+		if self.is_generating(): return  # pragma: no cover
 		self.parent.update_status("Génération en cours...")
 		msg = self.settings.parse_settings()
 		if msg != "":  # pragma: no cover
@@ -131,18 +158,95 @@ class SettingWidget(QWidget):
 
 		self.parent.update_status("Génération en cours... Paramètres récupérés...")
 		print(self.settings)
-
-		# Création du générateur
+		# Création du générateur puis planification avec ses options (pile en entiers 16 bits, statistiques)
 		stacker = self.settings.get_stacker()
-		self.parent.update_status("Génération en cours... Paramètres récupérés... Paramétrisation effectué...")
+		plan = self.planner.plan(self.settings.get_parameters(), OUTPUT_DIR, uint16=stacker.as_uint16, statistics=stacker.compute_statistics)
+		if plan.warnings: self.warning_popup("Mémoire", "\n".join(plan.warnings))  # pragma: no cover
+		self.parent.update_status(f"Génération en cours... Paramètres récupérés... Paramétrisation effectué... "
+								  f"(mode {plan.mode.name}, durée estimée : {plan.runtime:.0f} s)")
 
-		# Génération de la pile
-		stack = stacker.generate(self.settings.n_frames)
+		# Génération de la pile dans un thread séparé (la vérité terrain est écrite en flux à côté de la pile)
 		os.makedirs(OUTPUT_DIR, exist_ok=True)  # Créer le dossier de sorties (la première fois, il n'existe pas)
 		timestamp = get_timestamp_for_files()
-		stack.save(f"{OUTPUT_DIR}/{add_suffix("stack.tif", timestamp)}")
-		self.save_log(f"{OUTPUT_DIR}/{add_suffix("stack.log", timestamp)}")
-		self.parent.update_status("Génération terminée")
+		self.save_log(f"{OUTPUT_DIR}/{add_suffix("stack.log", timestamp)}")  # Paramètres au lancement (modifiables pendant la génération)
+		basename = f"{OUTPUT_DIR}/{add_suffix("stack", timestamp)}"
+		if plan.mode == StorageMode.MEMMAP: stacker.memmap_file = f"{basename}.npy"  # pragma: no cover
+		self.worker = GenerationWorker(stacker, self.settings.n_frames, basename,
+									   {"compression": self.settings.compression, "tile": self.settings.tile, "workers": plan.workers},
+									   monitoring=self.settings.monitoring)
+		self.thread = QThread(self)
+		self.worker.moveToThread(self.thread)
+		self.thread.started.connect(self.worker.run)
+		self.worker.progress.connect(self.on_progress)
+		self.worker.finished.connect(self.on_finished)
+		self.worker.failed.connect(self.on_failed)
+		self.generate_button.setEnabled(False)
+		self.cancel_button.setEnabled(True)
+		self.thread.start()
+
+	##################################################
+	def cancel_function(self):
+		""" Fonction appelée lors du clic sur le bouton "Annuler" : arrête la génération après la frame en cours. """
+		if not self.is_generating(): return  # pragma: no cover
+		self.worker.cancel()
+		self.cancel_button.setEnabled(False)
+		self.parent.update_status("Annulation en cours...")
+
+	##################################################
+	def is_generating(self) -> bool:
+		""" Indique si une génération est en cours. """
+		return self.thread is not None
+
+	##################################################
+	def wait_generation(self):
+		""" Attend la fin de la génération en cours en continuant de traiter les événements (signaux du thread de génération). """
+		while self.is_generating():
+			QApplication.processEvents()
+			if self.thread is not None: self.thread.wait(10)
+
+	##################################################
+	def on_progress(self, done: int, total: int, elapsed: float):
+		"""
+		Affiche l'avancement de la génération dans la barre de statut.
+
+		:param done: Nombre de frames générées.
+		:param total: Nombre de frames demandées.
+		:param elapsed: Temps écoulé en secondes.
+		"""
+		self.parent.update_status(format_progress(done, total, elapsed))
+
+	##################################################
+	def on_finished(self, done: int, total: int):
+		"""
+		Termine la génération : arrêt du thread, réactivation des boutons et message de fin.
+
+		:param done: Nombre de frames générées.
+		:param total: Nombre de frames demandées.
+		"""
+		self._stop_thread()
+		if done < total: self.parent.update_status(f"Génération annulée ({done}/{total} frames enregistrées)")
+		else: self.parent.update_status("Génération terminée")
+
+	##################################################
+	def on_failed(self, msg: str):  # pragma: no cover
+		"""
+		Termine la génération en erreur et affiche le message.
+
+		:param msg: Message d'erreur.
+		"""
+		self._stop_thread()
+		self.parent.update_status("Génération échouée")
+		self.warning_popup("Erreur de génération", msg)
+
+	##################################################
+	def _stop_thread(self):
+		""" Arrête le thread de génération et réactive le bouton "Générer". """
+		self.thread.quit()
+		self.thread.wait()
+		self.thread.deleteLater()
+		self.thread, self.worker = None, None
+		self.generate_button.setEnabled(True)
+		self.cancel_button.setEnabled(False)
 
 	##################################################
 	def save_log(self, filename: str):
@@ -15,11 +15,13 @@ en facilitant le paramétrage et en générant des objets prêts à l'emploi pou
 """
 
 import os
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict
 
 from SampleMaker import Fluorophore, Mask, Pattern, PatternType
-from SampleMaker.Generator import Noiser, Sampler, Stacker, StackModelType
+from SampleMaker.Generator import Noiser, Sampler, Stacker, StackModel, StackModelType
 from SampleMaker.GUI.Settings import UI
+from SampleMaker.Tools.FileIO import TIF_COMPRESSIONS
 
 MIN_SIZE, MAX_SIZE = 32, 4096
 
@@ -34,6 +36,7 @@ class Settings:
 	Fluorophore : Longueur d'onde, Intensité (lux ?), Variation (%), Scintillement (ms)
 	Répartition : Densité (molécules/µm²), Ratio Astigmatisme, Pattern, options du pattern,
 	Bruit : Intensité du bruit de fond (lux ?), Variation du bruit de fond (%), SNR Final
+	Sortie : Compression, Taille des tuiles (px), Threads d'encodage, Rapport de ressources, Entiers 16 bits, Statistiques
 	"""
 
 	size: int = field(init=False, repr=False)
@@ -56,6 +59,13 @@ class Settings:
 	background: float = field(init=False, repr=False)
 	variation: float = field(init=False, repr=False)
 
+	compression: str = field(init=False, repr=False)
+	tile: int = field(init=False, repr=False)
+	workers: int = field(init=False, repr=False)
+	monitoring: bool = field(init=False, repr=False)
+	as_uint16: bool = field(init=False, repr=False)
+	statistics: bool = field(init=False, repr=False)
+
 	parsing: bool = field(init=False, repr=False, default=False)
 
 	_ui: dict[str, list[UI.Setting]] = field(init=False, repr=False, default_factory=lambda: dict[str, list[UI.Setting]])
@@ -94,12 +104,29 @@ class Settings:
 														 UI.IntSetting(label="Taille (px)", min=4, max=MAX_SIZE, default=64, step=2),
 														 UI.IntSetting(label="Nombre de Rayons", min=1, max=MAX_SIZE, default=16, step=2),
 														 UI.FileSetting(label="Filename")]),
-								UI.ComboSetting(label="Style de pile", choices=[StackModelType.RANDOM.tostring()]),
+								UI.ComboSetting(label="Style de pile",
+												choices=[StackModelType.RANDOM.tostring(),
+														 StackModelType.BLINKING.tostring(),
+														 StackModelType.PHOTOPHYSICS.tostring(),
+														 StackModelType.DIFFUSION.tostring(),
+														 StackModelType.DRIFT.tostring()],
+												options=[UI.Setting(),
+														 UI.FloatSetting(label="Temps d'exposition (ms)", min=0.1, max=1000, default=10, step=1),
+														 UI.FloatSetting(label="Temps d'exposition (ms)", min=0.1, max=1000, default=10, step=1),
+														 UI.FloatSetting(label="Coefficient de diffusion (µm²/s)", min=0.001, max=10, default=0.1, step=0.05),
+														 UI.FileSetting(label="Trajectoire (vide : linéaire)")]),
 								],
 
 				"Noise":       [UI.IntSetting(label="Intensité du bruit de fond (lux ?)", min=1, max=10000, default=500, step=1),
 								UI.FloatSetting(label="Variation du bruit de fond (%)", min=1, max=100, default=10, step=1),
-								UI.FloatSetting(label="SNR", min=1, max=20, default=10, step=0.1)]
+								UI.FloatSetting(label="SNR", min=1, max=20, default=10, step=0.1)],
+
+				"Output":      [UI.ComboSetting(label="Compression", choices=["Aucune", "zlib", "zstd", "LZW"]),
+								UI.IntSetting(label="Taille des tuiles (px)", min=0, max=MAX_SIZE, default=0, step=16),
+								UI.IntSetting(label="Threads d'encodage", min=0, max=64, default=0, step=1),
+								UI.ComboSetting(label="Rapport de ressources", choices=["Non", "Oui"]),
+								UI.ComboSetting(label="Entiers 16 bits", choices=["Non", "Oui"]),
+								UI.ComboSetting(label="Statistiques", choices=["Non", "Oui"])]
 				}
 
 	##################################################
@@ -123,6 +150,17 @@ class Settings:
 			for setting in value:
 				setting.reset()
 
+	##################################################
+	def on_change(self, callback: Callable[[], None], sections=("Dimension", "Setup", "Fluorophore", "Structure", "Noise")):
+		"""
+		Appelle une fonction à chaque modification d'un paramètre des sections données (par exemple pour mettre à jour un aperçu).
+
+		:param callback: Fonction sans argument à appeler.
+		:param sections: Sections des paramètres à surveiller (par défaut toutes sauf la sortie).
+		"""
+		for section in sections:
+			for setting in self._ui[section]: setting.on_change(callback)
+
 	# ==================================================
 	# endregion Initialization
 	# ==================================================
@@ -156,6 +194,9 @@ class Settings:
 		self.background = self._ui["Noise"][0].get_value()
 		self.variation = self._ui["Noise"][1].get_value()
 
+		msg = self.parsing_output()
+		if msg != "": return msg
+
 		self.parsing = True
 		return ""
 
@@ -200,9 +241,34 @@ class Settings:
 		if setting[0] == 0:
 			self.stack_model_type = StackModelType.RANDOM
 			self.stack_model_options = {}
+		elif setting[0] == 1:
+			self.stack_model_type = StackModelType.BLINKING
+			self.stack_model_options = {"exposure": setting[1]}
+		elif setting[0] == 2:
+			self.stack_model_type = StackModelType.PHOTOPHYSICS
+			self.stack_model_options = {"exposure": setting[1]}
+		elif setting[0] == 3:
+			self.stack_model_type = StackModelType.DIFFUSION
+			self.stack_model_options = {"coefficient": setting[1]}
+		elif setting[0] == 4:
+			filename = setting[1]
+			if filename != "" and not os.path.isfile(filename): return f"Le fichier \"{filename}\" est introuvable."
+			self.stack_model_type = StackModelType.DRIFT
+			self.stack_model_options = {"mode": "file", "filename": filename} if filename != "" else {"mode": "linear"}
 		else: return "Modèle non reconnu."
 		return ""
 
+	##################################################
+	def parsing_output(self) -> str:
+		self.compression = TIF_COMPRESSIONS[self._ui["Output"][0].get_value()[0]]
+		self.tile = self._ui["Output"][1].get_value()
+		if self.tile % 16 != 0: return "La taille des tuiles doit être un multiple de 16 (0 pour un découpage en bandes)."
+		self.workers = self._ui["Output"][2].get_value()
+		self.monitoring = self._ui["Output"][3].get_value()[0] == 1
+		self.as_uint16 = self._ui["Output"][4].get_value()[0] == 1
+		self.statistics = self._ui["Output"][5].get_value()[0] == 1
+		return ""
+
 	# ==================================================
 	# endregion Parsing
 	# ==================================================
@@ -212,7 +278,7 @@ class Settings:
 	# ==================================================
 	##################################################
 	def get_stacker(self) -> Stacker:
-		return Stacker(self.get_sampler())
+		return Stacker(self.get_sampler(), StackModel.from_model(self.stack_model_type, self.stack_model_options), self.as_uint16, self.statistics)
 
 	##################################################
 	def get_sampler(self) -> Sampler:
@@ -231,6 +297,21 @@ class Settings:
 	def get_noiser(self) -> Noiser:
 		return Noiser(snr=self.snr, background=self.background, variation=self.variation)
 
+	##################################################
+	def get_parameters(self) -> Dict[str, Any]:
+		"""
+		Retourne les paramètres sous forme de dictionnaire, sans objet Qt (voir `Generator.Sweep.DEFAULT_PARAMETERS`).
+
+		:return: Le dictionnaire des paramètres.
+		"""
+		return {"size":        self.size, "n_frames": self.n_frames, "pixel_size": self.pixel_size, "na": self.na,
+				"wavelength":  self.wavelength, "intensity": self.intensity, "delta": self.delta, "flickering": self.flickering,
+				"density":     self.density, "astigmatism_ratio": self.astigmatism_ratio,
+				"pattern":     self.pattern.pattern.name, "pattern_options": asdict(self.pattern.options),
+				"stack_model": self.stack_model_type.name, "stack_model_options": self.stack_model_options,
+				"snr":         self.snr, "background": self.background, "variation": self.variation,
+				"compression": self.compression, "tile": self.tile, "workers": self.workers}
+
 	# ==================================================
 	# endregion Meta Object Getter
 	# ==================================================
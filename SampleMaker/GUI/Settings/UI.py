@@ -16,7 +16,7 @@ Classes :
 
 import os
 from dataclasses import dataclass, field
-from typing import Any, List
+from typing import Any, Callable, List, Optional
 
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import QComboBox, QDoubleSpinBox, QFileDialog, QFormLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton
@@ -39,10 +39,12 @@ class Setting:
 	Attributs :
 		- **label (str)** : Nom du paramètre.
 		- **_layout (QHBoxLayout)** : Le layout associé à ce paramètre, initialisé par défaut à un QHBoxLayout.
+		- **_on_change (Callable[[], None])** : Fonction appelée à chaque modification de la valeur (voir `on_change`).
 	"""
 
 	label: str = ""
 	_layout: QFormLayout = field(init=False, default_factory=QFormLayout)
+	_on_change: Optional[Callable[[], None]] = field(init=False, default=None, repr=False)
 
 	##################################################
 	def __post_init__(self):
@@ -96,6 +98,25 @@ class Setting:
 		"""
 		self._layout.addRow(QLabel(self.label + " : "), box)  # Ajoute le setting
 
+	##################################################
+	def on_change(self, callback: Callable[[], None]):
+		"""
+		Appelle une fonction à chaque modification de la valeur du paramètre (par exemple pour mettre à jour un aperçu).
+
+		:param callback: Fonction sans argument à appeler.
+		"""
+		self._on_change = callback
+		self.connect()
+
+	##################################################
+	def connect(self):
+		"""
+		Méthode abstraite pour relier le signal de modification de l'input à la fonction `_on_change`.
+
+		Cette méthode doit être implémentée dans les sous-classes selon le type d'input.
+		"""
+		return
+
 	##################################################
 	def reset(self):
 		"""
@@ -140,6 +161,9 @@ class IntSetting(Setting):
 		self.box.setValue(self.default)
 		self.add_row(self.box)  # Ajoute le spin
 
+	##################################################
+	def connect(self): self.box.valueChanged.connect(lambda _: self._on_change())
+
 	##################################################
 	def reset(self): self.set_value(self.default)
 
@@ -179,6 +203,9 @@ class FloatSetting(Setting):
 		self.box.setValue(self.default)
 		self.add_row(self.box)  # Ajoute le spin
 
+	##################################################
+	def connect(self): self.box.valueChanged.connect(lambda _: self._on_change())
+
 	##################################################
 	def reset(self): self.set_value(self.default)
 
@@ -218,13 +245,20 @@ class ComboSetting(Setting):
 			self.box.currentIndexChanged.connect(self.update_options)
 			self.update_options(0)  # Initialise les options pour "Choix 1"
 
+	##################################################
+	def connect(self):
+		self.box.currentIndexChanged.connect(lambda _: self._on_change())
+		for option in self.options: option.on_change(self._on_change)
+
 	##################################################
 	def reset(self): self.set_value(0)
 
 	##################################################
 	def update_options(self, index):
 		while self._layout.rowCount() > 1: self._layout.removeRow(1)
-		for option in self.options: option.initialize()  # recréer version fonctionnelle du layout de l'option
+		for option in self.options:
+			option.initialize()  # recréer version fonctionnelle du layout de l'option
+			if self._on_change is not None: option.on_change(self._on_change)  # Nouvel input : signal à relier de nouveau
 		self._layout.addRow(QLabel("Options : "), self.options[index].layout)
 
 
@@ -280,6 +314,9 @@ class FileSetting(Setting):
 		path, _ = QFileDialog.getOpenFileName(self.box, "Sélectionner un fichier", current)
 		if path: self.box.setText(path)  # Met à jour le chemin dans la boîte de texte
 
+	##################################################
+	def connect(self): self.box.textChanged.connect(lambda _: self._on_change())
+
 	##################################################
 	def reset(self): self.set_value("")
 
@@ -5,13 +5,30 @@ Ce sous-module gère l'interface utilisateur pour le projet SampleMaker.
 
 - Permet un accès direct aux classes principales via `from SampleMaker.GUI import <classe>`.
 - Tous les modules peuvent être importés directement via `from SampleMaker.GUI import <module>`.
+- Les classes sont chargées à la première utilisation (PEP 562) : importer le paquet n'importe pas PyQt5.
 
 """
 
-# Importation explicite des classes pour qu'elles soient accessibles directement
-from .MainUI import MainUI
-from .PreferencesDialog import PreferencesDialog
-from .SettingWidget import SettingWidget
+import importlib
+
 
 # Définir la liste des symboles exportés
-__all__ = ["Settings", "MainUI", "PreferencesDialog", "SettingWidget"]
+__all__ = ["Settings", "GenerationWorker", "MainUI", "PreferencesDialog", "PreviewWidget", "SettingWidget"]
+
+# Classes chargées à la première utilisation (chaque classe porte le nom de son module)
+_LAZY_SYMBOLS = ["GenerationWorker", "MainUI", "PreferencesDialog", "PreviewWidget", "SettingWidget"]
+
+
+##################################################
+def __getattr__(name: str):
+	"""
+	Charge une classe paresseusement lors du premier accès (PEP 562).
+
+	:param name: Nom de l'attribut demandé.
+	:return: La classe.
+	:raises AttributeError: Si l'attribut n'existe pas.
+	"""
+	if name not in _LAZY_SYMBOLS: raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+	value = getattr(importlib.import_module(f".{name}", __name__), name)
+	globals()[name] = value
+	return value
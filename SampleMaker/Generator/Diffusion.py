@@ -0,0 +1,135 @@
+"""
+Fichier contenant la classe `Diffusion` qui simule le déplacement d'une population de particules entre les frames.
+
+Les particules se déplacent par marche aléatoire, toutes en même temps (tableaux numpy, sans boucle Python par particule) :
+
+- **Brownien** (`confinement` nul) : déplacement gaussien d'écart-type `sqrt(2 * D * dt)` sur chaque axe.
+- **Confiné** (`confinement` positif) : processus d'Ornstein-Uhlenbeck autour de la position initiale de chaque particule,
+  mis à jour de manière exacte quel que soit le pas de temps. L'écart-type de la position autour de son ancre est `confinement`.
+
+Le masque (et les bords de l'image) servent de frontière : un déplacement qui ferait sortir une particule du masque est refusé
+et la particule reste à sa position précédente.
+
+Chaque frame est découpée en `sub_steps` sous-expositions : la position retournée pour une frame est la moyenne des positions
+intermédiaires (position vue par un logiciel de localisation), seules les positions courantes sont conservées.
+La coordonnée Z (astigmatisme) n'est pas modifiée, le déplacement est uniquement latéral.
+"""
+
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+##################################################
+@dataclass
+class Diffusion:
+	"""
+	Classe permettant de simuler la diffusion d'une population de particules.
+
+	Attributs :
+		- **localisation (NDArray[np.float32])** : Positions initiales des particules de forme (N, 3), où chaque ligne est (x, y, z) en pixel.
+		- **coefficient (float)** : Coefficient de diffusion en µm²/s (par défaut 0.1).
+		- **pixel_size (float)** : Taille d'un pixel en nanomètres (par défaut 160).
+		- **exposure (float)** : Temps d'exposition d'une frame en millisecondes (par défaut 10).
+		- **sub_steps (int)** : Nombre de sous-expositions par frame, moyennées pour la position de la frame (par défaut 1, position en fin de frame).
+		- **confinement (float)** : Écart-type du confinement autour de la position initiale en nanomètres (0 pour une diffusion libre, par défaut 0).
+		- **mask (NDArray[np.bool_])** : Masque servant de frontière aux particules (None pour les seuls bords de l'image, par défaut None).
+		- **size (int)** : Taille de l'image en pixel, remplacée par celle du masque s'il est défini (par défaut 256).
+	"""
+	localisation: NDArray[np.float32] = field(default_factory=lambda: np.empty((0, 3), dtype=np.float32))
+	coefficient: float = 0.1
+	pixel_size: float = 160
+	exposure: float = 10
+	sub_steps: int = 1
+	confinement: float = 0
+	mask: Optional[NDArray[np.bool_]] = None
+	size: int = 256
+	_positions: NDArray[np.float32] = field(init=False, repr=False, default=None)
+	_anchors: NDArray[np.float32] = field(init=False, repr=False, default=None)
+
+	##################################################
+	def __post_init__(self):
+		""" Méthode appelée automatiquement après l'initialisation du dataclass. Vérifie les paramètres et copie les positions initiales. """
+		if self.coefficient < 0 or self.confinement < 0: raise ValueError("Le coefficient de diffusion et le confinement doivent être positifs.")
+		if self.sub_steps < 1: raise ValueError("Le nombre de sous-expositions doit être strictement positif.")
+		if self.mask is not None: self.size = self.mask.shape[0]
+		self._positions = np.array(self.localisation, dtype=np.float32, copy=True)
+		self._anchors = self._positions[:, :2].copy()
+
+	##################################################
+	@property
+	def positions(self) -> NDArray[np.float32]:
+		"""
+		Retourne les positions courantes des particules.
+
+		:return: Tableau de forme (N, 3).
+		"""
+		return self._positions
+
+	##################################################
+	@property
+	def step_sigma(self) -> float:
+		"""
+		Retourne l'écart-type d'un déplacement libre par axe pendant une sous-exposition, en pixel.
+
+		Le coefficient en µm²/s est converti en pixel²/ms : D * 10⁶ / pixel_size² / 10³.
+
+		:return: L'écart-type en pixel.
+		"""
+		dt = self.exposure / self.sub_steps
+		return float(np.sqrt(2 * self.coefficient * 1e3 / self.pixel_size ** 2 * dt))
+
+	##################################################
+	def _is_inside(self, xy: NDArray[np.float32]) -> NDArray[np.bool_]:
+		"""
+		Vérifie si des positions sont dans l'image et dans le masque.
+
+		:param xy: Positions de forme (N, 2).
+		:return: Tableau de N booléens.
+		"""
+		inside = np.all((xy >= 0) & (xy < self.size), axis=1)
+		if self.mask is not None:
+			x_int = np.clip(xy[:, 0].astype(int), 0, self.size - 1)
+			y_int = np.clip(xy[:, 1].astype(int), 0, self.size - 1)
+			inside &= self.mask[y_int, x_int]  # Premier indice du masque : les lignes donc le Y
+		return inside
+
+	##################################################
+	def step(self) -> NDArray[np.float32]:
+		"""
+		Simule une frame et retourne la position moyenne de chaque particule pendant la frame.
+
+		:return: Tableau de forme (N, 3).
+		"""
+		n = self._positions.shape[0]
+		sigma = self.step_sigma
+		total = np.zeros((n, 2), dtype=np.float32)
+		if self.confinement > 0:
+			spread = self.confinement / self.pixel_size				   # Écart-type stationnaire en pixel
+			decay = np.exp(-(sigma / spread) ** 2 / 2)				   # exp(-dt / tau) avec tau = spread² / D
+			noise = spread * np.sqrt(1 - decay ** 2)
+		for _ in range(self.sub_steps):
+			xy = self._positions[:, :2]
+			if self.confinement > 0: proposal = self._anchors + (xy - self._anchors) * decay + np.random.normal(0, noise, (n, 2))
+			else: proposal = xy + np.random.normal(0, sigma, (n, 2))
+			accepted = self._is_inside(proposal)
+			xy[accepted] = proposal[accepted]
+			total += xy
+		result = self._positions.copy()
+		result[:, :2] = total / self.sub_steps
+		return result
+
+	##################################################
+	def tostring(self) -> str:
+		"""
+		Retourne une chaîne de caractères correspondant aux caractéristiques de la simulation.
+
+		:return: Une description textuelle de la simulation.
+		"""
+		return (f"Particles: {self._positions.shape[0]}, D: {self.coefficient} µm²/s, Exposure: {self.exposure} ms, Sub Steps: {self.sub_steps}, "
+				f"Confinement: {self.confinement or 'None'} nm")
+
+	##################################################
+	def __str__(self) -> str: return self.tostring()
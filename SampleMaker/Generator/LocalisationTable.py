@@ -0,0 +1,249 @@
+"""
+Fichier contenant la classe `LocalisationTable` qui stocke la vérité terrain des molécules générées dans une pile.
+
+La table est organisée en colonnes (indice de frame, x, y, z, intensité) stockées dans des tableaux numpy compacts (int32 et float32)
+et n'accepte que des ajouts. Elle est remplie au fil de la génération par le `Stacker` et permet d'évaluer des logiciels de localisation.
+
+Pour les grandes piles, la table peut être écrite en flux dans un fichier CSV au format ThunderSTORM :
+les lignes sont écrites par blocs et retirées de la mémoire, la table ne conserve donc jamais l'ensemble des molécules.
+
+**Format CSV (ThunderSTORM)** :
+
+- `id` : Identifiant de la molécule (à partir de 1).
+- `frame` : Indice de la frame (à partir de 1).
+- `x [nm]`, `y [nm]` : Position en nanomètres, l'origine étant le coin du premier pixel (le centre du pixel `i` est à `(i + 0.5) * pixel_size`).
+- `z` : Coordonnée axiale normalisée entre -1 et 1 (définissant l'astigmatisme).
+- `intensity [photon]` : Intensité totale de la molécule.
+- `x0 [nm]`, `y0 [nm]`, `z0` : Position sans dérive de l'échantillon (uniquement si la table enregistre la dérive).
+"""
+
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+COLUMNS = {"frame": np.int32, "x": np.float32, "y": np.float32, "z": np.float32, "intensity": np.float32}
+DRIFT_COLUMNS = {"x0": np.float32, "y0": np.float32, "z0": np.float32}
+CSV_HEADER = "\"id\",\"frame\",\"x [nm]\",\"y [nm]\",\"z\",\"intensity [photon]\""
+CSV_DRIFT_HEADER = ",\"x0 [nm]\",\"y0 [nm]\",\"z0\""
+CSV_FORMAT = ["%d", "%d", "%.3f", "%.3f", "%.5f", "%.2f"]
+CSV_DRIFT_FORMAT = ["%.3f", "%.3f", "%.5f"]
+
+
+##################################################
+@dataclass
+class LocalisationTable:
+	"""
+	Classe permettant de stocker les localisations de toutes les molécules d'une pile.
+
+	Attributs :
+		- **pixel_size (float)** : Taille d'un pixel en nanomètres (pour la conversion en nanomètres du fichier CSV, par défaut 160).
+		- **filename (str)** : Fichier CSV dans lequel la table est écrite en flux (vide pour tout conserver en mémoire, par défaut "").
+		- **chunk_size (int)** : Nombre de lignes conservées en mémoire avant l'écriture d'un bloc dans le fichier (par défaut 100000).
+		- **drift (bool)** : Si `True`, les positions sans dérive de l'échantillon sont enregistrées en plus des positions observées (par défaut False).
+	"""
+	pixel_size: float = 160
+	filename: str = ""
+	chunk_size: int = 100000
+	drift: bool = False
+	_columns: Dict[str, NDArray] = field(init=False, repr=False, default_factory=dict)
+	_n_rows: int = field(init=False, repr=False, default=0)
+	_n_flushed: int = field(init=False, repr=False, default=0)
+
+	# ==================================================
+	# region Initialization
+	# ==================================================
+	##################################################
+	def __post_init__(self):
+		"""
+		Méthode appelée automatiquement après l'initialisation du dataclass.
+		Initialise les colonnes et crée le fichier CSV (avec son entête) si la table est écrite en flux.
+		"""
+		names = COLUMNS | DRIFT_COLUMNS if self.drift else COLUMNS
+		self._columns = {name: np.empty(max(1, self.chunk_size if self.filename else 1024), dtype=dtype) for name, dtype in names.items()}
+		self._n_rows = 0
+		self._n_flushed = 0
+		if self.filename:
+			with open(self.filename, "w", encoding="utf-8") as f: f.write(self._csv_header + "\n")
+
+	##################################################
+	def __len__(self) -> int:
+		""" Nombre total de lignes de la table (en mémoire et déjà écrites dans le fichier). """
+		return self._n_flushed + self._n_rows
+
+	##################################################
+	@property
+	def columns(self) -> Dict[str, NDArray]:
+		"""
+		Retourne les colonnes conservées en mémoire (vues sur les tableaux internes).
+		Si la table est écrite en flux, seules les lignes pas encore écrites sont présentes.
+
+		:return: Dictionnaire des colonnes (frame, x, y, z, intensity et x0, y0, z0 si la dérive est enregistrée).
+		"""
+		return {name: column[:self._n_rows] for name, column in self._columns.items()}
+
+	# ==================================================
+	# endregion Initialization
+	# ==================================================
+
+	# ==================================================
+	# region Manipulation
+	# ==================================================
+	##################################################
+	def append(self, frame: int, localisation: NDArray[np.float32], intensities: NDArray[np.float32], undrifted: Optional[NDArray[np.float32]] = None):
+		"""
+		Ajoute les molécules d'une frame à la table.
+
+		:param frame: Indice de la frame (à partir de 0).
+		:param localisation: Tableau numpy de positions des molécules de forme (N, 3), où chaque ligne est (x, y, z) en pixel.
+		:param intensities: Intensités des molécules de forme (N,).
+		:param undrifted: Positions sans dérive de forme (N, 3), si None elles sont égales aux positions observées (par défaut None).
+		:raises ValueError: Si le nombre de positions et d'intensités ne correspond pas ou si la table n'enregistre pas la dérive.
+		"""
+		n = localisation.shape[0]
+		if intensities.shape[0] != n: raise ValueError(f"Le nombre d'intensités ({intensities.shape[0]}) ne correspond pas au nombre de molécules ({n}).")
+		if undrifted is not None and not self.drift: raise ValueError("La table n'enregistre pas les positions sans dérive.")
+		if n == 0: return
+		if self.filename and self._n_rows + n > self._columns["frame"].shape[0]: self.flush()
+		self._reserve(self._n_rows + n)
+
+		end = self._n_rows + n
+		self._columns["frame"][self._n_rows:end] = frame
+		self._columns["x"][self._n_rows:end] = localisation[:, 0]
+		self._columns["y"][self._n_rows:end] = localisation[:, 1]
+		self._columns["z"][self._n_rows:end] = localisation[:, 2]
+		self._columns["intensity"][self._n_rows:end] = intensities
+		if self.drift:
+			if undrifted is None: undrifted = localisation
+			self._columns["x0"][self._n_rows:end] = undrifted[:, 0]
+			self._columns["y0"][self._n_rows:end] = undrifted[:, 1]
+			self._columns["z0"][self._n_rows:end] = undrifted[:, 2]
+		self._n_rows = end
+		if self.filename and self._n_rows >= self.chunk_size: self.flush()
+
+	##################################################
+	def _reserve(self, n_rows: int):
+		"""
+		Agrandit les colonnes (en doublant leur capacité) si nécessaire pour contenir le nombre de lignes demandé.
+
+		:param n_rows: Nombre de lignes à pouvoir contenir.
+		"""
+		capacity = self._columns["frame"].shape[0]
+		if n_rows <= capacity: return
+		while capacity < n_rows: capacity *= 2
+		for name, column in self._columns.items():
+			new_column = np.empty(capacity, dtype=column.dtype)
+			new_column[:self._n_rows] = column[:self._n_rows]
+			self._columns[name] = new_column
+
+	##################################################
+	def get_frame(self, frame: int, undrifted: bool = False) -> NDArray[np.float32]:
+		"""
+		Retourne les molécules d'une frame conservées en mémoire.
+
+		:param frame: Indice de la frame (à partir de 0).
+		:param undrifted: Si `True`, retourne les positions sans dérive (par défaut False).
+		:return: Tableau numpy de forme (N, 4), où chaque ligne est (x, y, z, intensité).
+		:raises ValueError: Si les positions sans dérive sont demandées alors que la table ne les enregistre pas.
+		"""
+		if undrifted and not self.drift: raise ValueError("La table n'enregistre pas les positions sans dérive.")
+		columns = self.columns
+		selection = columns["frame"] == frame
+		names = ("x0", "y0", "z0", "intensity") if undrifted else ("x", "y", "z", "intensity")
+		return np.stack([columns[name][selection] for name in names], axis=1)
+
+	# ==================================================
+	# endregion Manipulation
+	# ==================================================
+
+	# ==================================================
+	# region IO
+	# ==================================================
+	##################################################
+	@property
+	def _csv_header(self) -> str: return CSV_HEADER + (CSV_DRIFT_HEADER if self.drift else "")
+
+	##################################################
+	@property
+	def _csv_format(self) -> List[str]: return CSV_FORMAT + (CSV_DRIFT_FORMAT if self.drift else [])
+
+	##################################################
+	def _to_csv_rows(self, first_id: int) -> NDArray[np.float64]:
+		"""
+		Convertit les lignes en mémoire au format ThunderSTORM.
+
+		:param first_id: Identifiant de la première ligne.
+		:return: Tableau de forme (N, 6) (id, frame, x [nm], y [nm], z, intensité), (N, 9) avec x0 [nm], y0 [nm], z0 si la dérive est enregistrée.
+		"""
+		columns = self.columns
+		rows = [np.arange(first_id, first_id + self._n_rows), columns["frame"] + 1,
+				(columns["x"] + 0.5) * self.pixel_size, (columns["y"] + 0.5) * self.pixel_size, columns["z"], columns["intensity"]]
+		if self.drift: rows += [(columns["x0"] + 0.5) * self.pixel_size, (columns["y0"] + 0.5) * self.pixel_size, columns["z0"]]
+		return np.column_stack(rows)
+
+	##################################################
+	def flush(self):
+		""" Écrit les lignes en mémoire à la fin du fichier CSV puis les retire de la mémoire (uniquement si la table est écrite en flux). """
+		if not self.filename or self._n_rows == 0: return
+		with open(self.filename, "a", encoding="utf-8") as f: np.savetxt(f, self._to_csv_rows(self._n_flushed + 1), fmt=self._csv_format, delimiter=",")
+		self._n_flushed += self._n_rows
+		self._n_rows = 0
+
+	##################################################
+	def save(self, filename: str):
+		"""
+		Enregistre la table complète dans un fichier CSV au format ThunderSTORM.
+		Si la table est écrite en flux dans ce même fichier, les dernières lignes sont simplement écrites.
+
+		:param filename: Nom du fichier CSV de sortie.
+		:raises ValueError: Si la table est écrite en flux dans un autre fichier (les lignes déjà écrites ne sont plus en mémoire).
+		"""
+		if self.filename:
+			if os.path.abspath(filename) != os.path.abspath(self.filename):
+				raise ValueError(f"La table est écrite en flux dans le fichier \"{self.filename}\".")
+			self.flush()
+			return
+		with open(filename, "w", encoding="utf-8") as f:
+			f.write(self._csv_header + "\n")
+			np.savetxt(f, self._to_csv_rows(1), fmt=self._csv_format, delimiter=",")
+
+	##################################################
+	@classmethod
+	def open(cls, filename: str, pixel_size: float = 160) -> 'LocalisationTable':
+		"""
+		Ouvre un fichier CSV au format ThunderSTORM et le charge en mémoire (avec les positions sans dérive si elles sont présentes).
+
+		:param filename: Nom du fichier CSV à ouvrir.
+		:param pixel_size: Taille d'un pixel en nanomètres (pour la conversion en pixel, par défaut 160).
+		:return: La table chargée.
+		"""
+		if not os.path.isfile(filename): raise OSError(f"Le fichier \"{filename}\" est introuvable.")
+		with open(filename, "r", encoding="utf-8") as f: drift = "x0" in f.readline()
+		rows = np.loadtxt(filename, delimiter=",", skiprows=1, ndmin=2)
+		rows = rows[np.argsort(rows[:, 1], kind="stable")]  # Un seul tri (stable : l'ordre des lignes d'une frame est conservé)
+		frames, starts = np.unique(rows[:, 1], return_index=True)
+		table = cls(pixel_size, drift=drift)
+		table._reserve(rows.shape[0])
+		localisation = np.column_stack(((rows[:, 2] / pixel_size) - 0.5, (rows[:, 3] / pixel_size) - 0.5, rows[:, 4]))
+		undrifted = np.column_stack(((rows[:, 6] / pixel_size) - 0.5, (rows[:, 7] / pixel_size) - 0.5, rows[:, 8])) if drift else None
+		for frame, start, stop in zip(frames.astype(int), starts, np.append(starts[1:], rows.shape[0])):
+			table.append(frame - 1, localisation[start:stop], rows[start:stop, 5], undrifted[start:stop] if drift else None)
+		return table
+
+	##################################################
+	def tostring(self) -> str:
+		"""
+		Retourne une chaîne de caractères correspondant aux caractéristiques de la table.
+
+		:return: Une description textuelle de la table.
+		"""
+		return f"{len(self)} localisations ({self._n_rows} en mémoire), Pixel Size: {self.pixel_size} nm, File: {self.filename or 'None'}"
+
+	##################################################
+	def __str__(self) -> str: return self.tostring()
+
+# ==================================================
+# endregion IO
+# ==================================================
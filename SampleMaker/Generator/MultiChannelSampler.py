@@ -0,0 +1,309 @@
+"""
+Fichier contenant la classe `MultiChannelSampler` qui génère des échantillons multi-couleurs (un canal par fluorophore).
+
+Générer un jeu de données multi-couleurs avec un `Sampler` par fluorophore (par exemple GFP, RFP et Alexa488 de `PREDEFINED_FLUOROPHORES`)
+reconstruit pour chaque canal l'axe de rendu et le masque, et tire de nouvelles positions.
+Le `MultiChannelSampler` est un `Sampler` dont les molécules sont réparties entre plusieurs fluorophores :
+
+- **Positions** : Tirées une seule fois pour tous les canaux (densité totale, masque commun).
+- **Canaux** : Attribués à toutes les molécules en une seule opération vectorisée, selon les proportions `fractions`.
+- **Noyaux** : Le noyau de chaque longueur d'onde (écart-type de base et fenêtre de ±`KERNEL_SIGMAS` sigma) est conservé
+  tant que l'ouverture numérique, la taille des pixels et l'astigmatisme ne changent pas.
+- **Rendu** : Vectorisé par canal et par bloc de molécules, chaque PSF n'étant calculée que sur la fenêtre du noyau de son canal
+  (profils séparables puis un seul `np.bincount` par bloc, sans boucle par molécule).
+
+Le résultat est une image par canal (axe des canaux en premier) ou un ensemble de piles (une `Stack` par canal).
+Le `Stacker` ne génère que des piles d'un seul canal et refuse ce générateur :
+les piles multi-couleurs sont générées par `generate_stacks` (frames indépendantes, sans modèle de pile).
+
+**Usage** :
+
+```python
+sampler = MultiChannelSampler(size=256, density=1, fluorophores=[PREDEFINED_FLUOROPHORES["GFP"], PREDEFINED_FLUOROPHORES["RFP"]])
+frame = sampler.generate_sample()  # Image de forme (2, 256, 256)
+stacks = sampler.generate_stacks(100)  # Une pile de 100 frames par canal
+```
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from SampleMaker import Fluorophore, Mask, Stack
+from SampleMaker.Tools import Decorators
+from SampleMaker.Generator.Noiser import Noiser
+from SampleMaker.Generator.Sampler import MAX_INTENSITY, Sampler
+from SampleMaker.Tools import print_warning
+from SampleMaker.Tools.Profiler import count, span
+
+KERNEL_SIGMAS = 6	  # Demi-largeur de la fenêtre des noyaux en sigma (queue négligée inférieure à exp(-18))
+RENDER_BLOCK = 2048  # Nombre de molécules rendues à la fois (borne les tableaux temporaires de forme (bloc, fenêtre, fenêtre))
+
+##################################################
+@dataclass
+@Decorators.invalidate_on_change("fluorophores", "psf")
+class MultiChannelSampler(Sampler):
+	"""
+	Classe permettant de générer un échantillon multi-couleurs (un canal par fluorophore).
+
+	La densité est la densité totale des molécules, réparties entre les canaux.
+	Le fluorophore du `Sampler` n'est pas stocké séparément : `fluorophore` est le premier élément de `fluorophores` (le modifier modifie le premier canal).
+	Les méthodes de rendu d'un seul canal (`render_psf`, `generate_psf`) sont remplacées par `render_channels` et lèvent une erreur,
+	`generate_grid`, `generate_clean_sample` et `generate_sample` retournent une image par canal.
+	Il ne peut donc pas être utilisé par un `Stacker` (erreur à la génération) : les piles sont générées par `generate_stacks`.
+
+	Attributs (en plus de ceux du `Sampler`) :
+		- **fluorophores (List[Fluorophore])** : Fluorophore de chaque canal.
+		- **fractions (NDArray[np.float64])** : Proportion des molécules de chaque canal (normalisée, par défaut identique pour tous les canaux).
+		- **last_channels (NDArray[np.int32])** : Canal de chacune des dernières molécules.
+	"""
+	_fluorophores: List[Fluorophore] = field(default_factory=list)
+	fractions: NDArray[np.float64] = field(default_factory=lambda: np.empty(0))
+	last_channels: NDArray[np.int32] = field(init=False, default_factory=lambda: np.empty(0, dtype=np.int32))
+	_kernels: Dict[Tuple[float, float, int, float], Tuple[float, NDArray[np.int64]]] = field(init=False, repr=False, compare=False, default_factory=dict)
+
+	##################################################
+	def __init__(self, size: int = 256, pixel_size: int = 160, na: float = 1.4, density: float = 0.25, astigmatism_ratio: float = 2.0,
+				 fluorophores: Optional[List[Fluorophore]] = None, fractions: Optional[List[float]] = None, mask: Mask = Mask(), noiser: Noiser = Noiser()):
+		"""
+		Constructeur personnalisé avec possibilité d'initialiser certains attributs manuellement.
+
+		:param size: Taille de l'image (par défaut : 256).
+		:param pixel_size: Taille d'un pixel en nanomètres (par défaut : 160).
+		:param na: Ouverture numérique (par défaut 1.4).
+		:param density: Densité totale de molécules par micromètre carré (par défaut 0.25).
+		:param astigmatism_ratio: Ratio de l'astigmatisme (par défaut 2 indique une déformation de X par rapport à Y de maximum 2).
+		:param fluorophores: Fluorophore de chaque canal (par défaut un seul fluorophore par défaut).
+		:param fractions: Proportion des molécules de chaque canal (par défaut identique pour tous les canaux).
+		:param mask: Masque utilisé pour la dispersion des molécules (commun à tous les canaux).
+		:param noiser: Caractéristiques du bruit (base, déviation, SNR souhaité), appliqué à chaque canal.
+		:raises ValueError: Si aucun fluorophore n'est fourni ou si les proportions ne correspondent pas aux canaux.
+		"""
+		fluorophores = list(fluorophores) if fluorophores is not None else [Fluorophore()]
+		if len(fluorophores) == 0: raise ValueError("Au moins un fluorophore est nécessaire.")
+		fractions = np.ones(len(fluorophores)) if fractions is None else np.asarray(fractions, dtype=np.float64)
+		if fractions.shape != (len(fluorophores),) or np.any(fractions < 0) or fractions.sum() <= 0:
+			raise ValueError(f"Les proportions doivent être positives, non toutes nulles et au nombre de {len(fluorophores)} (une par canal).")
+		self._fluorophores = fluorophores
+		self.fractions = fractions / fractions.sum()
+		self.last_channels = np.empty(0, dtype=np.int32)
+		self._kernels = {}
+		super().__init__(size, pixel_size, na, density, astigmatism_ratio, fluorophores[0], mask, noiser)
+
+	##################################################
+	@property
+	def _fluorophore(self) -> Fluorophore:
+		""" Fluorophore du `Sampler` : celui du premier canal (une seule copie, les deux restent toujours identiques). """
+		return self._fluorophores[0]
+
+	##################################################
+	@_fluorophore.setter
+	def _fluorophore(self, value: Fluorophore):
+		self._fluorophores = [value] + self._fluorophores[1:]  # Nouvelle liste : `fluorophores` retourné auparavant n'est pas modifié
+
+	##################################################
+	@property
+	def n_channels(self) -> int:
+		""" Nombre de canaux. """
+		return len(self.fluorophores)
+
+	##################################################
+	def get_kernels(self) -> List[Tuple[float, NDArray[np.int64]]]:
+		"""
+		Retourne le noyau de la PSF de chaque canal (les canaux de même longueur d'onde partagent leur noyau) :
+		l'écart-type de base et les décalages de la fenêtre de ±`KERNEL_SIGMAS` sigma (largeur maximale de l'astigmatisme) sur laquelle la PSF est calculée.
+		Les noyaux sont conservés tant que l'ouverture numérique, la taille des pixels et l'astigmatisme ne changent pas.
+
+		:return: Liste des noyaux (écart-type en pixels, décalages en pixels de forme (fenêtre,)), un par canal.
+		"""
+		self._ensure("psf")
+		keys = [(fluorophore.wavelength, self._na, self._pixel_size, float(self._astigmatism[1])) for fluorophore in self.fluorophores]
+		if any(key not in self._kernels for key in keys):
+			self._kernels = {}
+			for key in keys:
+				sigma = self.get_sigma_base(key[0])
+				radius = int(np.ceil(KERNEL_SIGMAS * sigma * key[3]))
+				self._kernels[key] = (sigma, np.arange(-radius, radius + 1))
+		return [self._kernels[key] for key in keys]
+
+	##################################################
+	def get_sigmas(self) -> NDArray[np.float64]:
+		"""
+		Retourne l'écart-type de base de la PSF de chaque canal (voir `get_kernels`).
+
+		:return: Tableau des écarts-types en pixels de forme (canaux,).
+		"""
+		return np.array([sigma for sigma, _ in self.get_kernels()])
+
+	##################################################
+	def assign_channels(self, n: int) -> NDArray[np.int32]:
+		"""
+		Attribue un canal à chaque molécule en une seule opération, selon les proportions des canaux.
+
+		:param n: Nombre de molécules.
+		:return: Tableau des canaux de forme (n,).
+		"""
+		return np.searchsorted(np.cumsum(self.fractions), np.random.uniform(0, 1, n), side="right").clip(0, self.n_channels - 1).astype(np.int32)
+
+	##################################################
+	def get_intensities(self, channels: NDArray[np.int32]) -> NDArray[np.float32]:
+		"""
+		Tire l'intensité de chaque molécule à partir du fluorophore de son canal.
+
+		:param channels: Canal de chaque molécule.
+		:return: Tableau des intensités de forme (n,).
+		"""
+		intensities = np.empty(channels.shape[0], dtype=np.float32)
+		for channel, fluorophore in enumerate(self.fluorophores):
+			selected = channels == channel
+			intensities[selected] = fluorophore.get_intensities(int(np.count_nonzero(selected)), True)
+		return intensities
+
+	# ==================================================
+	# region Generate Image
+	# ==================================================
+	##################################################
+	def render_psf(self, localisation, intensities: Optional[NDArray[np.float32]] = None,
+				   offset: Optional[NDArray[np.float32]] = None) -> NDArray[np.float32]:
+		"""
+		Le rendu d'un seul canal n'a pas de sens pour un générateur multi-couleurs (voir `render_channels`).
+
+		:raises ValueError: Toujours.
+		"""
+		raise ValueError("Le générateur multi-couleurs rend tous les canaux à la fois : utiliser `render_channels`.")
+
+	##################################################
+	def render_channels(self, localisation: NDArray[np.float32], channels: NDArray[np.int32],
+						intensities: Optional[NDArray[np.float32]] = None) -> NDArray[np.float32]:
+		"""
+		Calcule les images de tous les canaux en un seul passage sur la table des molécules, sans borner les valeurs.
+
+		:param localisation: Tableau numpy de positions des molécules de forme (N, 3), où chaque ligne est (x, y, z).
+		:param channels: Canal de chaque molécule de forme (N,).
+		:param intensities: Intensités des molécules de forme (N,), si None elles sont tirées à partir des fluorophores (par défaut None).
+		:return: Images de forme (canaux, size, size) avec les PSF ajoutées dans le canal de chaque molécule.
+		"""
+		images = np.zeros((self.n_channels, self._size, self._size), dtype=np.float32)
+		if self._astigmatism_ratio <= 0:  # Si à un ratio négatif ce n'est pas logique
+			print_warning("Le ratio d'astigmatisme doit être strictement positif, l'image sera noire.")
+			return images
+
+		if intensities is None: intensities = self.get_intensities(channels)
+		self._ensure("psf")
+		n_pixels = 0
+		with span("sampler.psf"):
+			for channel, (sigma_base, offsets) in enumerate(self.get_kernels()):
+				selected = np.flatnonzero(channels == channel)
+				for start in range(0, selected.size, RENDER_BLOCK):
+					block = selected[start:start + RENDER_BLOCK]
+					images[channel] += self._render_block(localisation[block], intensities[block], sigma_base, offsets)
+				n_pixels += selected.size * offsets.size ** 2
+		count("molecules", localisation.shape[0])
+		count("pixels", n_pixels)  # Chaque PSF n'est calculée que sur la fenêtre du noyau de son canal
+		count("bytes_allocated", images.nbytes)
+		return images
+
+	##################################################
+	def _render_block(self, localisation: NDArray[np.float32], intensities: NDArray[np.float32],
+					  sigma_base: float, offsets: NDArray[np.int64]) -> NDArray[np.float32]:
+		"""
+		Calcule l'image d'un bloc de molécules d'un même canal (le pré-calcul "psf" doit être à jour).
+		Les profils en X et en Y de chaque molécule sont calculés sur la fenêtre du noyau autour de son pixel,
+		leurs produits sont ensuite accumulés dans l'image en un seul `np.bincount`.
+
+		:param localisation: Positions des molécules du bloc de forme (B, 3).
+		:param intensities: Intensités des molécules du bloc de forme (B,).
+		:param sigma_base: Écart-type de base de la PSF du canal en pixels.
+		:param offsets: Décalages de la fenêtre du noyau du canal de forme (fenêtre,).
+		:return: Image de taille (size, size) du bloc.
+		"""
+		x, y, z = (localisation[:, i, np.newaxis] for i in range(3))
+		ratio = np.clip(1 + z * (self._astigmatism_ratio - 1), self._astigmatism[0], self._astigmatism[1])
+		sigma_x, sigma_y = sigma_base * ratio, sigma_base / ratio
+		cols, rows = np.rint(x).astype(np.int64) + offsets, np.rint(y).astype(np.int64) + offsets  # Fenêtre autour du pixel de chaque molécule (B, fenêtre)
+		profile_x = np.exp(-0.5 * ((cols - x) / sigma_x) ** 2) * ((cols >= 0) & (cols < self._size))  # Pixels hors de l'image : poids nul
+		profile_y = np.exp(-0.5 * ((rows - y) / sigma_y) ** 2) * ((rows >= 0) & (rows < self._size))
+		profile_y *= intensities[:, np.newaxis] / (2 * np.pi * sigma_x * sigma_y)
+		indices = np.clip(rows, 0, self._size - 1)[:, :, np.newaxis] * self._size + np.clip(cols, 0, self._size - 1)[:, np.newaxis, :]
+		image = np.bincount(indices.ravel(), (profile_y[:, :, np.newaxis] * profile_x[:, np.newaxis, :]).ravel(), minlength=self._size * self._size)
+		return image.reshape(self._size, self._size).astype(np.float32)
+
+	##################################################
+	def generate_grid(self, shift: int = 10, as_uint16: bool = False) -> NDArray[np.float32] | NDArray[np.uint16]:
+		"""
+		Calcule une répartition des molécules sur une grille et attribue un canal à chaque molécule.
+		Positionne les molécules sur l'image de leur canal, calcule leur psf puis applique le bruit à chaque canal.
+
+		:param shift: Espace en pixel entre 2 molécules (par défaut 10).
+		:param as_uint16: Si `True`, les images sont converties en entiers 16 bits dès l'application du bruit (par défaut False).
+		:return: Images de forme (canaux, size, size) avec les molécules affichées.
+		"""
+		self.last_localisations = self.generate_grid_localisation(shift)
+		self.last_channels = self.assign_channels(self.last_localisations.shape[0])
+		self.last_intensities = self.get_intensities(self.last_channels)
+		self.n_molecules.append(self.last_localisations.shape[0])
+		images = np.clip(self.render_channels(self.last_localisations, self.last_channels, self.last_intensities), 0, MAX_INTENSITY)
+		return np.stack([self.noiser.apply(image, as_uint16) for image in images])
+
+	##################################################
+	def generate_clean_sample(self) -> NDArray[np.float32]:
+		"""
+		Calcule une répartition des molécules sur une image carrée en fonction des paramètres du sampler, applique le masque
+		et attribue un canal à chaque molécule. Positionne les molécules sur l'image de leur canal et calcule leur psf, sans appliquer de bruit.
+
+		:return: Images de forme (canaux, size, size) avec les molécules affichées, sans bruit.
+		"""
+		self.last_localisations = self.generate_localisation()
+		self.last_channels = self.assign_channels(self.last_localisations.shape[0])
+		self.last_intensities = self.get_intensities(self.last_channels)
+		self.n_molecules.append(self.last_localisations.shape[0])
+		if self.on_phase is not None: self.on_phase("localisation")
+		return np.clip(self.render_channels(self.last_localisations, self.last_channels, self.last_intensities), 0, MAX_INTENSITY)
+
+	##################################################
+	def generate_sample(self, as_uint16: bool = False) -> NDArray[np.float32] | NDArray[np.uint16]:
+		"""
+		Calcule une frame multi-couleurs : positions, canaux, PSF puis bruit appliqué à chaque canal.
+
+		:param as_uint16: Si `True`, les images sont converties en entiers 16 bits dès l'application du bruit (par défaut False).
+		:return: Images de forme (canaux, size, size) avec les molécules affichées.
+		"""
+		with span("sampler.generate_sample"): return np.stack([self.noiser.apply(image, as_uint16) for image in self.generate_clean_sample()])
+
+	##################################################
+	def generate_stacks(self, n_frames: int, as_uint16: bool = False) -> List[Stack]:
+		"""
+		Génère une pile par canal (frames indépendantes, les molécules d'une frame sont partagées entre les canaux).
+
+		:param n_frames: Nombre de frames de chaque pile.
+		:param as_uint16: Si `True`, les piles sont stockées en entiers 16 bits (par défaut False).
+		:return: Liste des piles, une par canal.
+		"""
+		stacks = [Stack() for _ in range(self.n_channels)]
+		for stack in stacks: stack.reserve(n_frames, self._size, self._size, np.uint16 if as_uint16 else np.float32)
+		for i in range(n_frames):
+			for stack, image in zip(stacks, self.generate_sample(as_uint16)): stack.add_sample(image, i)
+		return stacks
+
+	# ==================================================
+	# endregion Generate Image
+	# ==================================================
+
+	# ==================================================
+	# region IO
+	# ==================================================
+	##################################################
+	def tostring(self) -> str:
+		"""
+		Retourne une chaîne de caractères correspondant aux caractéristiques du générateur et de ses canaux.
+
+		:return: Une description textuelle des attributs du générateur.
+		"""
+		channels = "\n".join(f"Channel {i}: {fraction:.2%}, {fluorophore}" for i, (fraction, fluorophore) in enumerate(zip(self.fractions, self.fluorophores)))
+		return f"{super().tostring()}\n{channels}"
+
+# ==================================================
+# endregion IO
+# ==================================================
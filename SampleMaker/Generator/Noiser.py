@@ -14,7 +14,8 @@ from dataclasses import dataclass
 import numpy as np
 from numpy.typing import NDArray
 
-from SampleMaker.Tools import print_warning
+from SampleMaker.Tools import print_warning, to_uint16
+from SampleMaker.Tools.Profiler import count, span
 
 MAX_INTENSITY = np.iinfo(np.uint16).max  # Pour des entiers sur 16 bits (soit 65535).
 
@@ -51,33 +52,37 @@ class Noiser:
 		return noise
 
 	##################################################
-	def apply(self, image: NDArray[np.float32]):
+	def apply(self, image: NDArray[np.float32], as_uint16: bool = False) -> NDArray[np.float32] | NDArray[np.uint16]:
 		"""
 		Ajoute du bruit gaussien et poissonien à une image pour atteindre un SNR donné.
 
 		:param image: L'image d'entrée (en valeurs de pixels).
+		:param as_uint16: Si `True`, l'image bruitée est directement arrondie et bornée en entiers 16 bits (par défaut False).
 		:return: L'image bruitée avec un SNR approximatif.
 		"""
 
-		size = image.shape[0]  # Récupère la taille de l'image
-		noisy = np.copy(image)
-		# Si le bruit de fond est non nul
-		if abs(self.background) > np.finfo(np.float32).eps and abs(self.variation) > np.finfo(np.float32).eps:
-			# Crée une image de fond (background) avec un bruit gaussien de base et un bruit poissonien et l'ajoute au signal
-			noisy += self.create_noise(size, self.background, (self.background * self.variation / 100))
-
-		# Si le SNR est non nul
-		if abs(self.snr) > np.finfo(np.float32).eps:
-			# Calcul du bruit requis pour obtenir le SNR
-			signal_mean = np.mean(noisy[noisy > np.finfo(np.float32).eps])  # Moyenne des pixels non nuls (pour éviter la majorité noire)
-
-			if abs(signal_mean) <= np.finfo(np.float32).eps or np.isnan(signal_mean):
-				print_warning("Attention : le signal moyen est nul, impossible d'ajouter du SNR.")
-			else:
-				noise_std = signal_mean / self.snr				# Calculer l'écart-type du bruit nécessaire pour le SNR
-				noisy += self.create_noise(size, 0, noise_std)  # Calcul du bruit du signal (en fonction du SNR) et l'ajoute.
-
-		return np.clip(noisy, 0, MAX_INTENSITY)				# Clipper les valeurs pour éviter les débordements
+		with span("noiser.apply"):
+			size = image.shape[0]  # Récupère la taille de l'image
+			noisy = np.copy(image)
+			count("bytes_allocated", noisy.nbytes)
+			# Si le bruit de fond est non nul
+			if abs(self.background) > np.finfo(np.float32).eps and abs(self.variation) > np.finfo(np.float32).eps:
+				# Crée une image de fond (background) avec un bruit gaussien de base et un bruit poissonien et l'ajoute au signal
+				noisy += self.create_noise(size, self.background, (self.background * self.variation / 100))
+
+			# Si le SNR est non nul
+			if abs(self.snr) > np.finfo(np.float32).eps:
+				# Calcul du bruit requis pour obtenir le SNR
+				signal_mean = np.mean(noisy[noisy > np.finfo(np.float32).eps])  # Moyenne des pixels non nuls (pour éviter la majorité noire)
+
+				if abs(signal_mean) <= np.finfo(np.float32).eps or np.isnan(signal_mean):
+					print_warning("Attention : le signal moyen est nul, impossible d'ajouter du SNR.")
+				else:
+					noise_std = signal_mean / self.snr				# Calculer l'écart-type du bruit nécessaire pour le SNR
+					noisy += self.create_noise(size, 0, noise_std)  # Calcul du bruit du signal (en fonction du SNR) et l'ajoute.
+
+			if as_uint16: return to_uint16(noisy)					# Arrondi et borne en une seule étape
+			return np.clip(noisy, 0, MAX_INTENSITY)				# Clipper les valeurs pour éviter les débordements
 
 	# ==================================================
 	# region IO
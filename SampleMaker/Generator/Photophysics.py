@@ -0,0 +1,154 @@
+"""
+Fichier contenant la classe `Photophysics` qui simule la photophysique d'une population de fluorophores.
+
+Chaque molécule suit un processus de Markov en temps continu à trois états : allumée (ON), éteinte (OFF) et photoblanchie (BLEACHED).
+Les temps de séjour dans chaque état suivent des lois exponentielles :
+
+- ON → OFF : durée moyenne `on_time` (la vitesse de scintillement du fluorophore, `Fluorophore.flickering`).
+- OFF → ON : durée moyenne `off_time`.
+- ON → BLEACHED : durée moyenne `bleach_time` (0 pour désactiver le photoblanchiment). Le photoblanchiment est en compétition avec l'extinction.
+
+Toute la population est simulée en même temps avec des tableaux numpy (état et date du prochain événement de chaque molécule),
+sans objet Python par molécule. Pour chaque frame, seules les molécules dont le prochain événement tombe pendant l'exposition sont traitées,
+et la fraction du temps d'exposition passée allumée est intégrée pour chaque molécule.
+La mémoire utilisée ne dépend que du nombre de molécules (quelques octets par molécule) et pas du nombre de frames.
+"""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+from numpy.typing import NDArray
+
+OFF, ON, BLEACHED = 0, 1, 2
+
+
+##################################################
+@dataclass
+class Photophysics:
+	"""
+	Classe permettant de simuler les états d'une population de fluorophores au fil des frames.
+
+	Attributs :
+		- **n_molecules (int)** : Nombre de molécules de la population.
+		- **on_time (float)** : Durée moyenne d'un état allumé en millisecondes (par défaut 50).
+		- **off_time (float)** : Durée moyenne d'un état éteint en millisecondes (par défaut 500).
+		- **bleach_time (float)** : Durée moyenne passée allumée avant le photoblanchiment en millisecondes (0 pour le désactiver, par défaut 0).
+		- **time (float)** : Temps simulé en millisecondes.
+	"""
+	n_molecules: int = 0
+	on_time: float = 50
+	off_time: float = 500
+	bleach_time: float = 0
+	time: float = field(init=False, default=0.0)
+	_state: NDArray[np.int8] = field(init=False, repr=False, default=None)
+	_next_event: NDArray[np.float64] = field(init=False, repr=False, default=None)
+
+	# ==================================================
+	# region Initialization
+	# ==================================================
+	##################################################
+	def __post_init__(self):
+		""" Méthode appelée automatiquement après l'initialisation du dataclass. Initialise la population. """
+		if self.on_time <= 0 or self.off_time <= 0 or self.bleach_time < 0:
+			raise ValueError("Les durées moyennes doivent être strictement positives (le photoblanchiment peut être désactivé avec 0).")
+		self.reset()
+
+	##################################################
+	def reset(self):
+		""" Réinitialise la population à l'équilibre entre les états allumé et éteint (aucune molécule photoblanchie). """
+		self.time = 0.0
+		on = np.random.random(self.n_molecules) < self.on_time / (self.on_time + self.off_time)
+		self._state = np.where(on, ON, OFF).astype(np.int8)
+		self._next_event = np.empty(self.n_molecules, dtype=np.float64)
+		self._draw_next_event(np.arange(self.n_molecules), 0.0)
+
+	##################################################
+	@property
+	def state(self) -> NDArray[np.int8]:
+		"""
+		Retourne l'état courant de chaque molécule (0 : éteinte, 1 : allumée, 2 : photoblanchie).
+
+		:return: Tableau de n_molecules états.
+		"""
+		return self._state
+
+	##################################################
+	@property
+	def on_rate(self) -> float:
+		""" Taux total de sortie de l'état allumé (extinction et photoblanchiment) en ms⁻¹. """
+		return 1 / self.on_time + (1 / self.bleach_time if self.bleach_time > 0 else 0)
+
+	# ==================================================
+	# endregion Initialization
+	# ==================================================
+
+	# ==================================================
+	# region Simulation
+	# ==================================================
+	##################################################
+	def _draw_next_event(self, indices: NDArray[np.int64], now: float | NDArray[np.float64]):
+		"""
+		Tire la date du prochain événement des molécules données selon leur état courant.
+
+		:param indices: Indices des molécules.
+		:param now: Date de l'entrée dans l'état courant (une valeur ou une valeur par molécule).
+		"""
+		state = self._state[indices]
+		scale = np.where(state == ON, 1 / self.on_rate, self.off_time)
+		dwell = np.random.exponential(scale)
+		self._next_event[indices] = np.where(state == BLEACHED, np.inf, now + dwell)
+
+	##################################################
+	def step(self, exposure: float) -> NDArray[np.float32]:
+		"""
+		Simule une frame et retourne la fraction du temps d'exposition passée allumée par chaque molécule.
+
+		La fraction est initialisée selon l'état au début de la frame puis corrigée à chaque événement :
+		une molécule qui s'éteint à la date `t` perd `(fin - t)` et une molécule qui s'allume gagne `(fin - t)`.
+		Seules les molécules ayant un événement pendant la frame sont traitées (plusieurs passes si une molécule change plusieurs fois d'état).
+
+		:param exposure: Temps d'exposition de la frame en millisecondes.
+		:return: Tableau de n_molecules fractions comprises entre 0 et 1.
+		"""
+		end = self.time + exposure
+		on_time = np.where(self._state == ON, exposure, 0).astype(np.float64)
+		while True:
+			indices = np.flatnonzero(self._next_event < end)
+			if indices.size == 0: break
+			now = self._next_event[indices]
+			remaining = end - now
+			was_on = self._state[indices] == ON
+
+			# Transitions : ON → OFF ou BLEACHED, OFF → ON
+			bleached = was_on & (np.random.random(indices.size) < (self.on_rate - 1 / self.on_time) / self.on_rate)
+			self._state[indices] = np.where(was_on, np.where(bleached, BLEACHED, OFF), ON)
+			on_time[indices] += np.where(was_on, -remaining, remaining)
+			self._draw_next_event(indices, now)
+
+		self.time = end
+		return np.clip(on_time / exposure, 0, 1).astype(np.float32)
+
+	# ==================================================
+	# endregion Simulation
+	# ==================================================
+
+	# ==================================================
+	# region IO
+	# ==================================================
+	##################################################
+	def tostring(self) -> str:
+		"""
+		Retourne une chaîne de caractères correspondant aux caractéristiques de la simulation.
+
+		:return: Une description textuelle de la simulation.
+		"""
+		counts = np.bincount(self._state, minlength=3)
+		return (f"Molecules: {self.n_molecules} (On: {counts[ON]}, Off: {counts[OFF]}, Bleached: {counts[BLEACHED]}), "
+				f"On Time: {self.on_time} ms, Off Time: {self.off_time} ms, Bleach Time: {self.bleach_time} ms, Time: {self.time} ms")
+
+	##################################################
+	def __str__(self) -> str: return self.tostring()
+
+# ==================================================
+# endregion IO
+# ==================================================
@@ -0,0 +1,294 @@
+"""
+Fichier contenant la classe `Planner` qui estime la mémoire et la durée d'une génération avant de la lancer.
+
+Une pile occupe `n_frames × size² × 4` octets (2 en entiers 16 bits), auxquels s'ajoutent les tableaux temporaires du rendu de chaque frame :
+une configuration trop grande fait swapper la machine ou termine la génération par un manque de mémoire, sans prévenir.
+Le planificateur estime avant la génération :
+
+- **La mémoire** : pic de mémoire résidente de chaque mode de stockage de la pile (rendu puis enregistrement), comparé à la mémoire disponible
+  (une fraction `memory_fraction` seulement, le reste étant laissé au système et aux autres processus) et l'espace disque nécessaire.
+  Les tableaux temporaires de chaque frame et l'état de chaque molécule dépendent du modèle de pile (`FRAME_TEMPORARIES`, `MOLECULE_BYTES`).
+- **La durée** : à partir d'un étalonnage rapide de la machine (coût du rendu d'une PSF par pixel, du bruit par pixel et d'une sous-exposition
+  de la diffusion par particule, mesurés une seule fois à petite taille et conservés), en considérant toutes les molécules tirées (majorant : sans masque).
+  Le modèle de clignotement ne rend que les molécules qui changent d'état, le modèle de diffusion ajoute ses sous-expositions.
+
+Il choisit ensuite le mode de stockage de la pile (`StorageMode`) et le nombre de threads d'encodage du fichier TIF :
+
+- **MEMORY** : La pile est en mémoire (le plus rapide), si le pic de mémoire tient dans la mémoire disponible.
+- **MEMMAP** : La pile est projetée en mémoire depuis un fichier `.npy` temporaire : le système ne garde que les pages utilisées (sortie TIF).
+- **STREAM** : La pile est écrite en flux dans le dossier de blocs de sortie, seul le bloc en cours est en mémoire (sortie en blocs).
+
+Les avertissements du plan (`warnings`) signalent les configurations qui saturent la mémoire ou le disque malgré l'adaptation.
+
+**Usage** :
+
+```python
+plan = Planner().plan(parameters, "Output")  # Paramètres complets (voir `Sweep.check_parameters`)
+stacker.memmap_file = "Output/stack.npy" if plan.mode == StorageMode.MEMMAP else ""
+```
+"""
+
+import os
+import shutil
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from SampleMaker.Generator.Diffusion import Diffusion
+from SampleMaker.Generator.Noiser import Noiser
+from SampleMaker.Generator.Sampler import Sampler
+from SampleMaker.Generator.StackModel import StackModel, StackModelType
+
+MEMORY_FRACTION = 0.8	  # Fraction de la mémoire disponible utilisable par la génération
+# Tableaux temporaires float32 de la taille d'une frame pendant le rendu (image, PSF, bruit, masque...) selon le modèle de pile
+# (pics mesurés : 9 frames, 11 avec l'accumulateur float64 du clignotement, arrondis avec une marge)
+FRAME_TEMPORARIES = {StackModelType.RANDOM: 12, StackModelType.BLINKING: 14, StackModelType.PHOTOPHYSICS: 12, StackModelType.DIFFUSION: 12,
+					 StackModelType.DRIFT: 12}
+# Octets par molécule tirée selon le modèle de pile (pics mesurés, arrondis) : tirage et rendu des positions (float64) et état de la population
+# persistante (états du clignotement, dates des événements photophysiques, ancres, propositions et somme des sous-expositions de la diffusion,
+# positions décalées et sans dérive de la dérive)
+MOLECULE_BYTES = {StackModelType.RANDOM: 176, StackModelType.BLINKING: 96, StackModelType.PHOTOPHYSICS: 96, StackModelType.DIFFUSION: 160,
+				  StackModelType.DRIFT: 240}
+DRIFT_FRAME_BYTES = 36	  # Octets par frame de la trajectoire de la dérive (calculée en float64 puis conservée en float32)
+STATISTICS_TEMPORARIES = 6  # Tableaux float32 de la taille d'une frame ajoutés par les statistiques de la pile (accumulateurs float64)
+ENCODE_FRAMES = 2		  # Frames conservées par thread d'encodage TIF compressé (frame source et frame compressée)
+SAVE_TEMPORARIES = 2	  # Tableaux float32 de la taille d'une frame pendant l'enregistrement TIF (conversion frame par frame en uint16)
+CHUNK_FRAMES = 64		  # Frames par bloc de la pile écrite en flux (voir `Stacker.chunk_frames`)
+CALIBRATION_SIZE = 128	  # Taille des images de l'étalonnage en pixels
+CALIBRATION_MOLECULES = 32  # Nombre de molécules rendues pendant l'étalonnage
+CALIBRATION_PARTICLES = 4096  # Nombre de particules déplacées pendant l'étalonnage de la diffusion
+CALIBRATION_REPEAT = 3	  # Nombre de mesures de l'étalonnage (la plus rapide est conservée)
+BYTES_RATIO = 1.0 / (1024 * 1024)  # Passage en Mo
+
+
+##################################################
+class StorageMode(Enum):
+	"""
+	Énumération représentant les modes de stockage de la pile pendant la génération.
+
+	- MEMORY : Pile en mémoire.
+	- MEMMAP : Pile projetée en mémoire depuis un fichier `.npy` temporaire.
+	- STREAM : Pile écrite en flux dans le dossier de blocs de sortie.
+	"""
+	MEMORY = 0
+	MEMMAP = 1
+	STREAM = 2
+
+
+##################################################
+@dataclass
+class Calibration:
+	"""
+	Classe contenant les coûts mesurés de la génération sur la machine locale.
+
+	Attributs :
+		- **psf_seconds (float)** : Durée du rendu d'une PSF par pixel de l'image en secondes.
+		- **pixel_seconds (float)** : Durée du bruit (et de la conversion) par pixel de l'image en secondes.
+		- **step_seconds (float)** : Durée d'une sous-exposition de la diffusion par particule en secondes.
+	"""
+	psf_seconds: float = 0.0
+	pixel_seconds: float = 0.0
+	step_seconds: float = 0.0
+
+	##################################################
+	def tostring(self) -> str:
+		"""
+		Retourne une chaîne de caractères correspondant à l'étalonnage.
+
+		:return: Une description textuelle de l'étalonnage.
+		"""
+		return (f"PSF: {self.psf_seconds * 1e9:.3f} ns/pixel, Noise: {self.pixel_seconds * 1e9:.3f} ns/pixel, "
+				f"Diffusion: {self.step_seconds * 1e9:.3f} ns/particle")
+
+	##################################################
+	def __str__(self) -> str: return self.tostring()
+
+
+##################################################
+@dataclass
+class Plan:
+	"""
+	Classe contenant le plan d'exécution d'une génération.
+
+	Attributs :
+		- **mode (StorageMode)** : Mode de stockage de la pile.
+		- **workers (int)** : Nombre de threads d'encodage du fichier TIF.
+		- **processes (int)** : Nombre de générations simultanées qui tiennent en mémoire (processus d'un `Sweep`).
+		- **molecules (int)** : Nombre de molécules tirées par frame (avant application du masque).
+		- **stack_bytes (int)** : Taille de la pile en octets.
+		- **peak_bytes (int)** : Pic de mémoire résidente estimé dans le mode choisi en octets.
+		- **available_bytes (int)** : Mémoire utilisable par la génération en octets.
+		- **disk_bytes (int)** : Espace disque nécessaire (pile, fichier temporaire) en octets.
+		- **free_bytes (int)** : Espace disque libre du dossier de sortie en octets.
+		- **frame_seconds (float)** : Durée estimée de la génération d'une frame en secondes (0 sans étalonnage).
+		- **runtime (float)** : Durée estimée de la génération de la pile en secondes (0 sans étalonnage).
+		- **warnings (List[str])** : Avertissements (adaptation du mode ou des threads, mémoire ou disque insuffisant).
+	"""
+	mode: StorageMode = StorageMode.MEMORY
+	workers: int = 1
+	processes: int = 1
+	molecules: int = 0
+	stack_bytes: int = 0
+	peak_bytes: int = 0
+	available_bytes: int = 0
+	disk_bytes: int = 0
+	free_bytes: int = 0
+	frame_seconds: float = 0.0
+	runtime: float = 0.0
+	warnings: List[str] = field(default_factory=list)
+
+	##################################################
+	def tostring(self) -> str:
+		"""
+		Retourne une chaîne de caractères correspondant au plan (les avertissements sur les lignes suivantes).
+
+		:return: Une description textuelle du plan.
+		"""
+		lines = [f"Mode: {self.mode.name}, Workers: {self.workers}, Processes: {self.processes}, Molecules: {self.molecules}\n"
+				 f"Stack: {self.stack_bytes * BYTES_RATIO:.1f} Mo, Peak: {self.peak_bytes * BYTES_RATIO:.1f} Mo "
+				 f"(Available: {self.available_bytes * BYTES_RATIO:.1f} Mo), "
+				 f"Disk: {self.disk_bytes * BYTES_RATIO:.1f} Mo (Free: {self.free_bytes * BYTES_RATIO:.1f} Mo)\n"
+				 f"Frame: {self.frame_seconds * 1000:.1f} ms, Runtime: {self.runtime:.1f} s"]
+		return "\n".join(lines + self.warnings)
+
+	##################################################
+	def __str__(self) -> str: return self.tostring()
+
+
+##################################################
+def get_available_memory() -> int:
+	"""
+	Retourne la mémoire disponible de la machine (sans swap).
+
+	:return: Mémoire disponible en octets.
+	"""
+	import psutil  # Import local : psutil n'est nécessaire que pour la planification
+	return int(psutil.virtual_memory().available)
+
+
+##################################################
+def get_free_disk(directory: str) -> int:
+	"""
+	Retourne l'espace libre du disque d'un dossier (le premier parent existant si le dossier n'existe pas encore).
+
+	:param directory: Dossier de sortie.
+	:return: Espace libre en octets.
+	"""
+	directory = os.path.abspath(directory or ".")
+	while not os.path.isdir(directory) and os.path.dirname(directory) != directory: directory = os.path.dirname(directory)
+	return int(shutil.disk_usage(directory).free)
+
+
+##################################################
+@dataclass
+class Planner:
+	"""
+	Classe permettant d'estimer la mémoire et la durée d'une génération et de choisir son mode d'exécution.
+
+	Attributs :
+		- **memory_fraction (float)** : Fraction de la mémoire disponible utilisable par la génération (par défaut `MEMORY_FRACTION`).
+		- **memory (int)** : Mémoire disponible imposée en octets, 0 pour la mesurer à chaque plan (par défaut 0).
+		- **calibration (Calibration)** : Étalonnage de la machine (mesuré au premier plan avec durée, None avant).
+	"""
+	memory_fraction: float = MEMORY_FRACTION
+	memory: int = 0
+	calibration: Optional[Calibration] = field(init=False, default=None)
+
+	##################################################
+	def calibrate(self) -> Calibration:
+		"""
+		Mesure le coût du rendu des PSF, du bruit et de la diffusion sur de petites images (une seule fois, l'étalonnage est conservé).
+
+		:return: L'étalonnage de la machine.
+		"""
+		if self.calibration is not None: return self.calibration
+		sampler, noiser = Sampler(size=CALIBRATION_SIZE), Noiser()
+		localisation = np.column_stack((np.random.uniform(0, CALIBRATION_SIZE, (CALIBRATION_MOLECULES, 2)), np.random.uniform(-1, 1, CALIBRATION_MOLECULES)))
+		intensities = np.full(CALIBRATION_MOLECULES, 1000.0)
+		sampler.render_psf(localisation[:1], intensities[:1])  # Pré-calculs de la PSF hors mesure
+		diffusion = Diffusion(np.full((CALIBRATION_PARTICLES, 3), CALIBRATION_SIZE / 2, dtype=np.float32), size=CALIBRATION_SIZE)
+		psf, noise, step = float("inf"), float("inf"), float("inf")
+		for _ in range(CALIBRATION_REPEAT):
+			start = time.perf_counter()
+			image = sampler.generate_psf(localisation, intensities)
+			middle = time.perf_counter()
+			noiser.apply(image)
+			end = time.perf_counter()
+			diffusion.step()
+			psf, noise, step = min(psf, middle - start), min(noise, end - middle), min(step, time.perf_counter() - end)
+		pixels = CALIBRATION_SIZE * CALIBRATION_SIZE
+		self.calibration = Calibration(psf / (CALIBRATION_MOLECULES * pixels), noise / pixels, step / CALIBRATION_PARTICLES)
+		return self.calibration
+
+	##################################################
+	def plan(self, parameters: Dict[str, Any], directory: str = ".", output_format: str = "tif", uint16: bool = False, statistics: bool = False,
+			 processes: int = 1, runtime: bool = True) -> Plan:
+		"""
+		Estime la mémoire et la durée d'une génération puis choisit le mode de stockage de la pile et le nombre de threads d'encodage.
+
+		:param parameters: Paramètres complets de la génération (voir `Sweep.check_parameters`).
+		:param directory: Dossier de sortie (pour l'espace disque, par défaut ".").
+		:param output_format: Format de sortie, "tif" ou "chunks" (par défaut "tif").
+		:param uint16: Si `True`, la pile est stockée en entiers 16 bits (par défaut False).
+		:param statistics: Si `True`, les statistiques de la pile sont calculées pendant la génération (par défaut False).
+		:param processes: Nombre de générations simultanées qui se partagent la mémoire (par défaut 1).
+		:param runtime: Si `True`, la durée est estimée (étalonnage au premier plan, par défaut True).
+		:return: Le plan de la génération.
+		"""
+		size, n_frames = parameters["size"], parameters["n_frames"]
+		model = StackModel.from_model(StackModelType[parameters["stack_model"]], parameters["stack_model_options"])
+		pixels = size * size
+		molecules = int((size * parameters["pixel_size"] / 1000) ** 2 * parameters["density"])
+		frame_bytes = pixels * (2 if uint16 else 4)
+		work_bytes = pixels * 4 * (FRAME_TEMPORARIES[model.model] + (STATISTICS_TEMPORARIES if statistics else 0))
+		work_bytes += molecules * MOLECULE_BYTES[model.model] + (n_frames * DRIFT_FRAME_BYTES if model.model == StackModelType.DRIFT else 0)
+		save_bytes = pixels * 4 * SAVE_TEMPORARIES if output_format == "tif" else 0
+		encode_bytes = ENCODE_FRAMES * frame_bytes if output_format == "tif" and parameters["compression"] != "none" else 0
+		cpus = os.cpu_count() or 1
+
+		result = Plan(molecules=molecules, stack_bytes=n_frames * frame_bytes)
+		result.available_bytes = int((self.memory or get_available_memory()) * self.memory_fraction / max(1, processes))
+		result.free_bytes = get_free_disk(directory)
+
+		# Mode de stockage : en mémoire si possible, sinon en flux (sortie en blocs) ou projeté depuis un fichier temporaire (sortie TIF)
+		# Le rendu et l'enregistrement se succèdent : le pic hors pile est le plus grand des deux (l'enregistrement convertit frame par frame)
+		step_bytes = max(work_bytes, save_bytes)
+		result.peak_bytes, result.disk_bytes = result.stack_bytes + step_bytes, result.stack_bytes
+		if result.peak_bytes + encode_bytes > result.available_bytes:
+			if output_format == "chunks":
+				result.mode, result.peak_bytes = StorageMode.STREAM, step_bytes + min(n_frames, CHUNK_FRAMES) * frame_bytes
+			else: result.mode, result.peak_bytes, result.disk_bytes = StorageMode.MEMMAP, step_bytes, 2 * result.stack_bytes
+			result.warnings.append(f"La pile ({result.stack_bytes * BYTES_RATIO:.0f} Mo) ne tient pas en mémoire "
+								   f"({result.available_bytes * BYTES_RATIO:.0f} Mo utilisables) : mode {result.mode.name}.")
+
+		# Threads d'encodage : autant que demandé (ou que de cœurs) dans la limite de la mémoire restante
+		requested = parameters["workers"] or cpus
+		if encode_bytes == 0: result.workers = requested
+		else:
+			result.workers = max(1, min(requested, (result.available_bytes - result.peak_bytes) // encode_bytes))
+			result.peak_bytes += result.workers * encode_bytes
+			if parameters["workers"] and result.workers < parameters["workers"]:
+				result.warnings.append(f"Threads d'encodage réduits de {parameters['workers']} à {result.workers} pour tenir en mémoire.")
+		result.processes = int(max(1, min(cpus, result.available_bytes * max(1, processes) // max(1, result.peak_bytes))))
+
+		if result.peak_bytes > result.available_bytes:
+			result.warnings.append(f"Le rendu d'une frame ({result.peak_bytes * BYTES_RATIO:.0f} Mo) dépasse la mémoire utilisable "
+								   f"({result.available_bytes * BYTES_RATIO:.0f} Mo) : la génération risque de swapper.")
+		if result.disk_bytes > result.free_bytes:
+			result.warnings.append(f"Espace disque insuffisant : {result.disk_bytes * BYTES_RATIO:.0f} Mo nécessaires, "
+								   f"{result.free_bytes * BYTES_RATIO:.0f} Mo libres.")
+
+		if runtime:
+			calibration = self.calibrate()
+			rendered, first = molecules, 0.0  # Molécules rendues par frame et rendu supplémentaire de la première frame
+			if model.model == StackModelType.BLINKING:  # Rendu incrémental : seules les molécules qui changent d'état sont rendues
+				on_ratio = float(np.clip(model.options.on_ratio, 0, 1))
+				p_off = 1 - np.exp(-model.options.exposure / max(float(parameters["flickering"]), np.finfo(np.float32).eps))
+				rendered, first = molecules * min(1.0, 2 * on_ratio * p_off), molecules * on_ratio  # Autant d'allumages que d'extinctions
+			result.frame_seconds = (rendered * calibration.psf_seconds + calibration.pixel_seconds) * pixels
+			if model.model == StackModelType.DIFFUSION: result.frame_seconds += molecules * model.options.sub_steps * calibration.step_seconds
+			result.runtime = result.frame_seconds * n_frames + first * calibration.psf_seconds * pixels
+		return result
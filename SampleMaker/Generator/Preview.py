@@ -0,0 +1,206 @@
+"""
+Fichier contenant la classe `Preview` qui calcule rapidement un aperçu d'une frame (sans interface graphique).
+
+Régler la densité, le SNR ou le masque demandait une génération complète puis l'ouverture du fichier TIF dans un autre logiciel.
+L'aperçu rend une seule frame d'au plus `max_size` pixels de côté, quelle que soit la taille de l'image demandée :
+
+- **Champ complet** (par défaut) : toute l'image est rendue à une résolution réduite d'un facteur entier (pixels `factor` fois plus grands).
+  Les tailles du motif exprimées en pixels sont réduites du même facteur et l'intensité est moyennée sur les pixels regroupés.
+- **Zone centrale** (`roi`) : la zone centrale de l'image est rendue à pleine résolution.
+
+Les molécules ne sont pas rendues une à une sur toute l'image : chaque molécule dépose un noyau gaussien pré-calculé (fenêtre de ±3 sigma)
+autour de son pixel, le Z étant arrondi à l'un des `n_levels` niveaux d'astigmatisme. Tous les dépôts sont sommés en un seul `np.bincount`.
+Les masques et les noyaux sont conservés entre deux rendus, seuls les paramètres modifiés entraînent un nouveau calcul.
+"""
+
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from SampleMaker import Fluorophore, Mask, Pattern, PatternType
+from SampleMaker.Generator.Noiser import Noiser
+from SampleMaker.Generator.Sampler import FWHM_SIGMA_RATIO, MAX_INTENSITY
+from SampleMaker.Generator.Sweep import check_parameters
+
+
+##################################################
+@dataclass
+class Preview:
+	"""
+	Classe permettant de calculer l'aperçu d'une frame.
+
+	Attributs :
+		- **max_size (int)** : Taille maximale de l'aperçu en pixels (par défaut 256).
+		- **roi (bool)** : Si `True`, la zone centrale est rendue à pleine résolution, sinon tout le champ à résolution réduite (par défaut False).
+		- **n_levels (int)** : Nombre de niveaux de Z (noyaux pré-calculés) pour l'astigmatisme (par défaut 9).
+		- **factor (int)** : Facteur de réduction du dernier aperçu (1 en zone centrale).
+		- **n_molecules (int)** : Nombre de molécules du dernier aperçu.
+		- **duration (float)** : Durée du dernier rendu en secondes.
+	"""
+	max_size: int = 256
+	roi: bool = False
+	n_levels: int = 9
+	factor: int = field(init=False, default=1)
+	n_molecules: int = field(init=False, default=0)
+	duration: float = field(init=False, default=0.0)
+	_masks: Dict[str, NDArray[np.bool_]] = field(init=False, repr=False, default_factory=dict)
+	_kernels: Dict[Tuple[float, float, int], Tuple[int, List[NDArray[np.float64]]]] = field(init=False, repr=False, default_factory=dict)
+
+	# ==================================================
+	# region Caches
+	# ==================================================
+	##################################################
+	def get_geometry(self, size: int) -> Tuple[int, int, int]:
+		"""
+		Retourne la géométrie de l'aperçu pour une image de taille donnée.
+
+		:param size: Taille de l'image demandée en pixels.
+		:return: Taille de l'aperçu, facteur de réduction et décalage de la zone rendue (en pixels de l'image demandée).
+		"""
+		if self.roi:
+			out = min(size, self.max_size)
+			return out, 1, (size - out) // 2
+		factor = max(1, math.ceil(size / self.max_size))
+		return size // factor, factor, 0
+
+	##################################################
+	def get_mask(self, size: int, pattern: Pattern) -> Optional[NDArray[np.bool_]]:
+		"""
+		Retourne le masque de l'aperçu (conservé tant que la taille et le motif ne changent pas).
+
+		En champ complet, le masque est généré directement à la taille de l'aperçu avec les tailles du motif réduites.
+		En zone centrale, le masque est généré à pleine taille puis recadré.
+
+		:param size: Taille de l'image demandée en pixels.
+		:param pattern: Motif du masque.
+		:return: Masque booléen de la taille de l'aperçu (None si aucun motif).
+		"""
+		if pattern.pattern == PatternType.NONE: return None
+		out, factor, offset = self.get_geometry(size)
+		key = f"{size}/{out}/{self.roi}/{pattern.pattern.name}/{pattern.options}"
+		if key not in self._masks:
+			if self.roi: mask = Mask(_size=size, _pattern=pattern).mask[offset:offset + out, offset:offset + out]
+			else: mask = Mask(_size=out, _pattern=self._scale_pattern(pattern, factor)).mask
+			if mask.shape != (out, out):  # Image existante de taille différente : rééchantillonnage au plus proche voisin
+				rows, cols = np.arange(out) * mask.shape[0] // out, np.arange(out) * mask.shape[1] // out
+				mask = mask[np.ix_(rows, cols)]
+			self._masks = {key: mask}  # Un seul masque conservé : celui des réglages courants
+		return self._masks[key]
+
+	##################################################
+	@staticmethod
+	def _scale_pattern(pattern: Pattern, factor: int) -> Pattern:
+		"""
+		Réduit les tailles du motif exprimées en pixels (bandes et carrés).
+
+		:param pattern: Motif à réduire.
+		:param factor: Facteur de réduction.
+		:return: Le motif réduit (le motif d'origine si aucune taille n'est à réduire).
+		"""
+		if factor == 1: return pattern
+		if pattern.pattern == PatternType.STRIPES:
+			options = pattern.options
+			return Pattern.from_pattern(PatternType.STRIPES, {"lengths":     [max(1, round(length / factor)) for length in options.lengths],
+															  "mirror":      options.mirror, "orientation": options.orientation})
+		if pattern.pattern == PatternType.SQUARES: return Pattern.from_pattern(PatternType.SQUARES, {"size": max(1, round(pattern.options.size / factor))})
+		return pattern
+
+	##################################################
+	def get_kernels(self, sigma: float, astigmatism_ratio: float) -> Tuple[int, List[NDArray[np.float64]]]:
+		"""
+		Retourne les noyaux gaussiens normalisés de chaque niveau de Z (conservés tant que la PSF ne change pas).
+
+		:param sigma: Écart-type de base de la PSF en pixels de l'aperçu.
+		:param astigmatism_ratio: Ratio de l'astigmatisme.
+		:return: Rayon des noyaux et liste des `n_levels` noyaux aplatis (somme de chaque noyau égale à 1).
+		"""
+		key = (round(sigma, 6), astigmatism_ratio, self.n_levels)
+		if key not in self._kernels:
+			low, high = min(astigmatism_ratio, 1 / astigmatism_ratio), max(astigmatism_ratio, 1 / astigmatism_ratio)
+			radius = int(round(3 * sigma * high))  # Nul si la PSF est plus petite qu'un pixel de l'aperçu
+			offsets = np.arange(-radius, radius + 1)
+			kernels = []
+			for z in np.linspace(-1, 1, self.n_levels):
+				ratio = np.clip(1 + z * (astigmatism_ratio - 1), low, high)
+				kernel = np.outer(np.exp(-0.5 * (offsets / (sigma / ratio)) ** 2), np.exp(-0.5 * (offsets / (sigma * ratio)) ** 2))  # (Y, X)
+				kernels.append((kernel / kernel.sum()).ravel())
+			self._kernels = {key: (radius, kernels)}
+		return self._kernels[key]
+
+	# ==================================================
+	# endregion Caches
+	# ==================================================
+
+	# ==================================================
+	# region Render
+	# ==================================================
+	##################################################
+	def render(self, parameters: Dict[str, Any]) -> NDArray[np.float32]:
+		"""
+		Calcule l'aperçu d'une frame bruitée.
+
+		:param parameters: Paramètres de génération (voir `Sweep.DEFAULT_PARAMETERS`, seuls ceux du sampler, du masque et du bruit sont utilisés).
+		:return: Image 2D de l'aperçu (au plus `max_size` pixels de côté).
+		:raises ValueError: Si un paramètre ou le motif n'est pas reconnu.
+		"""
+		start = time.perf_counter()
+		p = check_parameters(parameters)
+		out, self.factor, _ = self.get_geometry(p["size"])
+		mask = self.get_mask(p["size"], Pattern.from_pattern(PatternType[p["pattern"]], p["pattern_options"]))
+
+		# Molécules de la zone rendue (même densité que l'image demandée)
+		pixel_size = p["pixel_size"] * self.factor
+		n = int((out * pixel_size / 1000) ** 2 * p["density"])
+		x, y = np.random.uniform(0, out, n), np.random.uniform(0, out, n)
+		z = np.random.uniform(-1, 1, n)
+		x_int, y_int = np.minimum(x.astype(int), out - 1), np.minimum(y.astype(int), out - 1)
+		if mask is not None:
+			inside = mask[y_int, x_int]
+			x_int, y_int, z = x_int[inside], y_int[inside], z[inside]
+		self.n_molecules = x_int.size
+		fluorophore = Fluorophore(wavelength=p["wavelength"], intensity=p["intensity"], delta=p["delta"], flickering=p["flickering"])
+		intensities = fluorophore.get_intensities(self.n_molecules, True) / self.factor ** 2  # Intensité moyennée sur les pixels regroupés
+
+		# Dépôt des noyaux (un seul bincount pour toutes les molécules)
+		sigma = 0.61 * p["wavelength"] / p["na"] / FWHM_SIGMA_RATIO / pixel_size
+		radius, kernels = self.get_kernels(sigma, p["astigmatism_ratio"])
+		offsets = np.arange(-radius, radius + 1)
+		dy, dx = (grid.ravel() for grid in np.meshgrid(offsets, offsets, indexing="ij"))  # Même ordre que les noyaux aplatis (Y, X)
+		levels = np.rint((z + 1) / 2 * (self.n_levels - 1)).astype(int)
+		rows, cols = y_int[:, np.newaxis] + dy, x_int[:, np.newaxis] + dx
+		weights = intensities[:, np.newaxis] * np.asarray(kernels)[levels]
+		valid = (rows >= 0) & (rows < out) & (cols >= 0) & (cols < out)
+		image = np.bincount((rows * out + cols)[valid], weights[valid], minlength=out * out).reshape(out, out)
+		image = np.clip(image, 0, MAX_INTENSITY).astype(np.float32)
+
+		frame = Noiser(snr=p["snr"], background=p["background"], variation=p["variation"]).apply(image)
+		self.duration = time.perf_counter() - start
+		return frame
+
+	# ==================================================
+	# endregion Render
+	# ==================================================
+
+	# ==================================================
+	# region IO
+	# ==================================================
+	##################################################
+	def tostring(self) -> str:
+		"""
+		Retourne une chaîne de caractères correspondant au dernier aperçu.
+
+		:return: Une description textuelle de l'aperçu.
+		"""
+		mode = "ROI" if self.roi else f"Factor: {self.factor}"
+		return f"Preview: {self.max_size} px ({mode}), Molecules: {self.n_molecules}, Duration: {self.duration * 1000:.1f} ms"
+
+	##################################################
+	def __str__(self) -> str: return self.tostring()
+
+# ==================================================
+# endregion IO
+# ==================================================
@@ -7,37 +7,45 @@ Elle utilise un fluorophore pour définir les propriétés optiques des molécul
 
 Les principales fonctionnalités de la classe incluent :
 - La génération aléatoire ou en grille des positions des molécules dans l'image.
+- Le rendu d'une grille à partir d'un modèle sans bruit conservé entre deux appels (PSF unitaires de chaque molécule de la grille).
 - Le calcul des fonctions de réponse impulsionnelle (PSF) de chaque molécule.
 - L'ajout de bruit optique simulé pour obtenir une image avec un rapport signal/bruit (SNR) prédéfini.
 """
 
 from dataclasses import dataclass, field
-from typing import List
+from typing import Callable, List, Optional, Set, Tuple
 
 import numpy as np
 from numpy.typing import NDArray
-from scipy.stats import multivariate_normal
 
 from SampleMaker import Fluorophore, Mask, PatternType
 from SampleMaker.Generator.Noiser import Noiser
 from SampleMaker.Tools import Decorators, print_warning
+from SampleMaker.Tools.Profiler import count, span
 
 MAX_INTENSITY = np.iinfo(np.uint16).max  # Pour des entiers sur 16 bits (soit 65535).
 FWHM_SIGMA_RATIO = 2.355  # Valeur pour passer du FWHM à un sigma pour la PSF 2*sqrt(2*ln(2)) = 2.35482004503...
+GRID_WINDOW_SIGMAS = 5	  # Demi-largeur de la fenêtre des PSF du modèle de grille en sigma (queue négligée inférieure à exp(-12.5))
 
 
 ##################################################
 @dataclass
-@Decorators.reset_on_change("size")
-@Decorators.reset_on_change("pixel_size")
-@Decorators.reset_on_change("na")
-@Decorators.reset_on_change("density")
-@Decorators.reset_on_change("astigmatism_ratio")
-@Decorators.reset_on_change("fluorophore")
+@Decorators.invalidate_on_change("size", "area", "max_molecules", "axis")
+@Decorators.invalidate_on_change("pixel_size", "area", "max_molecules", "psf")
+@Decorators.invalidate_on_change("na", "psf")
+@Decorators.invalidate_on_change("density", "max_molecules")
+@Decorators.invalidate_on_change("astigmatism_ratio", "psf")
+@Decorators.invalidate_on_change("fluorophore", "psf")
 class Sampler:
 	"""
 	Classe permettant de générer un échantillon.
 
+	Les pré-calculs (aire, nombre de molécules, paramètres de la PSF, axe des coordonnées) ne sont recalculés qu'à leur prochaine utilisation,
+	et seulement si l'un des paramètres dont ils dépendent a changé. `update` modifie plusieurs paramètres à la fois.
+	Les PSF sont calculées à partir d'un seul axe de coordonnées 1D en float32 (l'image est carrée) :
+	la gaussienne étant séparable, chaque PSF est le produit extérieur de ses profils en Y et en X (broadcasting).
+	`memory_footprint` indique la mémoire occupée par le sampler.
+
 	Attributs :
 		- **size (int)** : Taille de l'image.
 		- **pixel_size (int)** : Taille d'un pixel en nanomètres (par défaut : 160).
@@ -49,6 +57,9 @@ class Sampler:
 		- **noise (Noiser)** : Caractéristiques du bruit (base, déviation, SNR souhaité).
 		- **n_molecules (List[int])** : Nombre de molécules sur chaque image généré par le sampler.
 		- **last_localisations (np.array[float])** : Dernières positions des molécules.
+		- **last_intensities (np.array[float])** : Dernières intensités des molécules.
+		- **on_phase (Callable[[str], None])** : Fonction appelée à la fin de la phase de localisation de `generate_clean_sample`
+		  avec le nom de la phase (utilisée par le `Stacker` pour ses observateurs, None par défaut).
 	"""
 	_size: int = 256
 	_pixel_size: int = 160
@@ -62,13 +73,17 @@ class Sampler:
 	# Attributs d'état du générateur
 	n_molecules: List[int] = field(init=False, default_factory=list)
 	last_localisations: NDArray[np.float32] = field(init=False, default_factory=lambda: np.empty((0, 3), dtype=np.float32))
+	last_intensities: NDArray[np.float32] = field(init=False, default_factory=lambda: np.empty(0, dtype=np.float32))
+	on_phase: Optional[Callable[[str], None]] = field(init=False, default=None, repr=False)
 
 	# Attributs de pré-calcul interne
 	_area: float = field(init=False, default=0.0)
 	_max_molecules: int = field(init=False, default=0)
 	_sigma_base: float = field(init=False, default=1)
 	_astigmatism: [float, float] = field(init=False, default_factory=lambda: [1.0, 1.0])
-	_meshgrid: NDArray[np.float32] = field(init=False, default_factory=lambda: [])
+	_axis: NDArray[np.float32] = field(init=False, default_factory=lambda: np.empty(0, dtype=np.float32))  # Coordonnées des pixels (X et Y)
+	_dirty: Set[str] = field(init=False, repr=False, compare=False, default_factory=set)  # Pré-calculs à refaire avant leur prochaine utilisation
+	_grid_template: Optional[Tuple[tuple, NDArray, NDArray, NDArray]] = field(init=False, repr=False, compare=False, default=None)  # Voir `get_grid_template`
 
 	# ==================================================
 	# region Initialization / Setter
@@ -99,12 +114,57 @@ class Sampler:
 		# Initialisation des champs "init=False"
 		self.n_molecules = []
 		self.last_localisations = np.empty((0, 3), dtype=np.float32)
+		self.last_intensities = np.empty(0, dtype=np.float32)
 		self._area = 0.0
 		self._max_molecules = 0
 		self._sigma_base = 1.0
 		self._astigmatism = [1.0, 1.0]
+		self._axis = np.empty(0, dtype=np.float32)
+		self._grid_template = None
+		self._dirty = set()
 		self.reset()
 
+	##################################################
+	def update(self, **params):
+		"""
+		Modifie plusieurs paramètres à la fois : les pré-calculs concernés sont invalidés une seule fois.
+
+		:param params: Nouveaux paramètres parmi `size`, `pixel_size`, `na`, `density`, `astigmatism_ratio`, `fluorophore`, `mask` et `noiser`.
+		:raises ValueError: Si un paramètre n'est pas reconnu.
+		"""
+		unknown = set(params) - set(self._dependencies) - {"mask", "noiser"}
+		if unknown: raise ValueError(f"Paramètres non reconnus : {sorted(unknown)}.")
+		for name, value in params.items(): setattr(self, name, value)  # Les setters invalident les pré-calculs sans les recalculer
+
+	##################################################
+	def _ensure(self, *names: str):
+		"""
+		Recalcule les pré-calculs invalidés parmi ceux demandés.
+
+		:param names: Noms des pré-calculs ("area", "max_molecules", "psf" ou "axis").
+		"""
+		for name in names:
+			if name not in self._dirty: continue
+			self._dirty.discard(name)
+			if name == "area": self._set_area()
+			elif name == "max_molecules": self._set_max_molecule_number()
+			elif name == "psf": self._set_psf_parameters()
+			elif name == "axis": self._set_axis()
+
+	##################################################
+	@property
+	def area(self) -> float:
+		""" Aire de l'image en micromètres carrés. """
+		self._ensure("area")
+		return self._area
+
+	##################################################
+	@property
+	def max_molecules(self) -> int:
+		""" Nombre de molécules tirées par image (avant application du masque). """
+		self._ensure("max_molecules")
+		return self._max_molecules
+
 	##################################################
 	def _set_area(self):
 		"""
@@ -119,38 +179,64 @@ class Sampler:
 		Calcule le nombre estimé de molécules dans une image carrée en fonction de sa taille, de la taille d'un pixel et de la densité de molécules.
 		Cette fonction est utile pour estimer la quantité totale de molécules dans une région d'image en fonction de paramètres physiques.
 		"""
-		self._max_molecules = int(self._area * self._density)  # Calculer le nombre de molécules en fonction de la densité
+		self._max_molecules = int(self.area * self._density)  # Calculer le nombre de molécules en fonction de la densité
+
+	##################################################
+	def get_sigma_base(self, wavelength: float) -> float:
+		"""
+		Calcule l'écart-type de base de la PSF pour une longueur d'onde (sans astigmatisme).
+
+		:param wavelength: Longueur d'onde d'émission en nanomètres.
+		:return: L'écart-type en pixels.
+		"""
+		fwhm = (0.61 * wavelength) / self._na  # Calcul de la largeur à mi-hauteur (FWHM) pour une PSF circulaire
+		sigma = fwhm / FWHM_SIGMA_RATIO		   # Convertir la largeur à mi-hauteur en variance (sigma)
+		return sigma / self._pixel_size		   # Convertir sigma en pixels (par rapport à la taille du pixel)
 
 	##################################################
 	def _set_psf_parameters(self):
 		""" Calcul des différents paramètres nécessaire au calcul des PSF. """
-		fwhm = (0.61 * self._fluorophore.wavelength) / self._na	 # Calcul de la largeur à mi-hauteur (FWHM) pour une PSF circulaire
-		self._sigma_base = fwhm / FWHM_SIGMA_RATIO  			 # Convertir la largeur à mi-hauteur en variance (sigma)
-		self._sigma_base /= self._pixel_size					 # Convertir sigma_base en pixels (par rapport à la taille du pixel)
+		self._sigma_base = self.get_sigma_base(self._fluorophore.wavelength)
 
 		# Déterminer les bornes pour le ratio d'aspect (si l'astigmatisme est inférieur à 1, on inverse l'étirement horizontal et vertical)
 		self._astigmatism[0] = min(self._astigmatism_ratio, 1.0 / self._astigmatism_ratio)
 		self._astigmatism[1] = max(self._astigmatism_ratio, 1.0 / self._astigmatism_ratio)
 
-	def _set_meshgrid(self):
-		""" Calcul de la grille pour appliquer la gaussienne à l'image. """
-		x_coords = np.arange(self._size)
-		y_coords = np.arange(self._size)
-		x_mesh, y_mesh = np.meshgrid(x_coords, y_coords)
-		self._meshgrid = np.dstack((x_mesh, y_mesh))
+	##################################################
+	def _set_axis(self):
+		""" Calcul de l'axe des coordonnées des pixels (identique en X et en Y, l'image étant carrée) pour appliquer la gaussienne à l'image. """
+		self._axis = np.arange(self._size, dtype=np.float32)
 
 	##################################################
-	def reset(self):
+	def memory_footprint(self) -> int:
 		"""
-		Réinitialise la dernière position et la liste de molécules.
-		(Utile dans le cas de plusieurs utilisations du même sampler avec des paramètres différents.)
+		Calcule la mémoire occupée par les tableaux du sampler (axe des coordonnées, masque, dernières positions et intensités, modèle de grille).
+		Les images générées ne sont pas comptées : elles appartiennent à l'appelant (voir `Stack`).
+
+		:return: Nombre d'octets occupés.
+		"""
+		arrays = [self._axis, self.last_localisations, self.last_intensities, getattr(self.mask, "mask", None)]
+		if self._grid_template is not None: arrays += list(self._grid_template[1:])
+		return sum(array.nbytes for array in arrays if isinstance(array, np.ndarray))
+
+	##################################################
+	def clear(self):
+		"""
+		Réinitialise uniquement l'état du générateur (dernière position et liste de molécules) en conservant les pré-calculs internes.
+		(Utile pour générer plusieurs piles avec les mêmes paramètres sans recalculer la grille de la PSF.)
 		"""
 		self.n_molecules.clear()
 		self.last_localisations = np.empty((0, 3), dtype=np.float32)
-		self._set_area()
-		self._set_max_molecule_number()
-		self._set_psf_parameters()
-		self._set_meshgrid()
+		self.last_intensities = np.empty(0, dtype=np.float32)
+
+	##################################################
+	def reset(self):
+		"""
+		Réinitialise la dernière position et la liste de molécules puis invalide tous les pré-calculs internes (aire, PSF, axe des coordonnées).
+		Ils seront recalculés à leur prochaine utilisation.
+		"""
+		self.clear()
+		self._dirty |= {"area", "max_molecules", "psf", "axis"}
 
 	# ==================================================
 	# endregion Initialization / Setter
@@ -169,20 +255,22 @@ class Sampler:
 		# Générer des positions aléatoires pour chaque molécule
 		# x et y sont des positions flottantes aléatoires dans l'espace 2D de l'image (0 à size)
 		# z est une position flottante aléatoire entre -1 et 1.
-		x = np.random.uniform(0, self._size, self._max_molecules)
-		y = np.random.uniform(0, self._size, self._max_molecules)
-		z = np.random.uniform(-1, 1, self._max_molecules)
-		localisation = np.vstack((x, y, z)).T  # Combiner les coordonnées dans un tableau de forme (n_molecules, 3)
-
-		if apply_mask and self.mask.pattern.pattern != PatternType.NONE:
-			# Convertir les coordonnées x et y en type entier pour correspondre aux pixels dans le masque,
-			# clip permet d'éviter les positions en dehors du masque.
-			x_int = np.clip(localisation[:, 0].astype(int), 0, self._size - 1)
-			y_int = np.clip(localisation[:, 1].astype(int), 0, self._size - 1)
-			# Sélectionner les positions des molécules dont le masque est "True" aux indices (x, y)
-			# On inverse les X et Y sur l'image du masque pour correspondre aux tableaux : Premier indice les lignes donc le Y
-			valid_indices = self.mask.mask[y_int, x_int]
-			localisation = localisation[valid_indices]	  # Ne garder que les molécules qui sont dans le masque
+		with span("sampler.localisation"):
+			n = self.max_molecules
+			x = np.random.uniform(0, self._size, n)
+			y = np.random.uniform(0, self._size, n)
+			z = np.random.uniform(-1, 1, n)
+			localisation = np.vstack((x, y, z)).T  # Combiner les coordonnées dans un tableau de forme (n_molecules, 3)
+
+			if apply_mask and self.mask.pattern.pattern != PatternType.NONE:
+				# Convertir les coordonnées x et y en type entier pour correspondre aux pixels dans le masque,
+				# clip permet d'éviter les positions en dehors du masque.
+				x_int = np.clip(localisation[:, 0].astype(int), 0, self._size - 1)
+				y_int = np.clip(localisation[:, 1].astype(int), 0, self._size - 1)
+				# Sélectionner les positions des molécules dont le masque est "True" aux indices (x, y)
+				# On inverse les X et Y sur l'image du masque pour correspondre aux tableaux : Premier indice les lignes donc le Y
+				valid_indices = self.mask.mask[y_int, x_int]
+				localisation = localisation[valid_indices]	  # Ne garder que les molécules qui sont dans le masque
 		return localisation
 
 	##################################################
@@ -211,58 +299,151 @@ class Sampler:
 	# region Generate Image
 	# ==================================================
 	##################################################
-	def generate_psf(self, localisation) -> NDArray[np.float32]:
+	def generate_psf(self, localisation, intensities: Optional[NDArray[np.float32]] = None,
+					 offset: Optional[NDArray[np.float32]] = None) -> NDArray[np.float32]:
 		"""
 		Calcule une image 2D avec la fonction de réponse impulsionnelle (PSF) de chaque molécule basée sur les coordonnées et un astigmatisme défini par z.
 
 		:param localisation: Tableau numpy de positions des molécules de forme (N, 3), où chaque ligne est (x, y, z).
+		:param intensities: Intensités des molécules de forme (N,), si None elles sont tirées à partir du fluorophore (par défaut None).
+		:param offset: Décalage (x, y, z) appliqué à toutes les positions lors du rendu, par exemple la dérive de l'échantillon (par défaut None).
 		:return: Image 2D de taille (size, size) avec les PSF ajoutées pour chaque molécule.
 		"""
+		return np.clip(self.render_psf(localisation, intensities, offset), 0, MAX_INTENSITY)  # Clipper les valeurs pour éviter les débordements
+
+	##################################################
+	def render_psf(self, localisation, intensities: Optional[NDArray[np.float32]] = None,
+				   offset: Optional[NDArray[np.float32]] = None) -> NDArray[np.float32]:
+		"""
+		Calcule la somme des PSF des molécules sans borner les valeurs.
+		Les images de plusieurs groupes de molécules peuvent ainsi être ajoutées ou soustraites sans perte (rendu incrémental).
 
+		:param localisation: Tableau numpy de positions des molécules de forme (N, 3), où chaque ligne est (x, y, z).
+		:param intensities: Intensités des molécules de forme (N,), si None elles sont tirées à partir du fluorophore (par défaut None).
+		:param offset: Décalage (x, y, z) appliqué à toutes les positions lors du rendu, par exemple la dérive de l'échantillon (par défaut None).
+		:return: Image 2D de taille (size, size) avec les PSF ajoutées pour chaque molécule.
+		"""
 		image = np.zeros((self._size, self._size), dtype=np.float32)
 		if self._astigmatism_ratio <= 0:  # Si à un ratio négatif ce n'est pas logique
 			print_warning("Le ratio d'astigmatisme doit être strictement positif, l'image sera noire.")
 			return image
 
-		for x, y, z in localisation:
-			# Calculer le ratio linéairement en fonction de z, mais borné aux limites logiques en cas de valeurs aberrantes
-			ratio = np.clip(1 + z * (self._astigmatism_ratio - 1), self._astigmatism[0], self._astigmatism[1])
-			sigma_x = self._sigma_base * ratio
-			sigma_y = self._sigma_base / ratio
+		if intensities is None: intensities = self._fluorophore.get_intensities(localisation.shape[0], True)
+		if offset is not None: localisation = localisation + offset  # Décalage des coordonnées, pas de l'image rendue
+		self._ensure("psf", "axis")
+		with span("sampler.psf"):
+			for (x, y, z), intensity in zip(localisation, intensities): self._add_psf(image, x, y, z, intensity, self._sigma_base)
+		count("molecules", localisation.shape[0])
+		count("pixels", localisation.shape[0] * image.size)  # Chaque PSF est calculée sur toute l'image
+		count("bytes_allocated", image.nbytes)
+		return image
 
-			# Création d'une grille pour la gaussienne 2D autour de (x, y)
-			rv = multivariate_normal(mean=[x, y], cov=[[sigma_x ** 2, 0], [0, sigma_y ** 2]])  # Définir la gaussienne avec l'astigmatisme selon le ratio
-			psf = self._fluorophore.get_intensity(True) * rv.pdf(self._meshgrid)			   # Générer une intensité et appliquer la gaussienne
-			image += psf																	   # Ajouter la PSF à l'image
+	##################################################
+	def _add_psf(self, image: NDArray[np.float32], x: float, y: float, z: float, intensity: float, sigma_base: float):
+		"""
+		Ajoute la PSF d'une molécule à une image (les pré-calculs "psf" et "axis" doivent être à jour).
+
+		:param image: Image 2D de taille (size, size) modifiée sur place.
+		:param x: Position X de la molécule en pixels.
+		:param y: Position Y de la molécule en pixels.
+		:param z: Position Z de la molécule (entre -1 et 1).
+		:param intensity: Intensité de la molécule.
+		:param sigma_base: Écart-type de base de la PSF en pixels (voir `get_sigma_base`).
+		"""
+		# Calculer le ratio linéairement en fonction de z, mais borné aux limites logiques en cas de valeurs aberrantes
+		ratio = np.clip(1 + z * (self._astigmatism_ratio - 1), self._astigmatism[0], self._astigmatism[1])
+		sigma_x = sigma_base * ratio
+		sigma_y = sigma_base / ratio
+
+		# Gaussienne 2D autour de (x, y) avec l'astigmatisme selon le ratio (densité normalisée, sans scipy)
+		# Séparable : profil en Y (colonne) multiplié par le profil en X (ligne), sans grille 2D de coordonnées
+		profile_x = np.exp(-0.5 * ((self._axis - x) / sigma_x) ** 2).astype(np.float32)
+		profile_y = np.exp(-0.5 * ((self._axis - y) / sigma_y) ** 2).astype(np.float32)
+		profile_y *= intensity / (2 * np.pi * sigma_x * sigma_y)  # Appliquer l'intensité de la molécule sur le plus petit tableau
+		image += profile_y[:, np.newaxis] * profile_x			   # Ajouter la PSF à l'image
 
-		return np.clip(image, 0, MAX_INTENSITY)  # Clipper les valeurs pour éviter les débordements
+	##################################################
+	def get_grid_template(self, shift: int = 10) -> Tuple[NDArray[np.float32], NDArray[np.int32], NDArray[np.float32]]:
+		"""
+		Retourne le modèle sans bruit d'une grille : les PSF d'intensité unitaire de chaque molécule de la grille,
+		calculées sur une fenêtre de ±`GRID_WINDOW_SIGMAS` sigma autour de leur pixel.
+		Le modèle est conservé tant que la taille, l'espacement et les paramètres de la PSF ne changent pas.
+
+		:param shift: Espace en pixel entre 2 molécules (par défaut 10).
+		:return: Positions des molécules de forme (N, 3), indices des pixels (image aplatie) et poids des PSF unitaires de forme (N, fenêtre²).
+		"""
+		self._ensure("psf", "axis")
+		key = (self._size, shift, self._sigma_base, self._astigmatism_ratio)
+		if self._grid_template is None or self._grid_template[0] != key:
+			localisation = self.generate_grid_localisation(shift)
+			x, y, z = (localisation[:, i, np.newaxis] for i in range(3))
+			ratio = np.clip(1 + z * (self._astigmatism_ratio - 1), self._astigmatism[0], self._astigmatism[1])
+			sigma_x, sigma_y = self._sigma_base * ratio, self._sigma_base / ratio
+			radius = int(np.ceil(GRID_WINDOW_SIGMAS * self._sigma_base * self._astigmatism[1]))
+			offsets = np.arange(-radius, radius + 1)
+			dy, dx = (grid.ravel() for grid in np.meshgrid(offsets, offsets, indexing="ij"))  # Fenêtre aplatie (Y, X)
+			rows, cols = np.rint(y).astype(int) + dy, np.rint(x).astype(int) + dx
+			weights = np.exp(-0.5 * (((cols - x) / sigma_x) ** 2 + ((rows - y) / sigma_y) ** 2)) / (2 * np.pi * sigma_x * sigma_y)
+			valid = (rows >= 0) & (rows < self._size) & (cols >= 0) & (cols < self._size)
+			indices = np.where(valid, rows * self._size + cols, 0).astype(np.int32)  # Pixels hors de l'image : poids nul sur le pixel 0
+			self._grid_template = (key, localisation, indices, np.where(valid, weights, 0).astype(np.float32))
+		return self._grid_template[1:]
 
 	##################################################
-	def generate_grid(self, shift: int = 10) -> NDArray[np.float32]:
+	def generate_grid(self, shift: int = 10, as_uint16: bool = False) -> NDArray[np.float32] | NDArray[np.uint16]:
 		"""
 		Calcule une répartition des molécules sur une grille.
 		Positionne les molécules sur une image 2D et calcule leur psf.
 		Simule un bruit optique afin d'avoir une image avec un SNR prédéfini.
 
+		Les molécules étant toujours aux mêmes positions, leurs PSF unitaires sont conservées (voir `get_grid_template`) :
+		chaque image n'est que la somme pondérée de ces PSF par les nouvelles intensités (un seul `np.bincount`), suivie du bruit.
+
 		:param shift: Espace en pixel entre 2 molécules (par défaut 10). On peut considérer que chaque molécule est au centre d'un carré de taille shift.
+		:param as_uint16: Si `True`, l'image est convertie en entiers 16 bits dès l'application du bruit (par défaut False).
 		:return: Image 2D de taille (size, size) avec les molécules affichées.
 		"""
-		self.last_localisations = self.generate_grid_localisation(shift)
+		if self._astigmatism_ratio <= 0:  # Image noire avec avertissement (voir `render_psf`)
+			self.last_localisations = self.generate_grid_localisation(shift)
+			self.last_intensities = self._fluorophore.get_intensities(self.last_localisations.shape[0], True)
+			self.n_molecules.append(self.last_localisations.shape[0])
+			return self.noiser.apply(self.generate_psf(self.last_localisations, self.last_intensities), as_uint16)
+
+		self.last_localisations, indices, weights = self.get_grid_template(shift)
+		self.last_intensities = self._fluorophore.get_intensities(self.last_localisations.shape[0], True)
+		self.n_molecules.append(self.last_localisations.shape[0])
+		with span("sampler.psf"):
+			image = np.bincount(indices.ravel(), (weights * self.last_intensities[:, np.newaxis]).ravel(), minlength=self._size * self._size)
+			image = np.clip(image.reshape(self._size, self._size), 0, MAX_INTENSITY).astype(np.float32)
+		count("molecules", self.last_localisations.shape[0])
+		count("pixels", indices.size)
+		return self.noiser.apply(image, as_uint16)
+
+	##################################################
+	def generate_clean_sample(self) -> NDArray[np.float32]:
+		"""
+		Calcule une répartition des molécules sur une image carrée en fonction des paramètres du sampler et applique le masque.
+		Positionne les molécules sur une image 2D et calcule leur psf, sans appliquer de bruit.
+
+		:return: Image 2D de taille (size, size) avec les molécules affichées, sans bruit.
+		"""
+		self.last_localisations = self.generate_localisation()
+		self.last_intensities = self._fluorophore.get_intensities(self.last_localisations.shape[0], True)
 		self.n_molecules.append(self.last_localisations.shape[0])
-		return self.noiser.apply(self.generate_psf(self.last_localisations))
+		if self.on_phase is not None: self.on_phase("localisation")
+		return self.generate_psf(self.last_localisations, self.last_intensities)
 
 	##################################################
-	def generate_sample(self) -> NDArray[np.float32]:
+	def generate_sample(self, as_uint16: bool = False) -> NDArray[np.float32] | NDArray[np.uint16]:
 		"""
 		Calcule une répartition des molécules sur une image carrée en fonction des paramètres du sampler et applique le masque.
 		Positionne les molécules sur une image 2D et calcule leur psf.
 		Simule un bruit optique afin d'avoir une image avec un SNR prédéfini.
 
+		:param as_uint16: Si `True`, l'image est convertie en entiers 16 bits dès l'application du bruit (par défaut False).
 		:return: Image 2D de taille (size, size) avec les molécules affichées.
 		"""
-		self.last_localisations = self.generate_localisation()
-		self.n_molecules.append(self.last_localisations.shape[0])
-		return self.noiser.apply(self.generate_psf(self.last_localisations))
+		with span("sampler.generate_sample"): return self.noiser.apply(self.generate_clean_sample(), as_uint16)
 
 	# ==================================================
 	# endregion Generate Image
@@ -280,7 +461,7 @@ class Sampler:
 		"""
 		return (
 				f"size: {self._size}, Pixel Size: {self._pixel_size} nm, Molecule Density : {self._density}\n"
-				f"Area: {self._area}, Maximum molecule number: {self._max_molecules}\n"
+				f"Area: {self.area}, Maximum molecule number: {self.max_molecules}\n"
 				f"Mask: {self.mask}\n"
 				f"Fluorophore: {self._fluorophore}\n"
 				f"Noise: {self.noiser}\n"
@@ -14,11 +14,15 @@ Il fournit :
 
 1. **Stack Model Type**
 
-   - `StackModelType` : Énumération pour les types de modèles (actuellement un modèle aléatoire).
+   - `StackModelType` : Énumération pour les types de modèles (aléatoire, clignotement, photophysique, diffusion ou dérive).
 
 2. **Stack Model Options**
 
    - `NoneOptions` : Classe d'options utilisée lorsque le modèle ne nécessite aucune configuration particulière.
+   - `BlinkingOptions` : Classe d'options du modèle de clignotement (temps d'exposition, proportion de molécules allumées).
+   - `PhotophysicsOptions` : Classe d'options du modèle photophysique (temps d'exposition, durées des états éteint et photoblanchi).
+   - `DiffusionOptions` : Classe d'options du modèle de diffusion (coefficient de diffusion, confinement, sous-expositions).
+   - `DriftOptions` : Classe d'options du modèle de dérive (trajectoire linéaire, marche aléatoire ou fichier).
 
 3. **Stack Model**
 
@@ -33,12 +37,20 @@ Classes :
 
 - **`StackModelType`** : Enumération des modèles disponibles.
 - **`NoneOptions`** : Classe d'options vide pour le modèle par défaut.
+- **`BlinkingOptions`** : Classe d'options pour le modèle de clignotement.
+- **`PhotophysicsOptions`** : Classe d'options pour le modèle photophysique.
+- **`DiffusionOptions`** : Classe d'options pour le modèle de diffusion.
+- **`DriftOptions`** : Classe d'options pour le modèle de dérive.
 - **`StackModel`** : Classe principale pour gérer les modèles et options de piles.
 """
 
+import os
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+from numpy.typing import NDArray
 
 
 # ==================================================
@@ -50,9 +62,17 @@ class StackModelType(Enum):
 	Énumération représentant les différents modèles de piles disponibles.
 	Chaque modèle est associé à un identifiant unique pour être utilisé dans la fonction `generate`.
 
-	- NONE : Aucun modèle particulier (les échantillons sont indépendants les uns des autres).
+	- RANDOM : Aucun modèle particulier (les échantillons sont indépendants les uns des autres).
+	- BLINKING : Population de molécules persistante dont chaque molécule s'allume et s'éteint au fil des frames.
+	- PHOTOPHYSICS : Population persistante dont les états (allumé, éteint, photoblanchi) suivent un processus de Markov en temps continu.
+	- DIFFUSION : Population persistante de particules qui se déplacent par marche aléatoire entre les frames (suivi de particules).
+	- DRIFT : Population de molécules fixe dont l'échantillon dérive au fil des frames.
 	"""
 	RANDOM = 0
+	BLINKING = 1
+	PHOTOPHYSICS = 2
+	DIFFUSION = 3
+	DRIFT = 4
 
 	###################################################
 	def tostring(self) -> str:
@@ -62,7 +82,11 @@ class StackModelType(Enum):
 		:return: Le nom du motif en français.
 		"""
 		return {
-				StackModelType.RANDOM: "Aléatoire",
+				StackModelType.RANDOM:       "Aléatoire",
+				StackModelType.BLINKING:     "Clignotement",
+				StackModelType.PHOTOPHYSICS: "Photophysique",
+				StackModelType.DIFFUSION:    "Diffusion",
+				StackModelType.DRIFT:        "Dérive",
 				}[self]
 
 
@@ -93,6 +117,164 @@ class NoneOptions:
 	def __str__(self) -> str: return self.tostring()
 
 
+##################################################
+@dataclass
+class BlinkingOptions:
+	"""
+	Options pour le modèle de clignotement.
+
+	La population de molécules est tirée une seule fois pour toute la pile. Chaque molécule reste allumée en moyenne
+	pendant la durée de scintillement du fluorophore (`Fluorophore.flickering`) et reste éteinte assez longtemps
+	pour que la proportion de molécules allumées à l'équilibre soit `on_ratio`.
+
+	Attributs :
+		- **exposure (float)** : Temps d'exposition d'une frame en millisecondes (par défaut 10).
+		- **on_ratio (float)** : Proportion de molécules allumées à l'équilibre, entre 0 et 1 (par défaut 0.5).
+	"""
+	exposure: float = 10
+	on_ratio: float = 0.5
+
+	##################################################
+	def tostring(self) -> str:
+		"""
+		Retourne une chaîne de caractères correspondant aux options.
+
+		:return: La liste des options.
+		"""
+		return f"Exposure: {self.exposure} ms, On Ratio: {self.on_ratio}"
+
+	##################################################
+	def __str__(self) -> str: return self.tostring()
+
+
+##################################################
+@dataclass
+class PhotophysicsOptions:
+	"""
+	Options pour le modèle photophysique.
+
+	La durée moyenne de l'état allumé est la vitesse de scintillement du fluorophore (`Fluorophore.flickering`).
+	L'intensité de chaque molécule sur une frame est proportionnelle au temps passé allumée pendant l'exposition.
+
+	Attributs :
+		- **exposure (float)** : Temps d'exposition d'une frame en millisecondes (par défaut 10).
+		- **off_time (float)** : Durée moyenne de l'état éteint en millisecondes (par défaut 500).
+		- **bleach_time (float)** : Durée moyenne passée allumée avant le photoblanchiment en millisecondes (0 pour le désactiver, par défaut 0).
+	"""
+	exposure: float = 10
+	off_time: float = 500
+	bleach_time: float = 0
+
+	##################################################
+	def tostring(self) -> str:
+		"""
+		Retourne une chaîne de caractères correspondant aux options.
+
+		:return: La liste des options.
+		"""
+		return f"Exposure: {self.exposure} ms, Off Time: {self.off_time} ms, Bleach Time: {self.bleach_time} ms"
+
+	##################################################
+	def __str__(self) -> str: return self.tostring()
+
+
+##################################################
+@dataclass
+class DiffusionOptions:
+	"""
+	Options pour le modèle de diffusion.
+
+	Attributs :
+		- **exposure (float)** : Temps d'exposition d'une frame en millisecondes (par défaut 10).
+		- **coefficient (float)** : Coefficient de diffusion en µm²/s (par défaut 0.1).
+		- **confinement (float)** : Écart-type du confinement autour de la position initiale en nanomètres (0 pour une diffusion libre, par défaut 0).
+		- **sub_steps (int)** : Nombre de sous-expositions par frame, moyennées pour la position de la frame (par défaut 1).
+	"""
+	exposure: float = 10
+	coefficient: float = 0.1
+	confinement: float = 0
+	sub_steps: int = 1
+
+	##################################################
+	def tostring(self) -> str:
+		"""
+		Retourne une chaîne de caractères correspondant aux options.
+
+		:return: La liste des options.
+		"""
+		return f"Exposure: {self.exposure} ms, D: {self.coefficient} µm²/s, Confinement: {self.confinement} nm, Sub Steps: {self.sub_steps}"
+
+	##################################################
+	def __str__(self) -> str: return self.tostring()
+
+
+##################################################
+@dataclass
+class DriftOptions:
+	"""
+	Options pour le modèle de dérive.
+
+	La dérive est un décalage (x, y, z) de l'échantillon pour chaque frame, nul sur la première frame :
+
+	- **linear** : Vitesse constante `velocity` (x et y en nanomètres par frame, z en unité normalisée par frame).
+	- **random_walk** : Marche aléatoire d'écart-type `sigma` par frame (mêmes unités que `velocity`), biaisée par `velocity`.
+	- **file** : Trajectoire chargée depuis un fichier CSV (une ligne d'entête puis une ligne par frame : x [nm], y [nm] et éventuellement z).
+	  Si le fichier contient moins de lignes que de frames, la dernière position est conservée.
+
+	Attributs :
+		- **mode (str)** : Type de trajectoire ("linear", "random_walk" ou "file", par défaut "linear").
+		- **velocity (List[float])** : Vitesse de dérive (x, y, z) par frame (par défaut [2, 1, 0]).
+		- **sigma (List[float])** : Écart-type de la marche aléatoire (x, y, z) par frame (par défaut [2, 2, 0]).
+		- **filename (str)** : Fichier de la trajectoire pour le mode "file" (par défaut "").
+	"""
+	mode: str = "linear"
+	velocity: List[float] = field(default_factory=lambda: [2, 1, 0])
+	sigma: List[float] = field(default_factory=lambda: [2, 2, 0])
+	filename: str = ""
+
+	##################################################
+	def get_trajectory(self, n_frames: int, pixel_size: float) -> NDArray[np.float32]:
+		"""
+		Calcule la trajectoire de la dérive en pixel.
+
+		:param n_frames: Nombre de frames.
+		:param pixel_size: Taille d'un pixel en nanomètres.
+		:return: Tableau de forme (n_frames, 3), où chaque ligne est le décalage (x, y, z) de la frame.
+		:raises ValueError: Si le mode n'est pas reconnu.
+		:raises OSError: Si le fichier de trajectoire est introuvable.
+		"""
+		scale = np.array([1 / pixel_size, 1 / pixel_size, 1], dtype=np.float64)
+		if self.mode == "linear":
+			trajectory = np.arange(n_frames)[:, np.newaxis] * np.asarray(self.velocity, dtype=np.float64)
+		elif self.mode == "random_walk":
+			steps = np.random.normal(self.velocity, self.sigma, (n_frames, 3))
+			steps[0] = 0
+			trajectory = np.cumsum(steps, axis=0)
+		elif self.mode == "file":
+			if not os.path.isfile(self.filename): raise OSError(f"Le fichier \"{self.filename}\" est introuvable.")
+			rows = np.loadtxt(self.filename, delimiter=",", skiprows=1, ndmin=2)
+			trajectory = np.zeros((n_frames, 3), dtype=np.float64)
+			n = min(n_frames, rows.shape[0])
+			trajectory[:n, :min(3, rows.shape[1])] = rows[:n, :3]
+			trajectory[n:] = trajectory[n - 1] if n > 0 else 0
+			trajectory -= trajectory[0]
+		else: raise ValueError(f"Le mode de dérive \"{self.mode}\" n'est pas reconnu.")
+		return (trajectory * scale).astype(np.float32)
+
+	##################################################
+	def tostring(self) -> str:
+		"""
+		Retourne une chaîne de caractères correspondant aux options.
+
+		:return: La liste des options.
+		"""
+		if self.mode == "file": return f"Mode: {self.mode}, File: {self.filename}"
+		return f"Mode: {self.mode}, Velocity: {self.velocity}, Sigma: {self.sigma}"
+
+	##################################################
+	def __str__(self) -> str: return self.tostring()
+
+
 # ==================================================
 # endregion Stack Model Options
 # ==================================================
@@ -110,7 +292,7 @@ class StackModel:
 		- **options (Dict)** : Dictionnaire contenant des options spécifiques au modèle.
 	"""
 	model: StackModelType = StackModelType.RANDOM
-	options: Union[NoneOptions] = field(default_factory=NoneOptions)
+	options: Union[NoneOptions, BlinkingOptions, PhotophysicsOptions, DiffusionOptions, DriftOptions] = field(default_factory=NoneOptions)
 
 	##################################################
 	@classmethod
@@ -122,7 +304,11 @@ class StackModel:
 		:param options: Dictionnaire des options à appliquer (facultatif).
 		:return: Instance de MaskOptions configurée pour le motif donné.
 		"""
-		return cls(model, NoneOptions())  # StackModelType.NONE ou autre
+		if model == StackModelType.BLINKING: return cls(model, BlinkingOptions(**(options or {})))
+		if model == StackModelType.PHOTOPHYSICS: return cls(model, PhotophysicsOptions(**(options or {})))
+		if model == StackModelType.DIFFUSION: return cls(model, DiffusionOptions(**(options or {})))
+		if model == StackModelType.DRIFT: return cls(model, DriftOptions(**(options or {})))
+		return cls(model, NoneOptions())  # StackModelType.RANDOM ou autre
 
 	##################################################
 	def tostring(self) -> str:
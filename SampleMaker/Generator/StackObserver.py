@@ -0,0 +1,133 @@
+"""
+Fichier contenant l'interface `StackObserver` qui permet de suivre la génération d'une pile par le `Stacker`.
+
+Un observateur est ajouté à la liste `Stacker.observers` et reçoit les événements de la génération :
+
+- `on_start` : début de la génération (nombre de frames demandées).
+- `on_frame` : fin de chaque frame (indice, nombre de molécules, temps écoulé).
+- `on_phase` : fin de chaque phase d'une frame, uniquement pour les observateurs dont l'attribut `phases` est `True`.
+  Les phases sont, dans l'ordre : `localisation` (positions et états des molécules), `psf` (rendu de l'image sans bruit),
+  `noise` (application du bruit) et `write` (vérité terrain, statistiques et copie dans la pile).
+- `on_end` : fin de la génération, y compris lorsqu'elle est annulée.
+
+Sans observateur, le générateur ne mesure aucun temps et ne crée aucun événement : le suivi ne coûte qu'un test par phase.
+Les méthodes de la classe de base ne font rien, un observateur ne surcharge que celles qui l'intéressent.
+
+`MonitoringObserver` transmet les phases et le débit de la génération à un `Tools.Monitoring`.
+"""
+
+from dataclasses import dataclass
+
+PHASES = ("localisation", "psf", "noise", "write")
+
+
+##################################################
+@dataclass
+class StackEvent:
+	"""
+	Classe décrivant un événement de la génération d'une pile.
+
+	Attributs :
+		- **frame (int)** : Indice de la frame dans la pile.
+		- **total (int)** : Nombre de frames demandées.
+		- **phase (str)** : Phase terminée (`localisation`, `psf`, `noise`, `write`) ou `frame` pour la fin de la frame.
+		- **n_molecules (int)** : Nombre de molécules de la frame.
+		- **elapsed (float)** : Temps écoulé depuis le début de la génération en secondes.
+		- **duration (float)** : Durée de la phase (ou de la frame) en secondes.
+	"""
+	frame: int = 0
+	total: int = 0
+	phase: str = "frame"
+	n_molecules: int = 0
+	elapsed: float = 0.0
+	duration: float = 0.0
+
+	##################################################
+	def tostring(self) -> str:
+		"""
+		Retourne une chaîne de caractères correspondant à l'événement.
+
+		:return: Une description textuelle de l'événement.
+		"""
+		return (f"Frame: {self.frame + 1}/{self.total}, Phase: {self.phase}, Molecules: {self.n_molecules}, "
+				f"Elapsed: {self.elapsed:.3f} s, Duration: {self.duration * 1000:.3f} ms")
+
+	##################################################
+	def __str__(self) -> str: return self.tostring()
+
+
+##################################################
+class StackObserver:
+	"""
+	Classe de base des observateurs de la génération d'une pile (toutes les méthodes sont vides).
+
+	Attributs :
+		- **phases (bool)** : Si `True`, l'observateur reçoit aussi les événements de chaque phase (par défaut False, mesure désactivée).
+	"""
+	phases: bool = False
+
+	##################################################
+	def on_start(self, total: int):
+		"""
+		Début de la génération.
+
+		:param total: Nombre de frames demandées.
+		"""
+
+	##################################################
+	def on_phase(self, event: StackEvent):
+		"""
+		Fin d'une phase d'une frame (uniquement si `phases` est `True`).
+
+		:param event: Événement de la phase.
+		"""
+
+	##################################################
+	def on_frame(self, event: StackEvent):
+		"""
+		Fin d'une frame.
+
+		:param event: Événement de la frame.
+		"""
+
+	##################################################
+	def on_end(self, n_generated: int, total: int, elapsed: float):
+		"""
+		Fin de la génération (terminée ou annulée).
+
+		:param n_generated: Nombre de frames générées.
+		:param total: Nombre de frames demandées.
+		:param elapsed: Durée de la génération en secondes.
+		"""
+
+
+##################################################
+class MonitoringObserver(StackObserver):
+	"""
+	Observateur transmettant la génération à un `Tools.Monitoring` : une phase "Generation" au début, une phase "Saving" à la fin
+	(l'enregistrement suit la génération) et le débit de chaque frame (frames et molécules par seconde).
+	"""
+
+	##################################################
+	def __init__(self, monitoring):
+		"""
+		Initialise l'observateur.
+
+		:param monitoring: Monitoring démarré (le module n'est pas importé ici : il dépend de plotly et psutil).
+		"""
+		self.monitoring = monitoring
+
+	##################################################
+	def on_start(self, total: int):
+		""" Marque le début de la phase de génération. """
+		self.monitoring.add_phase("Generation", f"{total} frames")
+
+	##################################################
+	def on_frame(self, event: StackEvent):
+		""" Ajoute la frame et ses molécules au débit. """
+		self.monitoring.add_throughput(1, event.n_molecules)
+
+	##################################################
+	def on_end(self, n_generated: int, total: int, elapsed: float):
+		""" Marque le début de la phase d'enregistrement. """
+		self.monitoring.add_phase("Saving", f"{n_generated}/{total} frames")
@@ -0,0 +1,208 @@
+"""
+Fichier contenant la classe `StackStatistics` qui calcule des statistiques d'une pile au fil de sa génération.
+
+Valider une pile générée demandait de recharger le fichier TIF et de le parcourir à nouveau pour calculer les projections et le SNR.
+Cette classe met à jour des statistiques à chaque frame générée, sans conserver les frames et sans seconde passe sur les données :
+
+- Moyenne et variance par pixel (algorithme de Welford, numériquement stable).
+- Projections minimum et maximum.
+- Histogramme de chaque frame (intervalles fixes sur la plage des entiers 16 bits).
+- SNR atteint sur chaque frame, à comparer au SNR visé par le `Noiser`.
+
+Le SNR atteint est défini comme la moyenne des pixels non nuls de la frame bruitée divisée par l'écart-type du bruit ajouté
+(différence entre la frame bruitée et l'image sans bruit). Le bruit de fond étant compris dans ce bruit, le SNR atteint est
+inférieur au SNR visé lorsque le bruit de fond est important.
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+MAX_INTENSITY = np.iinfo(np.uint16).max  # Pour des entiers sur 16 bits (soit 65535).
+
+
+##################################################
+@dataclass
+class StackStatistics:
+	"""
+	Classe permettant de calculer des statistiques d'une pile frame par frame.
+
+	Attributs :
+		- **target_snr (float)** : SNR visé lors de la génération (par défaut 0, non renseigné).
+		- **n_bins (int)** : Nombre d'intervalles des histogrammes sur la plage [0, 65536[ (par défaut 256).
+		- **n_frames (int)** : Nombre de frames prises en compte.
+	"""
+	target_snr: float = 0
+	n_bins: int = 256
+	n_frames: int = field(init=False, default=0)
+	_mean: Optional[NDArray[np.float64]] = field(init=False, repr=False, default=None)
+	_m2: Optional[NDArray[np.float64]] = field(init=False, repr=False, default=None)
+	_min: Optional[NDArray[np.float32]] = field(init=False, repr=False, default=None)
+	_max: Optional[NDArray[np.float32]] = field(init=False, repr=False, default=None)
+	_histograms: List[NDArray[np.int64]] = field(init=False, repr=False, default_factory=list)
+	_snr: List[float] = field(init=False, repr=False, default_factory=list)
+
+	# ==================================================
+	# region Update
+	# ==================================================
+	##################################################
+	def update(self, frame: NDArray[np.float32], clean: Optional[NDArray[np.float32]] = None):
+		"""
+		Met à jour les statistiques avec une nouvelle frame.
+
+		:param frame: Frame générée (bruitée).
+		:param clean: Image sans bruit de la frame, nécessaire au calcul du SNR atteint (par défaut None, SNR non calculé).
+		"""
+		values = frame.astype(np.float64)
+		self.n_frames += 1
+		if self._mean is None:
+			self._mean = np.zeros_like(values)
+			self._m2 = np.zeros_like(values)
+			self._min = frame.astype(np.float32)
+			self._max = frame.astype(np.float32)
+		else:
+			np.minimum(self._min, frame, out=self._min)
+			np.maximum(self._max, frame, out=self._max)
+
+		# Algorithme de Welford
+		delta = values - self._mean
+		self._mean += delta / self.n_frames
+		values -= self._mean  # Réutilisation du tableau pour (x - nouvelle moyenne)
+		self._m2 += delta * values
+
+		self._histograms.append(np.histogram(frame, bins=self.n_bins, range=(0, MAX_INTENSITY + 1))[0])
+		self._snr.append(self.compute_snr(frame, clean) if clean is not None else np.nan)
+
+	##################################################
+	@staticmethod
+	def compute_snr(frame: NDArray[np.float32], clean: NDArray[np.float32]) -> float:
+		"""
+		Calcule le SNR atteint d'une frame : moyenne des pixels non nuls divisée par l'écart-type du bruit ajouté.
+
+		:param frame: Frame générée (bruitée).
+		:param clean: Image sans bruit de la frame.
+		:return: Le SNR atteint (NaN si le bruit est nul).
+		"""
+		signal = frame[frame > 0]
+		noise_std = np.std(frame.astype(np.float32) - clean)
+		if signal.size == 0 or noise_std <= np.finfo(np.float32).eps: return np.nan
+		return float(np.mean(signal) / noise_std)
+
+	# ==================================================
+	# endregion Update
+	# ==================================================
+
+	# ==================================================
+	# region Getter
+	# ==================================================
+	##################################################
+	@property
+	def mean(self) -> NDArray[np.float32]:
+		"""
+		Retourne la moyenne de chaque pixel (projection moyenne).
+
+		:return: Image 2D de la moyenne.
+		"""
+		return self._mean.astype(np.float32)
+
+	##################################################
+	@property
+	def variance(self) -> NDArray[np.float32]:
+		"""
+		Retourne la variance (non biaisée) de chaque pixel.
+
+		:return: Image 2D de la variance (nulle si moins de deux frames).
+		"""
+		if self.n_frames < 2: return np.zeros_like(self._mean, dtype=np.float32)
+		return (self._m2 / (self.n_frames - 1)).astype(np.float32)
+
+	##################################################
+	@property
+	def min(self) -> NDArray[np.float32]:
+		"""
+		Retourne la projection minimum.
+
+		:return: Image 2D du minimum de chaque pixel.
+		"""
+		return self._min
+
+	##################################################
+	@property
+	def max(self) -> NDArray[np.float32]:
+		"""
+		Retourne la projection maximum.
+
+		:return: Image 2D du maximum de chaque pixel.
+		"""
+		return self._max
+
+	##################################################
+	@property
+	def histograms(self) -> NDArray[np.int64]:
+		"""
+		Retourne les histogrammes de chaque frame.
+
+		:return: Tableau de forme (n_frames, n_bins).
+		"""
+		if not self._histograms: return np.empty((0, self.n_bins), dtype=np.int64)
+		return np.stack(self._histograms)
+
+	##################################################
+	@property
+	def bin_edges(self) -> NDArray[np.float64]:
+		"""
+		Retourne les bornes des intervalles des histogrammes.
+
+		:return: Tableau de n_bins + 1 bornes.
+		"""
+		return np.linspace(0, MAX_INTENSITY + 1, self.n_bins + 1)
+
+	##################################################
+	@property
+	def snr(self) -> NDArray[np.float32]:
+		"""
+		Retourne le SNR atteint de chaque frame.
+
+		:return: Tableau de n_frames valeurs (NaN pour les frames sans image de référence).
+		"""
+		return np.array(self._snr, dtype=np.float32)
+
+	# ==================================================
+	# endregion Getter
+	# ==================================================
+
+	# ==================================================
+	# region IO
+	# ==================================================
+	##################################################
+	def save(self, filename: str):
+		"""
+		Enregistre les statistiques dans une archive numpy (.npz) contenant les tableaux :
+		`mean`, `variance`, `min`, `max`, `histograms`, `bin_edges`, `snr` et `target_snr`.
+
+		:param filename: Nom du fichier de sortie.
+		:raises ValueError: Si aucune frame n'a été prise en compte.
+		"""
+		if self.n_frames == 0: raise ValueError("Aucune frame n'a été prise en compte.")
+		np.savez_compressed(filename, mean=self.mean, variance=self.variance, min=self.min, max=self.max, histograms=self.histograms,
+							bin_edges=self.bin_edges, snr=self.snr, target_snr=np.float32(self.target_snr))
+
+	##################################################
+	def tostring(self) -> str:
+		"""
+		Retourne une chaîne de caractères correspondant au résumé des statistiques.
+
+		:return: Une description textuelle des statistiques.
+		"""
+		if self.n_frames == 0: return "Aucune frame n'a été prise en compte."
+		return (f"Frames: {self.n_frames}, Mean: {np.mean(self._mean):.2f}, Max: {np.max(self._max):.2f}, "
+				f"SNR: {np.nanmean(self.snr) if not np.isnan(self.snr).all() else np.nan:.2f} (target {self.target_snr})")
+
+	##################################################
+	def __str__(self) -> str: return self.tostring()
+
+# ==================================================
+# endregion IO
+# ==================================================
@@ -10,16 +10,39 @@ avec différents modèles pour varier la composition de la pile.
 **Fonctionnalités** :
 
 - Génération de piles d'échantillons simulés.
+- Modèle de clignotement : population de molécules persistante dont les frames sont rendues de manière incrémentale.
+- Modèle photophysique : états allumé, éteint et photoblanchi simulés pour toute la population (processus de Markov en temps continu).
+- Modèle de diffusion : particules en marche aléatoire dont les trajectoires sont enregistrées dans la vérité terrain (positions courantes seulement).
+- Modèle de dérive : décalage de l'échantillon appliqué aux coordonnées lors du rendu (positions avec et sans dérive enregistrées).
+- Enregistrement de la vérité terrain (localisations de toutes les frames) pendant la génération.
+- Calcul optionnel de statistiques de la pile (projections, histogrammes, SNR atteint) pendant la génération.
+- Suivi de la génération par des observateurs (`StackObserver`) frame par frame et phase par phase.
+- Annulation entre deux frames (la partie déjà générée est conservée).
+- Pile en mémoire, projetée depuis un fichier (memmap) ou écrite en flux dans un dossier de blocs (voir `Generator.Planner` pour le choix).
 - Supporte l'extension avec différents types de modèles pour la pile.
 - Méthodes de conversion en chaîne de caractères pour afficher les détails du générateur.
 
 """
 
+import time
 from dataclasses import dataclass, field
+from typing import Iterator, List, Optional
 
-from SampleMaker import Stack
+import numpy as np
+from numpy.typing import NDArray
+
+from SampleMaker import PatternType, Stack
+from SampleMaker.Generator.Diffusion import Diffusion
+from SampleMaker.Generator.LocalisationTable import LocalisationTable
+from SampleMaker.Generator.MultiChannelSampler import MultiChannelSampler
+from SampleMaker.Generator.Photophysics import Photophysics
 from SampleMaker.Generator.Sampler import Sampler
-from SampleMaker.Generator.StackModel import StackModel
+from SampleMaker.Generator.StackModel import StackModel, StackModelType
+from SampleMaker.Generator.StackObserver import StackEvent, StackObserver
+from SampleMaker.Generator.StackStatistics import StackStatistics
+from SampleMaker.Tools.Profiler import count, span
+
+MAX_INTENSITY = np.iinfo(np.uint16).max  # Pour des entiers sur 16 bits (soit 65535).
 
 
 ##################################################
@@ -31,32 +54,301 @@ class Stacker:
 	Attributs :
 		- **sampler (Sampler)** : Générateur de sample pré-configuré.
 		- **stack_model (StackModel)** : Modèle à utiliser pour générer la pile.
+		- **as_uint16 (bool)** : Si `True`, les frames sont converties en entiers 16 bits dès l'application du bruit
+		  et la pile est stockée en entiers 16 bits (deux fois moins de mémoire qu'en flottants, par défaut False).
+		- **compute_statistics (bool)** : Si `True`, les statistiques de la pile sont calculées pendant la génération (par défaut False).
+		- **localisations (LocalisationTable)** : Vérité terrain de la dernière pile générée (toutes les molécules de toutes les frames).
+		- **statistics (StackStatistics)** : Statistiques de la dernière pile générée (None si elles ne sont pas calculées).
+		- **drift (NDArray[np.float32])** : Trajectoire de la dérive en pixel de forme (frames générées, 3) (None pour les autres modèles).
+		- **observers (List[StackObserver])** : Observateurs de la génération (voir `StackObserver`, par défaut aucun).
+		- **n_generated (int)** : Nombre de frames générées de la dernière pile (inférieur à la taille demandée si elle a été annulée).
+		- **memmap_file (str)** : Fichier `.npy` dans lequel la pile est projetée en mémoire (vide pour la garder en mémoire, par défaut "").
+		- **stream_directory (str)** : Dossier de blocs dans lequel la pile est écrite en flux (prioritaire sur `memmap_file`, vide par défaut).
+		- **chunk_frames (int)** : Nombre de frames par bloc de la pile écrite en flux (par défaut 64).
 	"""
 	sampler: Sampler = field(default_factory=Sampler)
 	stack_model: StackModel = field(default_factory=StackModel)
+	as_uint16: bool = False
+	compute_statistics: bool = False
+	localisations: LocalisationTable = field(init=False, default_factory=LocalisationTable)
+	statistics: Optional[StackStatistics] = field(init=False, default=None)
+	drift: Optional[NDArray[np.float32]] = field(init=False, default=None)
+	observers: List[StackObserver] = field(default_factory=list, repr=False)
+	n_generated: int = field(init=False, default=0)
+	memmap_file: str = ""
+	stream_directory: str = ""
+	chunk_frames: int = 64
+	_cancelled: bool = field(init=False, repr=False, default=False)
+	_phase_observers: List[StackObserver] = field(init=False, repr=False, default_factory=list)
+	_frame_index: int = field(init=False, repr=False, default=0)
+	_start: float = field(init=False, repr=False, default=0.0)
+	_last_time: float = field(init=False, repr=False, default=0.0)
 
 	# ==================================================
 	# region Generate Stack
 	# ==================================================
 	##################################################
-	def generate(self, size: int = 100) -> Stack:
+	def generate(self, size: int = 100, localisation_file: str = "") -> Stack:
 		"""
 		Génère une pile.
 
+		La vérité terrain est enregistrée dans `localisations` au fil de la génération.
+		Si un fichier est spécifié, elle y est écrite en flux (format CSV ThunderSTORM) sans être conservée en mémoire.
+		Si la génération est annulée (`cancel`), elle s'arrête après la frame en cours et la pile retournée
+		ne contient que les frames déjà générées (leur vérité terrain est enregistrée).
+
 		:param size: Nombre d'éléments dans la pile.
+		:param localisation_file: Fichier CSV de sortie de la vérité terrain (vide pour la conserver en mémoire, par défaut "").
 		:return: Pile 3D définie par le sampler et le modèle du générateur.
+		:raises ValueError: Si le sampler est multi-couleurs (une pile par canal est générée par `MultiChannelSampler.generate_stacks`).
+		"""
+		if isinstance(self.sampler, MultiChannelSampler):
+			raise ValueError("Le Stacker ne génère que des piles d'un seul canal : utiliser `MultiChannelSampler.generate_stacks`.")
+		self.n_generated = 0
+		self._phase_observers = [observer for observer in self.observers if observer.phases]
+		self.sampler.on_phase = self._phase if self._phase_observers else None
+		self._start = self._last_time = time.perf_counter()
+		for observer in self.observers: observer.on_start(size)
+		self.sampler.clear()  # Les pré-calculs sont déjà à jour (recalculés à chaque modification d'un paramètre)
+		self.localisations = LocalisationTable(self.sampler.pixel_size, localisation_file, drift=self.stack_model.model == StackModelType.DRIFT)
+		self.drift = None
+		self.statistics = StackStatistics(self.sampler.noiser.snr) if self.compute_statistics else None
+		with span("stacker.generate"):
+			if self.stack_model.model == StackModelType.BLINKING: stack = self._blinking_model(size)
+			elif self.stack_model.model == StackModelType.PHOTOPHYSICS: stack = self._photophysics_model(size)
+			elif self.stack_model.model == StackModelType.DIFFUSION: stack = self._diffusion_model(size)
+			elif self.stack_model.model == StackModelType.DRIFT: stack = self._drift_model(size)
+			# elif self.stack_model.model == StackModelType.XXXX: stack = self._XXXX_model()
+			else: stack = self._none_model(size)
+		count("frames", self.n_generated)
+		self.localisations.flush()
+		stack.close(self.n_generated)  # Génération annulée : frames réservées inutilisées retirées (et dernier bloc écrit en flux)
+		if self.drift is not None: self.drift = self.drift[:self.n_generated]  # Trajectoire de la dérive limitée aux frames générées
+		self._cancelled = False  # Demande d'annulation traitée (une demande antérieure au lancement arrête la génération après une frame)
+		self.sampler.on_phase = None
+		for observer in self.observers: observer.on_end(self.n_generated, size, time.perf_counter() - self._start)
+		return stack
+
+	##################################################
+	def cancel(self):
+		""" Demande l'arrêt de la génération après la frame en cours (peut être appelé depuis un autre thread). """
+		self._cancelled = True
+
+	##################################################
+	@property
+	def cancelled(self) -> bool:
+		""" Indique si l'arrêt de la génération a été demandé. """
+		return self._cancelled
+
+	##################################################
+	def _frames(self, size: int) -> Iterator[int]:
 		"""
-		self.sampler.reset()
-		# if self.stack_model.model == StackModelType.XXXX: return self._XXXX_model()
-		# elif self.stack_model.model == StackModelType.XXXX: return self._XXXX_model()
-		return self._none_model(size)
+		Itère sur les indices des frames à générer en tenant à jour l'avancement.
+
+		Après chaque frame (la frame est alors copiée dans la pile), `n_generated` est mis à jour, les observateurs sont prévenus
+		puis l'itération s'arrête si l'annulation a été demandée.
+
+		:param size: Nombre d'éléments dans la pile.
+		:return: Itérateur sur les indices des frames.
+		"""
+		frame_start = self._start
+		for i in range(size):
+			self._frame_index = i
+			yield i
+			self._phase("write")
+			self.n_generated = i + 1
+			if self.observers:
+				now = time.perf_counter()
+				event = StackEvent(i, size, "frame", self.sampler.last_localisations.shape[0], now - self._start, now - frame_start)
+				for observer in self.observers: observer.on_frame(event)
+				frame_start = now
+			if self._cancelled: return
+
+	##################################################
+	def _phase(self, phase: str):
+		"""
+		Signale la fin d'une phase de la frame en cours aux observateurs des phases (aucune mesure sans observateur des phases).
+
+		:param phase: Nom de la phase terminée (voir `StackObserver`).
+		"""
+		if not self._phase_observers: return
+		now = time.perf_counter()
+		event = StackEvent(self._frame_index, 0, phase, self.sampler.last_localisations.shape[0], now - self._start, now - self._last_time)
+		self._last_time = now
+		for observer in self._phase_observers: observer.on_phase(event)
+
+	##################################################
+	def _new_stack(self, size: int) -> Stack:
+		"""
+		Crée la pile réservée de la génération (en mémoire, projetée depuis `memmap_file` ou écrite en flux dans `stream_directory`).
+
+		:param size: Nombre d'éléments dans la pile.
+		:return: La pile réservée.
+		"""
+		stack, dtype = Stack(), np.uint16 if self.as_uint16 else np.float32
+		if self.stream_directory: stack.stream(self.stream_directory, size, self.sampler.size, self.sampler.size, dtype, self.chunk_frames)
+		else: stack.reserve(size, self.sampler.size, self.sampler.size, dtype, self.memmap_file)
+		return stack
 
 	##################################################
 	def _none_model(self, size: int = 100):
-		stack = Stack()
-		for i in range(size): stack.add_sample(self.sampler.generate_sample())
+		stack = self._new_stack(size)
+		for i in self._frames(size):
+			clean = self.sampler.generate_clean_sample()  # La phase de localisation est signalée par le sampler
+			self._phase("psf")
+			stack.add_sample(self._finalize_frame(i, clean), i)
+		return stack
+
+	##################################################
+	def _blinking_model(self, size: int = 100):
+		"""
+		Génère une pile à partir d'une population de molécules persistante qui clignote.
+
+		Le temps passé allumé suit une loi exponentielle de moyenne `Fluorophore.flickering`,
+		le temps passé éteint est choisi pour obtenir la proportion de molécules allumées `on_ratio` à l'équilibre.
+		L'image sans bruit est conservée d'une frame à l'autre : seules les PSF des molécules qui changent d'état sont
+		soustraites (extinction) ou ajoutées (allumage), le coût d'une frame dépend donc du nombre de changements d'état
+		et non du nombre total de molécules.
+
+		:param size: Nombre d'éléments dans la pile.
+		:return: La pile générée.
+		"""
+		options = self.stack_model.options
+		on_ratio = np.clip(options.on_ratio, 0, 1)
+		stack = self._new_stack(size)
+
+		# Population persistante et probabilités de changement d'état pendant une frame
+		localisation = self.sampler.generate_localisation()
+		intensities = self.sampler.fluorophore.get_intensities(localisation.shape[0], True)
+		on_time = max(float(self.sampler.fluorophore.flickering), np.finfo(np.float32).eps)
+		off_time = on_time * (1 - on_ratio) / on_ratio if on_ratio > 0 else np.inf
+		p_off = 1 - np.exp(-options.exposure / on_time)
+		p_on = 1 - np.exp(-options.exposure / off_time) if off_time > 0 else 1.0
+
+		state = np.random.random(localisation.shape[0]) < on_ratio
+		accumulator = self.sampler.render_psf(localisation[state], intensities[state]).astype(np.float64)  # float64 : pas de dérive des sommes
+		for i in self._frames(size):
+			if i > 0:
+				draw = np.random.random(localisation.shape[0])
+				switch_off = state & (draw < p_off)
+				switch_on = ~state & (draw < p_on)
+				state ^= switch_off | switch_on
+
+			self.sampler.last_localisations = localisation[state]
+			self.sampler.last_intensities = intensities[state]
+			self.sampler.n_molecules.append(int(np.count_nonzero(state)))
+			self._phase("localisation")
+			if i > 0:
+				if switch_off.any(): accumulator -= self.sampler.render_psf(localisation[switch_off], intensities[switch_off])
+				if switch_on.any(): accumulator += self.sampler.render_psf(localisation[switch_on], intensities[switch_on])
+			clean = np.clip(accumulator, 0, MAX_INTENSITY).astype(np.float32)  # Le clip retire aussi les résidus négatifs des soustractions
+			self._phase("psf")
+			stack.add_sample(self._finalize_frame(i, clean), i)
+		return stack
+
+	##################################################
+	def _photophysics_model(self, size: int = 100):
+		"""
+		Génère une pile à partir d'une population de molécules persistante dont la photophysique est simulée par `Photophysics`.
+
+		L'intensité de chaque molécule sur une frame est son intensité multipliée par la fraction du temps d'exposition passée allumée,
+		seules les molécules allumées au moins une partie de la frame sont rendues et enregistrées dans la vérité terrain.
+
+		:param size: Nombre d'éléments dans la pile.
+		:return: La pile générée.
+		"""
+		options = self.stack_model.options
+		stack = self._new_stack(size)
+
+		localisation = self.sampler.generate_localisation()
+		intensities = self.sampler.fluorophore.get_intensities(localisation.shape[0], True)
+		photophysics = Photophysics(localisation.shape[0], self.sampler.fluorophore.flickering, options.off_time, options.bleach_time)
+		for i in self._frames(size):
+			fractions = photophysics.step(options.exposure)
+			visible = np.flatnonzero(fractions > 0)
+			self.sampler.last_localisations = localisation[visible]
+			self.sampler.last_intensities = intensities[visible] * fractions[visible]
+			self.sampler.n_molecules.append(visible.size)
+			self._phase("localisation")
+			clean = self.sampler.generate_psf(self.sampler.last_localisations, self.sampler.last_intensities)
+			self._phase("psf")
+			stack.add_sample(self._finalize_frame(i, clean), i)
 		return stack
 
+	##################################################
+	def _diffusion_model(self, size: int = 100):
+		"""
+		Génère une pile à partir d'une population de particules qui diffusent (voir `Diffusion`), le masque servant de frontière.
+
+		Chaque particule est rendue à sa position moyenne pendant la frame (moyenne des sous-expositions), une seule PSF par particule.
+		Seules les positions courantes sont conservées : les trajectoires sont enregistrées dans la vérité terrain (`localisations`),
+		écrite en flux dans le fichier CSV s'il est spécifié. Les particules y sont dans le même ordre à chaque frame
+		(la ligne `k` d'une frame est la particule `k`).
+
+		:param size: Nombre d'éléments dans la pile.
+		:return: La pile générée.
+		"""
+		options = self.stack_model.options
+		stack = self._new_stack(size)
+
+		localisation = self.sampler.generate_localisation()
+		intensities = self.sampler.fluorophore.get_intensities(localisation.shape[0], True)
+		diffusion = Diffusion(localisation, options.coefficient, self.sampler.pixel_size, options.exposure, options.sub_steps, options.confinement,
+							  self.sampler.mask.mask if self.sampler.mask.pattern.pattern != PatternType.NONE else None, self.sampler.size)
+		for i in self._frames(size):
+			self.sampler.last_localisations = diffusion.step()  # Position moyenne pendant la frame
+			self.sampler.last_intensities = intensities
+			self.sampler.n_molecules.append(localisation.shape[0])
+			self._phase("localisation")
+			clean = self.sampler.generate_psf(self.sampler.last_localisations, intensities)
+			self._phase("psf")
+			stack.add_sample(self._finalize_frame(i, clean), i)
+		return stack
+
+	##################################################
+	def _drift_model(self, size: int = 100):
+		"""
+		Génère une pile à partir d'une population de molécules fixe dont l'échantillon dérive.
+
+		La dérive est un simple décalage des coordonnées appliqué lors du rendu (voir `Sampler.generate_psf`) :
+		le coût d'une frame est celui d'un rendu ordinaire et les molécules ne sont pas ré-échantillonnées.
+		La vérité terrain enregistre les positions observées (avec dérive) et les positions sans dérive.
+
+		:param size: Nombre d'éléments dans la pile.
+		:return: La pile générée.
+		"""
+		stack = self._new_stack(size)
+
+		localisation = self.sampler.generate_localisation()
+		intensities = self.sampler.fluorophore.get_intensities(localisation.shape[0], True)
+		self.drift = self.stack_model.options.get_trajectory(size, self.sampler.pixel_size)
+		for i in self._frames(size):
+			self.sampler.last_localisations = localisation + self.drift[i]
+			self.sampler.last_intensities = intensities
+			self.sampler.n_molecules.append(localisation.shape[0])
+			self._phase("localisation")
+			clean = self.sampler.generate_psf(localisation, intensities, self.drift[i])
+			self._phase("psf")
+			stack.add_sample(self._finalize_frame(i, clean, localisation), i)
+		return stack
+
+	##################################################
+	def _finalize_frame(self, index: int, clean: NDArray[np.float32],
+						undrifted: Optional[NDArray[np.float32]] = None) -> NDArray[np.float32] | NDArray[np.uint16]:
+		"""
+		Applique le bruit à l'image sans bruit d'une frame puis enregistre sa vérité terrain et ses statistiques.
+
+		:param index: Indice de la frame dans la pile.
+		:param clean: Image sans bruit de la frame (les molécules sont celles des derniers attributs du sampler).
+		:param undrifted: Positions sans dérive des molécules, uniquement pour le modèle de dérive (par défaut None).
+		:return: La frame bruitée.
+		"""
+		frame = self.sampler.noiser.apply(clean, self.as_uint16)
+		self._phase("noise")
+		self.localisations.append(index, self.sampler.last_localisations, self.sampler.last_intensities, undrifted)
+		if self.statistics is not None: self.statistics.update(frame, clean)
+		return frame
+
 	# ==================================================
 	# region Generate Stack
 	# ==================================================
@@ -0,0 +1,263 @@
+"""
+Fichier contenant la classe `Sweep` qui génère une série de piles sur une grille de paramètres.
+
+Les jeux de données de référence sont générés sur des grilles de paramètres (densité, SNR, astigmatisme, motif, taille des pixels...).
+Cette classe développe la grille en une liste d'exécutions puis les répartit sur un groupe de processus.
+
+**Paramètres** :
+
+Les paramètres sont ceux des paramètres de l'interface (voir `DEFAULT_PARAMETERS`), sans dépendance à Qt.
+Le motif est donné par son nom (`PatternType`) avec ses options dans `pattern_options`, de même pour le modèle de pile.
+
+**Caches** :
+
+Chaque processus conserve les `MASK_CACHE_SIZE` derniers masques construits (`build_stacker`), seule partie coûteuse de la construction
+(motif soleil, lecture d'une image). Chaque pile a son propre sampler (ses pré-calculs sont négligeables), aucun état n'est partagé entre deux piles.
+Les exécutions sont triées pour que celles qui partagent un masque soient envoyées au même processus.
+
+**Reprise** :
+
+Chaque exécution écrit sa pile (`<nom>.tif`), sa vérité terrain (`<nom>.csv`) puis son log (`<nom>.log`) en dernier.
+Le log contient l'empreinte des paramètres complets (`get_parameters_hash`) : une exécution dont le log existe avec la même empreinte
+est considérée comme terminée et n'est pas relancée, une grille interrompue peut donc être reprise.
+Si les paramètres fixes ou les valeurs par défaut ont changé, l'exécution est relancée.
+
+**Mémoire** :
+
+Le nombre de processus est limité au nombre de générations simultanées qui tiennent en mémoire (voir `Planner`),
+une pile qui ne tient pas en mémoire est projetée depuis un fichier temporaire (`<nom>.npy`, supprimé après l'enregistrement).
+"""
+
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+
+from SampleMaker import Fluorophore, Mask, Pattern, PatternType
+from SampleMaker.Generator.Noiser import Noiser
+from SampleMaker.Generator.Planner import Planner, StorageMode
+from SampleMaker.Generator.Sampler import Sampler
+from SampleMaker.Generator.Stacker import Stacker
+from SampleMaker.Generator.StackModel import StackModel, StackModelType
+from SampleMaker.Tools import print_warning
+
+DEFAULT_PARAMETERS = {
+		"size":                256, "n_frames": 10, "pixel_size": 160, "na": 1.4,
+		"wavelength":          600, "intensity": 5000, "delta": 10, "flickering": 50,
+		"density":             0.25, "astigmatism_ratio": 2.0, "pattern": "NONE", "pattern_options": {},
+		"stack_model":         "RANDOM", "stack_model_options": {},
+		"snr":                 10, "background": 500, "variation": 10,
+		"compression":         "none", "tile": 0, "workers": 0,
+		}
+MASK_KEYS = ("size", "pattern", "pattern_options")
+MASK_CACHE_SIZE = 8  # Nombre de masques conservés par processus
+
+
+# ==================================================
+# region Parameters
+# ==================================================
+##################################################
+def check_parameters(parameters: Dict[str, Any]) -> Dict[str, Any]:
+	"""
+	Complète des paramètres avec les valeurs par défaut et vérifie leurs noms.
+
+	:param parameters: Paramètres à vérifier.
+	:return: Les paramètres complets.
+	:raises ValueError: Si un paramètre, un motif ou un modèle de pile n'est pas reconnu.
+	"""
+	unknown = set(parameters) - set(DEFAULT_PARAMETERS)
+	if unknown: raise ValueError(f"Paramètres non reconnus : {', '.join(sorted(unknown))}.")
+	result = DEFAULT_PARAMETERS | parameters
+	if result["pattern"] not in PatternType.__members__: raise ValueError(f"Le motif \"{result['pattern']}\" n'est pas reconnu.")
+	if result["stack_model"] not in StackModelType.__members__: raise ValueError(f"Le modèle \"{result['stack_model']}\" n'est pas reconnu.")
+	return result
+
+
+##################################################
+def _cache_key(parameters: Dict[str, Any], keys: Tuple[str, ...]) -> str:
+	""" Clé de cache (JSON trié) d'un sous-ensemble de paramètres. """
+	return json.dumps({key: parameters[key] for key in keys}, sort_keys=True)
+
+
+##################################################
+def get_parameters_hash(parameters: Dict[str, Any]) -> str:
+	"""
+	Retourne l'empreinte des paramètres complets d'une exécution (enregistrée dans son log pour la reprise).
+
+	:param parameters: Paramètres de l'exécution (complétés par les valeurs par défaut).
+	:return: Les 16 premiers caractères de l'empreinte SHA-256 des paramètres (JSON trié).
+	"""
+	return hashlib.sha256(json.dumps(check_parameters(parameters), sort_keys=True).encode()).hexdigest()[:16]
+
+
+##################################################
+@lru_cache(maxsize=MASK_CACHE_SIZE)
+def _build_mask(key: str) -> Mask:
+	""" Construit le masque d'une clé de cache (voir `MASK_KEYS`), les derniers masques construits sont conservés. """
+	p = json.loads(key)
+	return Mask(_size=p["size"], _pattern=Pattern.from_pattern(PatternType[p["pattern"]], p["pattern_options"]))
+
+
+##################################################
+def build_stacker(parameters: Dict[str, Any], cache: bool = True) -> Stacker:
+	"""
+	Construit un générateur de pile à partir de paramètres (sans interface graphique).
+
+	:param parameters: Paramètres (complétés par les valeurs par défaut, voir `DEFAULT_PARAMETERS`).
+	:param cache: Si `True`, les masques déjà construits dans ce processus sont réutilisés (lecture seule, par défaut True).
+	:return: Le générateur de pile configuré (avec son propre sampler).
+	"""
+	p = check_parameters(parameters)
+	mask_key = _cache_key(p, MASK_KEYS)
+	mask = _build_mask(mask_key) if cache else _build_mask.__wrapped__(mask_key)
+	noiser = Noiser(snr=p["snr"], background=p["background"], variation=p["variation"])
+	fluorophore = Fluorophore(wavelength=p["wavelength"], intensity=p["intensity"], delta=p["delta"], flickering=p["flickering"])
+	sampler = Sampler(size=p["size"], pixel_size=p["pixel_size"], na=p["na"], density=p["density"], astigmatism_ratio=p["astigmatism_ratio"],
+					  fluorophore=fluorophore, mask=mask, noiser=noiser)
+	return Stacker(sampler, StackModel.from_model(StackModelType[p["stack_model"]], p["stack_model_options"]))
+
+
+##################################################
+def expand_grid(grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+	"""
+	Développe une grille de paramètres en la liste de toutes les combinaisons.
+
+	:param grid: Dictionnaire associant à chaque paramètre la liste de ses valeurs.
+	:return: Liste des combinaisons (produit cartésien des valeurs).
+	"""
+	keys = list(grid.keys())
+	return [dict(zip(keys, values)) for values in itertools.product(*(grid[key] for key in keys))]
+
+
+##################################################
+def get_run_name(parameters: Dict[str, Any]) -> str:
+	"""
+	Retourne le nom (déterministe) d'une exécution à partir de ses paramètres variables.
+
+	:param parameters: Paramètres variables de l'exécution.
+	:return: Le nom utilisable comme nom de fichier (par exemple "density-0.5_snr-10").
+	"""
+	name = "_".join(f"{key}-{json.dumps(value, sort_keys=True) if isinstance(value, (dict, list)) else value}" for key, value in parameters.items())
+	for char in "{}[]\"' :,/\\": name = name.replace(char, "")
+	return name or "run"
+
+# ==================================================
+# endregion Parameters
+# ==================================================
+
+
+# ==================================================
+# region Run
+# ==================================================
+##################################################
+def run_one(parameters: Dict[str, Any], output_dir: str, name: str) -> Dict[str, Any]:
+	"""
+	Génère et enregistre une pile (fonction exécutée par les processus du groupe).
+
+	:param parameters: Paramètres complets de l'exécution.
+	:param output_dir: Dossier de sortie.
+	:param name: Nom de l'exécution (préfixe des fichiers).
+	:return: Résumé de l'exécution (nom, fichiers, durée, nombre de frames).
+	"""
+	start = time.perf_counter()
+	base = os.path.join(output_dir, name)
+	stacker = build_stacker(parameters)
+	if Planner().plan(parameters, output_dir, runtime=False).mode == StorageMode.MEMMAP: stacker.memmap_file = f"{base}.npy"
+	stack = stacker.generate(parameters["n_frames"], f"{base}.csv")
+	stack.save(f"{base}.tif", compression=parameters["compression"], tile=parameters["tile"], workers=parameters["workers"])
+	stack.release()  # Supprime le fichier temporaire de la pile projetée
+	elapsed = time.perf_counter() - start
+	with open(f"{base}.log", "w", encoding="utf-8") as f:  # Écrit en dernier : marque l'exécution comme terminée
+		json.dump({"name": name, "parameters": parameters, "hash": get_parameters_hash(parameters), "seconds": elapsed, "stacker": stacker.tostring()}, f, indent=4)
+	return {"name": name, "tif": f"{base}.tif", "log": f"{base}.log", "seconds": elapsed, "frames": parameters["n_frames"], "skipped": False}
+
+
+##################################################
+@dataclass
+class Sweep:
+	"""
+	Classe permettant de générer une série de piles sur une grille de paramètres.
+
+	Attributs :
+		- **grid (Dict[str, List[Any]])** : Valeurs de chaque paramètre variable (voir `DEFAULT_PARAMETERS`).
+		- **output_dir (str)** : Dossier de sortie des piles, vérités terrain et logs.
+		- **base (Dict[str, Any])** : Paramètres fixes communs à toutes les exécutions (par défaut aucun).
+		- **workers (int)** : Nombre de processus (0 pour le nombre de cœurs, 1 pour une exécution dans le processus courant, par défaut 0).
+	"""
+	grid: Dict[str, List[Any]] = field(default_factory=dict)
+	output_dir: str = "Output"
+	base: Dict[str, Any] = field(default_factory=dict)
+	workers: int = 0
+
+	##################################################
+	def get_runs(self) -> List[Tuple[str, Dict[str, Any]]]:
+		"""
+		Retourne la liste des exécutions, triées pour regrouper celles qui partagent un masque.
+
+		:return: Liste de couples (nom, paramètres complets).
+		:raises ValueError: Si un paramètre n'est pas reconnu.
+		"""
+		runs = [(get_run_name(values), check_parameters(self.base | values)) for values in expand_grid(self.grid)]
+		return sorted(runs, key=lambda run: (_cache_key(run[1], MASK_KEYS), run[0]))
+
+	##################################################
+	def is_done(self, name: str, parameters: Dict[str, Any]) -> bool:
+		""" Indique si une exécution est terminée : son log existe et a été écrit avec les mêmes paramètres complets. """
+		filename = os.path.join(self.output_dir, f"{name}.log")
+		if not os.path.isfile(filename): return False
+		try:
+			with open(filename, "r", encoding="utf-8") as f: log = json.load(f)
+		except (OSError, ValueError): return False  # Log illisible : l'exécution est relancée
+		return log.get("hash") == get_parameters_hash(parameters)
+
+	##################################################
+	def run(self) -> List[Dict[str, Any]]:
+		"""
+		Lance toutes les exécutions qui ne sont pas encore terminées.
+
+		:return: Liste des résumés de toutes les exécutions (les exécutions déjà terminées sont marquées `skipped`).
+		"""
+		os.makedirs(self.output_dir, exist_ok=True)
+		runs = self.get_runs()
+		results = {name: {"name": name, "tif": os.path.join(self.output_dir, f"{name}.tif"), "log": os.path.join(self.output_dir, f"{name}.log"),
+						  "seconds": 0.0, "frames": parameters["n_frames"], "skipped": True} for name, parameters in runs if self.is_done(name, parameters)}
+		pending = [(name, parameters) for name, parameters in runs if name not in results]
+
+		if pending:
+			names, parameters = [run[0] for run in pending], [run[1] for run in pending]
+			if self.workers == 1:
+				for result in map(run_one, parameters, [self.output_dir] * len(pending), names): results[result["name"]] = result
+			else:
+				workers = min(self.workers or os.cpu_count() or 1, len(pending))
+				limit = min(Planner().plan(p, self.output_dir, runtime=False).processes for p in parameters)  # Générations simultanées en mémoire
+				if limit < workers:
+					print_warning(f"Nombre de processus réduit de {workers} à {limit} pour tenir en mémoire.")
+					workers = limit
+				chunksize = max(1, len(pending) // (workers * 4))  # Blocs d'exécutions consécutives (donc partageant leurs caches)
+				with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+					for result in executor.map(run_one, parameters, [self.output_dir] * len(pending), names, chunksize=chunksize):
+						results[result["name"]] = result
+		return [results[name] for name, _ in runs]
+
+	##################################################
+	def tostring(self) -> str:
+		"""
+		Retourne une chaîne de caractères correspondant aux caractéristiques de la grille.
+
+		:return: Une description textuelle de la grille.
+		"""
+		n_runs = len(expand_grid(self.grid))
+		return f"Grid: {self.grid}, Runs: {n_runs}, Output: {self.output_dir}, Workers: {self.workers or os.cpu_count()}"
+
+	##################################################
+	def __str__(self) -> str: return self.tostring()
+
+# ==================================================
+# endregion Run
+# ==================================================
@@ -3,9 +3,18 @@ Ce sous-package contient des outils pour la génération d'images et de données
 
 **Modules disponibles** :
 
+- Diffusion : Simule le déplacement (marche aléatoire libre ou confinée) d'une population de particules entre les frames.
+- LocalisationTable : Stocke la vérité terrain (positions et intensités des molécules de chaque frame) d'une pile.
+- MultiChannelSampler : Génère des échantillons multi-couleurs (positions et rendu partagés entre les canaux, un canal par fluorophore).
+- Planner : Estime la mémoire et la durée d'une génération et choisit le mode de stockage de la pile (mémoire, memmap ou flux).
+- Photophysics : Simule les états (allumé, éteint, photoblanchi) d'une population de fluorophores au fil des frames.
+- Preview : Calcule rapidement l'aperçu d'une frame (résolution réduite ou zone centrale, masques et noyaux conservés).
 - Noiser : Permet d'ajouter du bruit gaussien et poissonien à des images pour simuler des conditions réalistes.
 - Sampler : Fournit des outils pour échantillonner et générer des images à partir de données.
 - Stacker : Fournit des fonctions pour empiler plusieurs images ou données dans une structure plus complexe.
+- StackObserver : Interface des observateurs de la génération d'une pile (événements par frame et par phase) et observateur du Monitoring.
+- StackStatistics : Calcule des statistiques d'une pile (projections, histogrammes, SNR atteint) au fil de sa génération.
+- Sweep : Génère une série de piles sur une grille de paramètres avec un groupe de processus (caches partagés et reprise).
 - StackModel : Modélise et génère des empilements d'images ou de données, souvent utilisés pour des simulations ou des analyses multidimensionnelles.
 
 **Fonctionnalités principales** :
@@ -15,10 +24,21 @@ Ce sous-package contient des outils pour la génération d'images et de données
 """
 
 # Importation explicite des classes pour qu'elles soient accessibles directement
+from .Diffusion import Diffusion
+from .LocalisationTable import LocalisationTable
+from .MultiChannelSampler import MultiChannelSampler
 from .Noiser import Noiser
+from .Photophysics import Photophysics
+from .Planner import Plan, Planner, StorageMode
+from .Preview import Preview
 from .Sampler import Sampler
 from .Stacker import Stacker
-from .StackModel import StackModel, StackModelType, NoneOptions
+from .StackModel import StackModel, StackModelType, NoneOptions, BlinkingOptions, PhotophysicsOptions, DiffusionOptions, DriftOptions
+from .StackObserver import MonitoringObserver, StackEvent, StackObserver
+from .StackStatistics import StackStatistics
+from .Sweep import Sweep, build_stacker
 
 # Définir la liste des symboles exportés
-__all__ = ["Noiser", "Sampler", "Stacker", "StackModel", "StackModelType", "NoneOptions"]
\ No newline at end of file
+__all__ = ["Diffusion", "LocalisationTable", "MultiChannelSampler", "Noiser", "Photophysics", "Plan", "Planner", "StorageMode", "Preview", "Sampler", "Stacker", "StackModel", "StackModelType",
+		   "NoneOptions", "BlinkingOptions", "PhotophysicsOptions", "DiffusionOptions", "DriftOptions", "MonitoringObserver", "StackEvent", "StackObserver",
+		   "StackStatistics", "Sweep", "build_stacker"]
@@ -171,13 +171,11 @@ class Mask:
 		n_segments = r * 2							  # Nombre de segments
 		angle_per_segment = 2 * math.pi / n_segments  # Calcul de l'angle par segment (en radians)
 
-		# Remplissage du masque
-		for x in range(self._size):
-			for y in range(self._size):
-				dx, dy = x - center, y - center								# Coordonnées par rapport au centre
-				angle = (math.atan2(dy, dx) + 2 * math.pi) % (2 * math.pi)  # Calcul de l'angle en radians par rapport au centre
-				segment = int(angle // angle_per_segment)					# Déterminer le segment dans lequel le point se situe
-				self.mask[x, y] = segment % 2 == 0							# Alterner la couleur (noir ou blanc) selon le segment
+		# Remplissage du masque (tous les pixels en même temps, premier indice X comme dans le parcours pixel par pixel)
+		dx, dy = np.meshgrid(np.arange(self._size) - center, np.arange(self._size) - center, indexing="ij")  # Coordonnées par rapport au centre
+		angle = (np.arctan2(dy, dx) + 2 * math.pi) % (2 * math.pi)  # Calcul de l'angle en radians par rapport au centre
+		segment = (angle // angle_per_segment).astype(int)			# Déterminer le segment dans lequel chaque point se situe
+		self.mask = segment % 2 == 0								# Alterner la couleur (noir ou blanc) selon le segment
 
 	# ==================================================
 	# endregion Mask Generator
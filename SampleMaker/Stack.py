@@ -4,18 +4,23 @@ d'images ou d'échantillons 2D, représentées comme des tableaux 3D.
 
 Fonctionnalités principales :
 
-- **Manipulation d'échantillons** : Ajouter ou récupérer des échantillons 2D dans une pile 3D.
-- **Entrée/Sortie (IO)** : Charger ou enregistrer des piles dans des fichiers TIF.
+- **Manipulation d'échantillons** : Ajouter ou récupérer des échantillons 2D dans une pile 3D (stockée en flottants ou en entiers 16 bits).
+- **Stockage** : Pile en mémoire, projetée en mémoire depuis un fichier `.npy` (memmap) ou écrite en flux dans un dossier de blocs
+  (seul le bloc de frames en cours est conservé en mémoire, voir `ChunkStore`).
+- **Entrée/Sortie (IO)** : Charger ou enregistrer des piles dans des fichiers TIF ou des dossiers de blocs (écritures parallèles).
 - **Affichage** : Générer une représentation textuelle décrivant la pile et son contenu.
 
 """
 
+import os
 from dataclasses import dataclass, field
+from typing import Optional
 
 import numpy as np
 from numpy.typing import NDArray
 
-from SampleMaker.Tools import open_tif_as_stack, save_stack_as_tif
+from SampleMaker.Tools import ChunkStore, convert_chunks_to_tif, open_tif_as_stack, save_stack_as_chunks, save_stack_as_tif, to_uint16
+from SampleMaker.Tools.Profiler import count
 
 
 ##################################################
@@ -25,13 +30,60 @@ class Stack:
 	Classe permettant de stocker une pile d'images
 
 	Attributs :
-		- **stack (np.ndarray)** : Tableau numpy 3D stockant la pile d'images.
+		- **stack (np.ndarray)** : Tableau numpy 3D stockant la pile d'images (en flottants 32 bits ou en entiers 16 bits).
+		  Projeté depuis un fichier si la pile est réservée avec un nom de fichier, bloc de frames en cours si la pile est écrite en flux.
+		- **filename (str)** : Fichier `.npy` de la pile projetée en mémoire (vide pour une pile en mémoire).
+		- **store (ChunkStore)** : Dossier de blocs de la pile écrite en flux (None pour une pile en mémoire ou projetée).
 	"""
-	stack: NDArray[np.float32] = field(init=False, default_factory=lambda: np.empty((0, 0, 0), dtype=np.float32))
+	stack: NDArray[np.float32] | NDArray[np.uint16] = field(init=False, default_factory=lambda: np.empty((0, 0, 0), dtype=np.float32))
+	filename: str = field(init=False, default="")
+	store: Optional[ChunkStore] = field(init=False, default=None, repr=False)
+	_start: int = field(init=False, repr=False, default=0)   # Indice de la première frame du bloc en cours (écriture en flux)
+	_filled: int = field(init=False, repr=False, default=0)  # Nombre de frames du bloc en cours (écriture en flux)
 
 	# ==================================================
 	# region Sample Manipulation
 	# ==================================================
+	##################################################
+	def reserve(self, n_frames: int, height: int, width: int, dtype: type = np.float32, filename: str = ""):
+		"""
+		Alloue une pile de frames nulles en une seule fois (évite les recopies de la pile à chaque ajout d'échantillon).
+		Les échantillons sont ensuite placés avec `add_sample` en précisant leur index.
+		Si un fichier est spécifié, la pile y est projetée en mémoire (memmap) : le système garde en mémoire uniquement les pages utilisées.
+
+		:param n_frames: Nombre de frames de la pile.
+		:param height: Hauteur des frames.
+		:param width: Largeur des frames.
+		:param dtype: Type des données stockées (np.float32 ou np.uint16, par défaut np.float32).
+		:param filename: Fichier `.npy` de la pile projetée en mémoire, vide pour une pile en mémoire (par défaut "").
+		"""
+		self.store, self.filename = None, filename
+		if filename == "":
+			self.stack = np.zeros((n_frames, height, width), dtype=dtype)
+			count("bytes_allocated", self.stack.nbytes)
+			return
+		directory = os.path.dirname(filename)
+		if directory: os.makedirs(directory, exist_ok=True)
+		self.stack = np.lib.format.open_memmap(filename, mode="w+", dtype=dtype, shape=(n_frames, height, width))
+
+	##################################################
+	def stream(self, directory: str, n_frames: int, height: int, width: int, dtype: type = np.float32, chunk_frames: int = 64):
+		"""
+		Prépare l'écriture en flux de la pile dans un dossier de blocs : seul le bloc de frames en cours est conservé en mémoire.
+		Les échantillons doivent être ajoutés dans l'ordre avec `add_sample`, puis l'écriture est terminée avec `close`.
+
+		:param directory: Dossier de blocs de la pile (voir `ChunkStore`).
+		:param n_frames: Nombre de frames de la pile.
+		:param height: Hauteur des frames.
+		:param width: Largeur des frames.
+		:param dtype: Type des données stockées (np.float32 ou np.uint16, par défaut np.float32).
+		:param chunk_frames: Nombre de frames par bloc (par défaut 64).
+		"""
+		self.store = ChunkStore.create(directory, (n_frames, height, width), np.dtype(dtype).name, chunk_frames)
+		self.filename, self._start, self._filled = "", 0, 0
+		self.stack = np.zeros((min(chunk_frames, n_frames), height, width), dtype=dtype)
+		count("bytes_allocated", self.stack.nbytes)
+
 	##################################################
 	def add_sample(self, sample: NDArray[np.float32], index: int = -1):
 		"""
@@ -42,6 +94,7 @@ class Stack:
 
 		Si la pile est vide, une pile 3D est créée en ajoutant l'échantillon comme premier élément.
 		Sinon, des vérifications de taille sont effectuées pour s'assurer de la compatibilité.
+		Si la pile est stockée en entiers 16 bits, l'échantillon est arrondi et borné avant son ajout.
 
 		:param sample: Tableau 2D représentant l'échantillon à ajouter.
 		:param index: Position dans la pile où insérer l'échantillon.
@@ -53,6 +106,10 @@ class Stack:
 		if sample.ndim != 2:
 			raise ValueError(f"Le sample doit être un tableau 2D, mais un tableau de {sample.ndim} dimensions a été fourni.")
 
+		if self.store is not None:
+			self._stream_sample(sample, index)
+			return
+
 		# Si la pile est vide ou nulle, initialise la pile avec le sample
 		if getattr(self, 'stack', None) is None or self.stack.size == 0:
 			self.stack = sample[np.newaxis, :, :]  # Crée une pile 3D avec sample comme premier élément
@@ -62,6 +119,9 @@ class Stack:
 		if sample.shape != self.stack.shape[1:]:
 			raise ValueError(f"La taille de l'échantillon {sample.shape} ne correspond pas à la taille actuelle {self.stack.shape[1:]}.")
 
+		# Conversion si la pile est stockée en entiers 16 bits
+		if self.stack.dtype == np.uint16: sample = to_uint16(sample)
+
 		# Ajuste l'index si nécessaire
 		if index < 0 or index > self.stack.shape[0]: index = self.stack.shape[0]
 
@@ -69,6 +129,61 @@ class Stack:
 		if index < self.stack.shape[0]: self.stack[index] = sample
 		else: self.stack = np.concatenate((self.stack, sample[np.newaxis, :, :]), axis=0)
 
+	##################################################
+	def _stream_sample(self, sample: NDArray[np.float32], index: int = -1):
+		"""
+		Ajoute un échantillon à la pile écrite en flux : il est placé dans le bloc en cours, écrit dès qu'il est complet.
+
+		:param sample: Tableau 2D représentant l'échantillon à ajouter.
+		:param index: Position dans la pile (négatif pour la frame suivante).
+		:raises ValueError: Si la taille de l'échantillon ne correspond pas à celle de la pile.
+		:raises ValueError: Si l'échantillon n'est pas la frame suivante de la pile.
+		"""
+		if sample.shape != self.store.shape[1:]:
+			raise ValueError(f"La taille de l'échantillon {sample.shape} ne correspond pas à la taille actuelle {self.store.shape[1:]}.")
+		if index < 0: index = self._start + self._filled
+		if index != self._start + self._filled or index >= self.store.shape[0]:
+			raise ValueError(f"En flux, les échantillons doivent être ajoutés dans l'ordre (frame {self._start + self._filled} attendue, {index} fournie).")
+		self.stack[self._filled] = to_uint16(sample) if self.stack.dtype == np.uint16 else sample
+		self._filled += 1
+		if self._filled == self.stack.shape[0]:
+			self.store.write_frames(self._start, self.stack)
+			self._start, self._filled = self._start + self._filled, 0
+			self.stack = self.stack[:min(self.store.chunk_frames, self.store.shape[0] - self._start)]  # Dernier bloc éventuellement plus court
+
+	##################################################
+	def close(self, n_frames: int):
+		"""
+		Termine le remplissage d'une pile réservée : les frames inutilisées (génération annulée) sont retirées.
+		En flux, les frames du bloc en cours sont écrites et le manifeste est réduit aux frames écrites,
+		la pile en mémoire est alors vide (les frames sont lues depuis `store`).
+
+		:param n_frames: Nombre de frames effectivement remplies.
+		"""
+		if self.store is None:
+			if n_frames < self.stack.shape[0]: self.stack = self.stack[:n_frames]
+			if isinstance(self.stack, np.memmap): self.stack.flush()
+			return
+		shape = (n_frames,) + self.store.shape[1:]
+		if n_frames < self.store.shape[0]: self.store = ChunkStore.create(self.store.directory, shape, self.store.dtype, self.store.chunk_frames)
+		if self._filled > 0 and self._start < n_frames: self.store.write_frames(self._start, self.stack[:min(self._filled, n_frames - self._start)])
+		self._start, self._filled = n_frames, 0
+		self.stack = np.empty((0,) + shape[1:], dtype=self.stack.dtype)
+
+	##################################################
+	def release(self):
+		""" Libère la pile : une pile projetée en mémoire est fermée et son fichier supprimé (fichier temporaire avant l'enregistrement). """
+		filename, self.filename = self.filename, ""
+		self.stack = np.empty((0, 0, 0), dtype=self.stack.dtype)
+		if filename != "" and os.path.isfile(filename): os.remove(filename)
+
+	##################################################
+	@property
+	def nbytes(self) -> int:
+		""" Taille des données de la pile en octets (y compris les frames déjà écrites en flux). """
+		if self.store is not None: return int(np.prod(self.store.shape)) * np.dtype(self.store.dtype).itemsize
+		return self.stack.nbytes
+
 	##################################################
 	def get_sample(self, index: int) -> NDArray[np.float32]:
 		"""
@@ -77,9 +192,20 @@ class Stack:
 		:param index: Index de la couche à récupérer.
 		:return: La couche 2D correspondante.
 		"""
+		if self.store is not None: return self.store.get_frame(index)
 		if not (0 <= index < self.stack.shape[0]): raise IndexError("Index hors de la profondeur de la pile.")
 		return self.stack[index]
 
+	##################################################
+	def as_float32(self) -> NDArray[np.float32]:
+		"""
+		Retourne la pile en flottants 32 bits (une copie n'est créée que si la pile est stockée en entiers 16 bits).
+
+		:return: La pile 3D en flottants.
+		"""
+		if self.store is not None: return self.store.read(np.float32)  # Pile en blocs chargée en totalité, directement en flottants
+		return self.stack.astype(np.float32, copy=False)
+
 	# ==================================================
 	# endregion Sample Manipulation
 	# ==================================================
@@ -93,6 +219,7 @@ class Stack:
 
 		:return: Chaîne décrivant la pile, incluant ses dimensions et son contenu si elle existe.
 		"""
+		if self.store is not None: return f"Pile 3D en blocs : {self.store.shape}\nStockage : {self.store}"
 		if getattr(self, 'stack', None) is None or self.stack.size == 0:
 			return "La pile est vide ou non initialisée."
 		return f"Pile 3D : {self.stack.shape}\nContenu :\n{self.stack}"
@@ -101,20 +228,49 @@ class Stack:
 	def __str__(self) -> str: return self.tostring()
 
 	##################################################
-	def save(self, filename):
+	def save(self, filename, compression: str = "none", level: Optional[int] = None, tile: int = 0, bigtiff: Optional[bool] = None,
+			 workers: int = 0):
 		"""
-		Enregistre le masque comme un fichier PNG.
+		Enregistre la pile comme un fichier TIF multi-frame (voir `save_stack_as_tif` pour le détail des options).
+		Les frames sont converties et écrites une à une : une pile projetée en mémoire ou écrite en flux n'est pas chargée en totalité.
 		:param filename: Nom du fichier à enregistrer
+		:param compression: Compression sans perte à utiliser (par défaut "none").
+		:param level: Niveau de compression (par défaut celui du codec).
+		:param tile: Taille des tuiles carrées en pixel, 0 pour un découpage en bandes (par défaut 0).
+		:param bigtiff: Force ou interdit le format BigTIFF, si None il est choisi selon la taille de la pile (par défaut None).
+		:param workers: Nombre de threads d'encodage, 0 pour automatique (par défaut 0).
+		"""
+		if self.store is not None: convert_chunks_to_tif(self.store.directory, filename, compression, level, tile, bigtiff, workers)  # Frame par frame
+		else: save_stack_as_tif(self.stack, filename, compression, level, tile, bigtiff, workers)
+
+	##################################################
+	def save_chunks(self, directory, chunk_frames: int = 64, tile: int = 0):
+		"""
+		Enregistre la pile dans un dossier de blocs `.npy` avec un manifeste JSON (voir `ChunkStore`).
+		Rien n'est fait si la pile a été écrite en flux (ou ouverte) dans ce même dossier, sinon ses blocs sont copiés un à un.
+		:param directory: Dossier de sortie
+		:param chunk_frames: Nombre de frames par bloc (par défaut 64).
+		:param tile: Taille des tuiles spatiales carrées en pixel, 0 pour des frames entières (par défaut 0).
 		"""
-		save_stack_as_tif(self.stack, filename)
+		if self.store is not None:
+			if os.path.abspath(self.store.directory) != os.path.abspath(directory): self.store.copy(directory, chunk_frames, tile)  # Bloc par bloc
+			return
+		save_stack_as_chunks(self.stack, directory, chunk_frames, tile)
 
 	##################################################
 	def open(self, filename):
 		"""
-		Ouvre un fichier PNG et le transforme en masque de booléen
-		:param filename: Nom du fichier à ouvrir
+		Ouvre un fichier TIF ou un dossier de blocs et le transforme en pile.
+		Un dossier de blocs n'est pas chargé : il reste le stockage de la pile (frames lues à la demande avec `get_sample`, comme une pile écrite en flux).
+		:param filename: Nom du fichier (ou du dossier) à ouvrir
 		"""
-		self.stack = open_tif_as_stack(filename)
+		self.store, self.filename = None, ""
+		if not os.path.isdir(filename):
+			self.stack = open_tif_as_stack(filename)
+			return
+		self.store = ChunkStore.open(filename)
+		self._start, self._filled = len(self.store), 0  # Pile complète : aucun échantillon ne peut être ajouté
+		self.stack = np.empty((0,) + self.store.shape[1:], dtype=self.store.dtype)
 
 	# ==================================================
 	# endregion IO
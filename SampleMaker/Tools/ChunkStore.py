@@ -0,0 +1,284 @@
+"""
+Fichier de la classe de stockage d'une pile en blocs (chunks) sur le disque.
+
+Un fichier TIF unique sérialise les écritures : plusieurs processus ne peuvent pas écrire simultanément la même pile.
+Ce module propose un format alternatif simple : un dossier contenant un manifeste JSON et un fichier `.npy` par bloc.
+Chaque bloc correspond à un groupe de frames consécutives, éventuellement découpé en tuiles spatiales,
+et peut être écrit indépendamment par un processus différent puis relu de manière paresseuse (memory-map).
+
+**Structure du dossier** :
+
+- `manifest.json` : Forme de la pile, type des données et forme des blocs.
+- `<t>.<y>.<x>.npy` : Bloc d'indice `t` sur l'axe des frames, `y` et `x` sur les axes spatiaux.
+
+**Fonctionnalités** :
+
+- Création d'un dossier de stockage vide (le manifeste est écrit une seule fois, avant les écritures parallèles).
+- Écriture atomique et indépendante de chaque bloc.
+- Lecture paresseuse d'une frame ou d'un groupe de frames, lecture complète de la pile.
+- Copie vers un autre dossier, un bloc de frames à la fois.
+
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+MANIFEST_NAME = "manifest.json"
+FORMAT_NAME = "SampleMaker-chunks"
+FORMAT_VERSION = 1
+
+
+##################################################
+@dataclass
+class ChunkStore:
+	"""
+	Classe permettant de lire et d'écrire une pile découpée en blocs dans un dossier.
+
+	Attributs :
+		- **directory (str)** : Dossier contenant le manifeste et les blocs.
+		- **shape (Tuple[int, int, int])** : Forme de la pile (frames, hauteur, largeur).
+		- **dtype (str)** : Type des données stockées (par exemple "uint16" ou "float32").
+		- **chunk_frames (int)** : Nombre de frames par bloc.
+		- **tile (int)** : Taille des tuiles spatiales carrées en pixel (0 pour des frames entières).
+	"""
+	directory: str
+	shape: Tuple[int, int, int] = (0, 0, 0)
+	dtype: str = "uint16"
+	chunk_frames: int = 64
+	tile: int = 0
+	_chunk_shape: Tuple[int, int, int] = field(init=False, repr=False, default=(0, 0, 0))
+
+	##################################################
+	def __post_init__(self):
+		""" Méthode appelée automatiquement après l'initialisation du dataclass. Calcule la forme d'un bloc. """
+		self.shape = tuple(int(s) for s in self.shape)
+		self.dtype = np.dtype(self.dtype).name
+		tile_y = self.tile if self.tile > 0 else self.shape[1]
+		tile_x = self.tile if self.tile > 0 else self.shape[2]
+		self._chunk_shape = (max(1, self.chunk_frames), max(1, tile_y), max(1, tile_x))
+
+	# ==================================================
+	# region Creation
+	# ==================================================
+	##################################################
+	@classmethod
+	def create(cls, directory: str, shape: Tuple[int, int, int], dtype: str = "uint16", chunk_frames: int = 64, tile: int = 0) -> 'ChunkStore':
+		"""
+		Crée un dossier de stockage vide et écrit son manifeste.
+
+		:param directory: Dossier à créer.
+		:param shape: Forme de la pile (frames, hauteur, largeur).
+		:param dtype: Type des données stockées (par défaut "uint16").
+		:param chunk_frames: Nombre de frames par bloc (par défaut 64).
+		:param tile: Taille des tuiles spatiales carrées en pixel, 0 pour des frames entières (par défaut 0).
+		:return: Le stockage créé.
+		:raises ValueError: Si la forme n'est pas 3D ou si la taille des blocs est invalide.
+		"""
+		if len(shape) != 3: raise ValueError("La forme doit être 3D (frames, hauteur, largeur).")
+		if chunk_frames < 1 or tile < 0: raise ValueError("Le nombre de frames par bloc doit être positif et la taille des tuiles positive ou nulle.")
+		store = cls(directory, shape, dtype, chunk_frames, tile)
+		os.makedirs(directory, exist_ok=True)
+		manifest = {"format":  FORMAT_NAME, "version": FORMAT_VERSION, "shape": list(store.shape), "dtype": store.dtype,
+					"chunks":  list(store._chunk_shape), "tile": tile}
+		with open(os.path.join(directory, MANIFEST_NAME), "w", encoding="utf-8") as f: json.dump(manifest, f, indent=4)
+		return store
+
+	##################################################
+	@classmethod
+	def open(cls, directory: str) -> 'ChunkStore':
+		"""
+		Ouvre un dossier de stockage existant à partir de son manifeste.
+
+		:param directory: Dossier à ouvrir.
+		:return: Le stockage ouvert.
+		:raises OSError: Si le manifeste est introuvable.
+		:raises ValueError: Si le manifeste ne correspond pas à ce format.
+		"""
+		filename = os.path.join(directory, MANIFEST_NAME)
+		if not os.path.isfile(filename): raise OSError(f"Le fichier \"{filename}\" est introuvable.")
+		with open(filename, "r", encoding="utf-8") as f: manifest = json.load(f)
+		if manifest.get("format") != FORMAT_NAME: raise ValueError(f"Le dossier \"{directory}\" n'est pas un stockage en blocs.")
+		return cls(directory, tuple(manifest["shape"]), manifest["dtype"], manifest["chunks"][0], manifest["tile"])
+
+	# ==================================================
+	# endregion Creation
+	# ==================================================
+
+	# ==================================================
+	# region Chunk Manipulation
+	# ==================================================
+	##################################################
+	@property
+	def chunk_grid(self) -> Tuple[int, int, int]:
+		"""
+		Retourne le nombre de blocs sur chaque axe.
+
+		:return: Nombre de blocs (frames, hauteur, largeur).
+		"""
+		return tuple(-(-s // c) for s, c in zip(self.shape, self._chunk_shape))
+
+	##################################################
+	def chunk_keys(self) -> List[Tuple[int, int, int]]:
+		"""
+		Retourne la liste de tous les indices de blocs (utile pour répartir les écritures entre plusieurs processus).
+
+		:return: Liste des indices (t, y, x) des blocs.
+		"""
+		nt, ny, nx = self.chunk_grid
+		return [(t, y, x) for t in range(nt) for y in range(ny) for x in range(nx)]
+
+	##################################################
+	def chunk_slices(self, t: int, y: int = 0, x: int = 0) -> Tuple[slice, slice, slice]:
+		"""
+		Retourne la zone de la pile couverte par un bloc.
+
+		:param t: Indice du bloc sur l'axe des frames.
+		:param y: Indice du bloc sur l'axe des lignes.
+		:param x: Indice du bloc sur l'axe des colonnes.
+		:return: Les slices (frames, lignes, colonnes) du bloc dans la pile.
+		"""
+		return tuple(slice(i * c, min((i + 1) * c, s)) for i, c, s in zip((t, y, x), self._chunk_shape, self.shape))
+
+	##################################################
+	def _chunk_filename(self, t: int, y: int, x: int) -> str: return os.path.join(self.directory, f"{t}.{y}.{x}.npy")
+
+	##################################################
+	def write_chunk(self, t: int, y: int, x: int, data: NDArray):
+		"""
+		Écrit un bloc de manière atomique (fichier temporaire puis renommage), indépendamment des autres blocs.
+
+		:param t: Indice du bloc sur l'axe des frames.
+		:param y: Indice du bloc sur l'axe des lignes.
+		:param x: Indice du bloc sur l'axe des colonnes.
+		:param data: Données du bloc (la forme doit correspondre à la zone couverte par le bloc).
+		:raises ValueError: Si la forme des données ne correspond pas au bloc.
+		"""
+		expected = tuple(s.stop - s.start for s in self.chunk_slices(t, y, x))
+		if data.shape != expected: raise ValueError(f"La forme du bloc {data.shape} ne correspond pas à la forme attendue {expected}.")
+		filename = self._chunk_filename(t, y, x)
+		tmp = f"{filename}.{os.getpid()}.tmp"
+		with open(tmp, "wb") as f: np.save(f, np.ascontiguousarray(data, dtype=self.dtype))
+		os.replace(tmp, filename)
+
+	##################################################
+	def read_chunk(self, t: int, y: int, x: int) -> NDArray:
+		"""
+		Lit un bloc de manière paresseuse (memory-map). Un bloc non écrit est considéré comme nul.
+
+		:param t: Indice du bloc sur l'axe des frames.
+		:param y: Indice du bloc sur l'axe des lignes.
+		:param x: Indice du bloc sur l'axe des colonnes.
+		:return: Les données du bloc.
+		"""
+		filename = self._chunk_filename(t, y, x)
+		if not os.path.isfile(filename): return np.zeros(tuple(s.stop - s.start for s in self.chunk_slices(t, y, x)), dtype=self.dtype)
+		return np.load(filename, mmap_mode="r")
+
+	##################################################
+	def write_frames(self, start: int, frames: NDArray):
+		"""
+		Écrit un groupe de frames consécutives aligné sur les blocs (tous les blocs spatiaux correspondants sont écrits).
+
+		:param start: Indice de la première frame (doit être un multiple de `chunk_frames`).
+		:param frames: Frames à écrire de forme (n, hauteur, largeur), n étant la taille d'un bloc (ou le reste en fin de pile).
+		:raises ValueError: Si le début n'est pas aligné sur un bloc.
+		"""
+		if start % self.chunk_frames != 0: raise ValueError(f"L'indice de départ {start} doit être un multiple de {self.chunk_frames}.")
+		t = start // self.chunk_frames
+		_, ny, nx = self.chunk_grid
+		for y in range(ny):
+			for x in range(nx):
+				_, sy, sx = self.chunk_slices(t, y, x)
+				self.write_chunk(t, y, x, frames[:, sy, sx])
+
+	##################################################
+	def get_frame(self, index: int) -> NDArray:
+		"""
+		Lit une frame de la pile en ne chargeant que les blocs nécessaires.
+
+		:param index: Indice de la frame.
+		:return: La frame 2D.
+		:raises IndexError: Si l'indice est hors de la pile.
+		"""
+		if not (0 <= index < self.shape[0]): raise IndexError("Index hors de la profondeur de la pile.")
+		return self.read_frames(index, index + 1)[0]
+
+	##################################################
+	def read_frames(self, start: int, stop: int, dtype: Optional[type] = None) -> NDArray:
+		"""
+		Lit un groupe de frames consécutives en ne chargeant que les blocs nécessaires.
+
+		:param start: Indice de la première frame.
+		:param stop: Indice de fin (exclu), borné à la taille de la pile.
+		:param dtype: Type des frames retournées, si None celui du stockage (par défaut None).
+		:return: Les frames de forme (stop - start, hauteur, largeur).
+		"""
+		start, stop = max(0, start), min(stop, self.shape[0])
+		frames = np.empty((max(0, stop - start),) + self.shape[1:], dtype=dtype or self.dtype)
+		_, ny, nx = self.chunk_grid
+		for t in range(start // self.chunk_frames, -(-stop // self.chunk_frames)):
+			st, _, _ = self.chunk_slices(t)
+			first, last = max(start, st.start), min(stop, st.stop)  # Frames du bloc comprises dans l'intervalle demandé
+			for y in range(ny):
+				for x in range(nx):
+					_, sy, sx = self.chunk_slices(t, y, x)
+					frames[first - start:last - start, sy, sx] = self.read_chunk(t, y, x)[first - st.start:last - st.start]
+		return frames
+
+	##################################################
+	def read(self, dtype: Optional[type] = None) -> NDArray:
+		"""
+		Lit l'ensemble de la pile (chargée en totalité en mémoire, voir `read_frames` pour une lecture par groupes de frames).
+
+		:param dtype: Type de la pile retournée, si None celui du stockage (par défaut None).
+		:return: La pile 3D complète.
+		"""
+		return self.read_frames(0, self.shape[0], dtype)
+
+	##################################################
+	def copy(self, directory: str, chunk_frames: int = 64, tile: int = 0) -> 'ChunkStore':
+		"""
+		Copie le stockage dans un autre dossier (avec un autre découpage éventuel), un bloc de frames à la fois.
+
+		:param directory: Dossier de destination.
+		:param chunk_frames: Nombre de frames par bloc de la copie (par défaut 64).
+		:param tile: Taille des tuiles spatiales carrées de la copie en pixel, 0 pour des frames entières (par défaut 0).
+		:return: Le stockage copié.
+		"""
+		store = ChunkStore.create(directory, self.shape, self.dtype, chunk_frames, tile)
+		for start in range(0, self.shape[0], chunk_frames): store.write_frames(start, self.read_frames(start, start + chunk_frames))
+		return store
+
+	##################################################
+	def __len__(self) -> int: return self.shape[0]
+
+	##################################################
+	def __getitem__(self, index: int) -> NDArray: return self.get_frame(index)
+
+	# ==================================================
+	# endregion Chunk Manipulation
+	# ==================================================
+
+	# ==================================================
+	# region IO
+	# ==================================================
+	##################################################
+	def tostring(self) -> str:
+		"""
+		Retourne une chaîne de caractères correspondant aux caractéristiques du stockage.
+
+		:return: Une description textuelle du stockage.
+		"""
+		return f"Directory: {self.directory}, Shape: {self.shape}, Type: {self.dtype}, Chunks: {self._chunk_shape}"
+
+	##################################################
+	def __str__(self) -> str: return self.tostring()
+
+# ==================================================
+# endregion IO
+# ==================================================
@@ -10,6 +10,12 @@ Il permet d'automatiser certaines tâches, comme l'appel d'une méthode lors de
 
    - Décorateur conçu pour déclencher automatiquement une méthode `reset` lors du changement d'un attribut.
    - Il crée un getter et un setter pour un attribut donné, avec la logique d'appel de la méthode `reset` lorsque le setter est invoqué.
+
+2. **`invalidate_on_change`**
+
+   - Décorateur conçu pour invalider uniquement les valeurs dérivées d'un attribut lors de son changement.
+   - Les valeurs invalidées sont ajoutées à l'ensemble `_dirty` de l'instance et recalculées à leur prochaine utilisation.
+   - Les dépendances de chaque attribut sont enregistrées dans le dictionnaire de classe `_dependencies` (utile pour les modifications groupées).
 """
 
 
@@ -42,3 +48,38 @@ def reset_on_change(attribute_name: str):
 		return cls
 
 	return decorator
+
+
+##################################################
+def invalidate_on_change(attribute_name: str, *derived: str):
+	"""
+	Décorateur permettant d'invalider les valeurs dérivées d'un attribut lors de son changement (recalcul paresseux).
+
+	Ce décorateur ajoute un getter et un setter pour un attribut donné. Lorsqu'une nouvelle valeur est assignée à cet attribut,
+	les noms des valeurs dérivées sont ajoutés à l'ensemble `_dirty` de l'instance : la classe les recalcule à leur prochaine utilisation.
+	Plusieurs changements successifs n'entraînent donc qu'un seul recalcul, et seules les valeurs qui dépendent de l'attribut sont recalculées.
+
+	:param attribute_name: Nom de l'attribut pour lequel le comportement doit être modifié.
+	                       Cet attribut doit exister dans la classe sous une forme privée (préfixée par un underscore, par ex. `_nom_attribut`).
+	:param derived: Noms des valeurs dérivées à invalider.
+	:return: La classe modifiée avec un getter et un setter pour l'attribut spécifié.
+	"""
+
+	def decorator(cls):
+		private_name = f"_{attribute_name}"
+		dependencies = set(derived)
+
+		@property
+		def prop(self):
+			return getattr(self, private_name)
+
+		@prop.setter
+		def prop(self, value):
+			setattr(self, private_name, value)
+			self._dirty |= dependencies
+
+		setattr(cls, attribute_name, prop)
+		cls._dependencies = {**getattr(cls, "_dependencies", {}), attribute_name: dependencies}  # Copie : pas de partage avec la classe mère
+		return cls
+
+	return decorator
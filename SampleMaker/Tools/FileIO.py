@@ -22,25 +22,47 @@ couvrent les masques booléens, les échantillons avec normalisation, et les pil
 
 3. **Sample TIF Stack IO**
 
-   - `save_stack_as_tif`: Sauvegarde une pile d'images 3D en tant que fichier TIF multi-frame.
+   - `save_stack_as_tif`: Sauvegarde une pile d'images 3D en tant que fichier TIF multi-frame (avec compression sans perte optionnelle).
    - `open_tif_as_stack`: Charge une pile d'images 3D depuis un fichier TIF.
 
+4. **Chunk Store IO**
+
+   - `save_stack_as_chunks`: Sauvegarde une pile d'images 3D dans un dossier de blocs `.npy` (voir `ChunkStore`).
+   - `open_chunks_as_stack`: Charge une pile d'images 3D depuis un dossier de blocs.
+   - `convert_tif_to_chunks`: Convertit un fichier TIF en dossier de blocs, frame par frame.
+   - `convert_chunks_to_tif`: Convertit un dossier de blocs en fichier TIF, frame par frame.
+
+5. **Config IO**
+
+   - `open_config`: Charge un fichier de configuration JSON ou TOML sous forme de dictionnaire.
+
 Constantes :
 
 - `MAX_UI_8` : Valeur maximale pour un entier non signé sur 8 bits (255).
 - `MAX_UI_16` : Valeur maximale pour un entier non signé sur 16 bits (65535).
+- `TIF_COMPRESSIONS` : Liste des compressions sans perte disponibles pour l'écriture TIF.
+- `BIGTIFF_LIMIT` : Taille (en octets) au-delà de laquelle le format BigTIFF est nécessaire.
 
 """
 
+import json
 import os
+import tomllib
+from typing import Any, Dict, Iterator, Optional
 
 import numpy as np
 import tifffile as tiff
 from numpy.typing import NDArray
 from PIL import Image
 
+from SampleMaker.Tools.ChunkStore import ChunkStore
+from SampleMaker.Tools.Profiler import count, is_profiling, span
+from SampleMaker.Tools.Utils import to_uint16
+
 MAX_UI_8 = np.iinfo(np.uint8).max
 MAX_UI_16 = np.iinfo(np.uint16).max
+TIF_COMPRESSIONS = ["none", "zlib", "zstd", "lzw"]  # zstd et lzw nécessitent le paquet imagecodecs pour l'encodage
+BIGTIFF_LIMIT = 2 ** 32 - 2 ** 25					 # Limite du format TIF classique (4 Go moins une marge pour les entêtes)
 
 
 # ==================================================
@@ -55,9 +77,11 @@ def save_boolean_mask_as_png(mask: NDArray[np.bool_], filename: str):
 	:param filename: Chemin du fichier PNG de sortie.
 	"""
 	if mask.ndim != 2: raise ValueError("Le tableau doit être 2D (hauteur, largeur).")
-	grayscale = (mask * MAX_UI_8).astype(np.uint8)  # Convertir le masque booléen en image en niveaux de gris (255 pour True, 0 pour False)
-	image = Image.fromarray(grayscale, mode='L')	# L pour niveau de gris
-	image.save(filename)							# Enregistrement
+	with span("fileio.save_boolean_mask_as_png"):
+		grayscale = (mask * MAX_UI_8).astype(np.uint8)  # Convertir le masque booléen en image en niveaux de gris (255 pour True, 0 pour False)
+		image = Image.fromarray(grayscale, mode='L')	# L pour niveau de gris
+		image.save(filename)							# Enregistrement
+	_count_written(filename)
 
 
 ##################################################
@@ -96,17 +120,18 @@ def save_sample_as_png(sample: NDArray[np.float32], filename: str, percentile: f
 	:param percentile: Percentile de l'intensité max qui deviendra un pixel blanc (par défaut 100%).
 	"""
 	if sample.ndim != 2: raise ValueError("Le tableau doit être 2D (hauteur, largeur).")
+	with span("fileio.save_sample_as_png"):
+		percentile = np.clip(percentile, 0, 100)								# On évite les options bizarres des utilisateurs.
+		if np.fabs(percentile) <= np.finfo(np.float32).eps: grayscale = sample  # Si le percentile est 0 il n'y a pas de mise à l'échelle
+		else:																	# Sinon mise à l'échelle
+			max_i = np.percentile(sample, percentile)							# Calcul du percentile
+			if max_i == 0: grayscale = np.zeros_like(sample, dtype=np.uint8)	# Si le maximum est 0, on remplit l'image avec des valeurs nulles
+			else: grayscale = (sample * MAX_UI_8 / max_i)						# Normalisation entre 0 et 255
 
-	percentile = np.clip(percentile, 0, 100)								# On évite les options bizarres des utilisateurs.
-	if np.fabs(percentile) <= np.finfo(np.float32).eps: grayscale = sample  # Si le percentile est 0 il n'y a pas de mise à l'échelle
-	else:																	# Sinon mise à l'échelle
-		max_i = np.percentile(sample, percentile)							# Calcul du percentile
-		if max_i == 0: grayscale = np.zeros_like(sample, dtype=np.uint8)	# Si le maximum est 0, on remplit l'image avec des valeurs nulles
-		else: grayscale = (sample * MAX_UI_8 / max_i)						# Normalisation entre 0 et 255
-
-	grayscale = np.clip(grayscale, 0, MAX_UI_8).astype(np.uint8)  # On s'assure que toutes les valeurs sont entre 0 et 255.
-	image = Image.fromarray(grayscale, mode='L')				  # L pour niveau de gris
-	image.save(filename)										  # Enregistrement
+		grayscale = np.clip(grayscale, 0, MAX_UI_8).astype(np.uint8)  # On s'assure que toutes les valeurs sont entre 0 et 255.
+		image = Image.fromarray(grayscale, mode='L')				  # L pour niveau de gris
+		image.save(filename)										  # Enregistrement
+	_count_written(filename)
 
 
 ##################################################
@@ -134,19 +159,70 @@ def open_png_as_sample(filename: str, intensity_factor: float = 1.0) -> NDArray[
 # region Sample TIF Stack IO
 # ==================================================
 ##################################################
-def save_stack_as_tif(stack: NDArray[np.float32], filename: str):
+def save_stack_as_tif(stack: NDArray[np.float32], filename: str, compression: str = "none", level: Optional[int] = None, tile: int = 0,
+					  bigtiff: Optional[bool] = None, workers: int = 0):
 	"""
 	Sauvegarde un tableau 3D (ou 2D converti en 3D) dans un fichier TIF multi-frame avec tifffile.
 
+	Les piles générées étant majoritairement composées de fond, une compression sans perte réduit fortement la taille des fichiers.
+	L'encodage des tuiles (ou bandes) de chaque frame peut être réparti sur plusieurs threads par tifffile.
+	Une pile flottante est convertie en entiers 16 bits une frame à la fois (pile projetée en mémoire comprise).
+
 	:param stack: Tableau contenant l'image ou les frames
 				  - Si 2D (hauteur x largeur), convertit en pile 3D avec une seule frame.
 				  - Si 3D (frames x hauteur x largeur), sauvegarde les frames en multi-frame.
 	:param filename: Nom du fichier TIF de sortie.
+	:param compression: Compression sans perte à utiliser parmi `TIF_COMPRESSIONS` (par défaut "none").
+	:param level: Niveau de compression (par défaut celui du codec).
+	:param tile: Taille des tuiles carrées en pixel (multiple de 16), 0 pour un découpage en bandes (par défaut 0).
+	:param bigtiff: Force ou interdit le format BigTIFF, si None il est utilisé lorsque la pile dépasse 4 Go (par défaut None).
+	:param workers: Nombre de threads d'encodage, 0 pour laisser tifffile choisir (par défaut 0).
+	:raises ValueError: Si le tableau n'est pas 2D ou 3D, si la compression est inconnue ou si la taille de tuile n'est pas un multiple de 16.
 	"""
-	if stack.ndim == 2: stack = stack[np.newaxis, ...]		 # Si le tableau est 2D, le transformer en 3D avec une seule frame
+	if stack.ndim == 2: stack = stack[np.newaxis, ...]  # Si le tableau est 2D, le transformer en 3D avec une seule frame
 	if stack.ndim != 3: raise ValueError("Le tableau doit être 2D (hauteur, largeur) ou 3D (frames, hauteur, largeur).")
-	stack = np.clip(stack, 0, MAX_UI_16).astype(np.uint16)   # S'assure que les valeurs sont bien entre 0 et MAX_UI_16 et de type uint16
-	tiff.imwrite(filename, stack, photometric="minisblack")  # Sauvegarde la pile avec tifffile
+	options = _get_tif_options(stack.size * np.dtype(np.uint16).itemsize, compression, level, tile, bigtiff, workers)
+	with span("fileio.save_stack_as_tif"):
+		if stack.dtype == np.uint16: tiff.imwrite(filename, stack, **options)  # Sauvegarde la pile avec tifffile
+		else:
+			# Valeurs arrondies et bornées entre 0 et MAX_UI_16 frame par frame (comme les piles stockées en uint16) :
+			# aucune copie de la pile entière, une pile projetée en mémoire n'est jamais chargée en totalité
+			frames = (to_uint16(frame) for frame in stack)
+			tiff.imwrite(filename, _iter_pages(frames, tile), shape=stack.shape, dtype=np.uint16, **options)
+	_count_written(filename)
+
+
+##################################################
+def _count_written(filename: str):
+	""" Ajoute la taille d'un fichier écrit au compteur `bytes_written` du profileur actif (voir `Profiler`). """
+	if is_profiling(): count("bytes_written", os.path.getsize(filename))
+
+
+##################################################
+def _get_tif_options(nbytes: int, compression: str = "none", level: Optional[int] = None, tile: int = 0, bigtiff: Optional[bool] = None,
+					 workers: int = 0) -> dict:
+	"""
+	Vérifie les options d'écriture TIF et les convertit en arguments pour tifffile.
+
+	:param nbytes: Taille des données non compressées en octets.
+	:param compression: Compression sans perte à utiliser parmi `TIF_COMPRESSIONS`.
+	:param level: Niveau de compression (None pour celui du codec).
+	:param tile: Taille des tuiles carrées en pixel (multiple de 16), 0 pour un découpage en bandes.
+	:param bigtiff: Force ou interdit le format BigTIFF, si None il est utilisé lorsque les données dépassent 4 Go.
+	:param workers: Nombre de threads d'encodage, 0 pour laisser tifffile choisir.
+	:return: Dictionnaire d'arguments pour `tifffile.imwrite`.
+	:raises ValueError: Si la compression est inconnue ou si la taille de tuile n'est pas un multiple de 16.
+	"""
+	if compression not in TIF_COMPRESSIONS: raise ValueError(f"Compression \"{compression}\" inconnue, choix possibles : {TIF_COMPRESSIONS}.")
+	if tile < 0 or tile % 16 != 0: raise ValueError("La taille des tuiles doit être un multiple positif de 16.")
+	if bigtiff is None: bigtiff = nbytes > BIGTIFF_LIMIT  # tifffile ne bascule pas seul en BigTIFF lorsque les données sont compressées
+
+	options = {"photometric": "minisblack", "bigtiff": bigtiff, "maxworkers": workers}
+	if compression != "none":
+		options["compression"] = compression
+		if level is not None: options["compressionargs"] = {"level": level}
+	if tile > 0: options["tile"] = (tile, tile)
+	return options
 
 
 ##################################################
@@ -165,3 +241,128 @@ def open_tif_as_stack(filename: str) -> NDArray[np.float32]:
 # ==================================================
 # endregion Sample TIF Stack IO
 # ==================================================
+
+
+# ==================================================
+# region Chunk Store IO
+# ==================================================
+##################################################
+def save_stack_as_chunks(stack: NDArray[np.float32], directory: str, chunk_frames: int = 64, tile: int = 0):
+	"""
+	Sauvegarde un tableau 3D (ou 2D converti en 3D) dans un dossier de blocs `.npy` avec un manifeste JSON.
+	Le type des données est conservé.
+
+	:param stack: Tableau contenant l'image ou les frames.
+	:param directory: Dossier de sortie.
+	:param chunk_frames: Nombre de frames par bloc (par défaut 64).
+	:param tile: Taille des tuiles spatiales carrées en pixel, 0 pour des frames entières (par défaut 0).
+	"""
+	if stack.ndim == 2: stack = stack[np.newaxis, ...]  # Si le tableau est 2D, le transformer en 3D avec une seule frame
+	if stack.ndim != 3: raise ValueError("Le tableau doit être 2D (hauteur, largeur) ou 3D (frames, hauteur, largeur).")
+	with span("fileio.save_stack_as_chunks"):
+		store = ChunkStore.create(directory, stack.shape, stack.dtype.name, chunk_frames, tile)
+		for key in store.chunk_keys(): store.write_chunk(*key, stack[store.chunk_slices(*key)])
+	count("bytes_written", stack.nbytes)  # Blocs .npy non compressés (entêtes exclus)
+
+
+##################################################
+def open_chunks_as_stack(directory: str) -> NDArray[np.float32]:
+	"""
+	Ouvre un dossier de blocs en tant que pile 3D (frames x hauteur x largeur).
+	La pile est chargée en totalité en mémoire : pour une lecture paresseuse, utiliser `ChunkStore.open` (ou `Stack.open`).
+
+	:param directory: Dossier à ouvrir.
+	:return: Tableau 3D contenant les données (avec conversion en float comme pour les fichiers TIF, lues directement en float).
+	"""
+	return ChunkStore.open(directory).read(np.float32)
+
+
+##################################################
+def convert_tif_to_chunks(filename: str, directory: str, chunk_frames: int = 64, tile: int = 0):
+	"""
+	Convertit un fichier TIF en dossier de blocs sans charger toute la pile en mémoire (un bloc de frames à la fois).
+
+	:param filename: Chemin du fichier TIF à convertir.
+	:param directory: Dossier de sortie.
+	:param chunk_frames: Nombre de frames par bloc (par défaut 64).
+	:param tile: Taille des tuiles spatiales carrées en pixel, 0 pour des frames entières (par défaut 0).
+	"""
+	if not os.path.isfile(filename): raise OSError(f"Le fichier \"{filename}\" est introuvable.")
+	with tiff.TiffFile(filename) as tif:
+		pages = tif.pages
+		first = pages[0]
+		store = ChunkStore.create(directory, (len(pages), *first.shape), first.dtype.name, chunk_frames, tile)
+		for start in range(0, len(pages), chunk_frames):
+			frames = np.stack([pages[i].asarray() for i in range(start, min(start + chunk_frames, len(pages)))])
+			store.write_frames(start, frames)
+
+
+##################################################
+def convert_chunks_to_tif(directory: str, filename: str, compression: str = "none", level: Optional[int] = None, tile: int = 0,
+						  bigtiff: Optional[bool] = None, workers: int = 0):
+	"""
+	Convertit un dossier de blocs en fichier TIF multi-frame sans charger toute la pile en mémoire (une frame à la fois).
+	Les options d'écriture sont celles de `save_stack_as_tif`.
+
+	:param directory: Dossier de blocs à convertir.
+	:param filename: Nom du fichier TIF de sortie.
+	:param compression: Compression sans perte à utiliser (par défaut "none").
+	:param level: Niveau de compression (par défaut celui du codec).
+	:param tile: Taille des tuiles carrées en pixel, 0 pour un découpage en bandes (par défaut 0).
+	:param bigtiff: Force ou interdit le format BigTIFF, si None il est choisi selon la taille de la pile (par défaut None).
+	:param workers: Nombre de threads d'encodage, 0 pour automatique (par défaut 0).
+	"""
+	store = ChunkStore.open(directory)
+	nbytes = int(np.prod(store.shape)) * np.dtype(np.uint16).itemsize
+	options = _get_tif_options(nbytes, compression, level, tile, bigtiff, workers)
+	frames = (to_uint16(store.get_frame(i)) for i in range(len(store)))
+	with span("fileio.convert_chunks_to_tif"): tiff.imwrite(filename, _iter_pages(frames, tile), shape=store.shape, dtype=np.uint16, **options)
+	_count_written(filename)
+
+
+##################################################
+def _iter_pages(frames: Iterator[NDArray[np.uint16]], tile: int = 0) -> Iterator[NDArray[np.uint16]]:
+	"""
+	Découpe des frames pour une écriture TIF depuis un itérateur : tifffile attend les frames entières pour un découpage en bandes,
+	mais les tuiles une à une (dans l'ordre des lignes, celles du bord étant complétées par tifffile) pour un fichier en tuiles.
+
+	:param frames: Frames 2D à écrire.
+	:param tile: Taille des tuiles carrées en pixel, 0 pour un découpage en bandes (par défaut 0).
+	:return: Un itérateur sur les frames ou sur leurs tuiles.
+	"""
+	for frame in frames:
+		if tile <= 0: yield frame
+		else:
+			for y in range(0, frame.shape[0], tile):
+				for x in range(0, frame.shape[1], tile): yield frame[y:y + tile, x:x + tile]
+
+# ==================================================
+# endregion Chunk Store IO
+# ==================================================
+
+# ==================================================
+# region Config IO
+# ==================================================
+##################################################
+def open_config(filename: str) -> Dict[str, Any]:
+	"""
+	Charge un fichier de configuration JSON (`.json`) ou TOML (`.toml`).
+
+	:param filename: Chemin du fichier de configuration.
+	:return: Le contenu du fichier sous forme de dictionnaire.
+	:raises OSError: Si le fichier est introuvable.
+	:raises ValueError: Si l'extension n'est pas reconnue ou si le contenu n'est pas un dictionnaire.
+	"""
+	if not os.path.isfile(filename): raise OSError(f"Le fichier \"{filename}\" est introuvable.")
+	extension = os.path.splitext(filename)[1].lower()
+	if extension == ".toml":
+		with open(filename, "rb") as f: config = tomllib.load(f)
+	elif extension == ".json":
+		with open(filename, "r", encoding="utf-8") as f: config = json.load(f)
+	else: raise ValueError(f"Le format de configuration \"{extension}\" n'est pas reconnu (JSON ou TOML).")
+	if not isinstance(config, dict): raise ValueError("La configuration doit être un dictionnaire.")
+	return config
+
+# ==================================================
+# endregion Config IO
+# ==================================================
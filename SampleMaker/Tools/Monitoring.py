@@ -1,10 +1,24 @@
 """
-Module de surveillance des ressources système pendant l'exécution de tests.
+Module de surveillance des ressources système pendant l'exécution de tests ou d'une génération.
 
 Ce fichier contient une classe principale `Monitoring` permettant de suivre en temps réel l'utilisation des
 ressources système (CPU, mémoire, disque) durant l'exécution de tests. Il offre des fonctionnalités de surveillance,
 de mise à jour des données et de visualisation graphique des résultats.
 
+Le monitoring s'utilise aussi comme gestionnaire de contexte autour de n'importe quelle génération (interface, ligne de commande ou script).
+Les phases (`add_phase`) sont marquées comme les tests, et le débit (`add_throughput`) ajoute les courbes de frames et de molécules par seconde.
+Les spans d'un `Profiler` peuvent aussi être ajoutés comme phases (`add_profile`) :
+
+```python
+with Monitoring(0.5) as monitoring:
+	monitoring.add_phase("Generation")
+	stacker.observers.append(MonitoringObserver(monitoring))  # Voir Generator.StackObserver
+	stack = stacker.generate(1000)
+	monitoring.add_phase("Saving")
+	stack.save("stack.tif")
+monitoring.save("Reports/Generation.html")
+```
+
 **Contenu** :
 
 1. **Classe principale**
@@ -13,30 +27,37 @@ de mise à jour des données et de visualisation graphique des résultats.
 
 2. **Fonctionnalités**
 
-   - Surveillance des ressources système (CPU, mémoire, disque) via `psutil`.
+   - Surveillance des ressources système (CPU, mémoire, disque) via `psutil`, sans attente bloquante.
+   - Stockage des mesures dans un tampon circulaire NumPy pré-alloué.
+   - Décompte des ressources utilisées par chaque test (durée, temps CPU, pic de mémoire, écritures) et comparaison entre deux exécutions.
    - Génération de graphiques interactifs avec `plotly`.
    - Sauvegarde des résultats au format texte, HTML ou JSON.
    - Gestion des intervalles de mise à jour via des threads.
+   - Utilisation comme gestionnaire de contexte avec des phases et des courbes de débit (frames et molécules par seconde).
 
 """
 
 import os
-import platform
 import re
 import threading
 import time
 from dataclasses import dataclass, field
-from typing import List
+from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
 import plotly.express as px  # Pour accéder aux couleurs qualitatives
 import plotly.graph_objects as go
 import psutil
+from numpy.typing import NDArray
 from plotly.subplots import make_subplots
 
 from SampleMaker.Tools.Drawing import draw_test_section, get_color_map_by_name
+from SampleMaker.Tools.Profiler import Profiler
 from SampleMaker.Tools.Utils import print_warning
 
 MEMORY_RATIO = 1.0 / (1024 * 1024)
+IO_COUNTERS = hasattr(psutil.Process, "io_counters")  # Indisponible sous macOS
+N_SERIES = 6  # Séries du tampon : timestamps, CPU, mémoire, octets écrits, frames et molécules cumulées
 
 
 ##################################################
@@ -49,26 +70,46 @@ class Monitoring:
 	Elle fournit des fonctionnalités pour démarrer et arrêter la surveillance, mettre à jour les valeurs des ressources,
 	et générer des graphiques ou des fichiers texte avec ces données.
 
+	Les mesures ne bloquent pas : l'utilisation CPU de chaque processus (principal et enfants) est calculée depuis la mesure précédente
+	(`cpu_percent` amorcé à la découverte du processus) et toutes ses informations sont lues en un seul passage (`oneshot`).
+	La période d'échantillonnage reste donc égale à `interval` quel que soit le nombre de processus enfants.
+	Les mesures sont stockées dans un tampon circulaire NumPy pré-alloué de `capacity` entrées (les plus anciennes sont écrasées).
+
 	Attributs :
-		- **cpu (List[float])** : Liste des valeurs d'utilisation du CPU.
-		- **memory (List[float])** : Liste des valeurs d'utilisation de la mémoire.
-		- **disk (List[float])** : Liste des valeurs d'utilisation du disque.
-		- **times (List[float])** : Liste des timestamps correspondant aux valeurs des ressources.
-		- **monitoring (bool)** : Indique si la surveillance est en cours ou non.
+		- **interval (float)** : Intervalle de temps entre chaque mise à jour des données en secondes.
+		- **capacity (int)** : Nombre maximal de mesures conservées (par défaut 65536, soit près de 2 heures à 0.1 s).
+		- **buffer (NDArray)** : Tampon circulaire des mesures (timestamps, CPU, mémoire, octets écrits, frames et molécules cumulées).
+		- **cpu, memory, disk, times (NDArray)** : Séries lisibles (CPU en %, mémoire et disque en Mo, temps en s), calculées à l'arrêt.
+		- **fps, mps (NDArray)** : Débits en frames et en molécules par seconde, calculés à l'arrêt.
+		- **processes (Dict[int, psutil.Process])** : Processus suivis (principal et enfants) par PID.
 		- **thread (threading.Thread)** : Le thread qui exécute le monitoring.
 		- **tests_info (List[dict])** : Liste des informations relatives aux tests exécutés.
-		- **interval (float)** : Intervalle de temps entre chaque mise à jour des données en secondes.
+		- **tests_usage (List[dict])** : Ressources utilisées par chaque test (voir `begin_test` et `end_test`).
 
 	"""
 	interval: float = 1.0
-	_cpu: List[float] = field(init=False, default_factory=list)
+	capacity: int = 65536
+	_buffer: NDArray[np.float64] = field(init=False, default_factory=lambda: np.zeros((N_SERIES, 0)))
+	_count: int = field(init=False, default=0)
+	_cpu: NDArray[np.float64] = field(init=False, default_factory=lambda: np.zeros(0))
 	# gpu: List[float] = field(init=False, default_factory=list)
-	_memory: List[float] = field(init=False, default_factory=list)
-	_disk: List[float] = field(init=False, default_factory=list)
-	_times: List[float] = field(init=False, default_factory=list)
-	_monitoring: bool = field(init=False, default=False)
+	_memory: NDArray[np.float64] = field(init=False, default_factory=lambda: np.zeros(0))
+	_disk: NDArray[np.float64] = field(init=False, default_factory=lambda: np.zeros(0))
+	_times: NDArray[np.float64] = field(init=False, default_factory=lambda: np.zeros(0))
+	_fps: NDArray[np.float64] = field(init=False, default_factory=lambda: np.zeros(0))
+	_mps: NDArray[np.float64] = field(init=False, default_factory=lambda: np.zeros(0))
+	_frames: int = field(init=False, default=0)		# Frames générées depuis le démarrage (voir `add_throughput`)
+	_molecules: int = field(init=False, default=0)  # Molécules rendues depuis le démarrage
+	_processes: Dict[int, psutil.Process] = field(init=False, default_factory=dict)
+	_written: Dict[int, int] = field(init=False, default_factory=dict)  # Derniers octets écrits de chaque processus suivi
+	_exited_written: int = field(init=False, default=0)				   # Octets écrits par les processus terminés
+	_stop_event: threading.Event = field(init=False, default_factory=threading.Event)
 	_thread: threading.Thread = field(init=False, default_factory=threading.Thread)
 	_tests_info: List[dict] = field(init=False, default_factory=list)  # Liste des informations des tests
+	_tests_usage: List[Dict[str, Any]] = field(init=False, default_factory=list)  # Ressources utilisées par chaque test
+	_current_test: Optional[Tuple[str, Tuple[float, float, int, int]]] = field(init=False, default=None)
+	_peak_memory: int = field(init=False, default=0)
+	_lock: threading.Lock = field(init=False, repr=False, default_factory=threading.Lock)
 	_figure: go.Figure = field(init=False, default_factory=go.Figure)
 
 	# ==================================================
@@ -80,37 +121,95 @@ class Monitoring:
 		"""
 		Retourne le nombre d'entrées (mesures) dans le monitoring.
 
-		:return: Nombre d'entrées dans les listes de données.
+		:return: Nombre de mesures conservées (au plus `capacity`).
 		"""
-		return len(self._times)
+		return min(self._count, self.capacity)
+
+	##################################################
+	@property
+	def running(self) -> bool:
+		""" Indique si la surveillance est en cours. """
+		return self._thread.is_alive()
 
 	##################################################
 	def _reset(self):
 		""" Réinitialise toutes les données de monitoring (CPU, mémoire, disque, etc.). """
-		self._cpu = []
+		self._buffer = np.zeros((N_SERIES, self.capacity))
+		self._count, self._frames, self._molecules = 0, 0, 0
+		self._cpu, self._memory, self._disk, self._times = np.zeros(0), np.zeros(0), np.zeros(0), np.zeros(0)
+		self._fps, self._mps = np.zeros(0), np.zeros(0)
 		# self.gpu = []
-		self._memory = []
-		self._disk = []
-		self._times = []
-		self._tests_info = []
-		self._monitoring = False
+		self._processes, self._written, self._exited_written = {}, {}, 0
+		self._tests_info, self._tests_usage, self._current_test, self._peak_memory = [], [], None, 0
+		self._stop_event = threading.Event()
 		self._thread = threading.Thread()
 
+	##################################################
+	def _get_processes(self) -> Dict[int, psutil.Process]:
+		"""
+		Met à jour la liste des processus suivis (processus courant et tous ses enfants).
+
+		Les nouveaux processus sont amorcés (`cpu_percent` sans intervalle) : leur utilisation CPU est mesurée à partir de la mesure suivante.
+		Les octets écrits par les processus terminés sont conservés pour que le total ne diminue pas.
+
+		:return: Les processus suivis par PID.
+		"""
+		pid = os.getpid()
+		if pid not in self._processes: self._processes = {pid: psutil.Process(pid)}
+		try: children = self._processes[pid].children(recursive=True)
+		except (psutil.Error, OSError): children = []  # Un enfant s'est terminé pendant le parcours de /proc
+		current = {pid} | {child.pid for child in children}
+		for child in children:
+			if child.pid in self._processes: continue
+			try: child.cpu_percent(interval=None)  # Amorçage (la première valeur est toujours 0)
+			except (psutil.Error, OSError): continue
+			self._processes[child.pid] = child
+		for old in [p for p in self._processes if p not in current]:
+			del self._processes[old]
+			self._exited_written += self._written.pop(old, 0)
+		return self._processes
+
+	##################################################
+	def _read(self, percent: bool) -> Tuple[float, float, int, int]:
+		"""
+		Lit en un seul passage (`oneshot`) l'utilisation des ressources de tous les processus suivis.
+
+		:param percent: Si `True`, l'utilisation CPU depuis la lecture précédente est calculée (réservé au thread de mesure).
+		:return: Utilisation CPU (en % d'un cœur), temps CPU cumulé (en s), mémoire (en octets) et octets écrits cumulés.
+		"""
+		with self._lock:
+			root, cpu, cpu_time, memory = os.getpid(), 0.0, 0.0, 0
+			for pid, proc in list(self._get_processes().items()):
+				try:
+					with proc.oneshot():
+						if percent: cpu += proc.cpu_percent(interval=None)
+						times = proc.cpu_times()
+						cpu_time += times.user + times.system
+						# Les enfants terminés sont comptés dans le temps du processus principal
+						if pid == root: cpu_time += getattr(times, "children_user", 0) + getattr(times, "children_system", 0)
+						memory += proc.memory_info().rss
+						if IO_COUNTERS: self._written[pid] = proc.io_counters().write_bytes
+				except (psutil.Error, OSError): continue  # Processus terminé entre le parcours et la lecture
+			self._peak_memory = max(self._peak_memory, memory)
+			return cpu, cpu_time, memory, self._exited_written + sum(self._written.values())
+
 	##################################################
 	def _update(self):
-		""" Met à jour les valeurs d'utilisation du CPU, de la mémoire et du disque en fonction des processus en cours. """
-		# Sélection de processus
-		pytest_pid = os.getpid()  # PID de pytest
-		pytest_proc = psutil.Process(pytest_pid)  # Récupère le processus parent
-		children = pytest_proc.children(recursive=True)  # Cible les processus enfants
-		processes = [pytest_proc] + children  # Inclut le processus principal et ses enfants
-
-		self._cpu.append(sum(proc.cpu_percent(interval=self.interval) for proc in processes))
-		self._memory.append(sum(proc.memory_info().rss for proc in processes))
-		# "Darwin" est le nom de macOS dans platform.system()
-		if platform.system() != "Darwin": self._disk.append(sum(proc.io_counters().write_bytes for proc in processes))
-		else: self._disk.append(0)  # pragma: no cover
-		self._times.append(time.time())
+		""" Ajoute une mesure de l'utilisation du CPU, de la mémoire et du disque des processus en cours (sans attente). """
+		cpu, _, memory, written = self._read(True)
+		index = self._count % self.capacity
+		self._buffer[:, index] = (time.time(), cpu, memory, written, self._frames, self._molecules)
+		self._count += 1
+
+	##################################################
+	def _get_series(self) -> Tuple[NDArray[np.float64], ...]:
+		"""
+		Retourne les mesures conservées dans l'ordre chronologique.
+
+		:return: Timestamps, CPU, mémoire, octets écrits, frames et molécules cumulés.
+		"""
+		if self._count <= self.capacity: return tuple(self._buffer[:, :self._count])
+		return tuple(np.roll(self._buffer, -(self._count % self.capacity), axis=1))
 
 	##################################################
 	def start(self, interval: float = 1.0):
@@ -121,22 +220,32 @@ class Monitoring:
 		"""
 		self._reset()
 		self.interval = interval
-		self._monitoring = True
-		self._thread = threading.Thread(target=self.monitor)
+		self._update()  # Mesure initiale (amorçage de l'utilisation CPU des processus, débit nul)
+		self._thread = threading.Thread(target=self.monitor, daemon=True)
 		self._thread.start()
 
+	##################################################
+	def __enter__(self) -> "Monitoring":
+		self.start(self.interval)
+		return self
+
+	##################################################
+	def __exit__(self, *_):
+		self.stop()
+
 	##################################################
 	def monitor(self):
-		""" Surveille les ressources en continu dans un thread séparé. """
-		while self._monitoring:
+		""" Surveille les ressources en continu dans un thread séparé (une mesure toutes les `interval` secondes, sans dérive). """
+		next_time = time.perf_counter() + self.interval
+		while not self._stop_event.wait(max(0.0, next_time - time.perf_counter())):
 			self._update()
-			time.sleep(self.interval)
+			next_time += self.interval
 
 	##################################################
 	def stop(self):
 		""" Arrête la surveillance et effectue une dernière mise à jour des valeurs. """
-		self._monitoring = False
-		self._thread.join()
+		self._stop_event.set()
+		if self._thread.is_alive(): self._thread.join()
 		self._update()  # Dernière entrée
 		self._update_array_for_readability()
 		self._draw()
@@ -154,6 +263,107 @@ class Monitoring:
 			test = match.group(2).replace('_', ' ').title()  # Récupère le nom du test et change la casse
 			self._tests_info.append({"File": file, "Test": test, "Timestamp": time.time()})
 
+	##################################################
+	def add_phase(self, name: str, detail: str = ""):
+		"""
+		Marque le début d'une phase (elle dure jusqu'à la phase suivante), affichée comme les tests sur les graphiques.
+
+		:param name: Nom de la phase (les phases de même nom ont la même couleur).
+		:param detail: Précision affichée avec le nom (par défaut aucune).
+		"""
+		self._tests_info.append({"File": name, "Test": detail, "Timestamp": time.time()})
+
+	##################################################
+	def add_profile(self, profiler: Profiler, min_duration: Optional[float] = None):
+		"""
+		Ajoute les exécutions des spans d'un profileur comme des phases (voir `Profiler`), à appeler avant `stop`.
+		Chaque exécution assez longue devient une phase à sa date réelle (`Profiler.start_time`), avec sa durée en précision :
+		le profil est ainsi affiché sur les graphiques des ressources.
+
+		:param profiler: Le profileur de la génération.
+		:param min_duration: Durée minimale en secondes des exécutions ajoutées, si None l'intervalle des mesures (par défaut None).
+		"""
+		if min_duration is None: min_duration = self.interval
+		for name, start, duration in profiler.events:
+			if duration >= min_duration: self._tests_info.append({"File": name, "Test": f"{duration:.2f} s", "Timestamp": profiler.start_time + start})
+		self._tests_info.sort(key=lambda phase: phase["Timestamp"])
+
+	##################################################
+	def add_throughput(self, frames: int = 1, molecules: int = 0):
+		"""
+		Ajoute des frames générées et des molécules rendues aux compteurs de débit (peut être appelé depuis le thread de génération).
+
+		:param frames: Nombre de frames générées (par défaut 1).
+		:param molecules: Nombre de molécules rendues (par défaut 0).
+		"""
+		with self._lock:
+			self._frames += frames
+			self._molecules += molecules
+
+	##################################################
+	def begin_test(self, name: str):
+		"""
+		Commence le décompte des ressources utilisées par un test.
+
+		:param name: Identifiant du test (par exemple "Tests/test_<file>.py::test_<test_name>").
+		"""
+		cpu_time, memory, written = self._read(False)[1:]
+		self._peak_memory = memory
+		self._current_test = (name, (time.perf_counter(), cpu_time, memory, written))
+
+	##################################################
+	def end_test(self) -> Optional[Dict[str, Any]]:
+		"""
+		Termine le décompte du test en cours et l'ajoute à la liste des ressources par test.
+
+		Le pic de mémoire est le maximum des mesures prises pendant le test (thread de mesure, début et fin du test).
+
+		:return: Ressources utilisées par le test (durée et temps CPU en s, pic de mémoire et écritures en Mo) ou None si aucun test n'est en cours.
+		"""
+		if self._current_test is None: return None
+		_, cpu_time, memory, written = self._read(False)
+		name, (start, start_cpu, start_memory, start_written) = self._current_test
+		usage = {"test": name, "duration": time.perf_counter() - start, "cpu_time": cpu_time - start_cpu,
+				 "peak_memory": (self._peak_memory - start_memory) * MEMORY_RATIO, "disk_written": max(written - start_written, 0) * MEMORY_RATIO}
+		self._tests_usage.append(usage)
+		self._current_test = None
+		return usage
+
+	##################################################
+	@property
+	def tests_usage(self) -> List[Dict[str, Any]]:
+		"""
+		Retourne les ressources utilisées par chaque test (voir `end_test`).
+
+		:return: Liste des ressources par test, dans l'ordre d'exécution.
+		"""
+		return self._tests_usage
+
+	##################################################
+	@staticmethod
+	def compare_tests_usage(reference: List[Dict[str, Any]], current: List[Dict[str, Any]], key: str = "cpu_time",
+							threshold: float = 0.1, minimum: float = 0.05) -> Dict[str, Dict[str, Any]]:
+		"""
+		Compare les ressources par test de deux exécutions (par exemple la clé `resources` de deux rapports JSON).
+
+		:param reference: Ressources par test de référence.
+		:param current: Ressources par test à comparer.
+		:param key: Ressource comparée ("duration", "cpu_time", "peak_memory" ou "disk_written", par défaut "cpu_time").
+		:param threshold: Variation relative tolérée (par défaut 0.1, soit 10 %).
+		:param minimum: Variation absolue en dessous de laquelle un test est stable, pour ignorer les tests très courts (par défaut 0.05).
+		:return: Dictionnaire associant à chaque test commun les valeurs, leur rapport et le statut ("heavier", "lighter" ou "stable").
+		"""
+		references = {usage["test"]: usage[key] for usage in reference}
+		comparison = {}
+		for usage in current:
+			if usage["test"] not in references: continue
+			ref, value = references[usage["test"]], usage[key]
+			ratio = value / ref if ref > 0 else (1.0 if value <= 0 else float("inf"))
+			status = "stable"
+			if abs(value - ref) > minimum: status = "heavier" if ratio > 1 + threshold else "lighter" if ratio < 1 - threshold else "stable"
+			comparison[usage["test"]] = {"reference": ref, "current": value, "ratio": ratio, "status": status}
+		return comparison
+
 	##################################################
 	def _update_array_for_readability(self, round_time: int = 2):
 		"""
@@ -161,16 +371,18 @@ class Monitoring:
 
 		:param round_time: Le nombre de décimales pour arrondir les timestamps.
 		"""
-		first_time = self._times[0]
+		times, cpu, memory, disk, frames, molecules = self._get_series()
+		first_time = times[0]
 
 		for test_info in self._tests_info: test_info["Timestamp"] = round(test_info["Timestamp"] - first_time, round_time)
-		self._times = [round(t - first_time, round_time) for t in self._times]
+		self._times = np.round(times - first_time, round_time)
 
-		num_cores = psutil.cpu_count(logical=True)
-		self._cpu = [c / num_cores for c in self._cpu]  # Division par le nombre de CPU
-		self._memory = [m * MEMORY_RATIO for m in self._memory]  # Passage en Mo
-		self._disk = [(self._disk[i] - self._disk[i - 1]) * MEMORY_RATIO for i in range(1, len(self._disk))]  # Passage en Mo et en delta d'utilisation
-		self._disk.insert(0, 0)  # Ajouter 0 au début pour avoir une taille correcte
+		self._cpu = cpu / psutil.cpu_count(logical=True)  # Division par le nombre de CPU
+		self._memory = memory * MEMORY_RATIO  # Passage en Mo
+		self._disk = np.maximum(np.diff(disk, prepend=disk[0]), 0) * MEMORY_RATIO  # Passage en Mo et en delta d'utilisation (0 au début)
+		elapsed = np.maximum(np.diff(times, prepend=times[0]), 1e-9)  # Durée depuis la mesure précédente
+		self._fps = np.diff(frames, prepend=frames[0]) / elapsed
+		self._mps = np.diff(molecules, prepend=molecules[0]) / elapsed
 
 	# ==================================================
 	# endregion Monitoring Manipulation
@@ -195,14 +407,17 @@ class Monitoring:
 
 	##################################################
 	def _draw(self):
-		""" Génère un graphique interactif des ressources utilisées pendant les tests et l'enregistre. """
-		self._figure = make_subplots(rows=3, cols=1, shared_xaxes=True, vertical_spacing=0.05,
-									 subplot_titles=("CPU Usage (%)", "Memory Usage (Mo)", "Disk Usage (IO Mo)"))
-		color_map = get_color_map_by_name([test["File"] for test in self._tests_info], px.colors.qualitative.Plotly)
-
+		""" Génère un graphique interactif des ressources utilisées pendant les tests et l'enregistre (avec le débit s'il a été suivi). """
 		params = [{"y": self._cpu, "name": "CPU Usage (%)", "line": dict(color="blue")},
 				  {"y": self._memory, "name": "Memory Usage (Mo)", "line": dict(color="green")},
 				  {"y": self._disk, "name": "Disk Usage (IO Mo)", "line": dict(color="red")}]
+		if self._frames > 0:
+			params += [{"y": self._fps, "name": "Throughput (frames/s)", "line": dict(color="purple")},
+					   {"y": self._mps, "name": "Throughput (molecules/s)", "line": dict(color="orange")}]
+		rows = len(params)
+		self._figure = make_subplots(rows=rows, cols=1, shared_xaxes=True, vertical_spacing=0.05,
+									 subplot_titles=[param["name"] for param in params])
+		color_map = get_color_map_by_name([test["File"] for test in self._tests_info], px.colors.qualitative.Plotly)
 
 		for i in range(len(params)):
 			self._figure.add_trace(go.Scatter(x=self._times, y=params[i]["y"], mode="lines",
@@ -210,13 +425,13 @@ class Monitoring:
 			draw_test_section(self._figure, self.get_y_range(params[i]["y"]), self._tests_info, color_map, self._times[-1], i + 1)
 
 		# add_color_map_legend
-		self._figure.update_layout(width=1200, height=600,
+		self._figure.update_layout(width=1200, height=200 * rows,
 								   margin={"t": 50, "l": 5, "r": 5, "b": 5},
 								   title_text="Resource Usage Over Time", showlegend=False)
-		for i in range(3):
+		for i in range(rows):
 			self._figure.update_yaxes(showgrid=False, row=i + 1, col=1)  # Supprimer la grille verticale
 			self._figure.update_xaxes(showgrid=False, row=i + 1, col=1)  # Supprimer la grille horizontale
-		self._figure.update_xaxes(title_text="Time (s)", row=3, col=1)  # Place le titre X uniquement sur le graphique du bas
+		self._figure.update_xaxes(title_text="Time (s)", row=rows, col=1)  # Place le titre X uniquement sur le graphique du bas
 
 	# ==================================================
 	# endregion Drawing
@@ -241,6 +456,7 @@ class Monitoring:
 			- CPU Usage : Utilisation du CPU.
 			- Memory Usage : Utilisation de la mémoire.
 			- Disk Usage : Utilisation du disque.
+			- Throughput : Débits en frames et en molécules par seconde (si le débit a été suivi).
 			- Liste des tests : Détails des tests effectués, incluant le fichier, le test et le timestamp.
 
 		:param filename: Le chemin et nom du fichier dans lequel les données de monitoring seront enregistrées.
@@ -258,11 +474,14 @@ class Monitoring:
 			self._figure.write_json(filename)
 		else:
 			with open(filename, "w", encoding="utf-8") as f:
-				f.write(f"Timestamps : {self._times}\n")
-				f.write(f"CPU Usage : {self._cpu}\n")
+				f.write(f"Timestamps : {self._times.tolist()}\n")
+				f.write(f"CPU Usage : {self._cpu.tolist()}\n")
 				# f.write(f"GPU Usage : {self.gpu}\n")
-				f.write(f"Memory Usage : {self._memory}\n")
-				f.write(f"Disk Usage : {self._disk}\n")
+				f.write(f"Memory Usage : {self._memory.tolist()}\n")
+				f.write(f"Disk Usage : {self._disk.tolist()}\n")
+				if self._frames > 0:
+					f.write(f"Throughput (frames/s) : {self._fps.tolist()}\n")
+					f.write(f"Throughput (molecules/s) : {self._mps.tolist()}\n")
 				f.write(f"Liste des tests : \n")
 				for test in self._tests_info: f.write(f"{test["File"]}, {test["Test"]}, {test["Timestamp"]}\n")
 
@@ -273,9 +492,9 @@ class Monitoring:
 
 		:return: Chaîne décrivant les données de monitoring.
 		"""
-		return (f"{self.n_entries} entrées.\nTimestamps : {self._times}\n"
-				f"CPU Usage : {self._cpu}\n"  # GPU Usage : {self.gpu}\n"
-				f"Memory Usage : {self._memory}\nDisk Usage : {self._disk}")
+		return (f"{self.n_entries} entrées.\nTimestamps : {self._times.tolist()}\n"
+				f"CPU Usage : {self._cpu.tolist()}\n"  # GPU Usage : {self.gpu}\n"
+				f"Memory Usage : {self._memory.tolist()}\nDisk Usage : {self._disk.tolist()}")
 
 	##################################################
 	def __str__(self) -> str: return self.tostring()
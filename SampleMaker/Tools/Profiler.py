@@ -0,0 +1,292 @@
+"""
+Fichier contenant le profileur de la génération : des intervalles de temps nommés (spans) et des compteurs.
+
+Le `Monitoring` suit l'utilisation globale des ressources, mais ne dit pas où une génération lente passe son temps.
+Les étapes coûteuses de la génération sont instrumentées :
+
+- **Spans** : `sampler.generate_sample`, `sampler.localisation`, `sampler.psf`, `noiser.apply`, `stacker.generate`
+  et les fonctions d'écriture de `FileIO` (`fileio.<fonction>`).
+- **Compteurs** : `molecules` (molécules rendues), `pixels` (pixels calculés pour les PSF), `frames` (frames générées),
+  `bytes_allocated` (images et piles allouées) et `bytes_written` (octets écrits sur le disque).
+
+Le profileur n'est actif qu'à l'intérieur d'un bloc `with Profiler()` (ou entre `enable` et `disable`).
+Sans profileur actif, `span` retourne un contexte vide partagé et `count` ne fait rien : l'instrumentation ne coûte qu'une lecture de variable.
+Les mesures ne suivent que le processus courant (les processus d'un `Sweep` ne sont pas profilés).
+
+**Usage** :
+
+```python
+with Profiler() as profiler:
+	stacker.generate(100)
+profiler.save("Reports/Profile.json")  # Rapport agrégé
+profiler.save("Reports/Profile.html")  # Graphiques plotly (temps total par span et chronologie)
+monitoring.add_profile(profiler)  # Spans affichés comme phases sur les graphiques du Monitoring (avant monitoring.stop())
+```
+"""
+
+import contextlib
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+_ACTIVE: Optional["Profiler"] = None	   # Profileur actif (None : instrumentation désactivée)
+_NULL_SPAN = contextlib.nullcontext()  # Contexte vide partagé, retourné lorsque le profileur est désactivé
+
+
+##################################################
+@dataclass
+class SpanStats:
+	"""
+	Classe agrégeant les durées d'un span.
+
+	Attributs :
+		- **count (int)** : Nombre d'exécutions.
+		- **total (float)** : Durée totale en secondes.
+		- **min (float)** : Durée minimale en secondes.
+		- **max (float)** : Durée maximale en secondes.
+	"""
+	count: int = 0
+	total: float = 0.0
+	min: float = float("inf")
+	max: float = 0.0
+
+	##################################################
+	def add(self, duration: float):
+		"""
+		Ajoute une exécution.
+
+		:param duration: Durée de l'exécution en secondes.
+		"""
+		self.count += 1
+		self.total += duration
+		self.min = min(self.min, duration)
+		self.max = max(self.max, duration)
+
+	##################################################
+	def tostring(self) -> str:
+		"""
+		Retourne une chaîne de caractères correspondant aux durées du span.
+
+		:return: Une description textuelle des durées.
+		"""
+		mean = self.total / self.count if self.count else 0.0
+		return f"Count: {self.count}, Total: {self.total:.3f} s, Mean: {mean * 1000:.3f} ms, Min: {self.min * 1000:.3f} ms, Max: {self.max * 1000:.3f} ms"
+
+	##################################################
+	def __str__(self) -> str: return self.tostring()
+
+
+##################################################
+@dataclass
+class Profiler:
+	"""
+	Classe collectant les spans et les compteurs de la génération.
+
+	Attributs :
+		- **max_events (int)** : Nombre maximal d'exécutions conservées pour la chronologie (les agrégats restent complets, par défaut 100000).
+		- **spans (Dict[str, SpanStats])** : Durées agrégées de chaque span.
+		- **counters (Dict[str, float])** : Valeur de chaque compteur.
+		- **events (List[Tuple[str, float, float]])** : Exécutions des spans (nom, début depuis l'activation et durée en secondes).
+		- **duration (float)** : Durée de l'activation en secondes (mise à jour à la désactivation).
+	"""
+	max_events: int = 100000
+	spans: Dict[str, SpanStats] = field(init=False, default_factory=dict)
+	counters: Dict[str, float] = field(init=False, default_factory=dict)
+	events: List[Tuple[str, float, float]] = field(init=False, default_factory=list)
+	duration: float = field(init=False, default=0.0)
+	start_time: float = field(init=False, default=0.0)  # Horodatage de l'activation (time.time, voir `Monitoring.add_profile`)
+	_start: float = field(init=False, default=0.0)
+	_previous: Optional["Profiler"] = field(init=False, repr=False, default=None)
+	_lock: threading.Lock = field(init=False, repr=False, default_factory=threading.Lock)
+
+	# ==================================================
+	# region Activation
+	# ==================================================
+	##################################################
+	def enable(self):
+		""" Active le profileur (il remplace le profileur actif jusqu'à sa désactivation). """
+		global _ACTIVE
+		self._previous, _ACTIVE = _ACTIVE, self
+		self.start_time, self._start = time.time(), time.perf_counter()
+
+	##################################################
+	def disable(self):
+		""" Désactive le profileur et réactive le précédent s'il y en avait un. """
+		global _ACTIVE
+		if _ACTIVE is self: _ACTIVE = self._previous
+		self._previous = None
+		self.duration = time.perf_counter() - self._start
+
+	##################################################
+	@property
+	def enabled(self) -> bool:
+		""" Indique si le profileur est le profileur actif. """
+		return _ACTIVE is self
+
+	##################################################
+	def __enter__(self) -> "Profiler":
+		self.enable()
+		return self
+
+	##################################################
+	def __exit__(self, *_):
+		self.disable()
+
+	# ==================================================
+	# endregion Activation
+	# ==================================================
+
+	# ==================================================
+	# region Recording
+	# ==================================================
+	##################################################
+	def record(self, name: str, start: float, end: float):
+		"""
+		Ajoute une exécution d'un span (peut être appelé depuis plusieurs threads).
+
+		:param name: Nom du span.
+		:param start: Début de l'exécution (time.perf_counter).
+		:param end: Fin de l'exécution (time.perf_counter).
+		"""
+		with self._lock:
+			if name not in self.spans: self.spans[name] = SpanStats()
+			self.spans[name].add(end - start)
+			if len(self.events) < self.max_events: self.events.append((name, start - self._start, end - start))
+
+	##################################################
+	def add(self, name: str, value: float):
+		"""
+		Incrémente un compteur (peut être appelé depuis plusieurs threads).
+
+		:param name: Nom du compteur.
+		:param value: Valeur à ajouter.
+		"""
+		with self._lock: self.counters[name] = self.counters.get(name, 0) + value
+
+	# ==================================================
+	# endregion Recording
+	# ==================================================
+
+	# ==================================================
+	# region IO
+	# ==================================================
+	##################################################
+	def to_dict(self) -> Dict[str, Any]:
+		"""
+		Retourne le rapport agrégé.
+
+		:return: Dictionnaire avec la durée, les spans (triés par durée totale décroissante), les compteurs et les exécutions.
+		"""
+		spans = sorted(self.spans.items(), key=lambda item: -item[1].total)
+		return {"duration": self.duration, "spans": {name: asdict(stats) for name, stats in spans}, "counters": dict(self.counters),
+				"events": [list(event) for event in self.events]}
+
+	##################################################
+	def draw(self):
+		"""
+		Génère les graphiques plotly du profil : temps total par span et chronologie des exécutions.
+
+		:return: La figure plotly.
+		"""
+		import plotly.graph_objects as go  # Import local : plotly n'est nécessaire que pour l'affichage
+		from plotly.subplots import make_subplots
+
+		names = [name for name, _ in sorted(self.spans.items(), key=lambda item: item[1].total)]
+		figure = make_subplots(rows=2, cols=1, vertical_spacing=0.12, subplot_titles=("Total Time per Span (s)", "Timeline (s)"))
+		figure.add_trace(go.Bar(x=[self.spans[name].total for name in names], y=names, orientation="h", marker=dict(color="blue"),
+								text=[f"x{self.spans[name].count}" for name in names]), row=1, col=1)
+		for name in names:
+			starts = [start for event, start, _ in self.events if event == name]
+			durations = [duration for event, _, duration in self.events if event == name]
+			figure.add_trace(go.Bar(x=durations, y=[name] * len(starts), base=starts, orientation="h", name=name), row=2, col=1)
+		counters = ", ".join(f"{name}: {value:.4g}" for name, value in self.counters.items())
+		figure.update_layout(width=1200, height=600, margin={"t": 80, "l": 5, "r": 5, "b": 5}, barmode="overlay",
+							 title_text=f"Profile ({self.duration:.2f} s) - {counters}", showlegend=False)
+		return figure
+
+	##################################################
+	def save(self, filename: str):
+		"""
+		Sauvegarde le profil en fonction de l'extension du fichier :
+			- `.json` : Rapport agrégé (voir `to_dict`).
+			- `.html` : Graphiques plotly (voir `draw`).
+			- Pour d'autres formats, le profil est enregistré sous forme de texte brut.
+
+		:param filename: Le chemin et nom du fichier de sortie.
+		"""
+		directory = os.path.dirname(filename)
+		if directory: os.makedirs(directory, exist_ok=True)
+		_, extension = os.path.splitext(filename)
+		if extension == ".json":
+			with open(filename, "w", encoding="utf-8") as f: json.dump(self.to_dict(), f, indent=4)
+		elif extension == ".html": self.draw().write_html(filename)
+		else:
+			with open(filename, "w", encoding="utf-8") as f: f.write(self.tostring())
+
+	##################################################
+	def tostring(self) -> str:
+		"""
+		Retourne une chaîne de caractères correspondant au profil (un span ou un compteur par ligne).
+
+		:return: Une description textuelle du profil.
+		"""
+		lines = [f"Profile: {self.duration:.3f} s"]
+		lines += [f"{name}: {stats}" for name, stats in sorted(self.spans.items(), key=lambda item: -item[1].total)]
+		lines += [f"{name}: {value:.6g}" for name, value in self.counters.items()]
+		return "\n".join(lines)
+
+	##################################################
+	def __str__(self) -> str: return self.tostring()
+
+# ==================================================
+# endregion IO
+# ==================================================
+
+
+# ==================================================
+# region Instrumentation
+# ==================================================
+##################################################
+@contextlib.contextmanager
+def _span(profiler: Profiler, name: str) -> Iterator[None]:
+	""" Mesure la durée du bloc et l'ajoute au profileur. """
+	start = time.perf_counter()
+	try: yield
+	finally: profiler.record(name, start, time.perf_counter())
+
+
+##################################################
+def span(name: str):
+	"""
+	Retourne un contexte mesurant la durée d'un bloc (contexte vide si aucun profileur n'est actif).
+
+	:param name: Nom du span.
+	:return: Le contexte à utiliser avec `with`.
+	"""
+	profiler = _ACTIVE
+	return _NULL_SPAN if profiler is None else _span(profiler, name)
+
+
+##################################################
+def count(name: str, value: float):
+	"""
+	Incrémente un compteur du profileur actif (ne fait rien si aucun profileur n'est actif).
+
+	:param name: Nom du compteur.
+	:param value: Valeur à ajouter.
+	"""
+	profiler = _ACTIVE
+	if profiler is not None: profiler.add(name, value)
+
+
+##################################################
+def is_profiling() -> bool:
+	""" Indique si un profileur est actif (pour éviter de calculer la valeur d'un compteur inutilement). """
+	return _ACTIVE is not None
+
+# ==================================================
+# endregion Instrumentation
+# ==================================================
@@ -7,6 +7,7 @@ Ce module regroupe des utilitaires pour des tâches courantes et est structuré
 - Gestion de fichiers : manipulation des noms de fichiers et ajout d'extensions ou de suffixes.
 - Affichage : impression de messages colorés pour les erreurs ou avertissements.
 - Dessin : ajout de grilles sur des images représentées sous forme de matrices NumPy.
+- Conversion : conversion des images flottantes en entiers 16 bits.
 
 **Structure** :
 
@@ -24,6 +25,10 @@ Ce module regroupe des utilitaires pour des tâches courantes et est structuré
 3. **Drawing**
 
    - `add_grid` : Ajoute une grille de pixels sur une image représentée sous forme de matrice NumPy.
+
+4. **Conversion**
+
+   - `to_uint16` : Arrondit et borne une image flottante en une seule passe pour la convertir en entiers 16 bits.
 """
 
 from datetime import datetime
@@ -32,6 +37,8 @@ import numpy as np
 from colorama import Fore, Style
 from numpy.typing import NDArray
 
+MAX_UI_16 = np.iinfo(np.uint16).max
+
 
 # ==================================================
 # region File Management
@@ -139,3 +146,25 @@ def add_grid(image: NDArray[np.float32], size_x: int = 10, size_y: int = 10, col
 # ==================================================
 # endregion Drawing
 # ==================================================
+
+
+# ==================================================
+# region Conversion
+# ==================================================
+##################################################
+def to_uint16(image: NDArray[np.float32]) -> NDArray[np.uint16]:
+	"""
+	Convertit une image flottante en entiers 16 bits non signés en bornant et arrondissant les valeurs.
+	La borne et l'arrondi sont faits dans un tampon flottant 32 bits (l'image d'entrée, flottante ou entière, n'est pas modifiée).
+
+	:param image: L'image d'entrée (en valeurs de pixels).
+	:return: L'image arrondie au plus proche et bornée entre 0 et 65535.
+	"""
+	if image.dtype == np.uint16: return image
+	res = np.clip(image, 0, MAX_UI_16, out=np.empty(image.shape, dtype=np.float32))  # Tampon flottant, même pour une image entière
+	res += 0.5  # Les valeurs étant positives, la troncature de x + 0.5 arrondit au plus proche
+	return res.astype(np.uint16)
+
+# ==================================================
+# endregion Conversion
+# ==================================================
@@ -3,27 +3,79 @@ Ce sous-package contient des outils utilitaires pour le projet SampleMaker.
 
 **Modules disponibles** :
 
+- ChunkStore : Fournit un stockage de pile en blocs sur le disque (écritures parallèles, lecture paresseuse).
 - Decorators : Fournit des décorateurs personnalisés.
 - Drawing : Fournit des fonctions de dessin génériques.
 - FileIO : Fournit des fonctions de manipulation de fichiers génériques.
 - Monitoring : Fournit un module de surveillance des ressources système pendant l'exécution de tests.
+- Profiler : Fournit des mesures de durée (spans) et des compteurs de la génération, sans coût lorsqu'il est désactivé.
 - Utils : Fournit des fonctions d'assistance génériques.
 
 **Fonctionnalités principales** :
 
 - Tous les modules peuvent être importés directement via `from SampleMaker.Tools import <module>`.
+- Les modules `Drawing` et `Monitoring` (et leurs fonctions) sont chargés à la première utilisation (PEP 562) :
+  ils dépendent de `plotly` et `psutil`, dont l'importation est coûteuse et inutile pour la génération.
+- `Tools.Monitoring` désigne toujours la classe, même après une importation directe du sous-module `SampleMaker.Tools.Monitoring`.
 
 """
 
 # Exemple d'importation des modules pour un accès direct
-from .Drawing import draw_test_section, get_color_map_by_name
-from .FileIO import open_png_as_boolean_mask, open_png_as_sample, open_tif_as_stack, save_boolean_mask_as_png, save_sample_as_png, save_stack_as_tif
-from .Monitoring import Monitoring
-from .Utils import add_extension, add_grid, add_suffix, get_timestamp_for_files, print_error, print_warning
+import importlib
+import sys
+import types
+
+from .ChunkStore import ChunkStore
+from .FileIO import (convert_chunks_to_tif, convert_tif_to_chunks, open_chunks_as_stack, open_config, open_png_as_boolean_mask, open_png_as_sample,
+					 open_tif_as_stack, save_boolean_mask_as_png, save_sample_as_png, save_stack_as_chunks, save_stack_as_tif)
+from .Profiler import Profiler, SpanStats
+from .Utils import add_extension, add_grid, add_suffix, get_timestamp_for_files, print_error, print_warning, to_uint16
 
 # Définir la liste des symboles exportés
-__all__ = ["Decorators", "Drawing", "FileIO", "Monitoring", "Utils",
+__all__ = ["ChunkStore", "Decorators", "Drawing", "FileIO", "Monitoring", "Profiler", "Utils",
+		   "SpanStats",
 		   "draw_test_section", "get_color_map_by_name",
-		   "open_png_as_boolean_mask", "open_png_as_sample", "open_tif_as_stack",
-		   "save_boolean_mask_as_png","save_sample_as_png","save_stack_as_tif",
-		   "add_extension", "add_grid", "add_suffix", "get_timestamp_for_files", "print_error", "print_warning"]
+		   "convert_chunks_to_tif", "convert_tif_to_chunks",
+		   "open_chunks_as_stack", "open_config", "open_png_as_boolean_mask", "open_png_as_sample", "open_tif_as_stack",
+		   "save_boolean_mask_as_png","save_sample_as_png", "save_stack_as_chunks", "save_stack_as_tif",
+		   "add_extension", "add_grid", "add_suffix", "get_timestamp_for_files", "print_error", "print_warning", "to_uint16"]
+
+# Symboles chargés à la première utilisation (module de définition)
+_LAZY_SYMBOLS = {"Drawing": None, "Monitoring": None, "draw_test_section": "Drawing", "get_color_map_by_name": "Drawing"}
+
+
+##################################################
+def __getattr__(name: str):
+	"""
+	Charge un module ou une fonction paresseusement lors du premier accès (PEP 562).
+
+	:param name: Nom de l'attribut demandé.
+	:return: Le module ou la fonction.
+	:raises AttributeError: Si l'attribut n'existe pas.
+	"""
+	if name not in _LAZY_SYMBOLS: raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+	module = _LAZY_SYMBOLS[name]
+	if module is None:
+		module = importlib.import_module(f".{name}", __name__)
+		value = getattr(module, name) if name == "Monitoring" else module  # La classe Monitoring porte le nom de son module
+	else: value = getattr(importlib.import_module(f".{module}", __name__), name)
+	globals()[name] = value
+	return value
+
+
+##################################################
+class _ToolsModule(types.ModuleType):
+	"""
+	Module du package `Tools` empêchant l'importation du sous-module `Monitoring` de masquer la classe du même nom.
+
+	Le système d'importation lie chaque sous-module importé comme attribut du package parent :
+	la liaison du sous-module `Monitoring` est remplacée par sa classe.
+	"""
+
+	##################################################
+	def __setattr__(self, name: str, value):
+		if name == "Monitoring" and isinstance(value, types.ModuleType): value = value.Monitoring
+		super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _ToolsModule
@@ -6,6 +6,7 @@ incluant les caractéristiques des fluorophores, les modèles de bruit, et les p
 
 **Modules principaux** :
 
+- `Benchmark` : Mesure la durée des opérations coûteuses de la génération et compare les résultats entre deux versions.
 - `Fluorophore` : Gère les propriétés optiques des fluorophores simulés.
 - `Generator` : Contient les outils pour créer des images synthétiques, y compris le bruit (Noiser), l'échantillonnage (Sampler), et la gestion des piles (
 Stacker, StackModel).
@@ -27,8 +28,13 @@ Les composants peuvent être importés directement selon les besoins, par exempl
 from SampleMaker import Fluorophore, Generator
 ```
 
+Les sous-packages `Generator`, `GUI` et `Tools` sont chargés à la première utilisation (PEP 562) :
+`import SampleMaker` reste rapide et n'importe ni PyQt5, ni plotly, ni scipy.
+
 """
 
+import importlib
+
 # Importation explicite des classes pour qu'elles soient accessibles directement
 from .Fluorophore import Fluorophore, PREDEFINED_FLUOROPHORES
 from .Mask import Mask
@@ -38,3 +44,19 @@ from .Stack import Stack
 # Définir la liste des symboles exportés
 __all__ = ["Generator", "GUI", "Tools", "Fluorophore", "PREDEFINED_FLUOROPHORES", "Mask", "Pattern", "PatternType", "Stack",
 		   "ExistingImageOptions", "NoneOptions", "SquaresOptions", "StripesOptions", "SunOptions"]
+
+# Sous-packages chargés à la première utilisation
+_LAZY_SUBPACKAGES = ["Generator", "GUI", "Tools"]
+
+
+##################################################
+def __getattr__(name: str):
+	"""
+	Charge un sous-package paresseusement lors du premier accès (PEP 562).
+
+	:param name: Nom de l'attribut demandé.
+	:return: Le sous-package.
+	:raises AttributeError: Si l'attribut n'existe pas.
+	"""
+	if name not in _LAZY_SUBPACKAGES: raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+	return importlib.import_module(f".{name}", __name__)
@@ -0,0 +1,247 @@
+"""
+Point d'entrée en ligne de commande de SampleMaker (sans interface graphique, Qt n'est pas importé).
+
+**Usage** :
+
+```
+python -m SampleMaker generate config.toml [--output DOSSIER] [--workers N] [--progress] [--profile Reports/Profile.json] [--monitor Reports/Generation.html]
+python -m SampleMaker sweep config.toml [--output DOSSIER] [--processes N]
+python -m SampleMaker plan config.toml [--output DOSSIER]
+python -m SampleMaker benchmark [--sizes 64 256] [--densities 0.25 1] [--repeat 5] [--filter psf] [--output Reports/Benchmark.json]
+python -m SampleMaker compare reference.json current.json [--threshold 0.1]
+```
+
+Les commandes `benchmark` et `compare` mesurent les chemins critiques de la génération (voir `SampleMaker.Benchmark`),
+`compare` retourne le code 1 si un cas est plus lent que la référence au-delà du seuil.
+
+Avant la génération, la mémoire nécessaire est estimée (voir `Generator.Planner`) : si la pile ne tient pas en mémoire,
+elle est projetée depuis un fichier temporaire (sortie TIF) ou écrite en flux (sortie en blocs) et un avertissement est affiché.
+La commande `plan` affiche l'estimation (mémoire, disque, durée, mode et threads) sans lancer la génération.
+
+**Fichier de configuration** (JSON ou TOML) :
+
+- `parameters` : Paramètres de génération, les mêmes que ceux de l'interface (voir `Generator.Sweep.DEFAULT_PARAMETERS`).
+- `output` : Sortie (`directory`, `name`, `format` "tif" ou "chunks", `uint16`, `statistics` et `processes` pour la commande `sweep`).
+- `grid` : Valeurs de chaque paramètre variable (uniquement pour la commande `sweep`).
+
+Exemple :
+
+```toml
+[parameters]
+size = 256
+n_frames = 1000
+density = 0.5
+pattern = "STRIPES"
+compression = "zlib"
+
+[output]
+directory = "Output"
+name = "stack"
+```
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from SampleMaker import Benchmark
+from SampleMaker import Tools
+from SampleMaker.Generator import MonitoringObserver, Planner, StackEvent, StackObserver, StorageMode, Sweep, build_stacker
+from SampleMaker.Generator.Planner import Plan
+from SampleMaker.Generator.Sweep import check_parameters
+from SampleMaker.Tools import open_config, print_warning, Profiler
+
+MONITORING_INTERVAL = 0.5  # Intervalle des mesures du Monitoring (en secondes)
+DEFAULT_OUTPUT = {"directory": "Output", "name": "stack", "format": "tif", "uint16": False, "statistics": False, "processes": 0}
+
+
+##################################################
+class ProgressPrinter(StackObserver):
+	""" Observateur affichant l'avancement de la génération sur la sortie d'erreur (au plus une ligne toutes les `interval` secondes). """
+
+	##################################################
+	def __init__(self, interval: float = 1.0):
+		"""
+		Initialise l'observateur.
+
+		:param interval: Intervalle minimal entre deux lignes en secondes (par défaut 1).
+		"""
+		self.interval = interval
+		self._last = 0.0
+
+	##################################################
+	def on_frame(self, event: StackEvent):
+		""" Affiche l'avancement (frames, débit et temps restant) si l'intervalle est écoulé ou à la dernière frame. """
+		done = event.frame + 1
+		if done < event.total and event.elapsed - self._last < self.interval: return
+		self._last = event.elapsed
+		fps = done / max(event.elapsed, 1e-9)
+		print(f"Frame {done}/{event.total} ({fps:.1f} frames/s, temps restant : {(event.total - done) / fps:.0f} s)", file=sys.stderr)
+
+
+##################################################
+def plan(config: Dict[str, Any], output_dir: Optional[str] = None, workers: Optional[int] = None, runtime: bool = True) -> Plan:
+	"""
+	Estime la mémoire et la durée de la génération d'une configuration (voir `Generator.Planner`).
+
+	:param config: Configuration (tables `parameters` et `output`).
+	:param output_dir: Dossier de sortie, remplace celui de la configuration (par défaut None).
+	:param workers: Nombre de threads d'encodage TIF, remplace celui de la configuration (par défaut None).
+	:param runtime: Si `True`, la durée est estimée (étalonnage de la machine, par défaut True).
+	:return: Le plan de la génération.
+	:raises ValueError: Si un paramètre n'est pas reconnu.
+	"""
+	parameters = check_parameters(config.get("parameters", {}) | ({"workers": workers} if workers is not None else {}))
+	output = DEFAULT_OUTPUT | config.get("output", {})
+	return Planner().plan(parameters, output_dir or output["directory"], output["format"], output["uint16"], output["statistics"], runtime=runtime)
+
+
+##################################################
+def generate(config: Dict[str, Any], output_dir: Optional[str] = None, workers: Optional[int] = None,
+			 observers: Optional[List[StackObserver]] = None) -> Dict[str, Any]:
+	"""
+	Génère une pile à partir d'une configuration et l'enregistre avec sa vérité terrain (et ses statistiques si demandées).
+	Le mode de stockage de la pile et le nombre de threads d'encodage sont choisis par le planificateur (voir `plan`),
+	ses avertissements sont affichés.
+
+	:param config: Configuration (tables `parameters` et `output`).
+	:param output_dir: Dossier de sortie, remplace celui de la configuration (par défaut None).
+	:param workers: Nombre de threads d'encodage TIF, remplace celui de la configuration (par défaut None).
+	:param observers: Observateurs de la génération (voir `Generator.StackObserver`, par défaut aucun).
+	:return: Résumé de la génération (fichiers, nombre de frames, mode de stockage, durées).
+	:raises ValueError: Si un paramètre ou le format de sortie n'est pas reconnu.
+	"""
+	parameters = check_parameters(config.get("parameters", {}) | ({"workers": workers} if workers is not None else {}))
+	output = DEFAULT_OUTPUT | config.get("output", {})
+	if output["format"] not in ("tif", "chunks"): raise ValueError(f"Le format de sortie \"{output['format']}\" n'est pas reconnu (tif ou chunks).")
+	directory = output_dir or output["directory"]
+	os.makedirs(directory, exist_ok=True)
+	base = os.path.join(directory, output["name"])
+	execution = Planner().plan(parameters, directory, output["format"], output["uint16"], output["statistics"], runtime=False)
+	for warning in execution.warnings: print_warning(warning)
+
+	start = time.perf_counter()
+	stacker = build_stacker(parameters, cache=False)
+	stacker.as_uint16, stacker.compute_statistics = output["uint16"], output["statistics"]
+	stacker.observers = observers or []
+	if execution.mode == StorageMode.MEMMAP: stacker.memmap_file = f"{base}.npy"
+	elif execution.mode == StorageMode.STREAM: stacker.stream_directory = f"{base}.chunks"
+	stack = stacker.generate(parameters["n_frames"], f"{base}.csv")
+	generated = time.perf_counter()
+	if output["format"] == "chunks": stack.save_chunks(f"{base}.chunks")  # Rien à faire si la pile a été écrite en flux
+	else: stack.save(f"{base}.tif", compression=parameters["compression"], tile=parameters["tile"], workers=execution.workers)
+	if stacker.statistics is not None: stacker.statistics.save(f"{base}_statistics.npz")
+	nbytes = stack.nbytes
+	stack.release()  # Supprime le fichier temporaire de la pile projetée
+	end = time.perf_counter()
+
+	return {"output": f"{base}.chunks" if output["format"] == "chunks" else f"{base}.tif", "frames": parameters["n_frames"],
+			"mode": execution.mode.name, "bytes": nbytes, "generation": generated - start, "save": end - generated, "total": end - start}
+
+
+##################################################
+def sweep(config: Dict[str, Any], output_dir: Optional[str] = None, processes: Optional[int] = None) -> List[Dict[str, Any]]:
+	"""
+	Génère une série de piles sur la grille de la configuration (voir `Generator.Sweep`).
+
+	:param config: Configuration (tables `parameters`, `grid` et `output`).
+	:param output_dir: Dossier de sortie, remplace celui de la configuration (par défaut None).
+	:param processes: Nombre de processus, remplace celui de la configuration (par défaut None).
+	:return: Résumés des exécutions.
+	"""
+	output = DEFAULT_OUTPUT | config.get("output", {})
+	runner = Sweep(config.get("grid", {}), output_dir or output["directory"], config.get("parameters", {}),
+				   processes if processes is not None else output["processes"])
+	return runner.run()
+
+
+##################################################
+def main(argv: Optional[List[str]] = None) -> int:
+	"""
+	Analyse les arguments de la ligne de commande et lance la commande demandée.
+
+	:param argv: Arguments (par défaut ceux de la ligne de commande).
+	:return: Code de retour (0 en cas de succès).
+	"""
+	parser = argparse.ArgumentParser(prog="python -m SampleMaker", description="Générateur de piles de microscopie sans interface graphique.")
+	commands = parser.add_subparsers(dest="command", required=True)
+	command = commands.add_parser("generate", help="Génère une pile à partir d'un fichier de configuration.")
+	command.add_argument("config", help="Fichier de configuration (JSON ou TOML).")
+	command.add_argument("--output", default=None, help="Dossier de sortie (remplace celui de la configuration).")
+	command.add_argument("--workers", type=int, default=None, help="Nombre de threads d'encodage TIF (0 : automatique).")
+	command.add_argument("--progress", action="store_true", help="Affiche l'avancement de la génération sur la sortie d'erreur.")
+	command.add_argument("--profile", default=None, help="Profile la génération et enregistre le rapport JSON (et ses graphiques en HTML).")
+	command.add_argument("--monitor", default=None, help="Suit les ressources et le débit de la génération et enregistre le rapport (html, json ou txt).")
+	command = commands.add_parser("sweep", help="Génère une série de piles sur une grille de paramètres.")
+	command.add_argument("config", help="Fichier de configuration (JSON ou TOML) avec une table [grid].")
+	command.add_argument("--output", default=None, help="Dossier de sortie (remplace celui de la configuration).")
+	command.add_argument("--processes", type=int, default=None, help="Nombre de processus (0 : nombre de cœurs).")
+	command = commands.add_parser("plan", help="Estime la mémoire et la durée de la génération d'un fichier de configuration.")
+	command.add_argument("config", help="Fichier de configuration (JSON ou TOML).")
+	command.add_argument("--output", default=None, help="Dossier de sortie (remplace celui de la configuration).")
+	command = commands.add_parser("benchmark", help="Mesure les chemins critiques de la génération.")
+	command.add_argument("--sizes", type=int, nargs="+", default=list(Benchmark.SIZES), help="Tailles des images en pixels.")
+	command.add_argument("--densities", type=float, nargs="+", default=list(Benchmark.DENSITIES), help="Densités de molécules par µm².")
+	command.add_argument("--repeat", type=int, default=5, help="Nombre maximal d'exécutions mesurées par cas.")
+	command.add_argument("--budget", type=float, default=2.0, help="Durée visée des mesures de chaque cas en secondes.")
+	command.add_argument("--filter", default="", help="N'exécute que les cas dont le nom contient cette chaîne.")
+	command.add_argument("--output", default="Reports/Benchmark.json", help="Fichier JSON des résultats.")
+	command = commands.add_parser("compare", help="Compare deux résultats de benchmark (code 1 en cas de régression).")
+	command.add_argument("reference", help="Résultats de référence (JSON).")
+	command.add_argument("current", help="Résultats à comparer (JSON).")
+	command.add_argument("--threshold", type=float, default=Benchmark.DEFAULT_THRESHOLD, help="Variation relative tolérée (0.1 : 10 %%).")
+	args = parser.parse_args(argv)
+
+	try:
+		if args.command == "benchmark":
+			Benchmark.save_results(Benchmark.run_benchmarks(args.sizes, args.densities, args.repeat, args.budget, args.filter), args.output)
+			print(f"Résultats enregistrés dans {args.output}")
+			return 0
+		if args.command == "compare":
+			comparison = Benchmark.compare(Benchmark.open_results(args.reference), Benchmark.open_results(args.current), args.threshold)
+			print(Benchmark.format_comparison(comparison))
+			regressions = Benchmark.get_regressions(comparison)
+			print(f"{len(regressions)} régression(s) au-delà de {args.threshold:.0%}")
+			return 1 if regressions else 0
+		config = open_config(args.config)
+		if args.command == "plan": print(plan(config, args.output))
+		elif args.command == "generate":
+			observers = [ProgressPrinter()] if args.progress else []
+			monitoring, profiler = None, Profiler()
+			try:  # Le thread de surveillance et le profileur actif ne doivent pas survivre à une erreur
+				if args.monitor is not None:
+					monitoring = Tools.Monitoring()  # Import de plotly et psutil uniquement si demandé
+					monitoring.start(MONITORING_INTERVAL)
+					observers.append(MonitoringObserver(monitoring))
+				if args.profile is not None: profiler.enable()  # Sans profil, l'instrumentation reste désactivée (aucun coût)
+				try: result = generate(config, args.output, args.workers, observers)
+				finally:
+					if profiler.enabled: profiler.disable()
+				if args.profile is not None:
+					profiler.save(args.profile)
+					profiler.save(f"{os.path.splitext(args.profile)[0]}.html")
+					if monitoring is not None: monitoring.add_profile(profiler)  # Spans du profil affichés avec les ressources
+			finally:
+				if monitoring is not None: monitoring.stop()
+			if monitoring is not None: monitoring.save(args.monitor, full_html=True)
+			print(f"{result['output']} : {result['frames']} frames en {result['total']:.2f} s "
+				  f"(génération {result['frames'] / max(result['generation'], 1e-9):.1f} frames/s, "
+				  f"écriture {result['bytes'] / 1e6 / max(result['save'], 1e-9):.1f} Mo/s)")
+		else:
+			start = time.perf_counter()
+			results = sweep(config, args.output, args.processes)
+			elapsed = time.perf_counter() - start
+			done = [r for r in results if not r["skipped"]]
+			frames = sum(r["frames"] for r in done)
+			print(f"{len(done)} piles générées ({len(results) - len(done)} déjà terminées) en {elapsed:.2f} s "
+				  f"({frames / max(elapsed, 1e-9):.1f} frames/s)")
+	except (OSError, ValueError) as error:
+		print(f"Erreur : {error}", file=sys.stderr)
+		return 1
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -68,9 +68,22 @@ def pytest_sessionfinish(session, exitstatus):
 
 
 ##################################################
-@pytest.hookimpl(tryfirst=True)
+@pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_protocol(item, nextitem):
-	""" Capture les informations sur chaque test """
+	""" Capture les informations sur chaque test et les ressources utilisées (préparation, exécution et nettoyage) """
 	global all_tests_monitoring
 	all_tests_monitoring.add_test_info(item.nodeid)
-	return None
+	all_tests_monitoring.begin_test(item.nodeid)
+	yield
+	all_tests_monitoring.end_test()
+
+
+##################################################
+@pytest.hookimpl(optionalhook=True)
+def pytest_json_modifyreport(json_report):
+	""" Ajoute les ressources utilisées par chaque test au rapport JSON (comparables avec `Monitoring.compare_tests_usage`) """
+	global all_tests_monitoring
+	usages = {usage["test"]: usage for usage in all_tests_monitoring.tests_usage}
+	json_report["resources"] = all_tests_monitoring.tests_usage
+	for test in json_report.get("tests", []):
+		if test["nodeid"] in usages: test["resources"] = {key: value for key, value in usages[test["nodeid"]].items() if key != "test"}
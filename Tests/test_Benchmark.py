@@ -0,0 +1,65 @@
+""" Fichier des tests pour la suite de micro-benchmarks """
+
+import os
+from pathlib import Path
+
+import pytest
+
+from SampleMaker.__main__ import main
+from SampleMaker.Benchmark import compare, get_case_name, get_regressions, measure, open_results, run_benchmarks, save_results
+
+OUTPUT_DIR = Path(__file__).parent / "Output"
+os.makedirs(OUTPUT_DIR, exist_ok=True)  # Créer le dossier de sorties (la première fois, il n'existe pas)
+
+
+##################################################
+def test_measure():
+	""" Test du chronométrage d'une fonction. """
+	calls = []
+	result = measure(lambda: calls.append(1), repeat=3, budget=1)
+	print(result)
+	assert result["repeat"] == 3, "Le nombre d'exécutions mesurées est incorrect."
+	assert len(calls) == 4, "L'exécution de chauffe n'est pas effectuée."
+	assert result["min"] <= result["median"], "Le minimum est supérieur à la médiane."
+	assert get_case_name("noiser.apply", {"size": 64}) == "noiser.apply[size=64]", "Le nom du cas est incorrect."
+
+
+##################################################
+def test_run_benchmarks():
+	""" Test de l'exécution de la suite sur une petite taille. """
+	results = run_benchmarks(sizes=[64], densities=[0.25], repeat=1, budget=0)
+	names = {value["name"] for value in results["results"].values()}
+	for name in ("mask.stripes", "mask.existing_image", "sampler.generate_localisation", "sampler.generate_psf", "noiser.apply", "stack.add_sample.reserved", "stack.open"):
+		assert name in names, f"Le cas {name} n'est pas mesuré."
+	assert all("median" in value for value in results["results"].values()), "Un cas de petite taille est ignoré."
+	assert results["metadata"]["numpy"], "Les informations de la machine sont absentes."
+
+	filename = f"{OUTPUT_DIR}/test_benchmark.json"
+	save_results(results, filename)
+	assert open_results(filename) == results, "Les résultats ne sont pas correctement enregistrés."
+	with pytest.raises(OSError) as exception_info: open_results("bad_filename.json")
+	assert exception_info.type == OSError, "L'erreur relevé n'est pas correcte."
+
+
+##################################################
+def test_compare():
+	""" Test de la comparaison de deux résultats. """
+	reference = {"results": {"a": {"median": 1.0}, "b": {"median": 1.0}, "c": {"median": 1.0}, "d": {"skipped": ""}}}
+	current = {"results": {"a": {"median": 1.05}, "b": {"median": 1.5}, "c": {"median": 0.5}, "d": {"median": 1.0}, "e": {"median": 1.0}}}
+	comparison = compare(reference, current, threshold=0.1)
+	print(comparison)
+	assert set(comparison) == {"a", "b", "c"}, "Seuls les cas mesurés dans les deux résultats doivent être comparés."
+	assert [comparison[key]["status"] for key in "abc"] == ["stable", "regression", "improvement"], "Le statut des cas est incorrect."
+	assert get_regressions(comparison) == ["b"], "Les régressions sont incorrectes."
+
+
+##################################################
+def test_main_benchmark(capsys):
+	""" Test des commandes benchmark et compare. """
+	filename = f"{OUTPUT_DIR}/test_benchmark_main.json"
+	assert main(["benchmark", "--sizes", "64", "--densities", "0.25", "--repeat", "1", "--budget", "0", "--filter", "noiser",
+				 "--output", filename]) == 0, "La commande benchmark a échoué."
+	assert list(open_results(filename)["results"]) == ["noiser.apply[size=64]"], "Le filtre des cas n'est pas appliqué."
+	assert main(["compare", filename, filename]) == 0, "Des résultats identiques ne doivent pas être en régression."
+	assert "0 régression" in capsys.readouterr().out, "Le résumé de la comparaison est absent."
+	assert main(["compare", filename, "bad_filename.json"]) == 1, "Un fichier introuvable doit retourner une erreur."
@@ -18,6 +18,11 @@ def test_fluorophore():
 	intensity = fluo.get_intensity(True)
 	assert 0 <= intensity <= 200, "La récupération d'une intensité avec variation ne correspond pas."
 
+	intensities = fluo.get_intensities(10)
+	assert intensities.shape == (10,) and (intensities == 100).all(), "La récupération des intensités sans variation ne correspond pas."
+	intensities = fluo.get_intensities(10, True)
+	assert ((0 <= intensities) & (intensities <= 200)).all(), "La récupération des intensités avec variation ne correspond pas."
+
 
 ##################################################
 def test_predefined_fluorophores():
@@ -1,14 +1,22 @@
 """ Fichier des tests pour l'interface utilisateur. """
 
+import os
 import platform
 import sys
+from pathlib import Path
 
 from PyQt5.QtCore import QCoreApplication, Qt, QTimer
 from PyQt5.QtWidgets import QApplication, QDialog, QMessageBox
 
+from SampleMaker import Stack
+from SampleMaker.Generator import Sampler, Stacker
 from SampleMaker.GUI import MainUI
+from SampleMaker.GUI.GenerationWorker import format_progress, GenerationWorker
 from SampleMaker.GUI.PreferencesDialog import PreferencesDialog
 
+OUTPUT_DIR = Path(__file__).parent / "Output"
+os.makedirs(OUTPUT_DIR, exist_ok=True)  # Créer le dossier de sorties (la première fois, il n'existe pas)
+
 
 ##################################################
 def initialize():
@@ -66,7 +74,71 @@ def test_settings_ui():
 	settings_ui = widget.settings.ui
 	settings_ui["Dimension"][1].set_value(1)  # On limite à 1 frame pour aller vite
 	widget.generate_function()
-	assert True
+	assert widget.is_generating(), "La génération doit être lancée dans un thread séparé."
+	widget.wait_generation()
+	assert not widget.is_generating(), "La génération doit être terminée."
+	assert widget.generate_button.isEnabled() and not widget.cancel_button.isEnabled(), "Les boutons doivent être réactivés."
+
+
+##################################################
+def test_preview_widget():
+	""" Test de l'aperçu : minuteur relancé à chaque modification puis rendu de la frame. """
+	app = initialize()
+	window = MainUI()
+	widget = window.centralWidget()
+	preview = widget.preview
+	preview.timer.stop()
+	widget.settings.ui["Structure"][0].set_value(0.5)  # Modification de la densité
+	assert preview.timer.isActive(), "Une modification doit relancer le minuteur de l'aperçu."
+	widget.settings.ui["Structure"][2].set_value(3)  # Nouveau motif : les options recréées doivent aussi être surveillées
+	preview.timer.stop()
+	widget.settings.ui["Structure"][2].options[3].set_value(8)
+	assert preview.timer.isActive(), "Une modification d'une option doit relancer le minuteur de l'aperçu."
+	preview.timer.stop()
+	preview.refresh()
+	print(preview.info_label.text())
+	assert not preview.image_label.pixmap().isNull(), "L'aperçu doit être affiché."
+	assert preview.preview.n_molecules > 0, "L'aperçu doit contenir des molécules."
+	preview.roi_box.setChecked(True)
+	preview.refresh()
+	assert preview.preview.roi, "La zone centrale doit être utilisée."
+
+
+##################################################
+def test_generation_worker():
+	""" Test du worker de génération : avancement, annulation et enregistrement de la partie générée. """
+	calls, results = [], []
+	stacker = Stacker(Sampler(size=64))
+	worker = GenerationWorker(stacker, 10, f"{OUTPUT_DIR}/test_generation_worker", interval=0)
+	worker.progress.connect(lambda done, total, elapsed: (calls.append(done), worker.cancel() if done == 4 else None))
+	worker.finished.connect(lambda done, total: results.append((done, total)))
+	worker.run()  # Exécution directe (signaux synchrones)
+	print(calls, results)
+	assert results == [(4, 10)], "La génération doit s'arrêter après la frame en cours."
+	assert calls[-1] == 4, "La dernière frame générée doit être signalée."
+	stack = Stack()
+	stack.open(f"{OUTPUT_DIR}/test_generation_worker.tif")
+	assert stack.stack.shape == (4, 64, 64), "La partie générée doit être enregistrée."
+
+	message = format_progress(50, 200, 2.0)
+	print(message)
+	assert "50/200" in message and "25.0 frames/s" in message and "6 s" in message, "Le message d'avancement n'est pas correct."
+	assert "inconnu" in format_progress(0, 200, 0.0), "Le temps restant est inconnu sans frame générée."
+
+	worker = GenerationWorker(Stacker(Sampler(size=32), compute_statistics=True), 3, f"{OUTPUT_DIR}/test_generation_worker_monitoring", monitoring=True)
+	worker.run()
+	assert os.path.isfile(f"{OUTPUT_DIR}/test_generation_worker_monitoring_monitoring.html"), "Le rapport des ressources n'est pas enregistré."
+	assert os.path.isfile(f"{OUTPUT_DIR}/test_generation_worker_monitoring_statistics.npz"), "Les statistiques ne sont pas enregistrées."
+
+	errors = []
+	stacker = Stacker(Sampler(size=32))
+	stacker.generate = lambda *_: len(None)  # Erreur inattendue (TypeError) pendant la génération
+	worker = GenerationWorker(stacker, 3, f"{OUTPUT_DIR}/test_generation_worker_error", monitoring=True)
+	worker.failed.connect(errors.append)
+	worker.run()
+	print(errors)
+	assert len(errors) == 1 and errors[0].startswith("TypeError"), "Toute erreur doit être signalée par le signal failed."
+	assert worker.stacker.observers[-1].monitoring.running is False, "Le monitoring doit être arrêté en cas d'erreur."
 
 # qtbot crash
 ###################################################
@@ -90,7 +90,12 @@ def test_settings():
 	res = settings.parse_settings()
 	stacker = settings.get_stacker()
 	print(settings)
-	assert True
+	assert not stacker.as_uint16 and not stacker.compute_statistics, "Par défaut, la pile est en flottants sans statistiques."
+	ui["Output"][4].set_value(1)
+	ui["Output"][5].set_value(1)
+	assert settings.parse_settings() == "", "Les options de sortie doivent être valides."
+	stacker = settings.get_stacker()
+	assert stacker.as_uint16 and stacker.compute_statistics, "Les options de sortie doivent être transmises au générateur."
 
 
 ###################################################
@@ -0,0 +1,70 @@
+""" Fichier des tests pour la simulation de la diffusion de particules """
+
+import time
+
+import numpy as np
+import pytest
+
+from SampleMaker.Generator import Diffusion
+
+N_PARTICLES = 10000
+
+
+##################################################
+def get_localisation(n: int = N_PARTICLES, size: int = 256) -> np.ndarray:
+	""" Positions initiales au centre de l'image. """
+	return np.column_stack((np.full(n, size / 2), np.full(n, size / 2), np.zeros(n))).astype(np.float32)
+
+
+##################################################
+def test_diffusion_brownian():
+	""" Test de la diffusion libre : le déplacement quadratique moyen doit valoir 4 * D * t. """
+	diffusion = Diffusion(get_localisation(), coefficient=0.5, pixel_size=100, exposure=10, sub_steps=4)
+	print(f"\n{diffusion}")
+	for _ in range(10): positions = diffusion.step()
+	assert positions.shape == (N_PARTICLES, 3), "La taille des positions n'est pas correcte."
+	assert np.allclose(positions[:, 2], 0), "La position moyenne ne doit pas modifier la coordonnée Z."
+	msd = np.mean(np.sum((diffusion.positions[:, :2] - 128) ** 2, axis=1)) * 100 ** 2 / 1e6  # en µm²
+	print(f"Déplacement quadratique moyen : {msd:.4f} µm² (attendu {4 * 0.5 * 0.1:.4f} µm²)")
+	assert msd == pytest.approx(4 * 0.5 * 0.1, rel=0.05), "Le déplacement quadratique moyen n'est pas correct."
+	assert np.all(diffusion.positions[:, 2] == 0), "La coordonnée Z ne doit pas être modifiée."
+
+
+##################################################
+def test_diffusion_confined():
+	""" Test de la diffusion confinée : l'écart-type autour de l'ancre doit tendre vers le confinement. """
+	diffusion = Diffusion(get_localisation(), coefficient=1, pixel_size=100, exposure=10, confinement=200)
+	for _ in range(200): diffusion.step()
+	spread = np.std(diffusion.positions[:, :2] - 128) * 100
+	print(f"\nÉcart-type autour de l'ancre : {spread:.1f} nm (attendu 200 nm)")
+	assert spread == pytest.approx(200, rel=0.05), "L'écart-type du confinement n'est pas correct."
+
+
+##################################################
+def test_diffusion_mask():
+	""" Test du masque comme frontière. """
+	mask = np.zeros((256, 256), dtype=bool)
+	mask[100:156, 100:156] = True
+	diffusion = Diffusion(get_localisation(), coefficient=5, pixel_size=100, exposure=10, mask=mask)
+	for _ in range(50): diffusion.step()
+	xy = diffusion.positions[:, :2].astype(int)
+	assert np.all(mask[xy[:, 1], xy[:, 0]]), "Les particules ne doivent pas sortir du masque."
+
+
+##################################################
+def test_diffusion_bad_parameters():
+	""" Test des paramètres invalides. """
+	with pytest.raises(ValueError) as exception_info: Diffusion(get_localisation(), coefficient=-1)
+	assert exception_info.type == ValueError, "L'erreur relevé n'est pas correcte."
+	with pytest.raises(ValueError) as exception_info: Diffusion(get_localisation(), sub_steps=0)
+	assert exception_info.type == ValueError, "L'erreur relevé n'est pas correcte."
+
+
+##################################################
+def test_diffusion_large_population():
+	""" Test de performance sur une grande population (cent mille particules). """
+	diffusion = Diffusion(get_localisation(100000), coefficient=0.1, sub_steps=2)
+	start = time.perf_counter()
+	for _ in range(100): diffusion.step()
+	elapsed = time.perf_counter() - start
+	print(f"\n{diffusion}\n100 frames en {elapsed:.2f} s ({100 / elapsed:.1f} frames/s)")
@@ -0,0 +1,83 @@
+""" Fichier des tests pour la table des localisations (vérité terrain) """
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from SampleMaker.Generator import LocalisationTable
+
+OUTPUT_DIR = Path(__file__).parent / "Output"
+os.makedirs(OUTPUT_DIR, exist_ok=True)  # Créer le dossier de sorties (la première fois, il n'existe pas)
+
+N_FRAMES, N_MOLECULES = 10, 50
+LOCALISATIONS = [np.random.uniform(0, 64, (N_MOLECULES, 3)).astype(np.float32) for _ in range(N_FRAMES)]
+INTENSITIES = [np.random.uniform(4500, 5500, N_MOLECULES).astype(np.float32) for _ in range(N_FRAMES)]
+
+
+##################################################
+def test_localisation_table():
+	""" Test basique sur la table (ajout, récupération, enregistrement, ouverture). """
+	table = LocalisationTable(pixel_size=100)
+	for i in range(N_FRAMES): table.append(i, LOCALISATIONS[i], INTENSITIES[i])
+	table.append(N_FRAMES, np.empty((0, 3)), np.empty(0))  # Frame sans molécule
+	print(f"\n{table}")
+	assert len(table) == N_FRAMES * N_MOLECULES, "Le nombre de localisations n'est pas correct."
+	assert table.columns["frame"].dtype == np.int32, "La colonne des frames doit être en int32."
+	frame = table.get_frame(3)
+	assert np.allclose(frame[:, :3], LOCALISATIONS[3]) and np.allclose(frame[:, 3], INTENSITIES[3]), "La frame ne correspond pas."
+
+	table.save(f"{OUTPUT_DIR}/test_localisation_table.csv")
+	res = LocalisationTable.open(f"{OUTPUT_DIR}/test_localisation_table.csv", pixel_size=100)
+	assert len(res) == len(table), "Le nombre de localisations n'est pas correct."
+	assert np.allclose(res.get_frame(3), frame, atol=1e-2), "La frame devrait correspondre à la référence avec une tolérance d'erreur."
+
+	with open(f"{OUTPUT_DIR}/test_localisation_table.csv", "r", encoding="utf-8") as f: lines = f.readlines()
+	with open(f"{OUTPUT_DIR}/test_localisation_table_shuffled.csv", "w", encoding="utf-8") as f: f.writelines(lines[:1] + lines[:0:-1])
+	res = LocalisationTable.open(f"{OUTPUT_DIR}/test_localisation_table_shuffled.csv", pixel_size=100)
+	assert np.allclose(res.get_frame(3)[::-1], frame, atol=1e-2), "Les lignes d'une frame doivent être regroupées quel que soit l'ordre du fichier."
+
+
+##################################################
+def test_localisation_table_stream():
+	""" Test sur l'écriture en flux de la table. """
+	filename = f"{OUTPUT_DIR}/test_localisation_table_stream.csv"
+	table = LocalisationTable(pixel_size=100, filename=filename, chunk_size=120)
+	for i in range(N_FRAMES): table.append(i, LOCALISATIONS[i], INTENSITIES[i])
+	assert len(table.columns["frame"]) < 120, "La table ne doit pas conserver toutes les lignes en mémoire."
+	table.save(filename)
+	assert len(table.columns["frame"]) == 0, "Toutes les lignes doivent être écrites."
+	res = LocalisationTable.open(filename, pixel_size=100)
+	assert len(res) == N_FRAMES * N_MOLECULES, "Le nombre de localisations n'est pas correct."
+	assert np.allclose(res.get_frame(N_FRAMES - 1)[:, :3], LOCALISATIONS[-1], atol=1e-2), "La frame devrait correspondre à la référence."
+
+
+##################################################
+def test_localisation_table_bad_options():
+	""" Test sur la table avec de mauvaises options. """
+	table = LocalisationTable(filename=f"{OUTPUT_DIR}/test_localisation_table_bad.csv")
+	with pytest.raises(ValueError) as exception_info: table.append(0, LOCALISATIONS[0], INTENSITIES[0][:10])
+	assert exception_info.type == ValueError, "L'erreur relevé n'est pas correcte."
+	with pytest.raises(ValueError) as exception_info: table.save(f"{OUTPUT_DIR}/test_localisation_table_other.csv")
+	assert exception_info.type == ValueError, "L'erreur relevé n'est pas correcte."
+	with pytest.raises(OSError) as exception_info: LocalisationTable.open("bad_filename.csv")
+	assert exception_info.type == OSError, "L'erreur relevé n'est pas correcte."
+
+
+##################################################
+def test_localisation_table_drift():
+	""" Test sur l'enregistrement des positions sans dérive. """
+	table = LocalisationTable(pixel_size=100, drift=True)
+	for i in range(N_FRAMES): table.append(i, LOCALISATIONS[i] + i, INTENSITIES[i], LOCALISATIONS[i])
+	assert np.allclose(table.get_frame(3, undrifted=True)[:, :3], LOCALISATIONS[3]), "Les positions sans dérive ne correspondent pas."
+	table.save(f"{OUTPUT_DIR}/test_localisation_table_drift.csv")
+	res = LocalisationTable.open(f"{OUTPUT_DIR}/test_localisation_table_drift.csv", pixel_size=100)
+	assert res.drift, "Les positions sans dérive doivent être chargées."
+	assert np.allclose(res.get_frame(3)[:, :3], LOCALISATIONS[3] + 3, atol=1e-2), "Les positions observées ne correspondent pas."
+	assert np.allclose(res.get_frame(3, undrifted=True)[:, :3], LOCALISATIONS[3], atol=1e-2), "Les positions sans dérive ne correspondent pas."
+
+	with pytest.raises(ValueError) as exception_info: LocalisationTable().append(0, LOCALISATIONS[0], INTENSITIES[0], LOCALISATIONS[0])
+	assert exception_info.type == ValueError, "L'erreur relevé n'est pas correcte."
+	with pytest.raises(ValueError) as exception_info: LocalisationTable().get_frame(0, undrifted=True)
+	assert exception_info.type == ValueError, "L'erreur relevé n'est pas correcte."
@@ -0,0 +1,109 @@
+""" Fichier des tests pour le générateur d'échantillons multi-couleurs """
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from SampleMaker import Fluorophore, PREDEFINED_FLUOROPHORES
+from SampleMaker.Generator import MultiChannelSampler, Noiser, Sampler, Stacker
+from SampleMaker.Tools.FileIO import save_sample_as_png
+
+OUTPUT_DIR = Path(__file__).parent / "Output"
+os.makedirs(OUTPUT_DIR, exist_ok=True)  # Créer le dossier de sorties (la première fois, il n'existe pas)
+FLUOROPHORES = [PREDEFINED_FLUOROPHORES["GFP"], PREDEFINED_FLUOROPHORES["RFP"], PREDEFINED_FLUOROPHORES["Alexa488"]]
+
+
+##################################################
+def test_multichannel_sampler():
+	""" Test basique du générateur multi-couleurs. """
+	sampler = MultiChannelSampler(size=64, density=2, fluorophores=FLUOROPHORES, fractions=[2, 1, 1])
+	print(sampler)
+	sample = sampler.generate_sample()
+	assert sample.shape == (3, 64, 64), "Les images doivent avoir un axe des canaux."
+	for i, image in enumerate(sample): save_sample_as_png(image, f"{OUTPUT_DIR}/test_multichannel_sampler_{i}.png")
+	assert sampler.last_channels.shape[0] == sampler.last_localisations.shape[0] == sampler.n_molecules[-1], "Chaque molécule doit avoir un canal."
+	assert np.allclose(sampler.fractions, [0.5, 0.25, 0.25]), "Les proportions doivent être normalisées."
+	assert sampler.generate_sample(as_uint16=True).dtype == np.uint16, "Les images doivent être converties en entiers 16 bits."
+
+	channels = sampler.assign_channels(100000)
+	assert np.allclose(np.bincount(channels, minlength=3) / 100000, sampler.fractions, atol=0.01), "Les canaux doivent suivre les proportions."
+
+
+##################################################
+def test_multichannel_sampler_render():
+	""" Test du rendu en un passage : chaque canal correspond au rendu d'un sampler de son fluorophore. """
+	sampler = MultiChannelSampler(size=32, fluorophores=FLUOROPHORES, noiser=Noiser(snr=0, background=0))
+	localisation = np.array([[10.2, 12.5, 0.3], [20.0, 5.5, -0.7], [16.0, 16.0, 0.0], [3.0, 25.0, 1.0]])
+	channels, intensities = np.array([0, 1, 2, 0]), np.array([1000.0, 2000.0, 1500.0, 500.0])
+	images = sampler.render_channels(localisation, channels, intensities)
+	for channel, fluorophore in enumerate(FLUOROPHORES):
+		reference = Sampler(size=32, fluorophore=fluorophore).render_psf(localisation[channels == channel], intensities[channels == channel])
+		assert np.allclose(images[channel], reference, atol=1e-3), f"Le canal {channel} ne correspond pas au rendu de son fluorophore."
+
+	sigmas = sampler.get_sigmas()
+	assert sigmas[0] > sigmas[2], "La PSF du GFP (509 nm) doit être plus large que celle de l'Alexa488 (495 nm)."
+	kernels = sampler.get_kernels()
+	assert all(offsets[-1] >= 6 * sigma * 2 for sigma, offsets in kernels), "La fenêtre doit couvrir la largeur maximale de l'astigmatisme."
+	assert all(new[1] is old[1] for new, old in zip(sampler.get_kernels(), kernels)), "Les noyaux doivent être conservés."
+	sampler.na = 1.2
+	assert sampler.get_sigmas()[0] > sigmas[0] and sampler.get_kernels()[0][1] is not kernels[0][1], "Les noyaux doivent être recalculés si l'ouverture change."
+	sampler.astigmatism_ratio = 3.0
+	assert sampler.get_kernels()[2][1].size > kernels[2][1].size, "La fenêtre doit suivre l'astigmatisme."
+
+	sampler = MultiChannelSampler(size=64, density=50, fluorophores=FLUOROPHORES[:2], noiser=Noiser(snr=0, background=0))
+	localisation = sampler.generate_localisation()  # Plusieurs blocs de molécules et des PSF sur les bords
+	channels, intensities = sampler.assign_channels(localisation.shape[0]), np.full(localisation.shape[0], 1000.0)
+	images = sampler.render_channels(localisation, channels, intensities)
+	for channel, fluorophore in enumerate(FLUOROPHORES[:2]):
+		reference = Sampler(size=64, fluorophore=fluorophore).render_psf(localisation[channels == channel], intensities[channels == channel])
+		assert np.allclose(images[channel], reference, atol=1e-2), f"Le canal {channel} ne correspond pas au rendu de son fluorophore."
+
+
+##################################################
+def test_multichannel_sampler_fluorophore():
+	""" Test de la synchronisation du fluorophore du sampler avec le premier canal et des méthodes d'un seul canal. """
+	sampler = MultiChannelSampler(size=32, fluorophores=FLUOROPHORES)
+	assert sampler.fluorophore is sampler.fluorophores[0], "Le fluorophore du sampler doit être celui du premier canal."
+	sigma = sampler.get_sigmas()[0]
+	sampler.fluorophore = PREDEFINED_FLUOROPHORES["Alexa488"]
+	assert sampler.fluorophores[0].wavelength == 495, "Modifier le fluorophore doit modifier le premier canal."
+	assert sampler.get_sigmas()[0] < sigma, "Le noyau du premier canal doit être recalculé."
+	sampler.fluorophores = [PREDEFINED_FLUOROPHORES["RFP"]] + FLUOROPHORES[1:]
+	assert sampler.fluorophore.wavelength == PREDEFINED_FLUOROPHORES["RFP"].wavelength, "Le fluorophore doit suivre le premier canal."
+	assert "psf" in sampler._dirty, "Modifier les canaux doit invalider la PSF."
+
+	with pytest.raises(ValueError) as exception_info: sampler.render_psf(np.zeros((1, 3)))
+	assert exception_info.type == ValueError, "L'erreur relevé n'est pas correcte."
+	with pytest.raises(ValueError) as exception_info: sampler.generate_psf(np.zeros((1, 3)))
+	assert exception_info.type == ValueError, "L'erreur relevé n'est pas correcte."
+	grid = sampler.generate_grid(8)
+	assert grid.shape == (3, 32, 32), "La grille doit être rendue dans chaque canal."
+	assert sampler.last_channels.shape[0] == sampler.last_localisations.shape[0], "Chaque molécule de la grille doit avoir un canal."
+
+
+##################################################
+def test_multichannel_sampler_stacks():
+	""" Test de la génération d'une pile par canal. """
+	sampler = MultiChannelSampler(size=32, density=1, fluorophores=[Fluorophore(), PREDEFINED_FLUOROPHORES["GFP"]])
+	stacks = sampler.generate_stacks(4, as_uint16=True)
+	assert len(stacks) == 2 and all(stack.stack.shape == (4, 32, 32) for stack in stacks), "Une pile doit être générée par canal."
+	assert stacks[0].stack.dtype == np.uint16, "Les piles doivent être stockées en entiers 16 bits."
+	assert len(sampler.n_molecules) == 4, "Les molécules doivent être tirées une seule fois par frame pour tous les canaux."
+
+	with pytest.raises(ValueError) as exception_info: Stacker(sampler).generate(4)
+	assert exception_info.type == ValueError, "L'erreur relevé n'est pas correcte."
+
+
+##################################################
+def test_multichannel_sampler_bad_parameters():
+	""" Test des paramètres invalides. """
+	with pytest.raises(ValueError) as exception_info: MultiChannelSampler(fluorophores=[])
+	assert exception_info.type == ValueError, "L'erreur relevé n'est pas correcte."
+	with pytest.raises(ValueError) as exception_info: MultiChannelSampler(fluorophores=FLUOROPHORES, fractions=[1, 1])
+	assert exception_info.type == ValueError, "L'erreur relevé n'est pas correcte."
+	with pytest.raises(ValueError) as exception_info: MultiChannelSampler(fluorophores=FLUOROPHORES, fractions=[0, 0, 0])
+	assert exception_info.type == ValueError, "L'erreur relevé n'est pas correcte."
+	sampler = MultiChannelSampler(size=16, astigmatism_ratio=-1)
+	assert np.all(sampler.render_channels(np.zeros((1, 3)), np.zeros(1, dtype=np.int32)) == 0), "Un ratio négatif doit donner une image noire."
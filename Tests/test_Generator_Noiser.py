@@ -62,3 +62,12 @@ def test_noiser_black_image():
 	res = noiser.apply(np.zeros((size, size), dtype=np.float32))
 	save_sample_as_png(res, f"{OUTPUT_DIR}/test_noiser_black.png", 0)
 	assert True
+
+
+##################################################
+def test_noiser_uint16():
+	""" Test sur le noiser avec une sortie directe en entiers 16 bits. """
+	noiser = Noiser(10, 20, 10)
+	res = noiser.apply(ref_image, as_uint16=True)
+	assert res.dtype == np.uint16, "Le type de l'image devrait être uint16."
+	save_sample_as_png(res, f"{OUTPUT_DIR}/test_noiser_uint16.png", 0)
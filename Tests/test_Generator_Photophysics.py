@@ -0,0 +1,54 @@
+""" Fichier des tests pour la simulation de la photophysique des fluorophores """
+
+import time
+
+import numpy as np
+import pytest
+
+from SampleMaker.Generator import Photophysics
+from SampleMaker.Generator.Photophysics import BLEACHED, OFF, ON
+
+
+##################################################
+def test_photophysics():
+	""" Test basique de la simulation photophysique. """
+	photophysics = Photophysics(10000, on_time=50, off_time=150)
+	print(f"\n{photophysics}")
+	fractions = np.stack([photophysics.step(10) for _ in range(200)])
+	print(photophysics)
+	assert fractions.shape == (200, 10000), "La taille des fractions n'est pas correcte."
+	assert fractions.min() >= 0 and fractions.max() <= 1, "Les fractions doivent être comprises entre 0 et 1."
+	assert photophysics.time == pytest.approx(2000), "Le temps simulé n'est pas correct."
+	assert np.mean(fractions) == pytest.approx(0.25, abs=0.02), "La proportion de temps allumé à l'équilibre n'est pas correcte."
+	assert np.any((fractions > 0) & (fractions < 1)), "Des changements d'état doivent avoir lieu pendant les frames."
+	assert not np.any(photophysics.state == BLEACHED), "Aucune molécule ne doit être photoblanchie sans photoblanchiment."
+
+
+##################################################
+def test_photophysics_bleaching():
+	""" Test du photoblanchiment. """
+	photophysics = Photophysics(10000, on_time=50, off_time=50, bleach_time=100)
+	first = photophysics.step(10)
+	for _ in range(500): last = photophysics.step(10)
+	print(f"\n{photophysics}")
+	assert np.mean(last) < np.mean(first), "Le photoblanchiment doit réduire le nombre de molécules allumées."
+	assert np.count_nonzero(photophysics.state == BLEACHED) > 9000, "La majorité des molécules doit être photoblanchie."
+	assert np.all(np.isin(photophysics.state, [OFF, ON, BLEACHED])), "Les états doivent être valides."
+
+
+##################################################
+def test_photophysics_bad_parameters():
+	""" Test des paramètres invalides. """
+	with pytest.raises(ValueError) as exception_info: Photophysics(10, on_time=0)
+	assert exception_info.type == ValueError, "L'erreur relevé n'est pas correcte."
+
+
+##################################################
+def test_photophysics_large_population():
+	""" Test de performance sur une grande population (un million de molécules). """
+	photophysics = Photophysics(1000000, on_time=50, off_time=500, bleach_time=2000)
+	start = time.perf_counter()
+	for _ in range(20): fractions = photophysics.step(10)
+	elapsed = time.perf_counter() - start
+	print(f"\n{photophysics}\n20 frames en {elapsed:.2f} s ({20 / elapsed:.1f} frames/s)")
+	assert fractions.dtype == np.float32, "Les fractions doivent être en flottants 32 bits."
@@ -0,0 +1,72 @@
+""" Fichier des tests pour le planificateur de la génération """
+
+import os
+from pathlib import Path
+
+from SampleMaker.Generator import build_stacker, Planner, StackModelType, StorageMode
+from SampleMaker.Generator.Planner import Calibration, DRIFT_FRAME_BYTES, FRAME_TEMPORARIES, MOLECULE_BYTES
+from SampleMaker.Generator.Sweep import check_parameters
+
+OUTPUT_DIR = Path(__file__).parent / "Output"
+os.makedirs(OUTPUT_DIR, exist_ok=True)  # Créer le dossier de sorties (la première fois, il n'existe pas)
+
+
+##################################################
+def test_planner():
+	""" Test basique du planificateur (la pile tient en mémoire). """
+	planner = Planner()
+	parameters = check_parameters({"size": 64, "n_frames": 10, "density": 0.5})
+	plan = planner.plan(parameters, f"{OUTPUT_DIR}")
+	print(f"\n{plan}\n{planner.calibration}")
+	assert plan.mode == StorageMode.MEMORY and plan.warnings == [], "Une petite pile doit être générée en mémoire."
+	assert plan.stack_bytes == 10 * 64 * 64 * 4, "La taille de la pile n'est pas correcte."
+	assert plan.molecules == build_stacker(parameters, cache=False).sampler.max_molecules, "Le nombre de molécules n'est pas correct."
+	assert plan.runtime > 0 and planner.calibration is not None, "La durée doit être estimée à partir de l'étalonnage."
+	calibration = planner.calibration
+	assert planner.plan(parameters).runtime == plan.runtime and planner.calibration is calibration, "L'étalonnage doit être conservé."
+	assert planner.plan(parameters | {"size": 128}).runtime > plan.runtime, "La durée doit augmenter avec la taille."
+	assert planner.plan(parameters, uint16=True, runtime=False).stack_bytes == plan.stack_bytes // 2, "Une pile 16 bits est deux fois plus petite."
+
+
+##################################################
+def test_planner_adapt():
+	""" Test de l'adaptation du plan lorsque la pile ne tient pas en mémoire. """
+	parameters = check_parameters({"size": 256, "n_frames": 100, "compression": "zlib", "workers": 8})
+	planner = Planner(memory=64 * 1024 ** 2)  # 64 Mo imposés, la pile en occupe 25
+	plan = planner.plan(parameters, runtime=False)
+	print(f"\n{plan}")
+	assert plan.mode == StorageMode.MEMORY and plan.workers == 8, "La pile tient en mémoire avec tous les threads d'encodage."
+	plan = Planner(memory=36 * 1024 ** 2).plan(parameters, runtime=False)  # Mémoire restante pour un seul thread d'encodage
+	print(f"\n{plan}")
+	assert plan.mode == StorageMode.MEMORY and plan.workers == 1 and plan.warnings, "Le nombre de threads d'encodage doit être réduit."
+	plan = planner.plan(parameters | {"n_frames": 1000}, runtime=False)
+	print(f"\n{plan}")
+	assert plan.mode == StorageMode.MEMMAP and plan.warnings, "Une pile TIF trop grande doit être projetée depuis un fichier (avec un avertissement)."
+	assert plan.disk_bytes == 2 * plan.stack_bytes, "Le fichier temporaire doit être compté dans l'espace disque."
+	assert plan.peak_bytes <= plan.available_bytes, "Le pic de mémoire doit tenir dans la mémoire utilisable."
+	assert plan.peak_bytes < plan.stack_bytes, "L'enregistrement d'une pile projetée ne doit pas compter la pile entière."
+	assert planner.plan(parameters | {"n_frames": 1000}, output_format="chunks", runtime=False).mode == StorageMode.STREAM, \
+		"Une pile en blocs trop grande doit être écrite en flux."
+	assert planner.plan(parameters, processes=4, runtime=False).mode == StorageMode.MEMMAP, "La mémoire doit être partagée entre les processus."
+	assert Planner(memory=1024 ** 2).plan(parameters, runtime=False).warnings[-1].startswith("Le rendu"), "La saturation doit être signalée."
+
+
+##################################################
+def test_planner_models():
+	""" Test des termes de mémoire et de durée propres à chaque modèle de pile. """
+	planner = Planner()
+	planner.calibration = Calibration(psf_seconds=1e-9, pixel_seconds=1e-9, step_seconds=1e-7)  # Étalonnage fixe (durées comparables)
+	plans = {}
+	for model in StackModelType:
+		parameters = check_parameters({"size": 128, "n_frames": 20, "density": 2, "stack_model": model.name})
+		plans[model] = plan = planner.plan(parameters)
+		expected = 128 * 128 * 4 * FRAME_TEMPORARIES[model] + plan.molecules * MOLECULE_BYTES[model]
+		if model == StackModelType.DRIFT: expected += 20 * DRIFT_FRAME_BYTES
+		assert plan.peak_bytes == plan.stack_bytes + expected, f"Le pic de mémoire du modèle {model.name} n'est pas correct."
+	print("\n" + "\n".join(f"{model.name}: {plan.peak_bytes} o, {plan.runtime:.3f} s" for model, plan in plans.items()))
+	assert plans[StackModelType.BLINKING].runtime < plans[StackModelType.RANDOM].runtime, "Le clignotement ne rend que les changements d'état."
+
+	parameters = check_parameters({"size": 128, "n_frames": 20, "density": 2, "stack_model": "DIFFUSION"})
+	slow = planner.plan(parameters | {"stack_model_options": {"sub_steps": 8}})
+	assert slow.runtime > plans[StackModelType.DIFFUSION].runtime, "Les sous-expositions de la diffusion doivent allonger la génération."
+	assert slow.peak_bytes == plans[StackModelType.DIFFUSION].peak_bytes, "Les sous-expositions ne doivent pas être conservées en mémoire."
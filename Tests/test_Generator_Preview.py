@@ -0,0 +1,74 @@
+""" Fichier des tests pour l'aperçu rapide d'une frame """
+
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from SampleMaker.Generator import Preview
+from SampleMaker.Tools.FileIO import save_sample_as_png
+
+OUTPUT_DIR = Path(__file__).parent / "Output"
+os.makedirs(OUTPUT_DIR, exist_ok=True)  # Créer le dossier de sorties (la première fois, il n'existe pas)
+
+
+##################################################
+def test_preview():
+	""" Test de l'aperçu en champ complet : taille, facteur de réduction et nombre de molécules. """
+	preview = Preview()
+	frame = preview.render({"size": 1024, "density": 0.5})
+	print(f"\n{preview}")
+	assert frame.shape == (256, 256), "La taille de l'aperçu n'est pas correcte."
+	assert frame.dtype == np.float32, "L'aperçu doit être en flottants 32 bits."
+	assert preview.factor == 4, "Le facteur de réduction n'est pas correct."
+	expected = (1024 * 160 / 1000) ** 2 * 0.5
+	assert abs(preview.n_molecules - expected) / expected < 0.01, "La densité de l'image demandée doit être conservée."
+
+	frame = preview.render({"size": 100})
+	assert frame.shape == (100, 100) and preview.factor == 1, "Une petite image n'est pas réduite."
+	with pytest.raises(ValueError) as exception_info: preview.render({"bad": 1})
+	assert exception_info.type == ValueError, "L'erreur relevé n'est pas correcte."
+
+
+##################################################
+def test_preview_roi():
+	""" Test de l'aperçu de la zone centrale à pleine résolution. """
+	preview = Preview(roi=True)
+	frame = preview.render({"size": 1024, "pattern": "STRIPES"})
+	assert frame.shape == (256, 256) and preview.factor == 1, "La zone centrale doit être à pleine résolution."
+	assert preview.get_geometry(1024) == (256, 1, 384), "La zone centrale n'est pas correcte."
+	save_sample_as_png(frame, f"{OUTPUT_DIR}/test_preview_roi.png", 0)
+
+
+##################################################
+def test_preview_caches():
+	""" Test de la conservation des masques et des noyaux entre deux rendus. """
+	preview = Preview()
+	parameters = {"size": 512, "pattern": "SQUARES", "pattern_options": {"size": 64}}
+	preview.render(parameters)
+	mask, kernels = preview._masks.copy(), preview._kernels.copy()
+	preview.render(parameters | {"snr": 5, "density": 1})
+	assert preview._masks.keys() == mask.keys(), "Le masque doit être conservé si le motif ne change pas."
+	assert preview._kernels.keys() == kernels.keys(), "Les noyaux doivent être conservés si la PSF ne change pas."
+	assert np.count_nonzero(next(iter(mask.values()))) < 256 * 256, "Le masque doit être appliqué."
+	preview.render(parameters | {"na": 1.0})
+	assert preview._kernels.keys() != kernels.keys(), "Les noyaux doivent être recalculés si la PSF change."
+
+	radius, kernels = preview.get_kernels(1.5, 2.0)
+	assert all(abs(k.sum() - 1) < 1e-6 for k in kernels), "Les noyaux doivent être normalisés."
+	assert preview.get_kernels(0.05, 2.0)[0] == 0, "Une PSF plus petite qu'un pixel doit être un noyau ponctuel."
+
+
+##################################################
+def test_preview_speed():
+	""" Test de la durée de l'aperçu d'une image de 4096 pixels (masque et noyaux déjà calculés). """
+	preview = Preview()
+	for parameters in ({"size": 4096}, {"size": 4096, "pattern": "SUN"}, {"size": 4096, "density": 1.0}):
+		preview.render(parameters)
+		start = time.perf_counter()
+		preview.render(parameters)
+		duration = time.perf_counter() - start
+		print(f"{parameters} : {preview}")
+		assert duration < 0.5, "L'aperçu doit être rapide."
@@ -3,7 +3,10 @@
 import os
 from pathlib import Path
 
-from SampleMaker.Generator import Sampler
+import numpy as np
+import pytest
+
+from SampleMaker.Generator import Noiser, Sampler
 from SampleMaker import Mask, Pattern, PatternType
 from SampleMaker.Tools.FileIO import save_sample_as_png
 
@@ -53,3 +56,75 @@ def test_sampler_bad_options():
 	sample = sampler.generate_sample()
 	save_sample_as_png(sample, f"{OUTPUT_DIR}/test_sampler_bad_options.png")
 	assert True
+
+
+##################################################
+def test_sampler_lazy_invalidation():
+	""" Test du recalcul paresseux des pré-calculs (uniquement ceux qui dépendent des paramètres modifiés). """
+	sampler = Sampler(size=64)
+	calls = []
+	for name in ("_set_area", "_set_psf_parameters", "_set_axis"):
+		method = getattr(sampler, name)
+		setattr(sampler, name, lambda method=method, name=name: (calls.append(name), method()))
+	sampler.generate_sample()
+	assert sorted(calls) == ["_set_area", "_set_axis", "_set_psf_parameters"], "Les pré-calculs doivent être faits à la première utilisation."
+
+	calls.clear()
+	sampler.size, sampler.size, sampler.size = 32, 48, 40
+	assert calls == [], "Les pré-calculs ne doivent pas être refaits lors de la modification d'un paramètre."
+	sampler.generate_sample()
+	assert sorted(calls) == ["_set_area", "_set_axis"], "Seuls les pré-calculs dépendant de la taille doivent être refaits, une seule fois."
+
+	calls.clear()
+	sampler.update(na=1.2, astigmatism_ratio=1.5, density=1)
+	sampler.generate_sample()
+	assert calls == ["_set_psf_parameters"], "Seuls les paramètres de la PSF doivent être recalculés."
+	assert sampler.max_molecules == int(sampler.area * 1), "Le nombre de molécules n'est pas mis à jour."
+	assert sampler.generate_sample().shape == (40, 40), "La taille de l'image n'est pas mise à jour."
+
+	with pytest.raises(ValueError) as exception_info: sampler.update(bad_param=1)
+	assert exception_info.type == ValueError, "L'erreur relevé n'est pas correcte."
+
+
+##################################################
+def test_sampler_memory_footprint():
+	""" Test de la mémoire occupée par le sampler (axe de coordonnées 1D, sans grille 2D). """
+	sampler = Sampler(size=512)
+	sample = sampler.generate_sample()
+	print(f"Mémoire occupée : {sampler.memory_footprint()} octets")
+	assert sampler._axis.shape == (512,) and sampler._axis.dtype == np.float32, "L'axe des coordonnées doit être 1D en float32."
+	expected = sampler._axis.nbytes + sampler.mask.mask.nbytes + sampler.last_localisations.nbytes + sampler.last_intensities.nbytes
+	assert sampler.memory_footprint() == expected, "La mémoire occupée n'est pas correcte."
+	assert sampler.memory_footprint() < sample.nbytes, "Le sampler ne doit pas conserver de tableau de la taille de l'image (hors masque booléen)."
+
+	# La PSF séparable correspond à la gaussienne 2D calculée sur toute la grille
+	sampler = Sampler(size=32)
+	localisation, intensities = np.array([[10.3, 20.7, 0.5]]), np.array([1000.0])
+	image = sampler.render_psf(localisation, intensities)
+	x_mesh, y_mesh = np.meshgrid(np.arange(32), np.arange(32))
+	ratio = 1 + 0.5 * (sampler.astigmatism_ratio - 1)
+	sigma_x, sigma_y = sampler._sigma_base * ratio, sampler._sigma_base / ratio
+	expected = 1000 / (2 * np.pi * sigma_x * sigma_y) * np.exp(-0.5 * (((x_mesh - 10.3) / sigma_x) ** 2 + ((y_mesh - 20.7) / sigma_y) ** 2))
+	assert np.allclose(image, expected, atol=1e-3), "La PSF séparable ne correspond pas à la gaussienne 2D."
+
+
+##################################################
+def test_sampler_grid_template():
+	""" Test du modèle sans bruit de la grille (PSF unitaires conservées entre deux appels). """
+	sampler = Sampler(size=128, noiser=Noiser(snr=0, background=0))
+	sample = sampler.generate_grid(shift=8)
+	template = sampler._grid_template
+	reference = sampler.generate_psf(sampler.last_localisations, sampler.last_intensities)
+	assert np.allclose(sample, reference, atol=1e-2), "La grille doit correspondre au rendu complet des PSF."
+
+	sample = sampler.generate_grid(shift=8)
+	assert sampler._grid_template is template, "Le modèle de la grille doit être conservé."
+	assert not np.allclose(sample, reference), "Les intensités doivent être tirées à chaque image."
+	assert sampler.memory_footprint() > template[2].nbytes + template[3].nbytes, "Le modèle doit être compté dans la mémoire occupée."
+
+	sampler.na = 1.2
+	sample = sampler.generate_grid(shift=8)
+	assert sampler._grid_template is not template, "Le modèle doit être recalculé si la PSF change."
+	reference = sampler.generate_psf(sampler.last_localisations, sampler.last_intensities)
+	assert np.allclose(sample, reference, atol=1e-2), "La grille doit correspondre au rendu complet des PSF avec la nouvelle PSF."
+	assert sampler.generate_grid(shift=16).shape == (128, 128) and sampler.n_molecules[-1] == 49, "Le modèle doit dépendre de l'espacement."
@@ -1,12 +1,25 @@
 """ Fichier des tests pour le Stacker : le générateur de pile d'échantillons """
 
-from SampleMaker.Generator import StackModel, StackModelType
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from SampleMaker.Generator import BlinkingOptions, DiffusionOptions, DriftOptions, PhotophysicsOptions, StackModel, StackModelType
+
+OUTPUT_DIR = Path(__file__).parent / "Output"
+os.makedirs(OUTPUT_DIR, exist_ok=True)  # Créer le dossier de sorties (la première fois, il n'existe pas)
 
 
 ##################################################
 def test_stack_model_type():
 	""" Test de l'objet StackModelType. """
 	assert StackModelType.RANDOM.tostring() == "Aléatoire", "La chaine de caractère ne correspond pas pour le pattern None"
+	assert StackModelType.BLINKING.tostring() == "Clignotement", "La chaine de caractère ne correspond pas pour le modèle de clignotement"
+	assert StackModelType.PHOTOPHYSICS.tostring() == "Photophysique", "La chaine de caractère ne correspond pas pour le modèle photophysique"
+	assert StackModelType.DIFFUSION.tostring() == "Diffusion", "La chaine de caractère ne correspond pas pour le modèle de diffusion"
+	assert StackModelType.DRIFT.tostring() == "Dérive", "La chaine de caractère ne correspond pas pour le modèle de dérive"
 
 
 ##################################################
@@ -16,3 +29,60 @@ def test_pattern():
 	model = StackModel.from_model(StackModelType.RANDOM, None)
 	assert model.model == StackModelType.RANDOM, "Ce n'est pas le bon type de pattern"
 	print(model)
+
+
+##################################################
+def test_blinking_model():
+	""" Test du modèle de clignotement. """
+	print()
+	model = StackModel.from_model(StackModelType.BLINKING, {"exposure": 20})
+	assert model.model == StackModelType.BLINKING, "Ce n'est pas le bon type de modèle"
+	assert isinstance(model.options, BlinkingOptions), "Les options ne correspondent pas au modèle"
+	assert model.options.exposure == 20 and model.options.on_ratio == 0.5, "Les options ne sont pas correctement appliquées"
+	print(model)
+
+
+##################################################
+def test_photophysics_model():
+	""" Test du modèle photophysique. """
+	print()
+	model = StackModel.from_model(StackModelType.PHOTOPHYSICS, {"bleach_time": 1000})
+	assert isinstance(model.options, PhotophysicsOptions), "Les options ne correspondent pas au modèle"
+	assert model.options.bleach_time == 1000 and model.options.exposure == 10, "Les options ne sont pas correctement appliquées"
+	print(model)
+
+
+##################################################
+def test_diffusion_model():
+	""" Test du modèle de diffusion. """
+	print()
+	model = StackModel.from_model(StackModelType.DIFFUSION, {"coefficient": 0.5, "sub_steps": 3})
+	assert isinstance(model.options, DiffusionOptions), "Les options ne correspondent pas au modèle"
+	assert model.options.coefficient == 0.5 and model.options.sub_steps == 3, "Les options ne sont pas correctement appliquées"
+	print(model)
+
+
+##################################################
+def test_drift_model():
+	""" Test du modèle de dérive et de ses trajectoires. """
+	print()
+	model = StackModel.from_model(StackModelType.DRIFT, {"velocity": [10, 0, 0]})
+	assert isinstance(model.options, DriftOptions), "Les options ne correspondent pas au modèle"
+	print(model)
+	trajectory = model.options.get_trajectory(5, pixel_size=100)
+	assert trajectory.shape == (5, 3), "La taille de la trajectoire n'est pas correcte."
+	assert np.allclose(trajectory[:, 0], [0, 0.1, 0.2, 0.3, 0.4]), "La dérive linéaire n'est pas correcte."
+
+	trajectory = DriftOptions(mode="random_walk", velocity=[0, 0, 0], sigma=[100, 100, 0]).get_trajectory(1000, pixel_size=100)
+	assert np.all(trajectory[0] == 0), "La dérive doit être nulle sur la première frame."
+	assert np.std(np.diff(trajectory[:, 0])) == pytest.approx(1, rel=0.1), "L'écart-type de la marche aléatoire n'est pas correct."
+
+	filename = f"{OUTPUT_DIR}/test_drift_model.csv"
+	np.savetxt(filename, [[100, 200], [150, 250], [300, 100]], delimiter=",", header="x [nm],y [nm]", comments="")
+	trajectory = DriftOptions(mode="file", filename=filename).get_trajectory(5, pixel_size=100)
+	assert np.allclose(trajectory[:, :2], [[0, 0], [0.5, 0.5], [2, -1], [2, -1], [2, -1]]), "La dérive chargée n'est pas correcte."
+
+	with pytest.raises(ValueError) as exception_info: DriftOptions(mode="bad").get_trajectory(5, 100)
+	assert exception_info.type == ValueError, "L'erreur relevé n'est pas correcte."
+	with pytest.raises(OSError) as exception_info: DriftOptions(mode="file", filename="bad_filename.csv").get_trajectory(5, 100)
+	assert exception_info.type == OSError, "L'erreur relevé n'est pas correcte."
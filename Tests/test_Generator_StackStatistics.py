@@ -0,0 +1,48 @@
+""" Fichier des tests pour les statistiques de pile calculées au fil de la génération """
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from SampleMaker.Generator import StackStatistics
+
+OUTPUT_DIR = Path(__file__).parent / "Output"
+os.makedirs(OUTPUT_DIR, exist_ok=True)  # Créer le dossier de sorties (la première fois, il n'existe pas)
+
+CLEAN = np.zeros((64, 64), dtype=np.float32)
+CLEAN[20:40, 20:40] = 1000
+REF_STACK = np.stack([CLEAN + np.random.normal(500, 50, CLEAN.shape).astype(np.float32) for _ in range(20)])
+
+
+##################################################
+def test_stack_statistics():
+	""" Test basique sur les statistiques (comparaison avec un calcul sur la pile complète). """
+	statistics = StackStatistics(target_snr=10)
+	for frame in REF_STACK: statistics.update(frame, CLEAN)
+	print(f"\n{statistics}")
+	assert statistics.n_frames == 20, "Le nombre de frames n'est pas correct."
+	assert np.allclose(statistics.mean, REF_STACK.mean(axis=0), atol=1e-3), "La moyenne ne correspond pas."
+	assert np.allclose(statistics.variance, REF_STACK.var(axis=0, ddof=1), rtol=1e-3), "La variance ne correspond pas."
+	assert np.array_equal(statistics.min, REF_STACK.min(axis=0)), "La projection minimum ne correspond pas."
+	assert np.array_equal(statistics.max, REF_STACK.max(axis=0)), "La projection maximum ne correspond pas."
+	assert statistics.histograms.shape == (20, 256), "La taille des histogrammes n'est pas correcte."
+	assert (statistics.histograms.sum(axis=1) == CLEAN.size).all(), "Tous les pixels doivent être comptés."
+	assert np.allclose(statistics.snr, (500 + CLEAN.mean()) / 50, rtol=0.1), "Le SNR atteint n'est pas correct."
+	statistics.save(f"{OUTPUT_DIR}/test_stack_statistics.npz")
+	assert set(np.load(f"{OUTPUT_DIR}/test_stack_statistics.npz").files) >= {"mean", "variance", "min", "max", "histograms", "snr"}
+
+
+##################################################
+def test_stack_statistics_empty():
+	""" Test sur des statistiques sans frame ou sans image de référence. """
+	statistics = StackStatistics()
+	print(f"\n{statistics}")
+	assert statistics.histograms.shape == (0, 256), "La taille des histogrammes n'est pas correcte."
+	with pytest.raises(ValueError) as exception_info: statistics.save(f"{OUTPUT_DIR}/test_stack_statistics_empty.npz")
+	assert exception_info.type == ValueError, "L'erreur relevé n'est pas correcte."
+	statistics.update(REF_STACK[0])
+	print(statistics)
+	assert np.isnan(statistics.snr[0]), "Le SNR ne peut pas être calculé sans image de référence."
+	assert np.allclose(statistics.variance, 0), "La variance d'une seule frame est nulle."
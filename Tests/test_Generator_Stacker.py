@@ -3,7 +3,9 @@
 import os
 from pathlib import Path
 
-from SampleMaker.Generator import Sampler, Stacker
+import numpy as np
+
+from SampleMaker.Generator import LocalisationTable, Sampler, Stacker, StackEvent, StackModel, StackModelType, StackObserver
 
 INPUT_DIR = Path(__file__).parent / "Input"
 OUTPUT_DIR = Path(__file__).parent / "Output"
@@ -21,3 +23,170 @@ def test_stacker():
 	print(stacker)
 	stack.save(f"{OUTPUT_DIR}/test_stacker_base.tif")
 	assert True
+
+
+##################################################
+def test_stacker_uint16():
+	""" Test sur le générateur de stack en entiers 16 bits. """
+	stacker = Stacker(sampler=SAMPLER, as_uint16=True)
+	stack = stacker.generate(5)
+	assert stack.stack.dtype == np.uint16, "La pile devrait être stockée en uint16."
+	assert stack.stack.shape == (5, 128, 128), "La taille de la pile n'est pas correcte."
+	assert stack.as_float32().dtype == np.float32, "La conversion en flottants n'est pas correcte."
+	stack.save(f"{OUTPUT_DIR}/test_stacker_uint16.tif")
+
+
+##################################################
+def test_stacker_localisations():
+	""" Test sur l'enregistrement de la vérité terrain par le générateur de stack. """
+	stacker = Stacker(sampler=SAMPLER)
+	stacker.generate(5)
+	assert len(stacker.localisations) == sum(SAMPLER.n_molecules), "Toutes les molécules doivent être enregistrées."
+	assert np.array_equal(np.unique(stacker.localisations.columns["frame"]), np.arange(5)), "Toutes les frames doivent être présentes."
+
+	stacker.generate(5, f"{OUTPUT_DIR}/test_stacker_localisations.csv")
+	assert os.path.isfile(f"{OUTPUT_DIR}/test_stacker_localisations.csv"), "Le fichier de vérité terrain doit être créé."
+
+
+##################################################
+def test_stacker_statistics():
+	""" Test sur le calcul des statistiques par le générateur de stack. """
+	stacker = Stacker(sampler=SAMPLER, compute_statistics=True)
+	stack = stacker.generate(5)
+	print(stacker.statistics)
+	assert np.allclose(stacker.statistics.mean, stack.stack.mean(axis=0), atol=1e-2), "La moyenne ne correspond pas."
+	assert np.array_equal(stacker.statistics.max, stack.stack.max(axis=0)), "La projection maximum ne correspond pas."
+	assert not np.isnan(stacker.statistics.snr).any(), "Le SNR atteint doit être calculé pour chaque frame."
+
+
+##################################################
+def test_stacker_blinking():
+	""" Test sur le modèle de clignotement (rendu incrémental d'une population persistante). """
+	stacker = Stacker(sampler=SAMPLER, stack_model=StackModel.from_model(StackModelType.BLINKING, {"exposure": 20}))
+	stack = stacker.generate(10)
+	assert stack.stack.shape == (10, 128, 128), "La taille de la pile n'est pas correcte."
+	assert len(stacker.localisations) == sum(SAMPLER.n_molecules), "Toutes les molécules allumées doivent être enregistrées."
+
+	# Les molécules allumées sont issues d'une même population persistante
+	first, last = stacker.localisations.get_frame(0), stacker.localisations.get_frame(9)
+	common = np.intersect1d(first[:, 0], last[:, 0])
+	print(f"\nMolécules allumées : {SAMPLER.n_molecules}, communes entre la première et la dernière frame : {common.size}")
+	assert common.size > 0, "La population de molécules doit être persistante."
+
+	stack.save(f"{OUTPUT_DIR}/test_stacker_blinking.tif")
+
+	# L'image sans bruit incrémentale doit correspondre à un rendu complet des molécules allumées
+	cleans, finalize = [], stacker._finalize_frame
+	stacker._finalize_frame = lambda index, clean: cleans.append(clean) or finalize(index, clean)
+	stacker.generate(10)
+	for i, clean in enumerate(cleans):
+		molecules = stacker.localisations.get_frame(i)
+		expected = SAMPLER.generate_psf(molecules[:, :3], molecules[:, 3])
+		assert np.allclose(clean, expected, atol=1e-2), f"L'image incrémentale de la frame {i} ne correspond pas au rendu complet."
+
+
+##################################################
+def test_stacker_photophysics():
+	""" Test sur le modèle photophysique. """
+	stacker = Stacker(sampler=SAMPLER, stack_model=StackModel.from_model(StackModelType.PHOTOPHYSICS, {"off_time": 100, "bleach_time": 200}))
+	stack = stacker.generate(10)
+	print(f"\nMolécules visibles : {SAMPLER.n_molecules}")
+	assert stack.stack.shape == (10, 128, 128), "La taille de la pile n'est pas correcte."
+	assert len(stacker.localisations) == sum(SAMPLER.n_molecules), "Toutes les molécules visibles doivent être enregistrées."
+	stack.save(f"{OUTPUT_DIR}/test_stacker_photophysics.tif")
+
+
+##################################################
+def test_stacker_diffusion():
+	""" Test sur le modèle de diffusion. """
+	stacker = Stacker(sampler=SAMPLER, stack_model=StackModel.from_model(StackModelType.DIFFUSION, {"coefficient": 1, "sub_steps": 2}))
+	stack = stacker.generate(5)
+	n = SAMPLER.n_molecules[0]
+	assert stack.stack.shape == (5, 128, 128), "La taille de la pile n'est pas correcte."
+	first, last = stacker.localisations.get_frame(0), stacker.localisations.get_frame(4)
+	assert first.shape == last.shape == (n, 4), "La vérité terrain doit contenir la position de chaque particule à chaque frame."
+	assert np.allclose(last[:, :3], SAMPLER.last_localisations), "La vérité terrain doit suivre les positions courantes."
+	assert not np.allclose(first[:, :3], last[:, :3]), "Les particules doivent se déplacer."
+	assert np.allclose(first[:, 2], last[:, 2]), "Les particules doivent être dans le même ordre à chaque frame."
+	stack.save(f"{OUTPUT_DIR}/test_stacker_diffusion.tif")
+
+
+##################################################
+def test_stacker_drift():
+	""" Test sur le modèle de dérive (décalage des coordonnées au rendu). """
+	stacker = Stacker(sampler=SAMPLER, stack_model=StackModel.from_model(StackModelType.DRIFT, {"velocity": [160, 80, 0]}))
+	stack = stacker.generate(5, f"{OUTPUT_DIR}/test_stacker_drift.csv")
+	assert stack.stack.shape == (5, 128, 128), "La taille de la pile n'est pas correcte."
+	assert np.allclose(stacker.drift[:, :2], [[i, i / 2] for i in range(5)]), "La trajectoire de la dérive n'est pas correcte."
+
+	table = LocalisationTable.open(f"{OUTPUT_DIR}/test_stacker_drift.csv", SAMPLER.pixel_size)
+	drifted, undrifted = table.get_frame(4), table.get_frame(4, undrifted=True)
+	assert np.allclose(undrifted[:, :3], table.get_frame(0, undrifted=True)[:, :3], atol=1e-2), "La population doit être fixe."
+	assert np.allclose(drifted[:, :3] - undrifted[:, :3], stacker.drift[4], atol=1e-2), "Les positions observées doivent inclure la dérive."
+	stack.save(f"{OUTPUT_DIR}/test_stacker_drift.tif")
+
+
+##################################################
+def test_stacker_progress_cancel():
+	""" Test du suivi de l'avancement et de l'annulation (la partie générée est conservée). """
+	calls = []
+
+	class Canceller(StackObserver):
+		def on_frame(self, event: StackEvent):
+			calls.append((event.frame + 1, event.total))
+			if event.frame == 2: stacker.cancel()
+
+	stacker = Stacker(sampler=SAMPLER, observers=[Canceller()])
+	stack = stacker.generate(10)
+	print(calls)
+	assert calls == [(1, 10), (2, 10), (3, 10)], "L'avancement doit être signalé après chaque frame."
+	assert stacker.n_generated == 3, "La génération doit s'arrêter après la frame en cours."
+	assert stack.stack.shape == (3, 128, 128), "La pile doit contenir uniquement les frames générées."
+	assert len(stacker.localisations.get_frame(2)) > 0 and len(stacker.localisations.get_frame(3)) == 0, "La vérité terrain doit s'arrêter à la dernière frame générée."
+	assert not stacker.cancelled, "La demande d'annulation doit être levée à la fin de la génération."
+
+	stacker.observers = []
+	stack = stacker.generate(4)
+	assert stacker.n_generated == 4 and stack.stack.shape[0] == 4, "Une nouvelle génération ne doit pas être annulée."
+
+	stacker.stack_model = StackModel.from_model(StackModelType.DRIFT, {"velocity": [160, 80, 0]})
+	stacker.observers = [Canceller()]
+	stack = stacker.generate(10)
+	assert stack.stack.shape[0] == 3 and stacker.drift.shape == (3, 3), "La trajectoire de la dérive doit s'arrêter à la dernière frame générée."
+
+
+##################################################
+class Recorder(StackObserver):
+	""" Observateur enregistrant tous les événements. """
+	phases = True
+
+	def __init__(self): self.starts, self.phase_events, self.frame_events, self.ends = [], [], [], []
+
+	def on_start(self, total: int): self.starts.append(total)
+
+	def on_phase(self, event: StackEvent): self.phase_events.append(event)
+
+	def on_frame(self, event: StackEvent): self.frame_events.append(event)
+
+	def on_end(self, n_generated: int, total: int, elapsed: float): self.ends.append((n_generated, total))
+
+
+##################################################
+def test_stacker_observers():
+	""" Test des observateurs : événements de début, de phases, de frames et de fin pour chaque modèle. """
+	for model in StackModelType:
+		recorder = Recorder()
+		stacker = Stacker(sampler=SAMPLER, stack_model=StackModel.from_model(model), observers=[recorder])
+		stacker.generate(3)
+		print(model, recorder.frame_events[-1])
+		assert recorder.starts == [3] and recorder.ends == [(3, 3)], f"Le début et la fin doivent être signalés ({model})."
+		assert [e.frame for e in recorder.frame_events] == [0, 1, 2], f"Chaque frame doit être signalée ({model})."
+		assert [e.phase for e in recorder.phase_events] == ["localisation", "psf", "noise", "write"] * 3, f"Les phases ne sont pas correctes ({model})."
+		assert all(e.n_molecules == n for e, n in zip(recorder.frame_events, SAMPLER.n_molecules)), f"Le nombre de molécules n'est pas correct ({model})."
+		assert all(e.duration >= 0 for e in recorder.phase_events + recorder.frame_events), f"Les durées doivent être positives ({model})."
+		assert SAMPLER.on_phase is None, "Le sampler ne doit plus être observé après la génération."
+
+	recorder = Recorder()
+	recorder.phases = False
+	Stacker(sampler=SAMPLER, observers=[recorder]).generate(2)
+	assert len(recorder.phase_events) == 0 and len(recorder.frame_events) == 2, "Les phases ne doivent être signalées qu'aux observateurs des phases."
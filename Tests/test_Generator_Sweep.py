@@ -0,0 +1,78 @@
+""" Fichier des tests pour la génération de séries de piles sur une grille de paramètres """
+
+import json
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from SampleMaker.Generator import Sweep, build_stacker
+from SampleMaker.Generator.Sweep import _build_mask, expand_grid, get_parameters_hash, get_run_name, MASK_CACHE_SIZE
+
+OUTPUT_DIR = Path(__file__).parent / "Output"
+os.makedirs(OUTPUT_DIR, exist_ok=True)  # Créer le dossier de sorties (la première fois, il n'existe pas)
+
+BASE = {"size": 64, "n_frames": 2}
+GRID = {"density": [0.25, 0.5], "snr": [5, 10], "pattern": ["NONE", "STRIPES"]}
+
+
+##################################################
+def test_sweep_grid():
+	""" Test du développement de la grille et des noms d'exécution. """
+	runs = expand_grid(GRID)
+	assert len(runs) == 8, "Le nombre de combinaisons n'est pas correct."
+	assert get_run_name(runs[0]) == "density-0.25_snr-5_pattern-NONE", "Le nom de l'exécution n'est pas correct."
+	assert get_run_name({"pattern_options": {"lengths": [10, 5]}}) == "pattern_options-lengths105", "Le nom de l'exécution n'est pas correct."
+
+
+##################################################
+def test_sweep_build_stacker():
+	""" Test de la construction d'un générateur à partir de paramètres et des caches. """
+	first = build_stacker(BASE | {"snr": 5, "pattern": "STRIPES"})
+	second = build_stacker(BASE | {"snr": 10, "pattern": "STRIPES"})
+	assert first.sampler is not second.sampler, "Chaque pile doit avoir son propre sampler."
+	assert first.sampler.mask is second.sampler.mask, "Le masque doit être réutilisé."
+	assert first.sampler.noiser.snr == 5 and second.sampler.noiser.snr == 10, "Le bruit d'un générateur ne doit pas être modifié par le suivant."
+	assert build_stacker(BASE | {"snr": 5, "pattern": "STRIPES"}, cache=False).sampler.mask is not first.sampler.mask, \
+		"Sans cache, un nouveau masque doit être construit."
+	for size in range(MASK_CACHE_SIZE + 4): build_stacker(BASE | {"size": 16 + size})
+	assert _build_mask.cache_info().currsize <= MASK_CACHE_SIZE, "Le cache des masques doit être borné."
+
+	with pytest.raises(ValueError) as exception_info: build_stacker({"bad_parameter": 1})
+	assert exception_info.type == ValueError, "L'erreur relevé n'est pas correcte."
+	with pytest.raises(ValueError) as exception_info: build_stacker({"pattern": "BAD"})
+	assert exception_info.type == ValueError, "L'erreur relevé n'est pas correcte."
+
+
+##################################################
+def test_sweep_run():
+	""" Test d'une grille exécutée dans le processus courant puis reprise. """
+	output = f"{OUTPUT_DIR}/test_sweep"
+	shutil.rmtree(output, ignore_errors=True)
+	sweep = Sweep(GRID, output, BASE, workers=1)
+	print(f"\n{sweep}")
+	results = sweep.run()
+	assert len(results) == 8 and not any(r["skipped"] for r in results), "Toutes les exécutions doivent être lancées."
+	for r in results: assert os.path.isfile(r["tif"]) and os.path.isfile(r["log"]), "Les fichiers de sortie doivent être créés."
+	with open(results[0]["log"], "r", encoding="utf-8") as f: log = json.load(f)
+	assert log["parameters"]["size"] == 64, "Le log doit contenir les paramètres."
+
+	assert log["hash"] == get_parameters_hash(log["parameters"]), "Le log doit contenir l'empreinte des paramètres."
+
+	# Reprise après interruption : seule l'exécution sans log est relancée
+	os.remove(results[3]["log"])
+	results = sweep.run()
+	assert sum(not r["skipped"] for r in results) == 1, "Seule l'exécution interrompue doit être relancée."
+	# Paramètres fixes modifiés : les noms sont identiques mais toutes les exécutions sont relancées
+	results = Sweep(GRID, output, BASE | {"n_frames": 3}, workers=1).run()
+	assert not any(r["skipped"] for r in results), "Les exécutions aux paramètres modifiés doivent être relancées."
+
+
+##################################################
+def test_sweep_run_pool():
+	""" Test d'une grille exécutée par un groupe de processus. """
+	output = f"{OUTPUT_DIR}/test_sweep_pool"
+	shutil.rmtree(output, ignore_errors=True)
+	results = Sweep({"snr": [5, 10, 20]}, output, BASE, workers=2).run()
+	assert len(results) == 3 and all(os.path.isfile(r["log"]) for r in results), "Toutes les exécutions doivent être terminées."
@@ -0,0 +1,61 @@
+""" Fichier des tests pour le temps d'importation et le chargement paresseux des modules """
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).parent.parent
+HEAVY_MODULES = ["plotly", "scipy", "psutil", "PyQt5"]
+MAX_IMPORT_TIME = 1.5  # Temps maximal d'importation en secondes (large, pour ne pas dépendre de la machine)
+
+
+##################################################
+def measure_import(module: str) -> tuple[float, list[str]]:
+	""" Mesure le temps d'importation d'un module dans un nouveau processus et retourne les modules coûteux importés. """
+	code = (f"import sys, time; start = time.perf_counter(); import {module}; elapsed = time.perf_counter() - start; "
+			f"print(elapsed); print(','.join(m for m in {HEAVY_MODULES} if m in sys.modules))")
+	result = subprocess.run([sys.executable, "-c", code], cwd=ROOT_DIR, capture_output=True, text=True, timeout=120)
+	assert result.returncode == 0, f"L'importation de {module} a échoué : {result.stderr}"
+	lines = result.stdout.splitlines()
+	return float(lines[0]), [m for m in lines[1].split(",") if m] if len(lines) > 1 else []
+
+
+##################################################
+@pytest.mark.parametrize("module", ["SampleMaker", "SampleMaker.Generator", "SampleMaker.Generator.Sampler", "SampleMaker.GUI"])
+def test_import_time(module):
+	""" Test du temps d'importation : aucun module coûteux ne doit être importé à l'importation du paquet. """
+	elapsed, heavy = measure_import(module)
+	print(f"\nImportation de {module} : {elapsed * 1000:.0f} ms (modules coûteux : {heavy or 'aucun'})")
+	assert not heavy, f"Les modules {heavy} ne doivent pas être importés par {module}."
+	assert elapsed < MAX_IMPORT_TIME, f"L'importation de {module} est trop lente ({elapsed:.2f} s)."
+
+
+##################################################
+def test_lazy_attributes():
+	""" Test du chargement paresseux des sous-packages, modules et classes. """
+	import SampleMaker
+	from SampleMaker import Tools
+
+	assert SampleMaker.Generator.Sampler is not None, "Le sous-package Generator doit être chargé à la demande."
+	assert isinstance(Tools.Monitoring, type), "Monitoring doit être la classe et non le module."
+	assert callable(Tools.draw_test_section), "Les fonctions de dessin doivent être chargées à la demande."
+	assert Tools.Drawing.draw_test_section is Tools.draw_test_section, "Le module de dessin doit être chargé à la demande."
+	with pytest.raises(AttributeError) as exception_info: _ = SampleMaker.BadModule
+	assert exception_info.type == AttributeError, "L'erreur relevé n'est pas correcte."
+	with pytest.raises(AttributeError) as exception_info: _ = Tools.BadModule
+	assert exception_info.type == AttributeError, "L'erreur relevé n'est pas correcte."
+
+
+##################################################
+def test_monitoring_not_shadowed():
+	""" Test de la classe Monitoring : l'importation directe du sous-module ne doit pas masquer la classe. """
+	import importlib
+
+	from SampleMaker import Tools
+
+	module = importlib.import_module("SampleMaker.Tools.Monitoring")
+	assert Tools.Monitoring is module.Monitoring, "Monitoring doit être la classe après l'importation du sous-module."
+	setattr(Tools, "Monitoring", module)  # Liaison effectuée par le système d'importation
+	assert Tools.Monitoring is module.Monitoring, "La liaison du sous-module ne doit pas masquer la classe."
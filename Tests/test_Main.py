@@ -0,0 +1,92 @@
+""" Fichier des tests pour le point d'entrée en ligne de commande """
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from SampleMaker import Stack
+from SampleMaker.Generator import Planner
+from SampleMaker.__main__ import generate, main, ProgressPrinter
+from SampleMaker.Tools import open_config
+
+ROOT_DIR = Path(__file__).parent.parent
+OUTPUT_DIR = Path(__file__).parent / "Output"
+os.makedirs(OUTPUT_DIR, exist_ok=True)  # Créer le dossier de sorties (la première fois, il n'existe pas)
+
+CONFIG = {"parameters": {"size": 64, "n_frames": 3, "density": 0.5, "pattern": "STRIPES", "compression": "zlib"},
+		  "output":     {"directory": f"{OUTPUT_DIR}/test_main", "name": "stack", "uint16": True, "statistics": True},
+		  "grid":       {"snr": [5, 10]}}
+
+
+##################################################
+def test_open_config():
+	""" Test de la lecture des fichiers de configuration. """
+	config = open_config(f"{ROOT_DIR}/Examples/Config.toml")
+	assert config["parameters"]["pattern"] == "STRIPES", "La configuration TOML n'est pas correctement lue."
+	with open(f"{OUTPUT_DIR}/test_main.json", "w", encoding="utf-8") as f: json.dump(CONFIG, f)
+	assert open_config(f"{OUTPUT_DIR}/test_main.json") == CONFIG, "La configuration JSON n'est pas correctement lue."
+
+	with pytest.raises(OSError) as exception_info: open_config("bad_filename.toml")
+	assert exception_info.type == OSError, "L'erreur relevé n'est pas correcte."
+	with pytest.raises(ValueError) as exception_info: open_config(f"{ROOT_DIR}/README.md")
+	assert exception_info.type == ValueError, "L'erreur relevé n'est pas correcte."
+
+
+##################################################
+def test_main_generate(capsys, monkeypatch):
+	""" Test de la génération à partir d'une configuration. """
+	result = generate(CONFIG, observers=[ProgressPrinter(0)])
+	assert "Frame 3/3" in capsys.readouterr().err, "L'avancement doit être affiché sur la sortie d'erreur."
+	print(f"\n{result}")
+	assert os.path.isfile(result["output"]), "La pile doit être enregistrée."
+	assert os.path.isfile(f"{OUTPUT_DIR}/test_main/stack.csv"), "La vérité terrain doit être enregistrée."
+	assert os.path.isfile(f"{OUTPUT_DIR}/test_main/stack_statistics.npz"), "Les statistiques doivent être enregistrées."
+
+	result = generate(CONFIG | {"output": CONFIG["output"] | {"format": "chunks"}})
+	assert os.path.isdir(result["output"]), "Le dossier de blocs doit être créé."
+	# Pile trop grande pour la mémoire (256 ko imposés) : pile projetée (TIF) ou écrite en flux (blocs)
+	monkeypatch.setattr(sys.modules[Planner.__module__], "get_available_memory", lambda: 256 * 1024)
+	result = generate(CONFIG | {"parameters": CONFIG["parameters"] | {"n_frames": 40}})
+	assert result["mode"] == "MEMMAP" and os.path.isfile(result["output"]), "La pile doit être projetée depuis un fichier temporaire."
+	assert not os.path.isfile(f"{OUTPUT_DIR}/test_main/stack.npy"), "Le fichier temporaire doit être supprimé."
+	result = generate(CONFIG | {"parameters": CONFIG["parameters"] | {"n_frames": 40}, "output": CONFIG["output"] | {"format": "chunks"}})
+	assert result["mode"] == "STREAM" and result["bytes"] == 40 * 64 * 64 * 2, "La pile doit être écrite en flux."
+	stack = Stack()
+	stack.open(result["output"])
+	assert stack.store.shape == (40, 64, 64), "La pile écrite en flux doit pouvoir être relue."
+	with pytest.raises(ValueError) as exception_info: generate(CONFIG | {"output": {"format": "bad"}})
+	assert exception_info.type == ValueError, "L'erreur relevé n'est pas correcte."
+
+
+##################################################
+def test_main_commands():
+	""" Test des commandes generate et sweep. """
+	shutil.rmtree(CONFIG["output"]["directory"], ignore_errors=True)
+	with open(f"{OUTPUT_DIR}/test_main.json", "w", encoding="utf-8") as f: json.dump(CONFIG, f)
+	assert main(["generate", f"{OUTPUT_DIR}/test_main.json", "--workers", "2"]) == 0, "La commande generate doit réussir."
+	assert main(["generate", f"{OUTPUT_DIR}/test_main.json", "--progress"]) == 0, "La commande generate avec l'avancement doit réussir."
+	assert main(["generate", f"{OUTPUT_DIR}/test_main.json", "--monitor", f"{OUTPUT_DIR}/test_main_monitoring.html"]) == 0, \
+		"La commande generate avec le monitoring doit réussir."
+	assert os.path.isfile(f"{OUTPUT_DIR}/test_main_monitoring.html"), "Le rapport des ressources n'est pas enregistré."
+	assert main(["sweep", f"{OUTPUT_DIR}/test_main.json", "--processes", "1"]) == 0, "La commande sweep doit réussir."
+	assert main(["plan", f"{OUTPUT_DIR}/test_main.json"]) == 0, "La commande plan doit réussir."
+	assert main(["generate", "bad_filename.toml"]) == 1, "Une configuration introuvable doit renvoyer une erreur."
+
+
+##################################################
+def test_main_without_qt():
+	""" Test de la ligne de commande dans un nouveau processus : Qt ne doit pas être importé. """
+	with open(f"{OUTPUT_DIR}/test_main.json", "w", encoding="utf-8") as f: json.dump(CONFIG, f)
+	code = ("import sys; from SampleMaker.__main__ import main; "
+			f"code = main(['generate', r'{OUTPUT_DIR}/test_main.json']); "
+			"print('Qt importé' if any(m.startswith('PyQt5') for m in sys.modules) else 'Qt non importé'); sys.exit(code)")
+	result = subprocess.run([sys.executable, "-c", code], cwd=ROOT_DIR, capture_output=True, text=True, timeout=300)
+	print(f"\n{result.stdout}{result.stderr}")
+	assert result.returncode == 0, "La commande doit réussir."
+	assert "Qt non importé" in result.stdout, "Qt ne doit pas être importé par la ligne de commande."
+	assert "frames/s" in result.stdout, "Le débit doit être affiché."
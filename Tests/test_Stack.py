@@ -1,6 +1,7 @@
 """ Fichier des tests pour la classe Stack """
 
 import os
+import tracemalloc
 from pathlib import Path
 
 import numpy as np
@@ -71,6 +72,22 @@ def test_stack_setter_getter():
 	assert exception_info.type == IndexError, "L'erreur relevé n'est pas correcte."
 
 
+##################################################
+def test_stack_uint16():
+	""" Test sur une pile stockée en entiers 16 bits. """
+	stack = Stack()
+	stack.reserve(2, 2, 2, np.uint16)
+	stack.add_sample(np.full((2, 2), 1.6, dtype=np.float32), 0)
+	stack.add_sample(np.full((2, 2), -3, dtype=np.float32), 1)
+	assert stack.stack.dtype == np.uint16, "La pile devrait être stockée en uint16."
+	assert np.array_equal(stack.get_sample(0), np.full((2, 2), 2)), "L'échantillon devrait être arrondi."
+	assert np.array_equal(stack.get_sample(1), np.zeros((2, 2))), "L'échantillon devrait être borné."
+	res = stack.as_float32()
+	assert res.dtype == np.float32 and np.allclose(res[0], 2), "La conversion en flottants n'est pas correcte."
+	stack.add_sample(np.array([[1, 2], [3, 70000]]), 1)
+	assert np.array_equal(stack.get_sample(1), np.array([[1, 2], [3, 65535]])), "Un échantillon entier devrait être borné sans erreur."
+
+
 ##################################################
 def test_stack_save():
 	""" Test sur l'enregistrement d'une pile. """
@@ -94,6 +111,27 @@ def test_stack_open():
 	assert np.allclose(ref.stack, stack.stack, atol=1), "La pile devrait correspondre à la référence avec une tolérance d'erreur."
 
 
+##################################################
+def test_stack_chunks():
+	""" Test sur l'enregistrement et l'ouverture d'une pile en blocs. """
+	stack = Stack()
+	stack.add_sample(np.zeros((2, 2)).astype(np.float32))
+	stack.add_sample(np.ones((2, 2)).astype(np.float32))
+	stack.save_chunks(f"{OUTPUT_DIR}/test_stack_chunks", chunk_frames=1)
+	res = Stack()
+	res.open(f"{OUTPUT_DIR}/test_stack_chunks")
+	print(res)
+	assert res.store is not None and res.stack.size == 0, "Le dossier de blocs ne doit pas être chargé en mémoire."
+	assert np.allclose(stack.stack, res.as_float32(), atol=1e-5), "La pile devrait correspondre à la référence avec une tolérance d'erreur."
+	res.save_chunks(f"{OUTPUT_DIR}/test_stack_chunks_copy", chunk_frames=2)  # Copie bloc par bloc
+	res.save(f"{OUTPUT_DIR}/test_stack_chunks.tif")  # Conversion frame par frame
+	copy = Stack()
+	copy.open(f"{OUTPUT_DIR}/test_stack_chunks_copy")
+	assert np.array_equal(copy.get_sample(1), stack.stack[1]), "La copie devrait correspondre à la référence."
+	copy.open(f"{OUTPUT_DIR}/test_stack_chunks.tif")
+	assert np.array_equal(copy.stack, stack.stack), "Le fichier TIF devrait correspondre à la référence."
+
+
 ##################################################
 def test_stack_open_bad_file():
 	""" Test sur l'enregistrement d'une pile avec un fichier inexistant. """
@@ -101,3 +139,57 @@ def test_stack_open_bad_file():
 	with pytest.raises(OSError) as exception_info:
 		stack.open("bad_filename.tif")
 	assert exception_info.type == OSError, "L'erreur relevé n'est pas correcte."
+
+
+##################################################
+def test_stack_memmap():
+	""" Test d'une pile projetée en mémoire depuis un fichier temporaire. """
+	stack = Stack()
+	stack.reserve(3, 4, 4, np.uint16, f"{OUTPUT_DIR}/test_stack_memmap.npy")
+	for i in range(2): stack.add_sample(np.full((4, 4), i + 0.6, dtype=np.float32), i)
+	stack.close(2)
+	assert isinstance(stack.stack, np.memmap) and stack.stack.shape == (2, 4, 4), "La pile projetée doit être réduite aux frames remplies."
+	assert stack.get_sample(1)[0, 0] == 2, "Les échantillons doivent être convertis en entiers 16 bits."
+	stack.save(f"{OUTPUT_DIR}/test_stack_memmap.tif")
+	stack.release()
+	assert not os.path.isfile(f"{OUTPUT_DIR}/test_stack_memmap.npy"), "Le fichier temporaire doit être supprimé."
+	res = Stack()
+	res.open(f"{OUTPUT_DIR}/test_stack_memmap.tif")
+	assert res.stack.shape == (2, 4, 4), "La pile enregistrée depuis le fichier projeté n'est pas correcte."
+
+
+##################################################
+def test_stack_memmap_save_peak():
+	""" Test du pic de mémoire de l'enregistrement d'une pile projetée en mémoire (conversion frame par frame). """
+	stack = Stack()
+	stack.reserve(32, SIZE, SIZE, np.float32, f"{OUTPUT_DIR}/test_stack_memmap_peak.npy")
+	for i in range(32): stack.add_sample(np.full((SIZE, SIZE), i * 100.4, dtype=np.float32), i)
+	stack.close(32)
+	tracemalloc.start()
+	stack.save(f"{OUTPUT_DIR}/test_stack_memmap_peak.tif", compression="zlib")
+	_, peak = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	print(f"Pile : {stack.nbytes / 1024 ** 2:.1f} Mo, pic de l'enregistrement : {peak / 1024 ** 2:.2f} Mo")
+	assert peak < 6 * SIZE * SIZE * 4, "L'enregistrement ne doit pas copier la pile entière en mémoire."
+	stack.release()
+	res = Stack()
+	res.open(f"{OUTPUT_DIR}/test_stack_memmap_peak.tif")
+	assert res.stack.shape == (32, SIZE, SIZE) and res.stack[31, 0, 0] == 3112, "La pile enregistrée frame par frame n'est pas correcte."
+
+
+##################################################
+def test_stack_stream():
+	""" Test d'une pile écrite en flux dans un dossier de blocs (annulée avant la fin). """
+	stack = Stack()
+	stack.stream(f"{OUTPUT_DIR}/test_stack_stream", 10, 4, 4, np.float32, chunk_frames=3)
+	for i in range(7): stack.add_sample(np.full((4, 4), i, dtype=np.float32))
+	assert stack.stack.shape == (3, 4, 4), "Seul le bloc en cours doit être conservé en mémoire."
+	with pytest.raises(ValueError) as exception_info: stack.add_sample(np.zeros((4, 4), dtype=np.float32), 9)
+	assert exception_info.type == ValueError, "L'erreur relevé n'est pas correcte."
+	stack.close(7)
+	assert stack.nbytes == 7 * 4 * 4 * 4, "La taille de la pile doit compter les frames écrites en flux."
+	assert stack.get_sample(6)[0, 0] == 6, "La dernière frame du bloc incomplet doit être écrite."
+	stack.save_chunks(f"{OUTPUT_DIR}/test_stack_stream")  # Même dossier : rien à faire
+	res = Stack()
+	res.open(f"{OUTPUT_DIR}/test_stack_stream")
+	assert np.allclose(res.as_float32()[:, 0, 0], np.arange(7)), "La pile écrite en flux n'est pas correcte."
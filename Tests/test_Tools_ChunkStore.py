@@ -0,0 +1,82 @@
+""" Fichier des tests pour le stockage de pile en blocs """
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from SampleMaker.Tools import ChunkStore
+
+OUTPUT_DIR = Path(__file__).parent / "Output"
+os.makedirs(OUTPUT_DIR, exist_ok=True)  # Créer le dossier de sorties (la première fois, il n'existe pas)
+
+SHAPE = (10, 64, 48)
+REF_STACK = np.arange(np.prod(SHAPE), dtype=np.uint32).reshape(SHAPE).astype(np.uint16)
+
+
+##################################################
+def write_chunk(directory: str, key):
+	""" Écriture d'un bloc depuis un processus indépendant (le stockage est rouvert à partir du manifeste). """
+	store = ChunkStore.open(directory)
+	store.write_chunk(*key, REF_STACK[store.chunk_slices(*key)])
+
+
+##################################################
+def test_chunk_store():
+	""" Test basique sur la classe (création, écriture, lecture). """
+	directory = f"{OUTPUT_DIR}/test_chunk_store"
+	store = ChunkStore.create(directory, SHAPE, "uint16", chunk_frames=4, tile=32)
+	print(f"\n{store}")
+	assert store.chunk_grid == (3, 2, 2), "Le découpage en blocs n'est pas correct."
+	for key in store.chunk_keys(): store.write_chunk(*key, REF_STACK[store.chunk_slices(*key)])
+
+	store = ChunkStore.open(directory)
+	assert len(store) == SHAPE[0], "Le nombre de frames n'est pas correct."
+	assert np.array_equal(store[5], REF_STACK[5]), "La frame devrait correspondre à la référence."
+	assert np.array_equal(store.read(), REF_STACK), "La pile devrait correspondre à la référence."
+	assert np.array_equal(store.read_frames(3, 9), REF_STACK[3:9]), "Le groupe de frames devrait correspondre à la référence."
+	assert store.read(np.float32).dtype == np.float32, "La pile devrait être lue directement dans le type demandé."
+
+	copy = store.copy(f"{OUTPUT_DIR}/test_chunk_store_copy", chunk_frames=3)
+	assert copy.chunk_grid == (4, 1, 1), "Le découpage de la copie n'est pas correct."
+	assert np.array_equal(ChunkStore.open(copy.directory).read(), REF_STACK), "La copie devrait correspondre à la référence."
+
+
+##################################################
+def test_chunk_store_parallel():
+	""" Test d'écriture des blocs par plusieurs processus dans le désordre. """
+	directory = f"{OUTPUT_DIR}/test_chunk_store_parallel"
+	store = ChunkStore.create(directory, SHAPE, "uint16", chunk_frames=3)
+	keys = store.chunk_keys()[::-1]
+	with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("spawn")) as executor: list(executor.map(write_chunk, [directory] * len(keys), keys))
+	assert np.array_equal(ChunkStore.open(directory).read(), REF_STACK), "La pile devrait correspondre à la référence."
+
+
+##################################################
+def test_chunk_store_partial():
+	""" Test de lecture d'un stockage incomplet et d'écriture par groupe de frames. """
+	directory = f"{OUTPUT_DIR}/test_chunk_store_partial"
+	store = ChunkStore.create(directory, SHAPE, "float32", chunk_frames=4)
+	store.write_frames(4, REF_STACK[4:8].astype(np.float32))
+	assert np.allclose(store[0], 0), "Un bloc non écrit doit être nul."
+	assert np.allclose(store[6], REF_STACK[6]), "La frame devrait correspondre à la référence."
+
+
+##################################################
+def test_chunk_store_bad_options():
+	""" Test sur le stockage avec de mauvaises options. """
+	directory = f"{OUTPUT_DIR}/test_chunk_store_bad"
+	with pytest.raises(ValueError) as exception_info: ChunkStore.create(directory, (10, 10), "uint16")
+	assert exception_info.type == ValueError, "L'erreur relevé n'est pas correcte."
+	store = ChunkStore.create(directory, SHAPE, "uint16", chunk_frames=4)
+	with pytest.raises(ValueError) as exception_info: store.write_chunk(0, 0, 0, REF_STACK[:3])
+	assert exception_info.type == ValueError, "L'erreur relevé n'est pas correcte."
+	with pytest.raises(ValueError) as exception_info: store.write_frames(1, REF_STACK[1:5])
+	assert exception_info.type == ValueError, "L'erreur relevé n'est pas correcte."
+	with pytest.raises(IndexError) as exception_info: store.get_frame(42)
+	assert exception_info.type == IndexError, "L'erreur relevé n'est pas correcte."
+	with pytest.raises(OSError) as exception_info: ChunkStore.open("bad_directory")
+	assert exception_info.type == OSError, "L'erreur relevé n'est pas correcte."
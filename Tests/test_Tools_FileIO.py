@@ -1,6 +1,7 @@
 """ Fichier des tests pour la génération de pattern """
 
 import os
+import time
 from pathlib import Path
 
 import numpy as np
@@ -104,6 +105,14 @@ def test_save_stack_as_tif_2d():
 	assert True
 
 
+##################################################
+def test_save_stack_as_tif_rounding():
+	""" Test de l'arrondi de la fonction save_stack_as_tif (identique à celui des piles stockées en uint16). """
+	FileIO.save_stack_as_tif(np.array([[[0.4, 0.6], [1.5, 70000.0]]], dtype=np.float32), f"{OUTPUT_DIR}/test_save_stack_rounding.tif")
+	res = FileIO.open_tif_as_stack(f"{OUTPUT_DIR}/test_save_stack_rounding.tif")
+	assert np.array_equal(res[0], np.array([[0, 1], [2, 65535]])), "Les valeurs doivent être arrondies au plus proche et bornées."
+
+
 ##################################################
 def test_save_stack_as_tif_bad_stack():
 	""" Test de la fonction save_stack_as_tif avec une image 1D. """
@@ -112,6 +121,41 @@ def test_save_stack_as_tif_bad_stack():
 	assert exception_info.type == ValueError, "L'erreur relevé n'est pas correcte."
 
 
+##################################################
+def test_save_stack_as_tif_compression():
+	""" Test de la fonction save_stack_as_tif avec les différentes compressions (et mesure du débit de chaque codec). """
+	# Pile majoritairement composée de fond bruité comme les piles générées
+	stack = np.random.poisson(500, (20, SIZE, SIZE)).astype(np.uint16)
+	stack[:, SIZE // 4:SIZE // 2, SIZE // 4:SIZE // 2] += 5000
+	print()
+	for compression in FileIO.TIF_COMPRESSIONS:
+		filename = f"{OUTPUT_DIR}/test_save_stack_{compression}.tif"
+		start = time.perf_counter()
+		FileIO.save_stack_as_tif(stack, filename, compression=compression, workers=2)
+		duration = time.perf_counter() - start
+		ratio = os.path.getsize(filename) / stack.nbytes
+		print(f"{compression} : {stack.nbytes / duration / (1024 * 1024):.1f} Mo/s, taille : {ratio * 100:.1f} %")
+		assert np.array_equal(stack, FileIO.open_tif_as_stack(filename)), "La compression doit être sans perte."
+
+	FileIO.save_stack_as_tif(stack, f"{OUTPUT_DIR}/test_save_stack_tiled.tif", compression="zlib", level=1, tile=128, bigtiff=True)
+	assert np.array_equal(stack, FileIO.open_tif_as_stack(f"{OUTPUT_DIR}/test_save_stack_tiled.tif")), "La compression doit être sans perte."
+	for compression in ["none", "zlib"]:  # Pile flottante (sortie par défaut du Stacker) convertie frame par frame en tuiles
+		FileIO.save_stack_as_tif(REF_STACK, f"{OUTPUT_DIR}/test_save_stack_tiled_float.tif", compression=compression, tile=64)
+		res = FileIO.open_tif_as_stack(f"{OUTPUT_DIR}/test_save_stack_tiled_float.tif")
+		assert np.allclose(REF_STACK, res, atol=0.5), "La pile flottante en tuiles devrait correspondre à la référence arrondie."
+
+
+##################################################
+def test_save_stack_as_tif_bad_options():
+	""" Test de la fonction save_stack_as_tif avec de mauvaises options. """
+	with pytest.raises(ValueError) as exception_info:
+		FileIO.save_stack_as_tif(REF_STACK, f"{OUTPUT_DIR}/test_save_stack_bad.tif", compression="jpeg")
+	assert exception_info.type == ValueError, "L'erreur relevé n'est pas correcte."
+	with pytest.raises(ValueError) as exception_info:
+		FileIO.save_stack_as_tif(REF_STACK, f"{OUTPUT_DIR}/test_save_stack_bad.tif", tile=100)
+	assert exception_info.type == ValueError, "L'erreur relevé n'est pas correcte."
+
+
 ##################################################
 def test_open_tif_as_stack():
 	""" Test de la fonction open_tif_as_stack. """
@@ -125,3 +169,26 @@ def test_open_tif_as_stack_bad_file():
 	with pytest.raises(OSError) as exception_info:
 		stack = FileIO.open_tif_as_stack("bad_filename.png")
 	assert exception_info.type == OSError, "L'erreur relevé n'est pas correcte."
+
+
+##################################################
+def test_chunks_conversion():
+	""" Test des fonctions de sauvegarde en blocs et de conversion depuis et vers le format TIF. """
+	FileIO.save_stack_as_chunks(REF_STACK, f"{OUTPUT_DIR}/test_save_stack_chunks", chunk_frames=1, tile=128)
+	stack = FileIO.open_chunks_as_stack(f"{OUTPUT_DIR}/test_save_stack_chunks")
+	assert np.allclose(REF_STACK, stack, atol=1e-5), "La pile devrait correspondre à la référence avec une tolérance d'erreur."
+
+	FileIO.convert_chunks_to_tif(f"{OUTPUT_DIR}/test_save_stack_chunks", f"{OUTPUT_DIR}/test_convert_chunks.tif", compression="zlib")
+	stack = FileIO.open_tif_as_stack(f"{OUTPUT_DIR}/test_convert_chunks.tif")
+	assert np.allclose(REF_STACK, stack, atol=1), "La pile devrait correspondre à la référence avec une tolérance d'erreur."
+	for compression in ["none", "zlib"]:  # Tuiles ne divisant pas la taille des frames (tuiles du bord complétées)
+		FileIO.convert_chunks_to_tif(f"{OUTPUT_DIR}/test_save_stack_chunks", f"{OUTPUT_DIR}/test_convert_chunks_tiled.tif", compression, tile=192)
+		stack = FileIO.open_tif_as_stack(f"{OUTPUT_DIR}/test_convert_chunks_tiled.tif")
+		assert np.allclose(REF_STACK, stack, atol=0.5), "La pile en tuiles devrait correspondre à la référence arrondie."
+
+	FileIO.convert_tif_to_chunks(f"{OUTPUT_DIR}/test_convert_chunks.tif", f"{OUTPUT_DIR}/test_convert_tif_chunks", chunk_frames=2)
+	stack = FileIO.open_chunks_as_stack(f"{OUTPUT_DIR}/test_convert_tif_chunks")
+	assert np.allclose(REF_STACK, stack, atol=1), "La pile devrait correspondre à la référence avec une tolérance d'erreur."
+
+	with pytest.raises(OSError) as exception_info: FileIO.convert_tif_to_chunks("bad_filename.tif", f"{OUTPUT_DIR}/test_bad_chunks")
+	assert exception_info.type == OSError, "L'erreur relevé n'est pas correcte."
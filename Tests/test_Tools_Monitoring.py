@@ -1,10 +1,15 @@
 """ Fichier des tests pour le monitoring """
 
 import os
+import subprocess
+import sys
 import time
 from pathlib import Path
 
-from SampleMaker.Tools import Monitoring
+import numpy as np
+
+from SampleMaker.Generator import MonitoringObserver, Sampler, Stacker
+from SampleMaker.Tools import Monitoring, Profiler
 
 OUTPUT_DIR = Path(__file__).parent / "Output"
 os.makedirs(OUTPUT_DIR, exist_ok=True)  # Créer le dossier de sorties (la première fois, il n'existe pas)
@@ -103,3 +108,91 @@ def test_monitoring_save():
 	for ext in ["png", "html", "json", "txt"]:
 		monitoring.save(f"{OUTPUT_DIR}/test_monitoring.{ext}")
 	assert True
+
+
+##################################################
+def test_monitoring_ring_buffer():
+	""" Test du tampon circulaire (les mesures les plus anciennes sont écrasées). """
+	monitoring = Monitoring(capacity=5)
+	monitoring.start(0.01)
+	time.sleep(0.2)
+	monitoring.stop()
+	print(f"\n{monitoring}")
+	assert monitoring.n_entries == 5, "Le nombre de mesures conservées doit être limité à la capacité."
+	assert monitoring._times[0] == 0 and all(np.diff(monitoring._times) >= 0), "Les mesures ne sont pas dans l'ordre chronologique."
+
+
+##################################################
+def test_monitoring_children():
+	""" Test de la période d'échantillonnage avec plusieurs processus enfants (les mesures ne doivent pas bloquer). """
+	children = [subprocess.Popen([sys.executable, "-c", "import time; time.sleep(1.5)"]) for _ in range(4)]
+	monitoring = Monitoring()
+	monitoring.start(0.05)
+	time.sleep(1)
+	n_processes = len(monitoring._processes)
+	monitoring.stop()
+	for child in children: child.wait()
+	print(f"\n{monitoring.n_entries} mesures, {n_processes} processus")
+	assert n_processes >= 5, "Les processus enfants ne sont pas suivis."
+	assert monitoring.n_entries >= 10, "La période d'échantillonnage dépend du nombre de processus."
+
+
+##################################################
+def test_monitoring_tests_usage():
+	""" Test du décompte des ressources par test et de la comparaison entre deux exécutions. """
+	monitoring = Monitoring()
+	monitoring.start(0.05)
+	assert monitoring.end_test() is None, "Aucun test n'est en cours."
+	monitoring.begin_test("Tests/test_simulation_cpu.py::test_high_cpu_usage")
+	simulate_cpu_usage(monitoring, duration=0.5)
+	allocated_memory = bytearray(50 * 1024 * 1024)
+	with open(f"{OUTPUT_DIR}/test_monitoring_usage.bin", "wb") as f: f.write(bytearray(5 * 1024 * 1024))
+	usage = monitoring.end_test()
+	del allocated_memory
+	monitoring.stop()
+	print(f"\n{usage}")
+	assert usage["duration"] >= 0.5 and usage["cpu_time"] > 0.2, "Le temps du test n'est pas mesuré."
+	assert usage["peak_memory"] >= 40, "Le pic de mémoire n'est pas mesuré."
+	assert monitoring.tests_usage == [usage], "Les ressources du test ne sont pas conservées."
+
+	heavier = usage | {"cpu_time": usage["cpu_time"] * 2}
+	comparison = Monitoring.compare_tests_usage([usage], [heavier, usage | {"test": "other"}])
+	assert list(comparison) == [usage["test"]], "Seuls les tests communs doivent être comparés."
+	assert comparison[usage["test"]]["status"] == "heavier", "Le test plus lourd n'est pas détecté."
+	assert Monitoring.compare_tests_usage([usage], [usage])[usage["test"]]["status"] == "stable", "Un test identique doit être stable."
+
+
+##################################################
+def test_monitoring_context():
+	""" Test du monitoring d'une génération (gestionnaire de contexte, phases et débit). """
+	stacker = Stacker(Sampler(size=32))
+	with Monitoring(0.05) as monitoring:
+		assert monitoring.running, "La surveillance n'est pas démarrée."
+		stacker.observers.append(MonitoringObserver(monitoring))
+		stacker.generate(20)
+		time.sleep(0.1)
+	assert not monitoring.running, "La surveillance n'est pas arrêtée."
+	print(f"\n{monitoring}")
+	assert [phase["File"] for phase in monitoring._tests_info] == ["Generation", "Saving"], "Les phases de la génération sont incorrectes."
+	assert monitoring._frames == 20 and np.max(monitoring._fps) > 0, "Le débit en frames par seconde est incorrect."
+	assert np.sum(monitoring._mps) > 0, "Le débit en molécules par seconde est absent."
+	for ext in ["html", "txt"]: monitoring.save(f"{OUTPUT_DIR}/test_monitoring_generation.{ext}")
+	with open(f"{OUTPUT_DIR}/test_monitoring_generation.txt", "r", encoding="utf-8") as f: assert "frames/s" in f.read(), "Le débit n'est pas enregistré."
+
+
+##################################################
+def test_monitoring_profile():
+	""" Test de l'affichage des spans d'un profileur comme phases du monitoring. """
+	stacker = Stacker(Sampler(size=32))
+	with Monitoring(0.05) as monitoring:
+		monitoring.add_phase("Generation")
+		with Profiler() as profiler: stacker.generate(10)
+		monitoring.add_profile(profiler, min_duration=0)
+		time.sleep(0.1)
+	phases = [phase["File"] for phase in monitoring._tests_info]
+	print(phases[:5])
+	assert phases[0] == "Generation" and "stacker.generate" in phases, "Les spans du profil doivent être ajoutés comme phases."
+	assert len(phases) == 1 + len(profiler.events), "Chaque exécution doit être ajoutée."
+	times = [phase["Timestamp"] for phase in monitoring._tests_info]
+	assert times == sorted(times) and times[0] >= 0, "Les phases doivent être ordonnées à leur date réelle."
+	monitoring.save(f"{OUTPUT_DIR}/test_monitoring_profile.html")
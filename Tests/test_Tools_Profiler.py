@@ -0,0 +1,81 @@
+""" Fichier des tests pour le profileur """
+
+import json
+import os
+import threading
+from pathlib import Path
+
+from SampleMaker.__main__ import main
+from SampleMaker.Generator import Sampler, Stacker
+from SampleMaker.Tools import Profiler, save_stack_as_tif
+from SampleMaker.Tools.Profiler import count, is_profiling, span
+
+OUTPUT_DIR = Path(__file__).parent / "Output"
+os.makedirs(OUTPUT_DIR, exist_ok=True)  # Créer le dossier de sorties (la première fois, il n'existe pas)
+
+
+##################################################
+def test_profiler_disabled():
+	""" Test de l'instrumentation sans profileur actif. """
+	assert not is_profiling(), "Aucun profileur ne doit être actif."
+	with span("test"): count("test", 1)  # Aucun effet
+	profiler = Profiler()
+	with profiler:
+		assert profiler.enabled and is_profiling(), "Le profileur n'est pas activé."
+		with span("test"): count("test", 2)
+	with span("test"): count("test", 3)
+	assert not profiler.enabled, "Le profileur n'est pas désactivé."
+	assert profiler.spans["test"].count == 1 and profiler.counters["test"] == 2, "Seules les mesures du bloc doivent être conservées."
+
+
+##################################################
+def test_profiler_nested():
+	""" Test de profileurs imbriqués (le précédent est réactivé). """
+	with Profiler() as outer:
+		with Profiler() as inner: count("test", 1)
+		count("test", 2)
+	assert inner.counters == {"test": 1} and outer.counters == {"test": 2}, "Le profileur précédent n'est pas réactivé."
+
+
+##################################################
+def test_profiler_generation():
+	""" Test du profil d'une génération et de son enregistrement. """
+	stacker = Stacker(Sampler(size=32, density=1))
+	with Profiler() as profiler:
+		stack = stacker.generate(3)
+		save_stack_as_tif(stack.stack, f"{OUTPUT_DIR}/test_profiler.tif")
+	print(f"\n{profiler}")
+	for name in ("stacker.generate", "sampler.localisation", "sampler.psf", "noiser.apply", "fileio.save_stack_as_tif"):
+		assert name in profiler.spans, f"Le span {name} est absent."
+	assert profiler.spans["sampler.psf"].count == 3, "Le nombre d'exécutions est incorrect."
+	assert profiler.counters["frames"] == 3, "Le compteur de frames est incorrect."
+	assert profiler.counters["molecules"] == sum(stacker.sampler.n_molecules), "Le compteur de molécules est incorrect."
+	assert profiler.counters["pixels"] == profiler.counters["molecules"] * 32 * 32, "Le compteur de pixels est incorrect."
+	assert profiler.counters["bytes_written"] == os.path.getsize(f"{OUTPUT_DIR}/test_profiler.tif"), "Le compteur d'octets écrits est incorrect."
+	assert profiler.counters["bytes_allocated"] >= stack.stack.nbytes, "Le compteur d'octets alloués est incorrect."
+
+	for ext in ["json", "html", "txt"]: profiler.save(f"{OUTPUT_DIR}/test_profiler.{ext}")
+	with open(f"{OUTPUT_DIR}/test_profiler.json", "r", encoding="utf-8") as f: report = json.load(f)
+	totals = [stats["total"] for stats in report["spans"].values()]
+	assert totals == sorted(totals, reverse=True), "Les spans doivent être triés par durée totale."
+	assert len(report["events"]) == sum(stats.count for stats in profiler.spans.values()), "Les exécutions ne sont pas toutes enregistrées."
+
+
+##################################################
+def test_main_profile():
+	""" Test de l'option de profilage de la ligne de commande. """
+	config = {"parameters": {"size": 32, "n_frames": 2}, "output": {"directory": f"{OUTPUT_DIR}/test_profiler", "name": "stack"}}
+	with open(f"{OUTPUT_DIR}/test_profiler_config.json", "w", encoding="utf-8") as f: json.dump(config, f)
+	assert main(["generate", f"{OUTPUT_DIR}/test_profiler_config.json", "--profile", f"{OUTPUT_DIR}/test_profiler_main.json"]) == 0, "La génération a échoué."
+	with open(f"{OUTPUT_DIR}/test_profiler_main.json", "r", encoding="utf-8") as f: report = json.load(f)
+	assert report["counters"]["frames"] == 2, "Le profil de la génération est incorrect."
+	assert os.path.isfile(f"{OUTPUT_DIR}/test_profiler_main.html"), "Les graphiques du profil ne sont pas enregistrés."
+	assert not is_profiling(), "Le profileur doit être désactivé après la génération."
+	# Erreur pendant la génération : le profileur et la surveillance doivent être arrêtés
+	config["output"]["format"] = "bad"
+	with open(f"{OUTPUT_DIR}/test_profiler_config.json", "w", encoding="utf-8") as f: json.dump(config, f)
+	threads = threading.active_count()
+	assert main(["generate", f"{OUTPUT_DIR}/test_profiler_config.json", "--profile", f"{OUTPUT_DIR}/test_profiler_main.json",
+				 "--monitor", f"{OUTPUT_DIR}/test_profiler_monitoring.html"]) == 1, "La génération doit échouer."
+	assert not is_profiling(), "Le profileur doit être désactivé après une erreur."
+	assert threading.active_count() == threads, "La surveillance doit être arrêtée après une erreur."
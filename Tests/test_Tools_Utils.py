@@ -75,3 +75,15 @@ def test_add_grid():
 	save_sample_as_png(image, f"{OUTPUT_DIR}/Grid.png")
 	ref = open_png_as_sample(f"{INPUT_DIR}/Grid.png")
 	assert np.allclose(ref, image), "L'image devrait correspondre à la référence."
+
+
+##################################################
+def test_to_uint16():
+	""" Test de la fonction to uint16. """
+	image = np.array([[-10.0, 0.4], [0.6, 70000.0]], dtype=np.float32)
+	res = Utils.to_uint16(image)
+	assert res.dtype == np.uint16, "Le type de l'image devrait être uint16."
+	assert np.array_equal(res, np.array([[0, 0], [1, 65535]])), "L'image devrait être arrondie et bornée."
+	assert Utils.to_uint16(res) is res, "Une image déjà en uint16 ne doit pas être copiée."
+	res = Utils.to_uint16(np.array([[-3, 2], [7, 70000]]))
+	assert np.array_equal(res, np.array([[0, 2], [7, 65535]])), "Une image entière devrait être bornée sans erreur."